@@ -0,0 +1,38 @@
+"""Add token_version to users and vendor_users.
+
+The token version is embedded in access tokens and bumped on logout,
+deactivation and role changes, which revokes all previously issued tokens
+and keys the authenticated-principal cache.
+
+Revision ID: 010_add_token_version
+Revises: 009_add_history
+Create Date: 2025-01-15
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "010"
+down_revision: Union[str, None] = "009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "users",
+        sa.Column("token_version", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.add_column(
+        "vendor_users",
+        sa.Column("token_version", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("vendor_users", "token_version")
+    op.drop_column("users", "token_version")
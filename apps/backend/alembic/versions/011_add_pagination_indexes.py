@@ -0,0 +1,48 @@
+"""Add composite indexes for keyset pagination.
+
+List endpoints page by (sort key, id) newest first; each index matches
+the filter columns and sort order of one list so that every page is an
+index range scan regardless of its depth.
+
+Revision ID: 011_add_pagination_indexes
+Revises: 010_add_token_version
+Create Date: 2025-01-20
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "011"
+down_revision: Union[str, None] = "010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ("ix_audit_cases_tenant_created", "audit_cases", ["tenant_id", "created_at", "id"]),
+    (
+        "ix_audit_logs_tenant_entity_created",
+        "audit_logs",
+        ["tenant_id", "entity_id", "created_at", "id"],
+    ),
+    ("ix_box_documents_box_uploaded", "box_documents", ["box_id", "uploaded_at", "id"]),
+    ("ix_module_events_created", "module_events", ["created_at", "id"]),
+    (
+        "ix_llm_conversations_tenant_updated",
+        "llm_conversations",
+        ["tenant_id", "updated_at", "id"],
+    ),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,80 @@
+"""Add search indexes for audit cases.
+
+Adds a generated, weighted tsvector column with a GIN index for ranked
+prefix search and a lower(case_number) index for case number prefixes.
+If the pg_trgm extension is available it is enabled and trigram GIN
+indexes are added for typo-tolerant matching; otherwise the search falls
+back to full text matching only.
+
+Revision ID: 012_add_audit_case_search
+Revises: 011_add_pagination_indexes
+Create Date: 2025-01-22
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "012"
+down_revision: Union[str, None] = "011"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('simple', coalesce(case_number, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(project_name, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(beneficiary_name, '')), 'C')"
+)
+
+TRIGRAM_COLUMNS = ["case_number", "project_name", "beneficiary_name"]
+
+
+def upgrade() -> None:
+    op.add_column(
+        "audit_cases",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(SEARCH_VECTOR, persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_audit_cases_search_vector",
+        "audit_cases",
+        ["search_vector"],
+        postgresql_using="gin",
+    )
+    op.execute(
+        "CREATE INDEX ix_audit_cases_case_number_prefix "
+        "ON audit_cases (lower(case_number) text_pattern_ops)"
+    )
+
+    available = op.get_bind().execute(
+        sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+    )
+    if available.scalar() is None:
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for column in TRIGRAM_COLUMNS:
+        op.create_index(
+            f"ix_audit_cases_{column}_trgm",
+            "audit_cases",
+            [column],
+            postgresql_using="gin",
+            postgresql_ops={column: "gin_trgm_ops"},
+        )
+
+
+def downgrade() -> None:
+    for column in TRIGRAM_COLUMNS:
+        op.execute(f"DROP INDEX IF EXISTS ix_audit_cases_{column}_trgm")
+    op.drop_index("ix_audit_cases_case_number_prefix", table_name="audit_cases")
+    op.drop_index("ix_audit_cases_search_vector", table_name="audit_cases")
+    op.drop_column("audit_cases", "search_vector")
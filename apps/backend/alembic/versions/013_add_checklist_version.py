@@ -0,0 +1,32 @@
+"""Add version to audit_case_checklists.
+
+Checklist responses are merged in the database; the version is bumped by
+every update and lets clients detect concurrent edits.
+
+Revision ID: 013_add_checklist_version
+Revises: 012_add_audit_case_search
+Create Date: 2025-01-27
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "013"
+down_revision: Union[str, None] = "012"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "audit_case_checklists",
+        sa.Column("version", sa.Integer(), nullable=False, server_default="1"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("audit_case_checklists", "version")
@@ -0,0 +1,128 @@
+"""Add checklist_answers table.
+
+Normalized copy of the answers in audit_case_checklists.responses, one row
+per checklist, question and value with typed value columns, so answer
+distributions are aggregated in SQL. Existing answers are backfilled.
+
+Revision ID: 014_add_checklist_answers
+Revises: 013_add_checklist_version
+Create Date: 2025-01-27
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "014"
+down_revision: Union[str, None] = "013"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Response entries are {"value": ..., "answered_at": ..., ...} (older
+# checklists store the bare value); lists have one row per element.
+BACKFILL = r"""
+INSERT INTO checklist_answers (
+    checklist_id, question_id, position, tenant_id, audit_case_id,
+    checklist_type, template_id, value_text, value_number, value_bool,
+    answered_at, answered_by
+)
+SELECT
+    c.id,
+    r.key,
+    v.position - 1,
+    ac.tenant_id,
+    c.audit_case_id,
+    c.checklist_type::text,
+    c.checklist_template_id,
+    left(v.item #>> '{}', 500),
+    CASE
+        WHEN jsonb_typeof(v.item) = 'number' THEN (v.item #>> '{}')::numeric
+        WHEN jsonb_typeof(v.item) = 'string'
+            AND v.item #>> '{}' ~ '^-?[0-9]+(\.[0-9]+)?$'
+            THEN (v.item #>> '{}')::numeric
+    END,
+    CASE
+        WHEN jsonb_typeof(v.item) = 'boolean' THEN (v.item #>> '{}')::boolean
+    END,
+    CASE
+        WHEN a.entry ->> 'answered_at' ~ '^\d{4}-\d{2}-\d{2}T'
+            THEN (a.entry ->> 'answered_at')::timestamptz
+    END,
+    CASE
+        WHEN a.entry ->> 'answered_by' ~ '^[0-9a-fA-F-]{36}$'
+            THEN (a.entry ->> 'answered_by')::uuid
+    END
+FROM audit_case_checklists c
+JOIN audit_cases ac ON ac.id = c.audit_case_id
+CROSS JOIN LATERAL jsonb_each(
+    CASE WHEN jsonb_typeof(c.responses) = 'object' THEN c.responses END
+) AS r(key, raw)
+CROSS JOIN LATERAL (
+    SELECT
+        CASE WHEN jsonb_typeof(r.raw) = 'object' THEN r.raw END AS entry,
+        CASE WHEN jsonb_typeof(r.raw) = 'object' THEN r.raw -> 'value'
+             ELSE r.raw END AS answer
+) AS a
+CROSS JOIN LATERAL jsonb_array_elements(
+    CASE WHEN jsonb_typeof(a.answer) = 'array' THEN a.answer
+         ELSE jsonb_build_array(a.answer) END
+) WITH ORDINALITY AS v(item, position)
+WHERE a.answer IS NOT NULL
+  AND jsonb_typeof(v.item) <> 'null'
+  AND length(r.key) <= 100
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        "checklist_answers",
+        sa.Column("checklist_id", postgresql.UUID(as_uuid=False), nullable=False),
+        sa.Column("question_id", sa.String(100), nullable=False),
+        sa.Column("position", sa.Integer(), nullable=False),
+        sa.Column("tenant_id", postgresql.UUID(as_uuid=False), nullable=False),
+        sa.Column("audit_case_id", postgresql.UUID(as_uuid=False), nullable=False),
+        sa.Column("checklist_type", sa.String(50), nullable=False),
+        sa.Column("template_id", postgresql.UUID(as_uuid=False), nullable=True),
+        sa.Column("value_text", sa.String(500), nullable=True),
+        sa.Column("value_number", sa.Numeric(), nullable=True),
+        sa.Column("value_bool", sa.Boolean(), nullable=True),
+        sa.Column("answered_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("answered_by", postgresql.UUID(as_uuid=False), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["checklist_id"], ["audit_case_checklists.id"], ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(["tenant_id"], ["tenants.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(
+            ["audit_case_id"], ["audit_cases.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("checklist_id", "question_id", "position"),
+    )
+    op.create_index(
+        "ix_checklist_answers_audit_case_id", "checklist_answers", ["audit_case_id"]
+    )
+    op.create_index(
+        "ix_checklist_answers_question_value",
+        "checklist_answers",
+        ["tenant_id", "question_id", "value_text"],
+    )
+    op.create_index(
+        "ix_checklist_answers_template_question",
+        "checklist_answers",
+        ["template_id", "question_id", "value_text"],
+    )
+
+    op.execute(sa.text(BACKFILL))
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_checklist_answers_template_question", table_name="checklist_answers"
+    )
+    op.drop_index("ix_checklist_answers_question_value", table_name="checklist_answers")
+    op.drop_index("ix_checklist_answers_audit_case_id", table_name="checklist_answers")
+    op.drop_table("checklist_answers")
@@ -0,0 +1,93 @@
+"""Add finding number counters and unique finding numbers.
+
+Finding numbers are reserved from a counter row per audit case instead of
+max(finding_number) + 1. Duplicate numbers created by concurrent requests
+before this migration are renumbered after the highest number of their
+case, so that (audit_case_id, finding_number) can be made unique.
+
+Revision ID: 015_add_finding_number_counters
+Revises: 014_add_checklist_answers
+Create Date: 2025-01-27
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "015"
+down_revision: Union[str, None] = "014"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Keeps the oldest finding of each duplicate number
+RENUMBER_DUPLICATES = """
+WITH numbered AS (
+    SELECT
+        id,
+        audit_case_id,
+        created_at,
+        row_number() OVER (
+            PARTITION BY audit_case_id, finding_number ORDER BY created_at, id
+        ) AS duplicate
+    FROM audit_case_findings
+),
+moved AS (
+    SELECT
+        id,
+        audit_case_id,
+        row_number() OVER (
+            PARTITION BY audit_case_id ORDER BY created_at, id
+        ) AS offset_number
+    FROM numbered
+    WHERE duplicate > 1
+),
+highest AS (
+    SELECT audit_case_id, max(finding_number) AS finding_number
+    FROM audit_case_findings
+    GROUP BY audit_case_id
+)
+UPDATE audit_case_findings f
+SET finding_number = highest.finding_number + moved.offset_number
+FROM moved
+JOIN highest ON highest.audit_case_id = moved.audit_case_id
+WHERE f.id = moved.id
+"""
+
+
+def upgrade() -> None:
+    op.execute(RENUMBER_DUPLICATES)
+    op.create_unique_constraint(
+        "uq_audit_case_findings_number",
+        "audit_case_findings",
+        ["audit_case_id", "finding_number"],
+    )
+
+    op.create_table(
+        "finding_number_counters",
+        sa.Column("audit_case_id", postgresql.UUID(as_uuid=False), nullable=False),
+        sa.Column("last_number", sa.Integer(), nullable=False, server_default="0"),
+        sa.ForeignKeyConstraint(
+            ["audit_case_id"], ["audit_cases.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("audit_case_id"),
+    )
+    op.execute(
+        """
+        INSERT INTO finding_number_counters (audit_case_id, last_number)
+        SELECT audit_case_id, max(finding_number)
+        FROM audit_case_findings
+        GROUP BY audit_case_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("finding_number_counters")
+    op.drop_constraint(
+        "uq_audit_case_findings_number", "audit_case_findings", type_="unique"
+    )
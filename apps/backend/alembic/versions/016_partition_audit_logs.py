@@ -0,0 +1,155 @@
+"""Partition audit_logs by month of created_at.
+
+The table is rebuilt as a range-partitioned table with one partition per
+month (audit_logs_yYYYYmMM, bounds in UTC) from the oldest entry up to
+three months ahead, plus a default partition. The primary key becomes
+(id, created_at) since it has to contain the partition key. Existing rows
+are copied over; the application creates further partitions (see
+app.services.audit_log_partitions).
+
+Revision ID: 016_partition_audit_logs
+Revises: 015_add_finding_number_counters
+Create Date: 2025-01-27
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "016"
+down_revision: Union[str, None] = "015"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ("ix_audit_logs_tenant_id", ["tenant_id"]),
+    ("ix_audit_logs_entity_type", ["entity_type"]),
+    ("ix_audit_logs_entity_id", ["entity_id"]),
+    ("ix_audit_logs_entity", ["entity_type", "entity_id"]),
+    ("ix_audit_logs_created_at", ["created_at"]),
+    (
+        "ix_audit_logs_tenant_entity_created",
+        ["tenant_id", "entity_id", "created_at", "id"],
+    ),
+]
+
+# Frees the index and constraint names of a renamed table
+RENAME_INDEXES = """
+DO $$
+DECLARE
+    idx record;
+BEGIN
+    FOR idx IN
+        SELECT indexname FROM pg_indexes WHERE tablename = '{table}'
+    LOOP
+        EXECUTE format(
+            'ALTER INDEX %I RENAME TO %I', idx.indexname, idx.indexname || '_old'
+        );
+    END LOOP;
+END $$
+"""
+
+CREATE_MONTHLY_PARTITIONS = """
+DO $$
+DECLARE
+    month timestamptz;
+    last_month timestamptz := date_trunc('month', now()) + interval '3 months';
+BEGIN
+    SELECT coalesce(
+        date_trunc('month', min(created_at)), date_trunc('month', now())
+    )
+    INTO month
+    FROM audit_logs_unpartitioned;
+
+    WHILE month <= last_month LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF audit_logs FOR VALUES FROM (%L) TO (%L)',
+            'audit_logs_y' || to_char(month, 'YYYY') || 'm' || to_char(month, 'MM'),
+            month,
+            month + interval '1 month'
+        );
+        month := month + interval '1 month';
+    END LOOP;
+END $$
+"""
+
+
+def _create_indexes() -> None:
+    for name, columns in INDEXES:
+        op.create_index(name, "audit_logs", columns)
+
+
+def upgrade() -> None:
+    # Month bounds are computed in UTC
+    op.execute("SET LOCAL timezone = 'UTC'")
+
+    op.execute("ALTER TABLE audit_logs RENAME TO audit_logs_unpartitioned")
+    op.execute(RENAME_INDEXES.format(table="audit_logs_unpartitioned"))
+
+    op.execute(
+        """
+        CREATE TABLE audit_logs (
+            LIKE audit_logs_unpartitioned INCLUDING DEFAULTS
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+    op.create_primary_key("pk_audit_logs", "audit_logs", ["id", "created_at"])
+    op.create_foreign_key(
+        "fk_audit_logs_tenant_id_tenants",
+        "audit_logs",
+        "tenants",
+        ["tenant_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
+    op.create_foreign_key(
+        "fk_audit_logs_user_id_users",
+        "audit_logs",
+        "users",
+        ["user_id"],
+        ["id"],
+        ondelete="SET NULL",
+    )
+    _create_indexes()
+
+    op.execute(CREATE_MONTHLY_PARTITIONS)
+    op.execute("CREATE TABLE audit_logs_default PARTITION OF audit_logs DEFAULT")
+
+    op.execute("INSERT INTO audit_logs SELECT * FROM audit_logs_unpartitioned")
+    op.execute("DROP TABLE audit_logs_unpartitioned")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE audit_logs RENAME TO audit_logs_partitioned")
+    op.execute(
+        """
+        CREATE TABLE audit_logs (
+            LIKE audit_logs_partitioned INCLUDING DEFAULTS
+        )
+        """
+    )
+    op.execute("INSERT INTO audit_logs SELECT * FROM audit_logs_partitioned")
+    # Drops the partitions and their indexes as well
+    op.execute("DROP TABLE audit_logs_partitioned")
+
+    op.create_primary_key("pk_audit_logs", "audit_logs", ["id"])
+    op.create_foreign_key(
+        "fk_audit_logs_tenant_id_tenants",
+        "audit_logs",
+        "tenants",
+        ["tenant_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
+    op.create_foreign_key(
+        "fk_audit_logs_user_id_users",
+        "audit_logs",
+        "users",
+        ["user_id"],
+        ["id"],
+        ondelete="SET NULL",
+    )
+    _create_indexes()
@@ -0,0 +1,76 @@
+"""Add composite and partial indexes found by the query plan review.
+
+Found with benchmarks/query_plans.py against 100,000 audit cases of one
+tenant among 500,000: filtering the case list by status or audit type,
+or the conversation list by context, read all rows of the tenant through
+the tenant index and discarded most of them; the authority drill-down
+sorted all cases of a tenant by updated_at and scanned all findings for
+drafts. The composite indexes put the filter column between tenant and
+sort key. Two indexes are partial: only conversations attached to an
+object have a context_id, and the drill-down only counts draft findings.
+
+Revision ID: 017_add_query_plan_indexes
+Revises: 016_partition_audit_logs
+Create Date: 2025-01-27
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "017"
+down_revision: Union[str, None] = "016"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    (
+        "ix_audit_cases_tenant_status_created",
+        "audit_cases",
+        ["tenant_id", "status", "created_at", "id"],
+        None,
+    ),
+    (
+        "ix_audit_cases_tenant_type_created",
+        "audit_cases",
+        ["tenant_id", "audit_type", "created_at", "id"],
+        None,
+    ),
+    (
+        "ix_audit_cases_tenant_updated",
+        "audit_cases",
+        ["tenant_id", "updated_at"],
+        None,
+    ),
+    (
+        "ix_audit_case_findings_draft",
+        "audit_case_findings",
+        ["audit_case_id"],
+        "status = 'draft'",
+    ),
+    (
+        "ix_llm_conversations_tenant_context_updated",
+        "llm_conversations",
+        ["tenant_id", "context_id", "updated_at", "id"],
+        "context_id IS NOT NULL",
+    ),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns, where in INDEXES:
+        op.create_index(
+            name,
+            table,
+            columns,
+            postgresql_where=sa.text(where) if where else None,
+        )
+
+
+def downgrade() -> None:
+    for name, table, _, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
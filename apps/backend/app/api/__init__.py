@@ -10,6 +10,7 @@ from app.api.checklists import router as checklists_router
 from app.api.document_box import router as document_box_router
 from app.api.findings import router as findings_router
 from app.api.audit_logs import router as audit_logs_router
+from app.api.audit_logs import tenant_router as tenant_audit_logs_router
 from app.api.modules import router as modules_router
 
 # Layer 0: Vendor & Development
@@ -36,6 +37,7 @@ router.include_router(checklists_router, tags=["Checklists"])
 router.include_router(document_box_router, tags=["Document Box"])
 router.include_router(findings_router, tags=["Findings"])
 router.include_router(audit_logs_router, tags=["Audit History"])
+router.include_router(tenant_audit_logs_router, tags=["Audit History"])
 router.include_router(modules_router, prefix="/modules", tags=["Module Converter"])
 # Layer 0: Vendor APIs
 router.include_router(vendor_router, prefix="/v1/vendor", tags=["Vendor"])
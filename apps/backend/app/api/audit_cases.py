@@ -1,49 +1,106 @@
 """Audit Cases API Endpoints."""
 
-from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
-from sqlalchemy import func, select
+from datetime import date
+from typing import Literal, Optional
+from uuid import UUID
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Form,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import aliased
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db, stream_in_own_session
+from app.core.config import settings
+from app.core.pagination import CountMode, paginate
+from app.core.response_cache import DetailResponseCache
 from app.api.auth import get_current_user
-from app.api.audit_logs import log_audit_event
+from app.api.audit_logs import audit_log_values, log_audit_event, log_audit_events
 from app.models.user import User
-from app.models.audit_case import AuditCase, AuditCaseChecklist, AuditCaseFinding
+from app.models.audit_case import (
+    AuditCase,
+    AuditCaseChecklist,
+    AuditCaseFinding,
+    ChecklistTemplate,
+)
 from app.schemas.audit_case import (
     AuditCaseCreate,
     AuditCaseUpdate,
     AuditCaseResponse,
+    AuditCaseBulkChange,
+    AuditCaseBulkUpdate,
+    AuditCaseBulkUpdateResult,
     AuditCaseDetailResponse,
+    AuditCaseImportResult,
     AuditCaseListResponse,
+    AuditCaseSearchHit,
+    AuditCaseSearchResponse,
     AuditCaseStatistics,
+    AuditCaseSummary,
     AuditorInfo,
     ChecklistSummary,
     ChecklistResponse,
     ChecklistUpdate,
+    FindingsSummary,
+)
+from app.services.audit_case_bulk import (
+    BulkLimitExceeded,
+    BulkUpdateError,
+    bulk_update_audit_cases,
+)
+from app.services.audit_case_io import (
+    XLSX_MEDIA_TYPE,
+    ImportFormatError,
+    ImportTooLarge,
+    detect_format,
+    export_csv,
+    export_xlsx,
+    import_audit_cases,
+    read_rows,
+)
+from app.services.audit_search import (
+    search_audit_cases,
+    search_filter,
+    trigram_available,
 )
+from app.services.audit_statistics import load_audit_statistics, statistics_cache
+from app.services.checklist_responses import (
+    ChecklistVersionConflict,
+    update_checklist_responses,
+)
+from app.services.checklist_templates import get_compiled_template
+from app.services.finding_statistics import load_findings_summaries
 
 router = APIRouter(prefix="/audit-cases", tags=["Audit Cases"])
 
+FINDINGS_SUMMARY_MAX_CASES = 500
 
-# --- Audit Cases CRUD ---
+# Serialized case detail responses, keyed by version (see get_audit_case)
+detail_cache = DetailResponseCache(max_entries=settings.detail_cache_size)
 
 
-@router.get("", response_model=AuditCaseListResponse)
-async def list_audit_cases(
-    page: int = Query(1, ge=1),
-    page_size: int = Query(20, ge=1, le=100),
+async def _filtered_cases(
+    db: AsyncSession,
+    user: User,
     status: Optional[str] = None,
     audit_type: Optional[str] = None,
-    search: Optional[str] = None,
     fiscal_year_id: Optional[str] = None,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
-):
-    """List audit cases with pagination and filtering."""
+    search: Optional[str] = None,
+) -> Select:
+    """Build the select of the user's audit cases matching the list filters."""
     # Base query with tenant filter
-    query = select(AuditCase).where(AuditCase.tenant_id == current_user.tenant_id)
+    query = select(AuditCase).where(AuditCase.tenant_id == user.tenant_id)
 
     # Apply filters
     if status:
@@ -53,34 +110,61 @@ async def list_audit_cases(
     if fiscal_year_id:
         query = query.where(AuditCase.fiscal_year_id == fiscal_year_id)
     if search:
-        search_pattern = f"%{search}%"
-        query = query.where(
-            (AuditCase.case_number.ilike(search_pattern))
-            | (AuditCase.project_name.ilike(search_pattern))
-            | (AuditCase.beneficiary_name.ilike(search_pattern))
-        )
+        query = query.where(search_filter(search, await trigram_available(db)))
+    return query
 
-    # Count total
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar() or 0
 
-    # Calculate pages
-    pages = (total + page_size - 1) // page_size if total > 0 else 1
+# --- Audit Cases CRUD ---
 
-    # Pagination
-    offset = (page - 1) * page_size
-    query = query.order_by(AuditCase.created_at.desc()).offset(offset).limit(page_size)
 
-    result = await db.execute(query)
-    items = result.scalars().all()
+@router.get("", response_model=AuditCaseListResponse)
+async def list_audit_cases(
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    status: Optional[str] = None,
+    audit_type: Optional[str] = None,
+    search: Optional[str] = None,
+    fiscal_year_id: Optional[str] = None,
+    cursor: Optional[str] = None,
+    count: CountMode = "exact",
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """List audit cases with pagination and filtering.
+
+    Pass the ``next_cursor`` of a response as ``cursor`` to fetch the next
+    page by keyset instead of offset. ``count`` selects whether the total
+    is counted exactly, capped or skipped.
+    """
+    query = await _filtered_cases(
+        db, current_user, status, audit_type, fiscal_year_id, search
+    )
+
+    result = await paginate(
+        db,
+        query,
+        AuditCase.created_at,
+        AuditCase.id,
+        page=page,
+        page_size=page_size,
+        cursor=cursor,
+        count=count,
+    )
+
+    # Calculate pages
+    pages = None
+    if result.total is not None:
+        pages = (result.total + page_size - 1) // page_size if result.total > 0 else 1
 
     return AuditCaseListResponse(
-        items=[AuditCaseResponse.model_validate(item) for item in items],
-        total=total,
+        items=[AuditCaseResponse.model_validate(item) for item in result.items],
+        total=result.total,
         page=page,
         page_size=page_size,
         pages=pages,
+        next_cursor=result.next_cursor,
+        has_more=result.has_more,
+        total_is_estimate=result.total_is_estimate,
     )
 
 
@@ -112,54 +196,274 @@ async def create_audit_case(
     )
 
     await db.commit()
+    statistics_cache.invalidate(current_user.tenant_id)
     await db.refresh(audit_case)
 
     return AuditCaseResponse.model_validate(audit_case)
 
 
+@router.get("/search", response_model=AuditCaseSearchResponse)
+async def search_cases(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    status: Optional[str] = None,
+    fiscal_year_id: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Search audit cases, most relevant first.
+
+    Matches case number prefixes, word prefixes in project and beneficiary
+    names and, if pg_trgm is installed, similar spellings.
+    """
+    query = select(AuditCase)
+    if status:
+        query = query.where(AuditCase.status == status)
+    if fiscal_year_id:
+        query = query.where(AuditCase.fiscal_year_id == fiscal_year_id)
+
+    hits = await search_audit_cases(
+        db, current_user.tenant_id, q, limit=limit, query=query
+    )
+
+    return AuditCaseSearchResponse(
+        items=[
+            AuditCaseSearchHit(
+                **AuditCaseSummary.model_validate(case).model_dump(), score=score
+            )
+            for case, score in hits
+        ],
+        query=q,
+        fuzzy=await trigram_available(db),
+    )
+
+
 @router.get("/statistics", response_model=AuditCaseStatistics)
 async def get_audit_statistics(
     fiscal_year_id: Optional[str] = None,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    """Get audit case statistics."""
-    query = select(AuditCase).where(AuditCase.tenant_id == current_user.tenant_id)
+    """Get audit case statistics.
 
-    if fiscal_year_id:
-        query = query.where(AuditCase.fiscal_year_id == fiscal_year_id)
+    Aggregated in the database and cached per tenant and fiscal year until
+    the next case write (or the cache TTL). Read from the primary, since
+    the result is cached for all users of the tenant and a lagging replica
+    would refill the cache with data from before the write.
+    """
+    return await load_audit_statistics(db, current_user.tenant_id, fiscal_year_id)
 
-    result = await db.execute(query)
-    cases = result.scalars().all()
-
-    # Calculate statistics
-    by_status: dict[str, int] = {}
-    by_result: dict[str, int] = {}
-    by_type: dict[str, int] = {}
-    total_audited = 0
-    total_irregular = 0
-
-    for case in cases:
-        by_status[case.status] = by_status.get(case.status, 0) + 1
-        if case.result:
-            by_result[case.result] = by_result.get(case.result, 0) + 1
-        by_type[case.audit_type] = by_type.get(case.audit_type, 0) + 1
-
-        if case.audited_amount:
-            total_audited += float(case.audited_amount)
-        if case.irregular_amount:
-            total_irregular += float(case.irregular_amount)
-
-    error_rate = (total_irregular / total_audited * 100) if total_audited > 0 else 0
-
-    return AuditCaseStatistics(
-        total=len(cases),
-        by_status=by_status,
-        by_result=by_result,
-        by_type=by_type,
-        total_audited_amount=total_audited,
-        total_irregular_amount=total_irregular,
-        error_rate=round(error_rate, 2),
+
+@router.get("/findings-summary", response_model=dict[str, FindingsSummary])
+async def get_findings_summaries(
+    case_ids: list[UUID] = Query(..., description="Prüfungsfall-IDs"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Get the findings summaries of many audit cases (for dashboards).
+
+    Uncached summaries are aggregated together in one query. Cases of other
+    tenants and unknown cases are left out. Read from the primary, as the
+    summaries are cached for all users.
+    """
+    if len(case_ids) > FINDINGS_SUMMARY_MAX_CASES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Maximal {FINDINGS_SUMMARY_MAX_CASES} Prüfungsfälle",
+        )
+
+    result = await db.execute(
+        select(AuditCase.id).where(
+            AuditCase.tenant_id == current_user.tenant_id,
+            AuditCase.id.in_({str(case_id) for case_id in case_ids}),
+        )
+    )
+    return await load_findings_summaries(db, result.scalars().all())
+
+
+# --- Bulk Import / Export ---
+
+
+@router.post("/import", response_model=AuditCaseImportResult)
+async def import_cases(
+    request: Request,
+    file: UploadFile = File(...),
+    dry_run: bool = Form(False),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Import audit cases from a CSV or XLSX file.
+
+    The first row holds the column names (the fields of AuditCaseCreate).
+    Valid rows are created, invalid rows are reported with their errors.
+    With ``dry_run`` the file is only validated.
+    """
+    try:
+        file_format = detect_format(file.filename, file.content_type)
+        result, created = await import_audit_cases(
+            db,
+            read_rows(file.file, file_format),
+            current_user,
+            max_rows=settings.import_max_rows,
+            dry_run=dry_run,
+        )
+    except ImportFormatError as e:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except ImportTooLarge as e:
+        await db.rollback()
+        raise HTTPException(status_code=413, detail=str(e))
+
+    if dry_run:
+        await db.rollback()
+        return result
+
+    # One audit log entry per created case, in a single INSERT
+    await log_audit_events(
+        db,
+        [
+            audit_log_values(
+                tenant_id=current_user.tenant_id,
+                entity_type="audit_case",
+                entity_id=case_id,
+                action="create",
+                user=current_user,
+                description=f"Prüfungsfall '{case_number}' importiert",
+                request=request,
+            )
+            for case_id, case_number in created
+        ],
+    )
+    await db.commit()
+    if created:
+        statistics_cache.invalidate(current_user.tenant_id)
+
+    return result
+
+
+@router.get("/export")
+async def export_cases(
+    format: Literal["csv", "xlsx"] = "csv",
+    status: Optional[str] = None,
+    audit_type: Optional[str] = None,
+    search: Optional[str] = None,
+    fiscal_year_id: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+) -> StreamingResponse:
+    """Export the audit cases matching the list filters as CSV or XLSX.
+
+    Rows are streamed from the database in batches, so exports of any size
+    run in constant memory.
+    """
+    query = await _filtered_cases(
+        db, current_user, status, audit_type, fiscal_year_id, search
+    )
+
+    if format == "xlsx":
+        export, media_type = export_xlsx, XLSX_MEDIA_TYPE
+    else:
+        export, media_type = export_csv, "text/csv; charset=utf-8"
+
+    filename = f"pruefungsfaelle-{date.today().isoformat()}.{format}"
+    return StreamingResponse(
+        stream_in_own_session(db, export, query),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+# --- Bulk Update ---
+
+
+def _bulk_log_entry(
+    change: AuditCaseBulkChange, user: User, request: Request
+) -> dict:
+    """Build the audit log entry of one case changed by a bulk update."""
+    status_change = change.changes.get("status")
+    if status_change:
+        return audit_log_values(
+            tenant_id=user.tenant_id,
+            entity_type="audit_case",
+            entity_id=change.id,
+            action="status_change",
+            user=user,
+            field_name="status",
+            old_value=status_change["old"],
+            new_value=status_change["new"],
+            changes=change.changes,
+            description=(
+                f"Status geändert von '{status_change['old']}' "
+                f"zu '{status_change['new']}' (Sammeländerung)"
+            ),
+            request=request,
+        )
+    return audit_log_values(
+        tenant_id=user.tenant_id,
+        entity_type="audit_case",
+        entity_id=change.id,
+        action="update",
+        user=user,
+        changes=change.changes,
+        description=(
+            f"Prüfungsfall aktualisiert ({len(change.changes)} Felder, "
+            "Sammeländerung)"
+        ),
+        request=request,
+    )
+
+
+@router.post("/bulk-update", response_model=AuditCaseBulkUpdateResult)
+async def bulk_update_cases(
+    data: AuditCaseBulkUpdate,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Apply one change to many audit cases.
+
+    Cases are selected by ``ids`` or by the list ``filter``. All cases are
+    updated with one statement and logged with one insert in a single
+    transaction; cases that already have the new values are skipped. If
+    more than ``max_affected`` cases (at most BULK_UPDATE_MAX_ROWS) would
+    change, nothing is changed. ``dry_run`` only reports the changes.
+    """
+    if data.ids is not None:
+        condition = AuditCase.id.in_([str(case_id) for case_id in data.ids])
+    else:
+        query = await _filtered_cases(db, current_user, **data.filter.model_dump())
+        condition = query.whereclause
+
+    limit = settings.bulk_update_max_rows
+    if data.max_affected is not None:
+        limit = min(limit, data.max_affected)
+
+    try:
+        changed = await bulk_update_audit_cases(
+            db,
+            current_user.tenant_id,
+            condition,
+            data.changes.model_dump(exclude_unset=True),
+            limit=limit,
+            dry_run=data.dry_run,
+        )
+    except BulkUpdateError as e:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except BulkLimitExceeded as e:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+    if not data.dry_run:
+        await log_audit_events(
+            db, [_bulk_log_entry(change, current_user, request) for change in changed]
+        )
+        await db.commit()
+        if changed:
+            statistics_cache.invalidate(current_user.tenant_id)
+
+    return AuditCaseBulkUpdateResult(
+        affected=len(changed), dry_run=data.dry_run, items=changed
     )
 
 
@@ -169,59 +473,77 @@ async def get_audit_case(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    """Get audit case details."""
+    """Get audit case details.
+
+    Case, auditors and counts are loaded in one statement. The serialized
+    response is cached under a fingerprint of the case and auditor rows and
+    the counts, so views of an unchanged case skip serialization.
+    """
+    primary = aliased(User)
+    secondary = aliased(User)
+    leader = aliased(User)
+    checklists_count = (
+        select(func.count())
+        .where(AuditCaseChecklist.audit_case_id == AuditCase.id)
+        .scalar_subquery()
+    )
+    findings_count = (
+        select(func.count())
+        .where(AuditCaseFinding.audit_case_id == AuditCase.id)
+        .scalar_subquery()
+    )
     query = (
-        select(AuditCase)
-        .options(
-            selectinload(AuditCase.primary_auditor),
-            selectinload(AuditCase.secondary_auditor),
-            selectinload(AuditCase.team_leader),
+        select(
+            AuditCase,
+            primary,
+            secondary,
+            leader,
+            checklists_count.label("checklists_count"),
+            findings_count.label("findings_count"),
         )
+        .outerjoin(primary, primary.id == AuditCase.primary_auditor_id)
+        .outerjoin(secondary, secondary.id == AuditCase.secondary_auditor_id)
+        .outerjoin(leader, leader.id == AuditCase.team_leader_id)
         .where(
             AuditCase.id == case_id,
             AuditCase.tenant_id == current_user.tenant_id,
         )
     )
-    result = await db.execute(query)
-    audit_case = result.scalar_one_or_none()
+    row = (await db.execute(query)).one_or_none()
 
-    if not audit_case:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Audit case not found",
         )
 
-    # Count related items
-    checklists_count = (
-        await db.scalar(
-            select(func.count()).where(AuditCaseChecklist.audit_case_id == case_id)
-        )
-        or 0
+    audit_case, primary_auditor, secondary_auditor, team_leader = row[:4]
+    checklists, findings = row.checklists_count, row.findings_count
+    auditors = (primary_auditor, secondary_auditor, team_leader)
+    cache_key = (
+        audit_case.id,
+        audit_case.updated_at,
+        checklists,
+        findings,
+        *((a.id, a.updated_at) if a else None for a in auditors),
     )
+    body = detail_cache.get(cache_key)
+    if body is None:
+        response = AuditCaseDetailResponse.model_validate(audit_case)
+        response.checklists_count = checklists
+        response.findings_count = findings
 
-    findings_count = (
-        await db.scalar(
-            select(func.count()).where(AuditCaseFinding.audit_case_id == case_id)
-        )
-        or 0
-    )
+        if primary_auditor:
+            response.primary_auditor = AuditorInfo.model_validate(primary_auditor)
+        if secondary_auditor:
+            response.secondary_auditor = AuditorInfo.model_validate(secondary_auditor)
+        if team_leader:
+            response.team_leader = AuditorInfo.model_validate(team_leader)
 
-    response = AuditCaseDetailResponse.model_validate(audit_case)
-    response.checklists_count = checklists_count
-    response.findings_count = findings_count
+        body = response.model_dump_json().encode()
+        detail_cache.set(cache_key, body)
 
-    if audit_case.primary_auditor:
-        response.primary_auditor = AuditorInfo.model_validate(
-            audit_case.primary_auditor
-        )
-    if audit_case.secondary_auditor:
-        response.secondary_auditor = AuditorInfo.model_validate(
-            audit_case.secondary_auditor
-        )
-    if audit_case.team_leader:
-        response.team_leader = AuditorInfo.model_validate(audit_case.team_leader)
-
-    return response
+    return Response(content=body, media_type="application/json")
 
 
 @router.patch("/{case_id}", response_model=AuditCaseResponse)
@@ -290,6 +612,7 @@ async def update_audit_case(
         )
 
     await db.commit()
+    statistics_cache.invalidate(current_user.tenant_id)
     await db.refresh(audit_case)
 
     return AuditCaseResponse.model_validate(audit_case)
@@ -332,6 +655,7 @@ async def delete_audit_case(
 
     await db.delete(audit_case)
     await db.commit()
+    statistics_cache.invalidate(current_user.tenant_id)
 
 
 # --- Checklists ---
@@ -393,35 +717,54 @@ async def update_checklist(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    """Update checklist responses."""
-    query = select(AuditCaseChecklist).where(
-        AuditCaseChecklist.id == checklist_id,
-        AuditCaseChecklist.audit_case_id == case_id,
+    """Update checklist responses.
+
+    Same as ``PATCH /checklists/audit-case/{case_id}/{checklist_id}``: the
+    sent answers are merged into the stored responses in the database, and
+    ``version`` rejects the update with 409 if the checklist was changed
+    since it was read.
+    """
+    query = (
+        select(AuditCaseChecklist.checklist_template_id, ChecklistTemplate.version)
+        .join(AuditCase, AuditCaseChecklist.audit_case_id == AuditCase.id)
+        .outerjoin(
+            ChecklistTemplate,
+            AuditCaseChecklist.checklist_template_id == ChecklistTemplate.id,
+        )
+        .where(
+            AuditCaseChecklist.id == checklist_id,
+            AuditCaseChecklist.audit_case_id == case_id,
+            AuditCase.tenant_id == current_user.tenant_id,
+        )
     )
     result = await db.execute(query)
-    checklist = result.scalar_one_or_none()
+    row = result.first()
 
-    if not checklist:
+    if not row:
         raise HTTPException(status_code=404, detail="Checklist not found")
 
-    # Merge responses
-    if data.responses:
-        checklist.responses = {**checklist.responses, **data.responses}
-        checklist.answered_questions = len(checklist.responses)
-        if checklist.total_questions > 0:
-            checklist.progress = int(
-                (checklist.answered_questions / checklist.total_questions) * 100
-            )
-
-    if data.status:
-        checklist.status = data.status
-        if data.status == "completed":
-            checklist.completed_by = current_user.id
-            from datetime import datetime, timezone
+    template_id, template_version = row
+    compiled = None
+    if template_id and template_version is not None:
+        compiled = await get_compiled_template(db, template_id, template_version)
+
+    try:
+        checklist = await update_checklist_responses(
+            db,
+            checklist_id,
+            case_id,
+            current_user,
+            compiled,
+            answers=data.responses,
+            status=data.status,
+            expected_version=data.version,
+        )
+    except ChecklistVersionConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
 
-            checklist.completed_at = datetime.now(timezone.utc)
+    if checklist is None:
+        raise HTTPException(status_code=404, detail="Checklist not found")
 
     await db.commit()
-    await db.refresh(checklist)
 
     return ChecklistResponse.model_validate(checklist)
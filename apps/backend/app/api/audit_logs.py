@@ -1,21 +1,36 @@
 """Audit Log API Endpoints."""
 
-from datetime import datetime
+from datetime import date, datetime
 from typing import Any
 from uuid import uuid4
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import func, select
+from sqlalchemy import Select, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db, stream_in_own_session
+from app.core.pagination import CountMode, decode_cursor, paginate
 from app.api.auth import get_current_user
 from app.models.user import User
 from app.models.audit_case import AuditCase
 from app.models.audit_log import AuditLog
+from app.services.audit_log_export import (
+    ExportFormat,
+    export_csv,
+    export_ndjson,
+    export_query,
+    gzip_stream,
+)
+from app.services.audit_log_writer import write_audit_logs
 
 router = APIRouter(prefix="/audit-cases/{case_id}/history", tags=["Audit History"])
+# Tenant-wide audit trail
+tenant_router = APIRouter(prefix="/audit-logs", tags=["Audit History"])
+
+# Roles allowed to export the audit trail of the whole tenant
+TENANT_EXPORT_ROLES = ("system_admin", "group_admin", "authority_head")
 
 
 # --- Schemas ---
@@ -45,10 +60,13 @@ class AuditLogListResponse(BaseModel):
     """Schema for paginated audit log list."""
 
     items: list[AuditLogResponse]
-    total: int
+    total: int | None = None
     page: int
     page_size: int
-    pages: int
+    pages: int | None = None
+    next_cursor: str | None = None
+    has_more: bool = False
+    total_is_estimate: bool = False
 
 
 class AuditLogCreate(BaseModel):
@@ -97,7 +115,11 @@ async def create_audit_log_entry(
     description: str | None = None,
     request: Request | None = None,
 ) -> AuditLog:
-    """Create an audit log entry."""
+    """Create an audit log entry.
+
+    Always added to the caller's session (regardless of audit_log_mode),
+    for entries that are returned to the client.
+    """
     log_entry = AuditLog(
         id=str(uuid4()),
         tenant_id=tenant_id,
@@ -119,6 +141,52 @@ async def create_audit_log_entry(
     return log_entry
 
 
+def _export_after(cursor: str | None) -> tuple[datetime, str] | None:
+    """Decode the resume cursor of an export."""
+    if not cursor:
+        return None
+    created_at, log_id = decode_cursor(cursor)
+    if not isinstance(created_at, datetime):
+        raise HTTPException(status_code=400, detail="Ungültiger Cursor")
+    return created_at, log_id
+
+
+def _check_actions(actions: list[str] | None) -> None:
+    """Reject unknown actions before the export starts streaming."""
+    unknown = set(actions or ()) - set(AuditLog.action.type.enums)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unbekannte Aktion: {', '.join(sorted(unknown))}",
+        )
+
+
+def _export_response(
+    db: AsyncSession,
+    query: Select,
+    format: ExportFormat,
+    compress: bool,
+    name: str,
+) -> StreamingResponse:
+    """Stream an audit trail export as a file download."""
+    if format == "csv":
+        export, media_type = export_csv, "text/csv; charset=utf-8"
+    else:
+        export, media_type = export_ndjson, "application/x-ndjson"
+    body = stream_in_own_session(db, export, query)
+
+    filename = f"{name}-{date.today().isoformat()}.{format}"
+    if compress:
+        body, media_type = gzip_stream(body), "application/gzip"
+        filename += ".gz"
+
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
 # --- Endpoints ---
 
 
@@ -126,12 +194,21 @@ async def create_audit_log_entry(
 async def list_audit_logs(
     case_id: str,
     action: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
     page: int = Query(1, ge=1),
     page_size: int = Query(50, ge=1, le=100),
-    db: AsyncSession = Depends(get_db),
+    cursor: str | None = None,
+    count: CountMode = "exact",
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ) -> AuditLogListResponse:
-    """List audit logs for an audit case."""
+    """List audit logs for an audit case (offset or cursor pagination).
+
+    The audit log is partitioned by month of created_at: a ``since``/
+    ``until`` range, and the cursor of a following page, limit the scan to
+    the partitions of that range.
+    """
     case = await get_audit_case_or_404(case_id, db, current_user)
 
     # Build query - include logs for the case and related entities
@@ -142,30 +219,70 @@ async def list_audit_logs(
 
     if action:
         query = query.where(AuditLog.action == action)
+    if since:
+        query = query.where(AuditLog.created_at >= since)
+    if until:
+        query = query.where(AuditLog.created_at < until)
+
+    result = await paginate(
+        db,
+        query,
+        AuditLog.created_at,
+        AuditLog.id,
+        page=page,
+        page_size=page_size,
+        cursor=cursor,
+        count=count,
+    )
 
-    # Count total
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar() or 0
-
-    # Paginate
-    query = query.order_by(AuditLog.created_at.desc())
-    query = query.offset((page - 1) * page_size).limit(page_size)
-
-    result = await db.execute(query)
-    logs = result.scalars().all()
-
-    pages = (total + page_size - 1) // page_size if total > 0 else 0
+    pages = None
+    if result.total is not None:
+        pages = (result.total + page_size - 1) // page_size if result.total > 0 else 0
 
     return AuditLogListResponse(
-        items=[AuditLogResponse.model_validate(log) for log in logs],
-        total=total,
+        items=[AuditLogResponse.model_validate(log) for log in result.items],
+        total=result.total,
         page=page,
         page_size=page_size,
         pages=pages,
+        next_cursor=result.next_cursor,
+        has_more=result.has_more,
+        total_is_estimate=result.total_is_estimate,
     )
 
 
+@router.get("/export")
+async def export_audit_logs(
+    case_id: str,
+    format: ExportFormat = "ndjson",
+    compress: bool = False,
+    action: list[str] | None = Query(None),
+    since: datetime | None = None,
+    until: datetime | None = None,
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+) -> StreamingResponse:
+    """Export the complete audit trail of an audit case, oldest first.
+
+    Streams NDJSON or CSV (gzip-compressed with ``compress``) in constant
+    memory. Every entry carries a ``cursor``; pass the cursor of the last
+    received entry to resume an interrupted export.
+    """
+    case = await get_audit_case_or_404(case_id, db, current_user)
+    _check_actions(action)
+
+    query = export_query(
+        current_user.tenant_id,
+        entity_id=case.id,
+        actions=action,
+        since=since,
+        until=until,
+        after=_export_after(cursor),
+    )
+    return _export_response(db, query, format, compress, f"audit-trail-{case.id}")
+
+
 @router.post("", status_code=201)
 async def add_comment(
     case_id: str,
@@ -208,6 +325,40 @@ async def add_comment(
 # --- Utility function for other modules ---
 
 
+def audit_log_values(
+    tenant_id: str,
+    entity_type: str,
+    entity_id: str,
+    action: str,
+    user: User | None = None,
+    field_name: str | None = None,
+    old_value: Any = None,
+    new_value: Any = None,
+    changes: dict[str, Any] | None = None,
+    description: str | None = None,
+    request: Request | None = None,
+) -> dict[str, Any]:
+    """Build the column values of an audit log entry."""
+    return {
+        "id": str(uuid4()),
+        "tenant_id": tenant_id,
+        "entity_type": entity_type,
+        "entity_id": entity_id,
+        "action": action,
+        "field_name": field_name,
+        # Convert values to strings
+        "old_value": str(old_value) if old_value is not None else None,
+        "new_value": str(new_value) if new_value is not None else None,
+        "changes": changes,
+        "description": description,
+        "user_id": user.id if user else None,
+        "user_email": user.email if user else None,
+        "user_name": f"{user.first_name} {user.last_name}" if user else None,
+        "ip_address": request.client.host if request and request.client else None,
+        "user_agent": request.headers.get("user-agent") if request else None,
+    }
+
+
 async def log_audit_event(
     db: AsyncSession,
     tenant_id: str,
@@ -225,26 +376,59 @@ async def log_audit_event(
     """
     Utility function to log an audit event.
     Can be called from other API modules to track changes.
+    Written in the caller's transaction or buffered (see audit_log_mode).
     """
-    # Convert values to strings
-    old_str = str(old_value) if old_value is not None else None
-    new_str = str(new_value) if new_value is not None else None
-
-    log_entry = AuditLog(
-        id=str(uuid4()),
+    values = audit_log_values(
         tenant_id=tenant_id,
         entity_type=entity_type,
         entity_id=entity_id,
         action=action,
+        user=user,
         field_name=field_name,
-        old_value=old_str,
-        new_value=new_str,
+        old_value=old_value,
+        new_value=new_value,
         changes=changes,
         description=description,
-        user_id=user.id if user else None,
-        user_email=user.email if user else None,
-        user_name=f"{user.first_name} {user.last_name}" if user else None,
-        ip_address=request.client.host if request and request.client else None,
-        user_agent=request.headers.get("user-agent") if request else None,
+        request=request,
     )
-    db.add(log_entry)
+    await write_audit_logs(db, [values])
+
+
+async def log_audit_events(db: AsyncSession, entries: list[dict[str, Any]]) -> None:
+    """
+    Insert many audit log entries (built with audit_log_values) at once.
+    Uses multi-row INSERTs instead of one INSERT per entry.
+    """
+    await write_audit_logs(db, entries)
+
+
+@tenant_router.get("/export")
+async def export_tenant_audit_logs(
+    format: ExportFormat = "ndjson",
+    compress: bool = False,
+    entity_type: str | None = None,
+    action: list[str] | None = Query(None),
+    since: datetime | None = None,
+    until: datetime | None = None,
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+) -> StreamingResponse:
+    """Export the audit trail of the current tenant, oldest first.
+
+    Same format and resume cursor as the export of an audit case; only
+    for administrators.
+    """
+    if current_user.role not in TENANT_EXPORT_ROLES:
+        raise HTTPException(status_code=403, detail="Administratorrechte erforderlich")
+    _check_actions(action)
+
+    query = export_query(
+        current_user.tenant_id,
+        entity_type=entity_type,
+        actions=action,
+        since=since,
+        until=until,
+        after=_export_after(cursor),
+    )
+    return _export_response(db, query, format, compress, "audit-trail")
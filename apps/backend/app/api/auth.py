@@ -5,6 +5,7 @@ from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
+from app.core.principal_cache import principal_cache
 from app.core.security import decode_access_token
 from app.models.user import User
 from app.schemas.auth import Token, UserCreate, UserResponse
@@ -19,7 +20,11 @@ async def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_db),
 ) -> User:
-    """Get current authenticated user."""
+    """Get current authenticated user.
+
+    Users are served from the principal cache while their token version
+    matches; the database is only queried on a cache miss.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Ungültige Anmeldedaten",
@@ -34,10 +39,16 @@ async def get_current_user(
     if user_id is None:
         raise credentials_exception
 
+    token_version = payload.get("ver", 0)
+    user = principal_cache.get("user", user_id, token_version)
+    if user is not None:
+        return user
+
     service = AuthService(db)
     user = await service.get_user_by_id(user_id)
 
-    if user is None:
+    # A bumped token version revokes all previously issued tokens
+    if user is None or user.token_version != token_version:
         raise credentials_exception
 
     if not user.is_active:
@@ -46,6 +57,9 @@ async def get_current_user(
             detail="Benutzer ist deaktiviert",
         )
 
+    # Detach so the cached instance is not expired by this session
+    db.expunge(user)
+    principal_cache.set("user", user_id, token_version, user)
     return user
 
 
@@ -71,6 +85,16 @@ async def login(
     return Token(access_token=access_token, user=user_response)
 
 
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> None:
+    """Log out by revoking all tokens issued to the current user."""
+    service = AuthService(db)
+    await service.revoke_tokens(current_user.id)
+
+
 @router.post(
     "/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED
 )
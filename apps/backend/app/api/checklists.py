@@ -1,12 +1,12 @@
 """Checklist API Endpoints."""
 
-from datetime import datetime, timezone
 from typing import Optional
 from uuid import uuid4
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer
 
 from app.core.database import get_db
 from app.api.auth import get_current_user
@@ -21,13 +21,46 @@ from app.schemas.checklist import (
     ChecklistResponseUpdate,
     ChecklistInstanceResponse,
     ChecklistSummaryResponse,
+    AnswerDistributionResponse,
     get_default_main_checklist,
     get_default_procurement_checklist,
 )
+from app.services.checklist_answers import AnswerGrouping, answer_distribution
+from app.services.checklist_responses import (
+    ChecklistVersionConflict,
+    update_checklist_responses,
+)
+from app.services.checklist_templates import (
+    CompiledTemplate,
+    get_compiled_template,
+)
 
 router = APIRouter(prefix="/checklists", tags=["Checklists"])
 
 
+def _instance_response(
+    checklist: AuditCaseChecklist,
+    template_name: str | None,
+    compiled: CompiledTemplate | None,
+    include_structure: bool,
+    status_code: int = 200,
+) -> Response:
+    """Serialize a checklist, embedding the pre-serialized template structure."""
+    response = ChecklistInstanceResponse.model_validate(checklist)
+    response.template_name = template_name
+    if compiled:
+        response.template_version = compiled.version
+        response.structure_etag = compiled.etag
+
+    body = response.model_dump_json(exclude={"structure"}).encode()
+    structure = compiled.structure_json if compiled and include_structure else b"null"
+    return Response(
+        content=body[:-1] + b',"structure":' + structure + b"}",
+        status_code=status_code,
+        media_type="application/json",
+    )
+
+
 # --- Template Endpoints ---
 
 
@@ -179,6 +212,39 @@ async def get_template(
     return ChecklistTemplateResponse.model_validate(template)
 
 
+@router.get("/templates/{template_id}/structure")
+async def get_template_structure(
+    template_id: str,
+    if_none_match: Optional[str] = Header(None),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Get the structure of a template.
+
+    Answers with an ETag; a request with a matching If-None-Match header
+    gets 304 Not Modified. Checklist responses carry the same ETag as
+    ``structure_etag``.
+    """
+    version = await db.scalar(
+        select(ChecklistTemplate.version).where(
+            ChecklistTemplate.id == template_id,
+            ChecklistTemplate.tenant_id == current_user.tenant_id,
+        )
+    )
+    if version is None:
+        raise HTTPException(status_code=404, detail="Template not found")
+
+    compiled = await get_compiled_template(db, template_id, version)
+    headers = {"ETag": compiled.etag, "Cache-Control": "private, no-cache"}
+    if if_none_match and compiled.etag in if_none_match:
+        return Response(status_code=304, headers=headers)
+    return Response(
+        content=compiled.structure_json,
+        media_type="application/json",
+        headers=headers,
+    )
+
+
 @router.patch("/templates/{template_id}", response_model=ChecklistTemplateResponse)
 async def update_template(
     template_id: str,
@@ -199,6 +265,9 @@ async def update_template(
         raise HTTPException(status_code=404, detail="Template not found")
 
     update_data = data.model_dump(exclude_unset=True)
+    # A new structure is a new version; compiled templates are cached by version
+    if "structure" in update_data and update_data["structure"] != template.structure:
+        template.version += 1
     for field, value in update_data.items():
         setattr(template, field, value)
 
@@ -291,6 +360,7 @@ async def list_case_checklists(
 async def add_checklist_to_case(
     case_id: str,
     data: ChecklistCreateFromTemplate,
+    include_structure: bool = True,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
@@ -306,9 +376,11 @@ async def add_checklist_to_case(
     if not audit_case:
         raise HTTPException(status_code=404, detail="Audit case not found")
 
-    # Get template
+    # Get template (the structure is loaded only if it is not compiled yet)
     template_result = await db.execute(
-        select(ChecklistTemplate).where(
+        select(ChecklistTemplate)
+        .options(defer(ChecklistTemplate.structure, raiseload=True))
+        .where(
             ChecklistTemplate.id == data.template_id,
             ChecklistTemplate.tenant_id == current_user.tenant_id,
         )
@@ -317,13 +389,7 @@ async def add_checklist_to_case(
     if not template:
         raise HTTPException(status_code=404, detail="Template not found")
 
-    # Count questions in template
-    total_questions = 0
-    structure = template.structure or {}
-    for section in structure.get("sections", []):
-        for question in section.get("questions", []):
-            if question.get("type") != "section":
-                total_questions += 1
+    compiled = await get_compiled_template(db, template.id, template.version)
 
     # Create checklist instance
     checklist = AuditCaseChecklist(
@@ -333,7 +399,7 @@ async def add_checklist_to_case(
         checklist_type=data.checklist_type or template.checklist_type,
         status="not_started",
         progress=0,
-        total_questions=total_questions,
+        total_questions=compiled.total_questions,
         answered_questions=0,
         responses={},
     )
@@ -342,11 +408,9 @@ async def add_checklist_to_case(
     await db.commit()
     await db.refresh(checklist)
 
-    response = ChecklistInstanceResponse.model_validate(checklist)
-    response.template_name = template.name
-    response.structure = template.structure
-
-    return response
+    return _instance_response(
+        checklist, template.name, compiled, include_structure, status_code=201
+    )
 
 
 @router.get(
@@ -355,12 +419,20 @@ async def add_checklist_to_case(
 async def get_case_checklist(
     case_id: str,
     checklist_id: str,
+    include_structure: bool = True,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    """Get a specific checklist with template structure."""
+    """Get a specific checklist with template structure.
+
+    With ``include_structure=false`` the structure is omitted; clients that
+    cache it by ``structure_etag`` fetch it from the template structure
+    endpoint only when the ETag changes.
+    """
     query = (
-        select(AuditCaseChecklist, ChecklistTemplate)
+        select(
+            AuditCaseChecklist, ChecklistTemplate.name, ChecklistTemplate.version
+        )
         .outerjoin(
             ChecklistTemplate,
             AuditCaseChecklist.checklist_template_id == ChecklistTemplate.id,
@@ -377,14 +449,14 @@ async def get_case_checklist(
     if not row:
         raise HTTPException(status_code=404, detail="Checklist not found")
 
-    checklist, template = row
-
-    response = ChecklistInstanceResponse.model_validate(checklist)
-    if template:
-        response.template_name = template.name
-        response.structure = template.structure
+    checklist, template_name, template_version = row
+    compiled = None
+    if checklist.checklist_template_id and template_version is not None:
+        compiled = await get_compiled_template(
+            db, checklist.checklist_template_id, template_version
+        )
 
-    return response
+    return _instance_response(checklist, template_name, compiled, include_structure)
 
 
 @router.patch(
@@ -394,12 +466,23 @@ async def update_case_checklist(
     case_id: str,
     checklist_id: str,
     data: ChecklistResponseUpdate,
+    include_structure: bool = True,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    """Update checklist responses."""
+    """Update checklist responses.
+
+    Only the sent answers and notes are merged into the stored responses,
+    in the database. Pass ``version`` to reject the update with 409 if the
+    checklist was changed since it was read.
+    """
     query = (
-        select(AuditCaseChecklist, ChecklistTemplate)
+        select(
+            AuditCaseChecklist.checklist_template_id,
+            ChecklistTemplate.name,
+            ChecklistTemplate.version,
+        )
+        .join(AuditCase, AuditCaseChecklist.audit_case_id == AuditCase.id)
         .outerjoin(
             ChecklistTemplate,
             AuditCaseChecklist.checklist_template_id == ChecklistTemplate.id,
@@ -407,6 +490,7 @@ async def update_case_checklist(
         .where(
             AuditCaseChecklist.id == checklist_id,
             AuditCaseChecklist.audit_case_id == case_id,
+            AuditCase.tenant_id == current_user.tenant_id,
         )
     )
 
@@ -416,57 +500,32 @@ async def update_case_checklist(
     if not row:
         raise HTTPException(status_code=404, detail="Checklist not found")
 
-    checklist, template = row
-
-    # Merge responses
-    if data.responses:
-        current_responses = checklist.responses or {}
-        for question_id, value in data.responses.items():
-            current_responses[question_id] = {
-                "value": value,
-                "answered_at": datetime.now(timezone.utc).isoformat(),
-                "answered_by": current_user.id,
-            }
-        checklist.responses = current_responses
-
-        # Update progress
-        checklist.answered_questions = len(current_responses)
-        if checklist.total_questions > 0:
-            checklist.progress = int(
-                (checklist.answered_questions / checklist.total_questions) * 100
-            )
-
-        # Update status
-        if checklist.status == "not_started":
-            checklist.status = "in_progress"
-
-    # Notes
-    if data.notes:
-        current_responses = checklist.responses or {}
-        for question_id, note in data.notes.items():
-            if question_id in current_responses:
-                current_responses[question_id]["note"] = note
-            else:
-                current_responses[question_id] = {"note": note}
-        checklist.responses = current_responses
-
-    # Status
-    if data.status:
-        checklist.status = data.status
-        if data.status == "completed":
-            checklist.completed_by = current_user.id
-            checklist.completed_at = datetime.now(timezone.utc)
-            checklist.progress = 100
+    template_id, template_name, template_version = row
+    compiled = None
+    if template_id and template_version is not None:
+        compiled = await get_compiled_template(db, template_id, template_version)
+
+    try:
+        checklist = await update_checklist_responses(
+            db,
+            checklist_id,
+            case_id,
+            current_user,
+            compiled,
+            answers=data.responses,
+            notes=data.notes,
+            status=data.status,
+            expected_version=data.version,
+        )
+    except ChecklistVersionConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
 
-    await db.commit()
-    await db.refresh(checklist)
+    if checklist is None:
+        raise HTTPException(status_code=404, detail="Checklist not found")
 
-    response = ChecklistInstanceResponse.model_validate(checklist)
-    if template:
-        response.template_name = template.name
-        response.structure = template.structure
+    await db.commit()
 
-    return response
+    return _instance_response(checklist, template_name, compiled, include_structure)
 
 
 @router.delete("/audit-case/{case_id}/{checklist_id}", status_code=204)
@@ -490,3 +549,42 @@ async def delete_case_checklist(
 
     await db.delete(checklist)
     await db.commit()
+
+
+# --- Answer Statistics ---
+
+
+@router.get("/answers/distribution", response_model=AnswerDistributionResponse)
+async def get_answer_distribution(
+    question_id: str,
+    template_id: Optional[str] = None,
+    checklist_type: Optional[str] = None,
+    fiscal_year_id: Optional[str] = None,
+    authority_id: Optional[str] = None,
+    group_by: AnswerGrouping = "none",
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Distribution of the answers to a question across audit cases.
+
+    Counts the answers of the own tenant and its authorities, optionally
+    restricted to a template, checklist type, fiscal year or authority and
+    grouped by fiscal year or authority (``group_by=tenant``).
+    """
+    items = await answer_distribution(
+        db,
+        current_user.tenant_id,
+        question_id,
+        template_id=template_id,
+        checklist_type=checklist_type,
+        fiscal_year_id=fiscal_year_id,
+        authority_id=authority_id,
+        group_by=group_by,
+    )
+
+    return AnswerDistributionResponse(
+        question_id=question_id,
+        group_by=group_by,
+        total=sum(item.count for item in items),
+        items=items,
+    )
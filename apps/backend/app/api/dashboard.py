@@ -6,7 +6,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.core.database import get_read_db
 from app.models.user import User
 from app.models.tenant import Tenant
 from app.models.vendor import Vendor, VendorUser
@@ -126,7 +126,7 @@ async def get_authority_summary(tenant: Tenant, db: AsyncSession) -> AuthoritySu
 @router.get("/layers", response_model=LayerDashboardResponse)
 async def get_layer_dashboard(
     current_user: VendorUser = Depends(get_current_vendor_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> LayerDashboardResponse:
     """Get layer dashboard for vendor (AC-4.1.1: vendor_admin sees all customers)."""
     # Get vendor info
@@ -182,7 +182,7 @@ async def get_layer_dashboard(
 @router.get("/my-dashboard", response_model=LayerDashboardResponse)
 async def get_my_layer_dashboard(
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> LayerDashboardResponse:
     """Get layer dashboard based on user's role.
 
@@ -243,7 +243,7 @@ async def get_my_layer_dashboard(
 async def get_customer_detail(
     customer_id: str,
     current_user: VendorUser = Depends(get_current_vendor_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> CustomerDetailResponse:
     """Get detailed customer view with authorities (AC-4.1.4: Drill-Down)."""
     result = await db.execute(
@@ -313,7 +313,7 @@ async def get_authority_detail(
     customer_id: str,
     authority_id: str,
     current_user: VendorUser = Depends(get_current_vendor_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> AuthorityDetailResponse:
     """Get detailed authority view."""
     # Verify customer access
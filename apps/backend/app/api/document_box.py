@@ -14,6 +14,7 @@ from app.api.auth import get_current_user
 from app.api.audit_logs import log_audit_event
 from app.core.config import settings
 from app.core.database import get_db
+from app.core.pagination import CountMode, paginate
 from app.models.audit_case import AuditCase
 from app.models.document_box import BoxDocument, DocumentBox
 from app.models.user import User
@@ -121,10 +122,12 @@ async def list_documents(
     status: str | None = None,
     page: int = 1,
     page_size: int = 20,
+    cursor: str | None = None,
+    count: CountMode = "exact",
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> BoxDocumentListResponse:
-    """List documents for an audit case."""
+    """List documents for an audit case (offset or cursor pagination)."""
     case = await get_audit_case_or_404(case_id, db, current_user)
 
     # Get or create document box
@@ -150,26 +153,30 @@ async def list_documents(
     if status:
         query = query.where(BoxDocument.manual_status == status)
 
-    # Count total
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar() or 0
-
-    # Paginate
-    query = query.order_by(BoxDocument.uploaded_at.desc())
-    query = query.offset((page - 1) * page_size).limit(page_size)
-
-    result = await db.execute(query)
-    documents = result.scalars().all()
+    result = await paginate(
+        db,
+        query,
+        BoxDocument.uploaded_at,
+        BoxDocument.id,
+        page=page,
+        page_size=page_size,
+        cursor=cursor,
+        count=count,
+    )
 
-    pages = (total + page_size - 1) // page_size if total > 0 else 0
+    pages = None
+    if result.total is not None:
+        pages = (result.total + page_size - 1) // page_size if result.total > 0 else 0
 
     return BoxDocumentListResponse(
-        items=[BoxDocumentResponse.model_validate(doc) for doc in documents],
-        total=total,
+        items=[BoxDocumentResponse.model_validate(doc) for doc in result.items],
+        total=result.total,
         page=page,
         page_size=page_size,
         pages=pages,
+        next_cursor=result.next_cursor,
+        has_more=result.has_more,
+        total_is_estimate=result.total_is_estimate,
     )
 
 
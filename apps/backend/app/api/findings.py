@@ -4,18 +4,25 @@ from datetime import datetime, timezone
 from uuid import uuid4
 
 from fastapi import APIRouter, Depends, HTTPException, Request
-from sqlalchemy import func, select
+from sqlalchemy import insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.api.auth import get_current_user
-from app.api.audit_logs import log_audit_event
+from app.api.audit_logs import audit_log_values, log_audit_event, log_audit_events
 from app.models.user import User
 from app.models.audit_case import AuditCase, AuditCaseFinding
 from app.schemas.audit_case import (
+    FindingBulkCreate,
     FindingCreate,
     FindingUpdate,
     FindingResponse,
+    FindingsSummary,
+)
+from app.services.finding_numbers import reserve_finding_numbers
+from app.services.finding_statistics import (
+    findings_summary_cache,
+    load_findings_summaries,
 )
 
 # Finding type labels for logging
@@ -68,15 +75,22 @@ async def get_finding_or_404(
     return finding
 
 
-async def get_next_finding_number(case_id: str, db: AsyncSession) -> int:
-    """Get next finding number for a case."""
-    result = await db.execute(
-        select(func.max(AuditCaseFinding.finding_number)).where(
-            AuditCaseFinding.audit_case_id == case_id
-        )
-    )
-    max_number = result.scalar()
-    return (max_number or 0) + 1
+def finding_values(case_id: str, finding_number: int, data: FindingCreate) -> dict:
+    """Build the column values of a new draft finding."""
+    return {
+        "id": str(uuid4()),
+        "audit_case_id": case_id,
+        "finding_number": finding_number,
+        "finding_type": data.finding_type,
+        "error_category": data.error_category,
+        "title": data.title,
+        "description": data.description,
+        "financial_impact": data.financial_impact,
+        "is_systemic": data.is_systemic,
+        "status": "draft",
+        "response_requested": data.response_requested,
+        "response_deadline": data.response_deadline,
+    }
 
 
 # --- Endpoints ---
@@ -87,7 +101,7 @@ async def list_findings(
     case_id: str,
     status: str | None = None,
     finding_type: str | None = None,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ) -> list[FindingResponse]:
     """List findings for an audit case."""
@@ -119,23 +133,10 @@ async def create_finding(
     """Create a new finding for an audit case."""
     case = await get_audit_case_or_404(case_id, db, current_user)
 
-    # Get next finding number
-    finding_number = await get_next_finding_number(case_id, db)
-
-    finding = AuditCaseFinding(
-        id=str(uuid4()),
-        audit_case_id=case.id,
-        finding_number=finding_number,
-        finding_type=data.finding_type,
-        error_category=data.error_category,
-        title=data.title,
-        description=data.description,
-        financial_impact=data.financial_impact,
-        is_systemic=data.is_systemic,
-        status="draft",
-        response_requested=data.response_requested,
-        response_deadline=data.response_deadline,
-    )
+    # Reserve the next finding number
+    (finding_number,) = await reserve_finding_numbers(db, case.id)
+
+    finding = AuditCaseFinding(**finding_values(case.id, finding_number, data))
 
     db.add(finding)
     await db.flush()
@@ -154,6 +155,7 @@ async def create_finding(
     )
 
     await db.commit()
+    findings_summary_cache.invalidate(case_id)
     await db.refresh(finding)
 
     return FindingResponse.model_validate(finding)
@@ -216,6 +218,7 @@ async def update_finding(
         )
 
     await db.commit()
+    findings_summary_cache.invalidate(case_id)
     await db.refresh(finding)
 
     return FindingResponse.model_validate(finding)
@@ -257,11 +260,63 @@ async def delete_finding(
 
     await db.delete(finding)
     await db.commit()
+    findings_summary_cache.invalidate(case_id)
 
 
 # --- Bulk Operations ---
 
 
+@router.post("/bulk", status_code=201)
+async def create_findings(
+    case_id: str,
+    data: FindingBulkCreate,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> list[FindingResponse]:
+    """Create many findings for an audit case at once.
+
+    The finding numbers are reserved as one consecutive range and the
+    findings are inserted with a single multi-row INSERT.
+    """
+    case = await get_audit_case_or_404(case_id, db, current_user)
+
+    numbers = await reserve_finding_numbers(db, case.id, len(data.findings))
+    result = await db.execute(
+        insert(AuditCaseFinding).returning(AuditCaseFinding),
+        [
+            finding_values(case.id, finding_number, item)
+            for finding_number, item in zip(numbers, data.findings)
+        ],
+    )
+    findings = [FindingResponse.model_validate(f) for f in result.scalars()]
+
+    await log_audit_events(
+        db,
+        [
+            audit_log_values(
+                tenant_id=current_user.tenant_id,
+                entity_type="audit_case",
+                entity_id=case_id,
+                action="create",
+                user=current_user,
+                description=(
+                    f"Feststellung #{f.finding_number} erstellt: "
+                    f"{FINDING_TYPE_LABELS.get(f.finding_type, f.finding_type)}"
+                    f" - {f.title}"
+                ),
+                request=request,
+            )
+            for f in findings
+        ],
+    )
+
+    await db.commit()
+    findings_summary_cache.invalidate(case_id)
+
+    return findings
+
+
 @router.post("/{finding_id}/confirm")
 async def confirm_finding(
     case_id: str,
@@ -298,6 +353,7 @@ async def confirm_finding(
     )
 
     await db.commit()
+    findings_summary_cache.invalidate(case_id)
     await db.refresh(finding)
 
     return FindingResponse.model_validate(finding)
@@ -343,6 +399,7 @@ async def resolve_finding(
     )
 
     await db.commit()
+    findings_summary_cache.invalidate(case_id)
     await db.refresh(finding)
 
     return FindingResponse.model_validate(finding)
@@ -351,48 +408,19 @@ async def resolve_finding(
 # --- Statistics ---
 
 
-@router.get("/stats/summary")
+@router.get("/stats/summary", response_model=FindingsSummary)
 async def get_findings_summary(
     case_id: str,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
-) -> dict:
-    """Get findings summary for an audit case."""
-    await get_audit_case_or_404(case_id, db, current_user)
-
-    # Total count
-    total_result = await db.execute(
-        select(func.count()).where(AuditCaseFinding.audit_case_id == case_id)
-    )
-    total = total_result.scalar() or 0
+) -> FindingsSummary:
+    """Get findings summary for an audit case.
 
-    # Count by status
-    status_result = await db.execute(
-        select(AuditCaseFinding.status, func.count())
-        .where(AuditCaseFinding.audit_case_id == case_id)
-        .group_by(AuditCaseFinding.status)
-    )
-    by_status = dict(status_result.all())
-
-    # Count by type
-    type_result = await db.execute(
-        select(AuditCaseFinding.finding_type, func.count())
-        .where(AuditCaseFinding.audit_case_id == case_id)
-        .group_by(AuditCaseFinding.finding_type)
-    )
-    by_type = dict(type_result.all())
-
-    # Total financial impact
-    impact_result = await db.execute(
-        select(func.sum(AuditCaseFinding.financial_impact)).where(
-            AuditCaseFinding.audit_case_id == case_id
-        )
-    )
-    total_financial_impact = impact_result.scalar() or 0
+    Aggregated in one query and cached per case until the next finding
+    write (or the cache TTL). Read from the primary, as the summary is
+    cached for all users.
+    """
+    case = await get_audit_case_or_404(case_id, db, current_user)
 
-    return {
-        "total": total,
-        "by_status": by_status,
-        "by_type": by_type,
-        "total_financial_impact": float(total_financial_impact),
-    }
+    summaries = await load_findings_summaries(db, [case.id])
+    return summaries[case.id]
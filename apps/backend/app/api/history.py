@@ -10,11 +10,12 @@ from typing import Optional
 from uuid import uuid4
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import func, select
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
+from app.core.pagination import CountMode, paginate
 from app.api.auth import get_current_user
 from app.models.user import User
 from app.models.history import (
@@ -58,7 +59,9 @@ async def list_module_events(
     event_type: Optional[str] = None,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = None,
+    count: CountMode = "exact",
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """List module events with filtering."""
@@ -71,23 +74,25 @@ async def list_module_events(
     if event_type:
         query = query.where(ModuleEvent.event_type == event_type)
 
-    # Count total
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar() or 0
-
-    # Paginate
-    query = query.order_by(ModuleEvent.created_at.desc())
-    query = query.offset((page - 1) * page_size).limit(page_size)
-
-    result = await db.execute(query)
-    events = result.scalars().all()
+    result = await paginate(
+        db,
+        query,
+        ModuleEvent.created_at,
+        ModuleEvent.id,
+        page=page,
+        page_size=page_size,
+        cursor=cursor,
+        count=count,
+    )
 
     return ModuleEventListResponse(
-        items=[ModuleEventResponse.model_validate(e) for e in events],
-        total=total,
+        items=[ModuleEventResponse.model_validate(e) for e in result.items],
+        total=result.total,
         page=page,
         page_size=page_size,
+        next_cursor=result.next_cursor,
+        has_more=result.has_more,
+        total_is_estimate=result.total_is_estimate,
     )
 
 
@@ -143,7 +148,9 @@ async def list_conversations(
     is_active: Optional[bool] = None,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = None,
+    count: CountMode = "exact",
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """List LLM conversations for current tenant."""
@@ -158,23 +165,27 @@ async def list_conversations(
     if is_active is not None:
         query = query.where(LLMConversation.is_active == is_active)
 
-    # Count total
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar() or 0
-
-    # Paginate
-    query = query.order_by(LLMConversation.updated_at.desc())
-    query = query.offset((page - 1) * page_size).limit(page_size)
-
-    result = await db.execute(query)
-    conversations = result.scalars().all()
+    # updated_at moves when messages are added, so a conversation touched
+    # while paging may show up again on a later page or be skipped
+    result = await paginate(
+        db,
+        query,
+        LLMConversation.updated_at,
+        LLMConversation.id,
+        page=page,
+        page_size=page_size,
+        cursor=cursor,
+        count=count,
+    )
 
     return LLMConversationListResponse(
-        items=[LLMConversationResponse.model_validate(c) for c in conversations],
-        total=total,
+        items=[LLMConversationResponse.model_validate(c) for c in result.items],
+        total=result.total,
         page=page,
         page_size=page_size,
+        next_cursor=result.next_cursor,
+        has_more=result.has_more,
+        total_is_estimate=result.total_is_estimate,
     )
 
 
@@ -7,11 +7,14 @@ Provides REST API for:
 - GitHub Integration management
 """
 
+import json
+from collections.abc import AsyncIterator
 from datetime import datetime
-from typing import Any
+from typing import TYPE_CHECKING, Any
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -26,9 +29,12 @@ from app.models.module_converter import (
     ModuleTemplate,
 )
 from app.models.user import User
-from app.services.module_service import ModuleConverterService
-from app.services.llm import LLMService
-from app.services.github_service import GitHubService
+
+# The LLM providers, the converter and the GitHub client stack are imported
+# by the endpoints that use them, so that workers start without them
+if TYPE_CHECKING:
+    from app.services.github_clients import GitHubClientRegistry
+    from app.services.github_service import Repository
 
 
 router = APIRouter()
@@ -235,6 +241,8 @@ async def test_llm_config(
     current_user: User = Depends(get_current_user),
 ) -> dict[str, Any]:
     """Test an LLM configuration connection."""
+    from app.services.llm import LLMService
+
     llm_service = LLMService(db)
     is_valid = await llm_service.test_connection(str(config_id))
 
@@ -426,6 +434,8 @@ async def start_conversion(
     current_user: User = Depends(get_current_user),
 ) -> dict[str, Any]:
     """Start a new module conversion."""
+    from app.services.module_service import ModuleConverterService
+
     service = ModuleConverterService(db)
 
     conversion = await service.create_conversion(
@@ -460,6 +470,7 @@ async def _run_conversion_background(
 ) -> None:
     """Run conversion in background."""
     from app.core.database import get_session_factory
+    from app.services.module_service import ModuleConverterService
 
     async with get_session_factory()() as db:
         service = ModuleConverterService(db)
@@ -565,6 +576,8 @@ async def cancel_conversion(
     current_user: User = Depends(get_current_user),
 ) -> dict[str, Any]:
     """Cancel a running conversion."""
+    from app.services.module_service import ModuleConverterService
+
     service = ModuleConverterService(db)
     cancelled = await service.cancel_conversion(str(conversion_id))
 
@@ -735,6 +748,7 @@ async def update_github_integration(
         integration.access_token_encrypted = data["access_token"]
 
     await db.commit()
+    _github_clients().invalidate(integration_id)
     return {"message": "Integration updated"}
 
 
@@ -758,6 +772,7 @@ async def delete_github_integration(
 
     await db.delete(integration)
     await db.commit()
+    _github_clients().invalidate(integration_id)
     return {"message": "Integration deleted"}
 
 
@@ -779,22 +794,17 @@ async def validate_github_integration(
         raise HTTPException(status_code=404, detail="Integration not found")
 
     # Test connection
-    github = GitHubService(
-        access_token=integration.access_token_encrypted or "",
-    )
+    github = _github_clients().get(integration)
 
-    try:
-        is_valid = await github.validate_token()
-        integration.validation_status = "valid" if is_valid else "invalid"
-        integration.last_validated_at = datetime.utcnow()
-        await db.commit()
+    is_valid = await github.validate_token()
+    integration.validation_status = "valid" if is_valid else "invalid"
+    integration.last_validated_at = datetime.utcnow()
+    await db.commit()
 
-        return {
-            "is_valid": is_valid,
-            "message": "Connection successful" if is_valid else "Connection failed",
-        }
-    finally:
-        await github.close()
+    return {
+        "is_valid": is_valid,
+        "message": "Connection successful" if is_valid else "Connection failed",
+    }
 
 
 @router.get("/github-integrations/{integration_id}/repos", tags=["GitHub Integration"])
@@ -802,36 +812,88 @@ async def list_github_repos(
     integration_id: UUID,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
+    page: int = Query(1, ge=1),
+    per_page: int = Query(30, ge=1, le=100),
 ) -> dict[str, Any]:
-    """List repositories for a GitHub integration."""
-    result = await db.execute(
-        select(GitHubIntegration).where(GitHubIntegration.id == str(integration_id))
-    )
-    integration = result.scalar_one_or_none()
+    """List repositories for a GitHub integration (one page at a time)."""
+    integration = await _get_github_integration(db, integration_id)
 
-    if not integration:
-        raise HTTPException(status_code=404, detail="Integration not found")
+    github = _github_clients().get(integration)
 
-    github = GitHubService(
-        access_token=integration.access_token_encrypted or "",
-    )
+    repo_page = await github.get_repositories_page(page=page, per_page=per_page)
+    return {
+        "items": [_repository_to_dict(r) for r in repo_page.items],
+        "page": repo_page.page,
+        "per_page": repo_page.per_page,
+        "has_more": repo_page.has_next,
+    }
 
-    try:
-        repos = await github.list_repositories()
-        return {
-            "items": [
-                {
-                    "name": r.name,
-                    "full_name": r.full_name,
-                    "default_branch": r.default_branch,
-                    "private": r.private,
-                    "url": r.url,
-                }
-                for r in repos
-            ]
-        }
-    finally:
-        await github.close()
+
+@router.get(
+    "/github-integrations/{integration_id}/repos/stream", tags=["GitHub Integration"]
+)
+async def stream_github_repos(
+    integration_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> StreamingResponse:
+    """Stream all repositories of a GitHub integration as NDJSON.
+
+    Pages are fetched from GitHub while earlier ones are being sent, so
+    the first repositories arrive before the listing is complete.
+    """
+    from app.services.github_service import GitHubError
+
+    integration = await _get_github_integration(db, integration_id)
+
+    github = _github_clients().get(integration)
+
+    async def generate() -> AsyncIterator[str]:
+        try:
+            async for repo in github.iter_repositories():
+                yield json.dumps(_repository_to_dict(repo)) + "\n"
+        except GitHubError as e:
+            yield json.dumps({"error": str(e), "status_code": e.status_code}) + "\n"
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
+@router.get(
+    "/github-integrations/{integration_id}/branches", tags=["GitHub Integration"]
+)
+async def list_github_branches(
+    integration_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    owner: str | None = None,
+    repo: str | None = None,
+    page: int = Query(1, ge=1),
+    per_page: int = Query(30, ge=1, le=100),
+) -> dict[str, Any]:
+    """List branches of a repository (defaults to the integration's repo)."""
+    integration = await _get_github_integration(db, integration_id)
+
+    owner = owner or integration.default_owner
+    repo = repo or integration.default_repo
+    if not owner or not repo:
+        raise HTTPException(
+            status_code=400, detail="Repository owner and name required"
+        )
+
+    github = _github_clients().get(integration)
+
+    branch_page = await github.get_branches_page(
+        owner, repo, page=page, per_page=per_page
+    )
+    return {
+        "items": [
+            {"name": b.name, "sha": b.sha, "protected": b.protected}
+            for b in branch_page.items
+        ],
+        "page": branch_page.page,
+        "per_page": branch_page.per_page,
+        "has_more": branch_page.has_next,
+    }
 
 
 # ==============================================================================
@@ -934,6 +996,38 @@ def _conversion_to_dict(
     return result
 
 
+async def _get_github_integration(
+    db: AsyncSession, integration_id: UUID
+) -> GitHubIntegration:
+    """Load a GitHub integration or raise 404."""
+    result = await db.execute(
+        select(GitHubIntegration).where(GitHubIntegration.id == str(integration_id))
+    )
+    integration = result.scalar_one_or_none()
+
+    if not integration:
+        raise HTTPException(status_code=404, detail="Integration not found")
+
+    return integration
+
+
+def _github_clients() -> "GitHubClientRegistry":
+    from app.services.github_clients import get_github_clients
+
+    return get_github_clients()
+
+
+def _repository_to_dict(repo: "Repository") -> dict[str, Any]:
+    """Convert GitHub repository to dictionary."""
+    return {
+        "name": repo.name,
+        "full_name": repo.full_name,
+        "default_branch": repo.default_branch,
+        "private": repo.private,
+        "url": repo.url,
+    }
+
+
 def _github_integration_to_dict(
     integration: GitHubIntegration,
     include_details: bool = False,
@@ -5,16 +5,17 @@ from uuid import uuid4
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload  # noqa: F401
 
 from app.core.database import get_db
+from app.core.principal_cache import principal_cache
 from app.core.security import (
     create_access_token,
     decode_access_token,
-    get_password_hash,
-    verify_password,
+    hash_password,
+    verify_and_update_password,
 )
 from app.models.vendor import Vendor, VendorUser, VendorRole
 from app.schemas.vendor import (
@@ -37,7 +38,7 @@ async def get_current_vendor_user(
     token: str = Depends(vendor_oauth2_scheme),
     db: AsyncSession = Depends(get_db),
 ) -> VendorUser:
-    """Get current authenticated vendor user."""
+    """Get current authenticated vendor user (cached, see get_current_user)."""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Ungültige Anmeldedaten",
@@ -54,12 +55,19 @@ async def get_current_vendor_user(
     if user_id is None or user_type != "vendor":
         raise credentials_exception
 
+    token_version = payload.get("ver", 0)
+    user = principal_cache.get("vendor", user_id, token_version)
+    if user is not None:
+        return user
+
     result = await db.execute(select(VendorUser).where(VendorUser.id == user_id))
     user = result.scalar_one_or_none()
 
-    if user is None or not user.is_active:
+    if user is None or not user.is_active or user.token_version != token_version:
         raise credentials_exception
 
+    db.expunge(user)
+    principal_cache.set("vendor", user_id, token_version, user)
     return user
 
 
@@ -120,7 +128,12 @@ async def vendor_login(
     )
     user = result.scalar_one_or_none()
 
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    valid, new_hash = (
+        await verify_and_update_password(form_data.password, user.hashed_password)
+        if user
+        else (False, None)
+    )
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Ungültige E-Mail oder Passwort",
@@ -133,12 +146,19 @@ async def vendor_login(
             detail="Benutzer ist deaktiviert",
         )
 
-    # Update last login
+    # Update last login (and upgrade outdated password hashes)
     user.last_login_at = datetime.now(timezone.utc)
+    if new_hash:
+        user.hashed_password = new_hash
     await db.commit()
 
     access_token = create_access_token(
-        data={"sub": user.id, "type": "vendor", "role": user.role.value}
+        data={
+            "sub": user.id,
+            "type": "vendor",
+            "role": user.role.value,
+            "ver": user.token_version,
+        }
     )
 
     return Token(
@@ -147,6 +167,21 @@ async def vendor_login(
     )
 
 
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def vendor_logout(
+    current_user: VendorUser = Depends(get_current_vendor_user),
+    db: AsyncSession = Depends(get_db),
+) -> None:
+    """Log out by revoking all tokens issued to the current vendor user."""
+    await db.execute(
+        update(VendorUser)
+        .where(VendorUser.id == current_user.id)
+        .values(token_version=VendorUser.token_version + 1)
+    )
+    await db.commit()
+    principal_cache.invalidate("vendor", current_user.id)
+
+
 # Vendor CRUD
 @router.get("", response_model=VendorResponse)
 async def get_vendor(
@@ -233,7 +268,7 @@ async def create_vendor_user(
         id=str(uuid4()),
         vendor_id=current_user.vendor_id,
         email=data.email,
-        hashed_password=get_password_hash(data.password),
+        hashed_password=await hash_password(data.password),
         role=data.role,
         first_name=data.first_name,
         last_name=data.last_name,
@@ -295,13 +330,22 @@ async def update_vendor_user(
     update_data = data.model_dump(exclude_unset=True)
 
     if "password" in update_data:
-        update_data["hashed_password"] = get_password_hash(update_data.pop("password"))
+        password = update_data.pop("password")
+        update_data["hashed_password"] = await hash_password(password)
 
+    revoke = any(
+        field in update_data for field in ("role", "is_active", "hashed_password")
+    )
     for field, value in update_data.items():
         setattr(user, field, value)
+    if revoke:
+        # Role, status or password changes invalidate issued tokens
+        user.token_version += 1
 
     await db.commit()
     await db.refresh(user)
+    if revoke:
+        principal_cache.invalidate("vendor", user.id)
 
     return VendorUserResponse.model_validate(user)
 
@@ -334,4 +378,6 @@ async def deactivate_vendor_user(
         )
 
     user.is_active = False
+    user.token_version += 1
     await db.commit()
+    principal_cache.invalidate("vendor", user.id)
@@ -0,0 +1,122 @@
+"""Maintenance commands.
+
+Usage::
+
+    python -m app.cli create-schema
+    python -m app.cli check-schema
+    python -m app.cli audit-log-partitions
+    python -m app.cli audit-log-archive [--retention-months N] [--archive-dir DIR]
+    python -m app.cli audit-log-restore FILE
+"""
+
+import argparse
+import asyncio
+from pathlib import Path
+
+from app.core.config import settings
+from app.core.database import (
+    SCHEMA_REVISION,
+    SchemaVersionError,
+    check_schema,
+    close_db,
+    create_schema,
+    get_engine,
+)
+from app.services.audit_log_partitions import (
+    PartitionError,
+    archive_partitions,
+    maintain_partitions,
+    restore_partition,
+)
+
+
+async def _create_schema(args: argparse.Namespace) -> None:
+    if await create_schema():
+        print(f"Created schema at revision {SCHEMA_REVISION}")
+    else:
+        print(f"Schema already at revision {SCHEMA_REVISION}")
+
+
+async def _check_schema(args: argparse.Namespace) -> None:
+    print(f"Schema at revision {await check_schema()}")
+
+
+async def _partitions(args: argparse.Namespace) -> None:
+    created = await maintain_partitions()
+    print(f"Created {len(created)} partition(s): {', '.join(created) or '-'}")
+
+
+async def _archive(args: argparse.Namespace) -> None:
+    async with get_engine().connect() as conn:
+        files = await archive_partitions(
+            conn, Path(args.archive_dir), args.retention_months
+        )
+    for path in files:
+        print(f"Archived {path}")
+    print(f"Archived {len(files)} partition(s)")
+
+
+async def _restore(args: argparse.Namespace) -> None:
+    async with get_engine().begin() as conn:
+        name = await restore_partition(conn, Path(args.file))
+    print(f"Restored {name}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command line parser."""
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    create = commands.add_parser(
+        "create-schema", help="Create the tables of a new database"
+    )
+    create.set_defaults(handler=_create_schema)
+
+    check = commands.add_parser(
+        "check-schema", help="Check that the database is migrated to head"
+    )
+    check.set_defaults(handler=_check_schema)
+
+    partitions = commands.add_parser(
+        "audit-log-partitions", help="Create upcoming audit log partitions"
+    )
+    partitions.set_defaults(handler=_partitions)
+
+    archive = commands.add_parser(
+        "audit-log-archive", help="Archive audit log partitions past retention"
+    )
+    archive.add_argument(
+        "--retention-months", type=int, default=settings.audit_log_retention_months
+    )
+    archive.add_argument("--archive-dir", default=settings.audit_log_archive_dir)
+    archive.set_defaults(handler=_archive)
+
+    restore = commands.add_parser(
+        "audit-log-restore", help="Restore an archived audit log partition"
+    )
+    restore.add_argument("file", help="Archive file (audit_logs_yYYYYmMM.csv.gz)")
+    restore.set_defaults(handler=_restore)
+
+    return parser
+
+
+async def _run(args: argparse.Namespace) -> None:
+    try:
+        await args.handler(args)
+    finally:
+        await close_db()
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run a maintenance command."""
+    args = build_parser().parse_args(argv)
+    try:
+        asyncio.run(_run(args))
+    except (PartitionError, SchemaVersionError) as e:
+        print(f"Error: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,7 +2,7 @@
 
 import warnings
 from functools import lru_cache
-from typing import Any
+from typing import Any, Literal
 
 from pydantic import PostgresDsn, field_validator, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -28,11 +28,31 @@ class Settings(BaseSettings):
 
     # Database
     database_url: PostgresDsn
+    # Startup check of the Alembic revision: "error" refuses to start on a
+    # missing or outdated schema, "warn" only logs it
+    database_schema_check: Literal["error", "warn", "off"] = "error"
+    # Connection pool of each engine (see app.core.db_pool)
+    database_pool_size: int = 10  # connections kept open when idle
+    database_max_overflow: int = 20  # additional connections under load
+    database_pool_timeout: float = 30.0  # seconds to wait for a connection
+    database_pool_recycle: int = 1800  # seconds; replaces stale connections
+    # Keep as many connections open as the recent peak load needs
+    database_pool_adaptive: bool = False
+    database_pool_adapt_interval: float = 60.0  # seconds
+    # Read replica for read-only endpoints (see app.core.read_replica)
+    database_replica_url: PostgresDsn | None = None
+    database_replica_sticky_seconds: float = 10.0  # reads on primary after a write
+    database_replica_retry_seconds: float = 30.0  # primary only after a failure
+    database_replica_connect_timeout: float = 2.0
 
     # Security
     secret_key: str = _DEV_SECRET_KEY
     access_token_expire_minutes: int = 60 * 24  # 24 hours
     algorithm: str = "HS256"
+    auth_cache_ttl: float = 30.0  # seconds; 0 disables the principal cache
+    password_bcrypt_rounds: int = 12  # older hashes are upgraded on login
+    password_hash_workers: int = 4
+    password_hash_queue: int = 32  # waiting operations before 503
 
     @model_validator(mode="after")
     def validate_secret_key(self) -> "Settings":
@@ -50,6 +70,34 @@ class Settings(BaseSettings):
             )
         return self
 
+    # GitHub clients
+    github_client_idle_timeout: float = 300.0  # seconds
+    github_max_connections: int = 20
+    github_http2: bool = True
+    github_content_cache_dir: str | None = None  # e.g. /data/cache/github
+    github_content_cache_max_bytes: int = 256 * 1024 * 1024  # 256 MB
+
+    # Audit cases
+    statistics_cache_ttl: float = 60.0  # seconds; 0 disables the snapshot cache
+    detail_cache_size: int = 1_000  # cached case detail responses; 0 disables
+    import_max_rows: int = 10_000  # rows per bulk import file
+    bulk_update_max_rows: int = 1_000  # cases changed by one bulk update
+
+    # Findings
+    findings_summary_cache_ttl: float = 60.0  # seconds; 0 disables the cache
+
+    # Audit log
+    audit_log_mode: Literal["transactional", "buffered"] = "transactional"
+    audit_log_batch_size: int = 500  # buffered: entries per INSERT
+    audit_log_flush_interval_ms: int = 200  # buffered: max delay of an entry
+    audit_log_queue_size: int = 10_000  # buffered: waiting entries before blocking
+    audit_log_partitions_ahead: int = 3  # monthly partitions created in advance
+    audit_log_retention_months: int = 24  # older partitions are archived
+    audit_log_archive_dir: str = "/data/archive/audit_logs"
+
+    # Checklists
+    template_cache_size: int = 256  # compiled template versions; 0 disables
+
     # CORS
     cors_origins: list[str] = ["http://localhost:5173", "http://localhost:3000"]
 
@@ -70,7 +118,7 @@ class Settings(BaseSettings):
         "text/csv",
     ]
 
-    @field_validator("database_url", mode="before")
+    @field_validator("database_url", "database_replica_url", mode="before")
     @classmethod
     def assemble_db_connection(cls, v: Any) -> Any:
         """Validate database URL."""
@@ -1,10 +1,15 @@
 """Database configuration and session management."""
 
-from collections.abc import AsyncGenerator
+import asyncio
+import logging
+from collections.abc import AsyncGenerator, AsyncIterator, Callable
 from typing import Any
 
-from sqlalchemy import MetaData
+from fastapi import Request
+from sqlalchemy import MetaData, Select, text
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
     AsyncEngine,
     AsyncSession,
     async_sessionmaker,
@@ -13,6 +18,15 @@ from sqlalchemy.ext.asyncio import (
 from sqlalchemy.orm import DeclarativeBase
 
 from app.core.config import settings
+from app.core.db_pool import InstrumentedPool, render_metrics
+from app.core.read_replica import (
+    LAST_WRITE_COOKIE,
+    last_write_of,
+    principal_of,
+    replica_router,
+)
+
+logger = logging.getLogger(__name__)
 
 # Naming convention for constraints
 NAMING_CONVENTION: dict[str, str] = {
@@ -25,6 +39,18 @@ NAMING_CONVENTION: dict[str, str] = {
 
 metadata = MetaData(naming_convention=NAMING_CONVENTION)
 
+# Alembic revision the models correspond to, i.e. the newest migration in
+# alembic/versions (tests/test_schema.py keeps the two in step)
+SCHEMA_REVISION = "017"
+
+# Revision of the schema that earlier versions created with create_all at
+# startup, without an Alembic version table
+STARTUP_SCHEMA_REVISION = "009"
+
+
+class SchemaVersionError(Exception):
+    """Raised when the database schema is not at SCHEMA_REVISION."""
+
 
 class Base(DeclarativeBase):
     """Base class for all database models."""
@@ -39,6 +65,31 @@ class Base(DeclarativeBase):
 # Lazy engine initialization to avoid event loop issues in tests
 _engine: AsyncEngine | None = None
 _async_session_factory: async_sessionmaker[AsyncSession] | None = None
+_read_engine: AsyncEngine | None = None
+_read_session_factory: async_sessionmaker[AsyncSession] | None = None
+
+
+def _create_engine(url: str, **kwargs: Any) -> AsyncEngine:
+    """Create an engine with the pool configured in the settings.
+
+    Connections are not pinged on checkout (saving a round-trip per
+    request); after a disconnect error, SQLAlchemy invalidates the failed
+    connection and all older ones, and pool_recycle replaces connections
+    the server may have dropped meanwhile.
+    """
+    engine = create_async_engine(
+        url,
+        echo=settings.debug,
+        poolclass=InstrumentedPool,
+        pool_size=settings.database_pool_size,
+        max_overflow=settings.database_max_overflow,
+        pool_timeout=settings.database_pool_timeout,
+        pool_recycle=settings.database_pool_recycle,
+        **kwargs,
+    )
+    if settings.database_pool_adaptive:
+        engine.pool.configure_adaptive(settings.database_pool_adapt_interval)
+    return engine
 
 
 def get_engine() -> AsyncEngine:
@@ -49,14 +100,7 @@ def get_engine() -> AsyncEngine:
     """
     global _engine
     if _engine is None:
-        _engine = create_async_engine(
-            str(settings.database_url),
-            echo=settings.debug,
-            future=True,
-            pool_pre_ping=True,
-            pool_size=10,
-            max_overflow=20,
-        )
+        _engine = _create_engine(str(settings.database_url))
     return _engine
 
 
@@ -74,6 +118,55 @@ def get_session_factory() -> async_sessionmaker[AsyncSession]:
     return _async_session_factory
 
 
+def get_read_engine() -> AsyncEngine | None:
+    """Get or create the engine of the read replica, if one is configured."""
+    global _read_engine
+    if _read_engine is None and settings.database_replica_url:
+        _read_engine = _create_engine(
+            str(settings.database_replica_url),
+            connect_args={
+                "timeout": settings.database_replica_connect_timeout,
+                # Writes fail as on a hot standby, also when the "replica"
+                # is a second connection to the primary (local setups)
+                "server_settings": {"default_transaction_read_only": "on"},
+            },
+        )
+    return _read_engine
+
+
+def get_read_session_factory() -> async_sessionmaker[AsyncSession] | None:
+    """Get or create the session factory of the read replica, if configured."""
+    global _read_session_factory
+    if _read_session_factory is None and (engine := get_read_engine()):
+        _read_session_factory = async_sessionmaker(
+            engine,
+            class_=AsyncSession,
+            expire_on_commit=False,
+            autocommit=False,
+            autoflush=False,
+        )
+    return _read_session_factory
+
+
+def _pools() -> dict[str, InstrumentedPool]:
+    engines = {"primary": _engine, "replica": _read_engine}
+    return {
+        name: engine.pool
+        for name, engine in engines.items()
+        if engine is not None and isinstance(engine.pool, InstrumentedPool)
+    }
+
+
+def pool_metrics() -> dict[str, dict[str, Any]]:
+    """Connection pool usage of the primary and (if configured) the replica."""
+    return {name: pool.snapshot() for name, pool in _pools().items()}
+
+
+def pool_metrics_text() -> str:
+    """Connection pool metrics in the Prometheus text format."""
+    return "\n".join(render_metrics(_pools(), "flowaudit_db_pool")) + "\n"
+
+
 # Backwards compatible aliases - use functions directly
 # Note: Code that imports `engine` or `async_session_factory` should be updated
 # to use get_engine() and get_session_factory() instead
@@ -93,20 +186,178 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
-async def init_db() -> None:
-    """Initialize database tables."""
-    engine = get_engine()
-    async with engine.begin() as conn:
+async def _open_read_session(request: Request) -> AsyncSession:
+    factory = get_read_session_factory()
+    principal = principal_of(request.headers.get("authorization"))
+    last_write = last_write_of(request.cookies.get(LAST_WRITE_COOKIE))
+    if factory is not None and replica_router.use_replica(principal, last_write):
+        session = factory()
+        try:
+            await session.connection()
+            return session
+        except (OSError, asyncio.TimeoutError, DBAPIError) as e:
+            await session.close()
+            replica_router.replica_failed()
+            logger.warning("Read replica unavailable, reading from primary: %s", e)
+    return get_session_factory()()
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Dependency for the session of a read-only endpoint.
+
+    Reads from the replica if one is configured and may serve the user
+    (see app.core.read_replica), otherwise from the primary. The session
+    is never committed.
+    """
+    session = await _open_read_session(request)
+    try:
+        yield session
+    finally:
+        await session.close()
+
+
+def stream_in_own_session(
+    db: AsyncSession,
+    export: Callable[[AsyncSession, Select], AsyncIterator[bytes]],
+    query: Select,
+) -> AsyncIterator[bytes]:
+    """Run a streaming export in a session of its own.
+
+    Before FastAPI 0.118, the sessions of yield dependencies are closed
+    before a StreamingResponse body is sent. The export therefore opens a
+    new session on the engine of the request's session (keeping its
+    primary/replica choice) and closes it once the body is exhausted or
+    the client disconnects.
+
+    Args:
+        db: Session of the request
+        export: Generator function streaming the rows of a query
+        query: Query to export
+
+    Returns:
+        Response body
+    """
+    bind = db.bind
+
+    async def body() -> AsyncIterator[bytes]:
+        async with AsyncSession(bind) as session:
+            async for chunk in export(session, query):
+                yield chunk
+
+    return body()
+
+
+async def _has_tables(conn: AsyncConnection) -> bool:
+    result = await conn.execute(
+        text(
+            "SELECT EXISTS (SELECT 1 FROM information_schema.tables "
+            "WHERE table_schema = current_schema() AND table_name = ANY(:names))"
+        ),
+        {"names": list(Base.metadata.tables)},
+    )
+    return result.scalar_one()
+
+
+async def _schema_revision(conn: AsyncConnection) -> str | None:
+    result = await conn.execute(
+        text("SELECT to_regclass('alembic_version') IS NOT NULL")
+    )
+    if not result.scalar_one():
+        return None
+    result = await conn.execute(text("SELECT version_num FROM alembic_version"))
+    return result.scalar_one_or_none()
+
+
+async def check_schema(engine: AsyncEngine | None = None) -> str:
+    """Check that the database is migrated to SCHEMA_REVISION.
+
+    Reads the Alembic version table only, so that workers start without
+    inspecting every table. The schema is created by ``python -m app.cli
+    create-schema`` and migrated by ``alembic upgrade head``.
+
+    Args:
+        engine: Engine to check (defaults to the application engine)
+
+    Returns:
+        Revision of the database
+
+    Raises:
+        SchemaVersionError: If the schema is missing or at another revision
+    """
+    async with (engine or get_engine()).connect() as conn:
+        revision = await _schema_revision(conn)
+    if revision is None:
+        raise SchemaVersionError(
+            "Datenbankschema fehlt: python -m app.cli create-schema ausführen"
+        )
+    if revision != SCHEMA_REVISION:
+        raise SchemaVersionError(
+            f"Datenbankschema auf Revision {revision}, erwartet "
+            f"{SCHEMA_REVISION}: alembic upgrade head ausführen"
+        )
+    return revision
+
+
+async def create_schema(engine: AsyncEngine | None = None) -> bool:
+    """Create all tables of a new database and stamp it at SCHEMA_REVISION.
+
+    A database that already has application tables but no Alembic version
+    (created by earlier versions at startup) is left unchanged; it has to
+    be stamped at STARTUP_SCHEMA_REVISION and migrated with Alembic.
+
+    Args:
+        engine: Engine of the database (defaults to the application engine)
+
+    Returns:
+        False if the database already was at SCHEMA_REVISION
+
+    Raises:
+        SchemaVersionError: If the database is at another revision or has
+            tables without a revision; it has to be migrated with Alembic
+            instead
+    """
+    from app import models  # noqa: F401  (registers all tables)
+
+    async with (engine or get_engine()).begin() as conn:
+        revision = await _schema_revision(conn)
+        if revision == SCHEMA_REVISION:
+            return False
+        if revision is not None:
+            raise SchemaVersionError(
+                f"Datenbankschema auf Revision {revision}: alembic upgrade head "
+                "ausführen"
+            )
+        if await _has_tables(conn):
+            raise SchemaVersionError(
+                "Datenbank enthält Tabellen ohne Alembic-Version: alembic stamp "
+                f"{STARTUP_SCHEMA_REVISION} && alembic upgrade head ausführen"
+            )
         await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(
+            text(
+                "CREATE TABLE IF NOT EXISTS alembic_version ("
+                "version_num VARCHAR(32) NOT NULL, "
+                "CONSTRAINT alembic_version_pkc PRIMARY KEY (version_num))"
+            )
+        )
+        await conn.execute(
+            text("INSERT INTO alembic_version (version_num) VALUES (:revision)"),
+            {"revision": SCHEMA_REVISION},
+        )
+    return True
 
 
 async def close_db() -> None:
     """Close database connection."""
-    global _engine, _async_session_factory
+    global _engine, _async_session_factory, _read_engine, _read_session_factory
     if _engine is not None:
         await _engine.dispose()
         _engine = None
         _async_session_factory = None
+    if _read_engine is not None:
+        await _read_engine.dispose()
+        _read_engine = None
+        _read_session_factory = None
 
 
 def reset_engine() -> None:
@@ -114,9 +365,11 @@ def reset_engine() -> None:
 
     This allows tests to create a fresh engine in their event loop.
     """
-    global _engine, _async_session_factory
+    global _engine, _async_session_factory, _read_engine, _read_session_factory
     if _engine is not None:
         # Note: Can't await dispose here, must be done async
         pass
     _engine = None
     _async_session_factory = None
+    _read_engine = None
+    _read_session_factory = None
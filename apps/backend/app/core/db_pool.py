@@ -0,0 +1,262 @@
+"""Instrumented connection pool of the database engines.
+
+InstrumentedPool is the asyncio queue pool with telemetry: a histogram of
+checkout latency (the time to obtain a connection, including waiting for
+one and opening it), the number of checkouts waiting, connections in use
+and idle, overflow connections and pool timeouts. render_metrics formats
+them in the Prometheus text format.
+
+The pool allows up to ``pool_size + max_overflow`` connections and keeps
+up to a target number of them open when idle; connections returned beyond
+that are closed. The target is ``pool_size``, which is how QueuePool
+behaves. In adaptive mode, the target follows the peak number of
+connections in use per interval (between ``pool_size`` and the maximum),
+so that a sustained load above ``pool_size`` no longer opens and closes
+connections on every burst. Above the target the target rises at once;
+below it, it moves halfway down to the peak per interval.
+
+Connections are not pinged on checkout. Stale connections are replaced
+after ``pool_recycle`` seconds, and when a query fails with a disconnect
+error SQLAlchemy invalidates that connection and every connection opened
+before it (counted as invalidations).
+"""
+
+import bisect
+import time
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
+
+# Checkout latency buckets in seconds
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class Histogram:
+    """Cumulative histogram in the Prometheus sense."""
+
+    def __init__(self, buckets: Iterable[float] = LATENCY_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # last: +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Record a value."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        """(upper bound, observations up to it) per bucket."""
+        bounds = [f"{bound:g}" for bound in self.buckets] + ["+Inf"]
+        result, total = [], 0
+        for bound, count in zip(bounds, self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+
+class PoolStats:
+    """Counters of a pool, kept when the pool is recreated."""
+
+    def __init__(self) -> None:
+        self.checkout_seconds = Histogram()
+        self.waiting = 0
+        self.connects = 0
+        self.overflow_connects = 0
+        self.overflow_closes = 0
+        self.timeouts = 0
+        self.invalidations = 0
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Asyncio queue pool with telemetry and an optional adaptive size."""
+
+    def __init__(
+        self,
+        creator: Any,
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        **kw: Any,
+    ) -> None:
+        # The queue holds every connection the pool may open; how many stay
+        # open when idle is decided in _do_return_conn
+        super().__init__(
+            creator, pool_size=pool_size + max_overflow, max_overflow=0, **kw
+        )
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.target_size = pool_size
+        self.adapt_interval: float | None = None
+        self.stats = PoolStats()
+        self._clock: Callable[[], float] = time.monotonic
+        self._next_adapt = 0.0
+        self._peak_in_use = 0
+        event.listen(self, "invalidate", self._count_invalidation)
+
+    def configure_adaptive(
+        self, interval: float, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        """Let the number of idle connections kept follow the load.
+
+        Args:
+            interval: Seconds between adjustments of the target size
+            clock: Monotonic clock returning seconds
+        """
+        self.adapt_interval = interval
+        self._clock = clock
+        self._next_adapt = clock() + interval
+
+    @property
+    def max_size(self) -> int:
+        """Maximum number of open connections."""
+        return self.pool_size + self.max_overflow
+
+    def open_connections(self) -> int:
+        """Connections currently open, in use or idle."""
+        return self._overflow + self.max_size
+
+    def recreate(self) -> "InstrumentedPool":
+        pool = super().recreate()
+        pool.pool_size = self.pool_size
+        pool.max_overflow = self.max_overflow
+        pool.target_size = self.target_size
+        pool.stats = self.stats
+        if self.adapt_interval is not None:
+            pool.configure_adaptive(self.adapt_interval, self._clock)
+        return pool
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        stats = self.stats
+        started = time.perf_counter()
+        stats.waiting += 1
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            stats.timeouts += 1
+            raise
+        finally:
+            stats.waiting -= 1
+        stats.checkout_seconds.observe(time.perf_counter() - started)
+
+        self._peak_in_use = max(self._peak_in_use, self.checkedout())
+        if self.adapt_interval is not None and self._clock() >= self._next_adapt:
+            self._adapt()
+        return record
+
+    def _do_return_conn(self, record: ConnectionPoolEntry) -> None:
+        # Checkouts only wait while no connection is idle, so closing one
+        # while others are idle never starves a waiting checkout
+        idle = self.checkedin()
+        if idle and idle >= self.target_size:
+            self.stats.overflow_closes += 1
+            try:
+                record.close()
+            finally:
+                self._dec_overflow()
+            return
+        super()._do_return_conn(record)
+
+    def _create_connection(self) -> ConnectionPoolEntry:
+        # _overflow was already incremented for this connection; read it
+        # before connecting, while other checkouts may connect concurrently
+        overflow = self.open_connections() > self.pool_size
+        record = super()._create_connection()
+        self.stats.connects += 1
+        if overflow:
+            self.stats.overflow_connects += 1
+        return record
+
+    def _adapt(self) -> None:
+        peak, self._peak_in_use = self._peak_in_use, self.checkedout()
+        self._next_adapt = self._clock() + (self.adapt_interval or 0)
+        if peak >= self.target_size:
+            self.target_size = min(peak, self.max_size)
+        else:
+            self.target_size = max(self.pool_size, (self.target_size + peak) // 2)
+
+    def _count_invalidation(self, *args: Any) -> None:
+        self.stats.invalidations += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        """Current usage and counters."""
+        stats = self.stats
+        return {
+            "pool_size": self.pool_size,
+            "max_size": self.max_size,
+            "target_size": self.target_size,
+            "in_use": self.checkedout(),
+            "idle": self.checkedin(),
+            "open": self.open_connections(),
+            "waiting": stats.waiting,
+            "checkouts": stats.checkout_seconds.count,
+            "connects": stats.connects,
+            "overflow_connects": stats.overflow_connects,
+            "overflow_closes": stats.overflow_closes,
+            "timeouts": stats.timeouts,
+            "invalidations": stats.invalidations,
+        }
+
+
+_GAUGES = {
+    "in_use": "Connections checked out",
+    "idle": "Connections open and idle",
+    "open": "Connections open",
+    "waiting": "Checkouts waiting for a connection",
+    "target_size": "Idle connections the pool keeps open",
+    "max_size": "Maximum number of connections",
+}
+_COUNTERS = {
+    "connects": "Connections opened",
+    "overflow_connects": "Connections opened beyond pool_size",
+    "overflow_closes": "Returned connections closed beyond the target size",
+    "timeouts": "Checkouts that timed out waiting for a connection",
+    "invalidations": "Connections invalidated after errors",
+}
+
+
+def render_metrics(pools: dict[str, InstrumentedPool], prefix: str) -> list[str]:
+    """Pool metrics in the Prometheus text format.
+
+    Args:
+        pools: Pools by engine name (the ``engine`` label)
+        prefix: Metric name prefix
+
+    Returns:
+        Lines of the exposition
+    """
+    lines: list[str] = []
+    snapshots = {name: pool.snapshot() for name, pool in pools.items()}
+
+    for key, help_text in _GAUGES.items():
+        metric = f"{prefix}_{key}"
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} gauge"]
+        lines += [
+            f'{metric}{{engine="{name}"}} {snapshot[key]}'
+            for name, snapshot in snapshots.items()
+        ]
+
+    for key, help_text in _COUNTERS.items():
+        metric = f"{prefix}_{key}_total"
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter"]
+        lines += [
+            f'{metric}{{engine="{name}"}} {snapshot[key]}'
+            for name, snapshot in snapshots.items()
+        ]
+
+    metric = f"{prefix}_checkout_seconds"
+    lines += [
+        f"# HELP {metric} Time to obtain a connection from the pool",
+        f"# TYPE {metric} histogram",
+    ]
+    for name, pool in pools.items():
+        histogram = pool.stats.checkout_seconds
+        lines += [
+            f'{metric}_bucket{{engine="{name}",le="{bound}"}} {count}'
+            for bound, count in histogram.cumulative()
+        ]
+        lines.append(f'{metric}_sum{{engine="{name}"}} {histogram.sum:.6f}')
+        lines.append(f'{metric}_count{{engine="{name}"}} {histogram.count}')
+    return lines
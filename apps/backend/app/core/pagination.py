@@ -0,0 +1,154 @@
+"""Shared pagination for list endpoints.
+
+Two modes are supported:
+
+- Offset mode (``page``/``page_size``), kept for backward compatibility.
+  Deep pages get slower because the database still has to walk all
+  skipped rows.
+- Keyset mode (``cursor``): an opaque cursor encodes the (sort key, id)
+  of the last row of the previous page, and the next page starts right
+  after it. Backed by a composite index on (..., sort key, id), every page
+  costs the same.
+
+Every response carries a ``next_cursor``, so clients can switch from
+offset to keyset mode after the first page. Totals are optional: exact,
+capped at COUNT_CAP rows, or skipped entirely.
+"""
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Generic, Literal, TypeVar
+
+from fastapi import HTTPException
+from sqlalchemy import Select, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+
+T = TypeVar("T")
+
+CountMode = Literal["exact", "capped", "none"]
+
+# Rows counted at most in "capped" mode
+COUNT_CAP = 10_000
+
+
+@dataclass
+class PageResult(Generic[T]):
+    """A page of results with cursor and (optional) total."""
+
+    items: list[T]
+    page_size: int
+    next_cursor: str | None
+    has_more: bool
+    total: int | None = None
+    total_is_estimate: bool = False
+
+
+def encode_cursor(sort_value: Any, row_id: Any) -> str:
+    """Encode the position after a row as an opaque cursor."""
+    if isinstance(sort_value, datetime):
+        payload = {"t": "dt", "s": sort_value.isoformat(), "i": str(row_id)}
+    else:
+        payload = {"s": sort_value, "i": str(row_id)}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[Any, str]:
+    """Decode a cursor into (sort value, id).
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        sort_value = payload["s"]
+        if payload.get("t") == "dt":
+            sort_value = datetime.fromisoformat(sort_value)
+        return sort_value, payload["i"]
+    except (binascii.Error, ValueError, KeyError, TypeError) as e:
+        raise HTTPException(status_code=400, detail="Ungültiger Cursor") from e
+
+
+async def _count(db: AsyncSession, query: Select, mode: CountMode) -> int | None:
+    """Count the rows of a query according to the count mode."""
+    if mode == "none":
+        return None
+    if mode == "capped":
+        query = query.limit(COUNT_CAP + 1)
+    count_query = select(func.count()).select_from(query.subquery())
+    result = await db.execute(count_query)
+    return result.scalar() or 0
+
+
+async def paginate(
+    db: AsyncSession,
+    query: Select,
+    sort_column: InstrumentedAttribute,
+    id_column: InstrumentedAttribute,
+    *,
+    page_size: int,
+    page: int = 1,
+    cursor: str | None = None,
+    count: CountMode = "exact",
+) -> PageResult[Any]:
+    """Paginate a select over one entity, newest first.
+
+    Args:
+        db: Database session
+        query: Filtered select (without ordering or limits)
+        sort_column: Column sorted descending (e.g. created_at)
+        id_column: Unique tie-breaker column
+        page_size: Rows per page
+        page: Page number for offset mode (ignored with a cursor)
+        cursor: Cursor from a previous page (keyset mode)
+        count: "exact", "capped" (at COUNT_CAP rows) or "none"
+
+    Returns:
+        Page of ORM objects
+    """
+    total = await _count(db, query, count)
+    total_is_estimate = count == "capped" and total is not None and total > COUNT_CAP
+    if total_is_estimate:
+        total = COUNT_CAP
+
+    ordered = query.order_by(sort_column.desc(), id_column.desc())
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor)
+        if not isinstance(sort_value, sort_column.type.python_type):
+            raise HTTPException(status_code=400, detail="Ungültiger Cursor")
+        ordered = ordered.where(
+            tuple_(sort_column, id_column) < (sort_value, row_id),
+            # Redundant with the row comparison, but a plain column bound
+            # lets the planner prune partitions (see audit_logs)
+            sort_column <= sort_value,
+        )
+    else:
+        ordered = ordered.offset((page - 1) * page_size)
+
+    # One extra row tells whether another page follows
+    result = await db.execute(ordered.limit(page_size + 1))
+    rows = list(result.scalars().all())
+    has_more = len(rows) > page_size
+    items = rows[:page_size]
+
+    next_cursor = None
+    if has_more:
+        last = items[-1]
+        next_cursor = encode_cursor(
+            getattr(last, sort_column.key), getattr(last, id_column.key)
+        )
+
+    return PageResult(
+        items=items,
+        page_size=page_size,
+        next_cursor=next_cursor,
+        has_more=has_more,
+        total=total,
+        total_is_estimate=total_is_estimate,
+    )
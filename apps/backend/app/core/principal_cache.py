@@ -0,0 +1,88 @@
+"""Per-process cache of authenticated principals.
+
+Resolving the current user otherwise costs a full SELECT on every
+authenticated request. Entries are keyed by principal kind, user id and
+the token version embedded in the access token, and expire after a short
+TTL so that changes made by other processes are picked up. Logout,
+deactivation and role changes bump the token version and drop the entry
+immediately in the process that made the change.
+
+Cached principals are detached from any session: only their column
+attributes may be used, relationships cannot be lazy-loaded.
+"""
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+from app.core.config import settings
+
+
+class PrincipalCache:
+    """TTL cache of principals keyed by (kind, user id, token version)."""
+
+    def __init__(
+        self,
+        ttl: float = 30.0,
+        max_entries: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            ttl: Seconds a principal is served without hitting the database
+                (0 disables the cache)
+            max_entries: Maximum number of cached principals
+            clock: Monotonic clock returning seconds
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[tuple[str, str], tuple[int, Any, float]] = (
+            OrderedDict()
+        )
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, kind: str, user_id: str, version: int) -> Any | None:
+        """Get a cached principal for a token version, if still fresh."""
+        key = (kind, user_id)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        cached_version, principal, expires_at = entry
+        if cached_version != version or expires_at <= self._clock():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return principal
+
+    def set(self, kind: str, user_id: str, version: int, principal: Any) -> None:
+        """Cache a principal for a token version."""
+        if self.ttl <= 0:
+            return
+        key = (kind, user_id)
+        self._entries[key] = (version, principal, self._clock() + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, kind: str, user_id: str) -> None:
+        """Drop the cached principal of a user."""
+        self._entries.pop((kind, str(user_id)), None)
+
+    def clear(self) -> None:
+        """Drop all cached principals."""
+        self._entries.clear()
+
+
+principal_cache = PrincipalCache(ttl=settings.auth_cache_ttl)
@@ -0,0 +1,210 @@
+"""Routing of read-only requests to a database replica.
+
+Endpoints that only read take their session from ``get_read_db``. With
+DATABASE_REPLICA_URL set, that session reads from the replica, except:
+
+- for users who sent a writing request (any method but GET, HEAD and
+  OPTIONS) within the last ``database_replica_sticky_seconds``, so that
+  they read their own writes despite replication lag;
+- for ``database_replica_retry_seconds`` after the replica could not be
+  reached.
+
+In both cases the primary serves the read. Writes are recorded per process,
+like the principal cache, and additionally in the LAST_WRITE_COOKIE sent
+with the response of the write, so that the user's reads on other workers
+(which have not seen the write) are pinned as well. The cookie holds the
+wall clock time of the write; the sticky window should exceed the usual
+replication lag plus the clock skew between hosts.
+
+Endpoints whose results are cached for all users (audit case statistics,
+findings summaries) read from the primary: a replica read right after a
+write would put data from before the write back into the shared cache.
+"""
+
+import math
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.security import decode_access_token
+
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+LAST_WRITE_COOKIE = "flowaudit_last_write"
+
+
+class ReplicaRouter:
+    """Decides per read whether the replica may serve it."""
+
+    def __init__(
+        self,
+        sticky_seconds: float = 10.0,
+        retry_seconds: float = 30.0,
+        max_entries: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+        wall_clock: Callable[[], float] = time.time,
+    ) -> None:
+        """Initialize the router.
+
+        Args:
+            sticky_seconds: Seconds a user reads from the primary after a write
+            retry_seconds: Seconds the replica is skipped after a failure
+            max_entries: Maximum number of tracked writers
+            clock: Monotonic clock returning seconds
+            wall_clock: Clock of the write times in LAST_WRITE_COOKIE
+        """
+        self.sticky_seconds = sticky_seconds
+        self.retry_seconds = retry_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._wall_clock = wall_clock
+        self._writes: OrderedDict[str, float] = OrderedDict()
+        self._down_until = 0.0
+        self.replica_reads = 0
+        self.sticky_reads = 0
+        self.fallback_reads = 0
+        self.replica_failures = 0
+
+    def record_write(self, principal: str) -> None:
+        """Pin the reads of a user to the primary for the sticky window."""
+        self._writes[principal] = self._clock() + self.sticky_seconds
+        self._writes.move_to_end(principal)
+        while len(self._writes) > self.max_entries:
+            self._writes.popitem(last=False)
+
+    def write_cookie(self, secure: bool = False) -> str:
+        """Set-Cookie value recording a write at the current time."""
+        cookie = (
+            f"{LAST_WRITE_COOKIE}={self._wall_clock():.3f}; "
+            f"Max-Age={math.ceil(self.sticky_seconds)}; Path=/; HttpOnly; "
+            "SameSite=Lax"
+        )
+        return cookie + "; Secure" if secure else cookie
+
+    def use_replica(
+        self, principal: str | None, last_write: float | None = None
+    ) -> bool:
+        """Whether a read of a user may go to the replica.
+
+        Args:
+            principal: User id of the request, if authenticated
+            last_write: Wall clock time of the user's last write, from
+                LAST_WRITE_COOKIE
+        """
+        now = self._clock()
+        if now < self._down_until:
+            self.fallback_reads += 1
+            return False
+        if (
+            last_write is not None
+            and 0 <= self._wall_clock() - last_write < self.sticky_seconds
+        ):
+            self.sticky_reads += 1
+            return False
+        if principal is not None:
+            pinned_until = self._writes.get(principal)
+            if pinned_until is not None:
+                if now < pinned_until:
+                    self.sticky_reads += 1
+                    return False
+                del self._writes[principal]
+        self.replica_reads += 1
+        return True
+
+    def replica_failed(self) -> None:
+        """Send all reads to the primary for the retry interval.
+
+        Called for a read that use_replica routed to the replica; the read
+        is counted as a fallback instead.
+        """
+        self.replica_failures += 1
+        self.replica_reads -= 1
+        self.fallback_reads += 1
+        self._down_until = self._clock() + self.retry_seconds
+
+    def metrics(self) -> dict[str, Any]:
+        """Routing counters."""
+        return {
+            "replica_reads": self.replica_reads,
+            "sticky_reads": self.sticky_reads,
+            "fallback_reads": self.fallback_reads,
+            "replica_failures": self.replica_failures,
+            "replica_available": self._clock() >= self._down_until,
+            "sticky_users": len(self._writes),
+        }
+
+    def clear(self) -> None:
+        """Forget all writes and failures and reset the counters."""
+        self._writes.clear()
+        self._down_until = 0.0
+        self.replica_reads = 0
+        self.sticky_reads = 0
+        self.fallback_reads = 0
+        self.replica_failures = 0
+
+
+def last_write_of(cookie: str | None) -> float | None:
+    """Write time stored in LAST_WRITE_COOKIE, if valid."""
+    if not cookie:
+        return None
+    try:
+        last_write = float(cookie)
+    except ValueError:
+        return None
+    return last_write if math.isfinite(last_write) else None
+
+
+def principal_of(authorization: str | None) -> str | None:
+    """User id of a bearer token in an Authorization header, if valid."""
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    payload = decode_access_token(token)
+    return payload.get("sub") if payload else None
+
+
+class ReadYourWritesMiddleware:
+    """Pure ASGI middleware recording the writing requests of each user.
+
+    Writes are recorded in the replica router of the process and in
+    LAST_WRITE_COOKIE on the response.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] == "http"
+            and settings.database_replica_url
+            and scope["method"] not in SAFE_METHODS
+        ):
+            headers = dict(scope.get("headers", []))
+            authorization = headers.get(b"authorization", b"").decode("latin-1")
+            # Recorded when the write starts, so reads sent while it is
+            # still running go to the primary as well
+            if principal := principal_of(authorization):
+                replica_router.record_write(principal)
+                cookie = replica_router.write_cookie(scope.get("scheme") == "https")
+
+                async def send_with_cookie(message: Message) -> None:
+                    if message["type"] == "http.response.start":
+                        headers = MutableHeaders(scope=message)
+                        headers.append("set-cookie", cookie)
+                    await send(message)
+
+                await self.app(scope, receive, send_with_cookie)
+                return
+        await self.app(scope, receive, send)
+
+
+replica_router = ReplicaRouter(
+    sticky_seconds=settings.database_replica_sticky_seconds,
+    retry_seconds=settings.database_replica_retry_seconds,
+)
@@ -0,0 +1,51 @@
+"""In-process cache of serialized responses.
+
+Entries are keyed by a version fingerprint of everything a response is
+built from (e.g. the row id plus ``updated_at`` of each source row), so a
+changed source produces a new key and stale entries simply age out of the
+LRU. No explicit invalidation or TTL is needed.
+"""
+
+from collections import OrderedDict
+from collections.abc import Hashable
+
+
+class DetailResponseCache:
+    """LRU cache of serialized response bodies keyed by version."""
+
+    def __init__(self, max_entries: int = 1_000) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached responses (0 disables it)
+        """
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, bytes] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> bytes | None:
+        """Get a cached response body."""
+        body = self._entries.get(key)
+        if body is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return body
+
+    def set(self, key: Hashable, body: bytes) -> None:
+        """Cache a response body."""
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = body
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached responses."""
+        self._entries.clear()
@@ -1,15 +1,30 @@
 """Security utilities - JWT tokens, password hashing."""
 
+import asyncio
+import logging
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Any
+from typing import Any, TypeVar
 
+from fastapi import Request
+from fastapi.responses import JSONResponse
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
 from app.core.config import settings
 
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
 # Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.password_bcrypt_rounds,
+)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -22,6 +37,116 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+# ==============================================================================
+# Off-loop password hashing
+# ==============================================================================
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when too many hashing operations are already queued."""
+
+
+class PasswordHasher:
+    """Runs bcrypt on a bounded thread pool instead of the event loop.
+
+    bcrypt releases the GIL, so worker threads hash in parallel while the
+    event loop keeps serving other requests. At most ``max_workers``
+    operations run and ``max_queue`` wait; beyond that callers fail fast
+    with PasswordHasherBusy instead of piling up behind a login storm.
+    """
+
+    def __init__(self, max_workers: int = 4, max_queue: int = 32) -> None:
+        """Initialize the hasher.
+
+        Args:
+            max_workers: Number of hashing threads
+            max_queue: Operations allowed to wait for a free thread
+        """
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor: ThreadPoolExecutor | None = None
+        self._pending = 0
+        self.rejected = 0
+
+    @property
+    def pending(self) -> int:
+        """Operations running or waiting."""
+        return self._pending
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        if self._pending >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            raise PasswordHasherBusy("Password hashing queue is full")
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="password-hash"
+            )
+
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            self._pending -= 1
+
+    async def hash(self, password: str) -> str:
+        """Hash a password off the event loop."""
+        return await self._run(pwd_context.hash, password)
+
+    async def verify_and_update(
+        self, password: str, hashed_password: str
+    ) -> tuple[bool, str | None]:
+        """Verify a password off the event loop.
+
+        Returns:
+            Tuple of (valid, new hash). The new hash is set when the stored
+            hash uses outdated parameters and should replace it.
+        """
+        return await self._run(pwd_context.verify_and_update, password, hashed_password)
+
+    def shutdown(self) -> None:
+        """Stop the worker threads (application shutdown)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    max_workers=settings.password_hash_workers,
+    max_queue=settings.password_hash_queue,
+)
+
+
+async def hash_password(password: str) -> str:
+    """Generate password hash without blocking the event loop."""
+    return await password_hasher.hash(password)
+
+
+async def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    """Verify a password without blocking the event loop.
+
+    Returns:
+        Tuple of (valid, new hash to store or None)
+    """
+    return await password_hasher.verify_and_update(plain_password, hashed_password)
+
+
+def password_hasher_busy_handler(
+    request: Request, exc: PasswordHasherBusy
+) -> JSONResponse:
+    """Answer with 503 when the password hashing queue is full."""
+    logger.warning(f"Rejected request to {request.url.path}: {exc}")
+    return JSONResponse(
+        status_code=503,
+        content={
+            "detail": "Zu viele Anmeldungen. Bitte versuchen Sie es gleich erneut."
+        },
+        headers={"Retry-After": "1"},
+    )
+
+
 def create_access_token(
     data: dict[str, Any],
     expires_delta: timedelta | None = None,
@@ -0,0 +1,24 @@
+"""Helpers for export files that are opened in spreadsheet applications.
+
+Excel and LibreOffice evaluate cells starting with ``=``, ``+``, ``-`` or
+``@`` as formulas, also in CSV files, so user-entered text could run
+formulas (e.g. ``=HYPERLINK(...)``) on the machine of whoever opens an
+export. Such text is prefixed with an apostrophe, which spreadsheets show
+as plain text.
+"""
+
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def escape_formula(value: str) -> str:
+    """Make a text cell safe from formula evaluation.
+
+    Args:
+        value: Cell text
+
+    Returns:
+        The text, prefixed with ``'`` if it would be read as a formula
+    """
+    if value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
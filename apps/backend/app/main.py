@@ -1,17 +1,35 @@
 """FastAPI Application entrypoint."""
 
+import asyncio
+import sys
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from sqlalchemy import text
 
 from app.api import router as api_router
 from app.core.config import settings
-from app.core.database import close_db, init_db, get_session_factory
+from app.core.database import (
+    SchemaVersionError,
+    check_schema,
+    close_db,
+    get_session_factory,
+    pool_metrics,
+    pool_metrics_text,
+)
 from app.core.logging import setup_logging, get_logger, LoggingMiddleware
 from app.core.rate_limit import setup_rate_limiting
+from app.core.read_replica import ReadYourWritesMiddleware, replica_router
+from app.core.security import (
+    PasswordHasherBusy,
+    password_hasher,
+    password_hasher_busy_handler,
+)
+from app.services.audit_log_partitions import run_partition_maintenance
+from app.services.audit_log_writer import audit_log_writer
 
 # Initialize logging
 setup_logging()
@@ -24,13 +42,36 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     logger.info("Starting FlowAudit API", version="0.1.0", debug=settings.debug)
 
     # Startup
-    await init_db()
-    logger.info("Database initialized")
+    schema_checked = False
+    if settings.database_schema_check != "off":
+        try:
+            revision = await check_schema()
+            logger.info("Database schema checked", revision=revision)
+            schema_checked = True
+        except SchemaVersionError as e:
+            if settings.database_schema_check == "error":
+                raise
+            logger.warning("Database schema check failed", error=str(e))
+    # Partitions need the current schema; without a checked schema they are
+    # left to the audit-log-partitions command
+    partition_maintenance = None
+    if schema_checked:
+        partition_maintenance = asyncio.create_task(run_partition_maintenance())
+    if settings.audit_log_mode == "buffered":
+        audit_log_writer.start()
 
     yield
 
     # Shutdown
     logger.info("Shutting down FlowAudit API")
+    if partition_maintenance:
+        partition_maintenance.cancel()
+    # Write queued audit log entries before the pool is closed
+    await audit_log_writer.stop()
+    # Imported on first use by the module converter
+    if github_clients := sys.modules.get("app.services.github_clients"):
+        await github_clients.close_github_clients()
+    password_hasher.shutdown()
     await close_db()
 
 
@@ -46,6 +87,7 @@ app = FastAPI(
 
 # Rate limiting
 setup_rate_limiting(app)
+app.add_exception_handler(PasswordHasherBusy, password_hasher_busy_handler)
 
 # CORS
 app.add_middleware(
@@ -59,6 +101,9 @@ app.add_middleware(
 # Logging middleware (pure ASGI, no BaseHTTPMiddleware issues)
 app.add_middleware(LoggingMiddleware)
 
+# Pins the reads of writing users to the primary (read replica only)
+app.add_middleware(ReadYourWritesMiddleware)
+
 # Include API router
 app.include_router(api_router, prefix=settings.api_prefix)
 
@@ -84,3 +129,26 @@ async def api_health_check() -> dict[str, str]:
         "api": "healthy",
         "database": db_status,
     }
+
+
+@app.get("/api/health/database")
+async def database_health() -> dict[str, Any]:
+    """Connection pool usage and read replica routing counters."""
+    metrics: dict[str, Any] = {"pools": pool_metrics()}
+    if settings.database_replica_url:
+        metrics["replica_routing"] = replica_router.metrics()
+    return metrics
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics() -> PlainTextResponse:
+    """Connection pool metrics in the Prometheus text format."""
+    return PlainTextResponse(
+        pool_metrics_text(), media_type="text/plain; version=0.0.4"
+    )
+
+
+@app.get("/api/health/audit-log")
+async def audit_log_health() -> dict[str, Any]:
+    """Audit log writer metrics (queue depth, flush latency)."""
+    return audit_log_writer.metrics()
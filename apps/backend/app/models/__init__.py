@@ -15,6 +15,8 @@ from app.models.audit_case import (
     AuditCase,
     AuditCaseChecklist,
     AuditCaseFinding,
+    ChecklistAnswer,
+    FindingNumberCounter,
     FiscalYear,
     ChecklistTemplate,
 )
@@ -69,6 +71,8 @@ __all__ = [
     "AuditCase",
     "AuditCaseChecklist",
     "AuditCaseFinding",
+    "ChecklistAnswer",
+    "FindingNumberCounter",
     "FiscalYear",
     "ChecklistTemplate",
     "AuditLog",
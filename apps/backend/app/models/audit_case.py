@@ -6,22 +6,34 @@ from uuid import uuid4
 
 from sqlalchemy import (
     Boolean,
+    Computed,
     Date,
     DateTime,
     Enum,
     ForeignKey,
+    Index,
     Integer,
     Numeric,
     String,
     Text,
+    UniqueConstraint,
+    text,
 )
-from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
 from app.models.base import TimestampMixin
 
 
+# Weighted search document of an audit case (see migration 012)
+AUDIT_CASE_SEARCH_VECTOR = (
+    "setweight(to_tsvector('simple', coalesce(case_number, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(project_name, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(beneficiary_name, '')), 'C')"
+)
+
+
 class AuditCase(Base, TimestampMixin):
     """Prüfungsfall - Einzelne Vorhabenprüfung."""
 
@@ -51,6 +63,14 @@ class AuditCase(Base, TimestampMixin):
     project_name: Mapped[str] = mapped_column(String(500), nullable=False)
     beneficiary_name: Mapped[str] = mapped_column(String(500), nullable=False)
 
+    # Volltextsuche (case_number > project_name > beneficiary_name)
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed(AUDIT_CASE_SEARCH_VECTOR, persisted=True),
+        nullable=True,
+        deferred=True,
+    )
+
     # Finanzielle Daten
     approved_amount: Mapped[Decimal | None] = mapped_column(
         Numeric(15, 2), nullable=True
@@ -165,6 +185,36 @@ class AuditCase(Base, TimestampMixin):
         uselist=False,
     )
 
+    # Keyset pagination of the case list (newest first per tenant), also
+    # filtered by status or audit type, and the recently updated cases of
+    # the authority dashboard. Trigram indexes for fuzzy search are created
+    # by migration 012 when the pg_trgm extension is available
+    __table_args__ = (
+        Index("ix_audit_cases_tenant_created", "tenant_id", "created_at", "id"),
+        Index(
+            "ix_audit_cases_tenant_status_created",
+            "tenant_id",
+            "status",
+            "created_at",
+            "id",
+        ),
+        Index(
+            "ix_audit_cases_tenant_type_created",
+            "tenant_id",
+            "audit_type",
+            "created_at",
+            "id",
+        ),
+        Index("ix_audit_cases_tenant_updated", "tenant_id", "updated_at"),
+        Index(
+            "ix_audit_cases_search_vector", "search_vector", postgresql_using="gin"
+        ),
+        Index(
+            "ix_audit_cases_case_number_prefix",
+            text("lower(case_number) text_pattern_ops"),
+        ),
+    )
+
 
 class AuditCaseChecklist(Base, TimestampMixin):
     """Checkliste zu einem Prüfungsfall."""
@@ -217,6 +267,11 @@ class AuditCaseChecklist(Base, TimestampMixin):
     # Antworten (JSONB)
     responses: Mapped[dict] = mapped_column(JSONB, default=dict, nullable=False)
 
+    # Optimistic concurrency, incremented by every response update
+    version: Mapped[int] = mapped_column(
+        Integer, default=1, server_default="1", nullable=False
+    )
+
     # Bearbeiter
     completed_by: Mapped[str | None] = mapped_column(
         UUID(as_uuid=False),
@@ -235,6 +290,67 @@ class AuditCaseChecklist(Base, TimestampMixin):
     )
 
 
+class ChecklistAnswer(Base):
+    """Antwort auf eine Checklistenfrage (normalisiert).
+
+    Mirrors the answers in AuditCaseChecklist.responses, one row per
+    checklist, question and value (multiselect answers have one row per
+    selected option), for aggregation in SQL.
+    """
+
+    __tablename__ = "checklist_answers"
+
+    checklist_id: Mapped[str] = mapped_column(
+        UUID(as_uuid=False),
+        ForeignKey("audit_case_checklists.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    question_id: Mapped[str] = mapped_column(String(100), primary_key=True)
+    position: Mapped[int] = mapped_column(Integer, primary_key=True, default=0)
+
+    # Denormalized from the checklist for filtering without joins
+    tenant_id: Mapped[str] = mapped_column(
+        UUID(as_uuid=False),
+        ForeignKey("tenants.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    audit_case_id: Mapped[str] = mapped_column(
+        UUID(as_uuid=False),
+        ForeignKey("audit_cases.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    checklist_type: Mapped[str] = mapped_column(String(50), nullable=False)
+    template_id: Mapped[str | None] = mapped_column(UUID(as_uuid=False), nullable=True)
+
+    # Wert (typisiert)
+    value_text: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    value_number: Mapped[Decimal | None] = mapped_column(Numeric, nullable=True)
+    value_bool: Mapped[bool | None] = mapped_column(Boolean, nullable=True)
+
+    answered_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    answered_by: Mapped[str | None] = mapped_column(
+        UUID(as_uuid=False), nullable=True
+    )
+
+    __table_args__ = (
+        Index(
+            "ix_checklist_answers_question_value",
+            "tenant_id",
+            "question_id",
+            "value_text",
+        ),
+        Index(
+            "ix_checklist_answers_template_question",
+            "template_id",
+            "question_id",
+            "value_text",
+        ),
+    )
+
+
 class AuditCaseFinding(Base, TimestampMixin):
     """Feststellung zu einem Prüfungsfall."""
 
@@ -324,6 +440,40 @@ class AuditCaseFinding(Base, TimestampMixin):
         back_populates="findings",
     )
 
+    # Draft findings are counted per tenant on the authority dashboard
+    __table_args__ = (
+        UniqueConstraint(
+            "audit_case_id",
+            "finding_number",
+            name="uq_audit_case_findings_number",
+        ),
+        Index(
+            "ix_audit_case_findings_draft",
+            "audit_case_id",
+            postgresql_where=text("status = 'draft'"),
+        ),
+    )
+
+
+class FindingNumberCounter(Base):
+    """Zähler der Feststellungsnummern je Prüfungsfall.
+
+    Holds the last allocated finding number of a case. Numbers are reserved
+    by incrementing the row (see app.services.finding_numbers), which
+    serializes concurrent allocations per case.
+    """
+
+    __tablename__ = "finding_number_counters"
+
+    audit_case_id: Mapped[str] = mapped_column(
+        UUID(as_uuid=False),
+        ForeignKey("audit_cases.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    last_number: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+
 
 class FiscalYear(Base, TimestampMixin):
     """Prüfjahr / Haushaltsjahr."""
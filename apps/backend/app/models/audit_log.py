@@ -1,18 +1,26 @@
 """Audit Log model for tracking changes."""
 
+from datetime import datetime, timezone
 from typing import Any
 from uuid import uuid4
 
-from sqlalchemy import Enum, ForeignKey, Index, String, Text
+from sqlalchemy import DDL, DateTime, Enum, ForeignKey, Index, String, Text, event
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
 from app.models.base import TimestampMixin
 
+DEFAULT_PARTITION = "audit_logs_default"
+
 
 class AuditLog(Base, TimestampMixin):
-    """Audit log entry for tracking changes to entities."""
+    """Audit log entry for tracking changes to entities.
+
+    The table is range-partitioned by month on created_at (see
+    app.services.audit_log_partitions), so created_at is part of the
+    primary key.
+    """
 
     __tablename__ = "audit_logs"
 
@@ -21,6 +29,11 @@ class AuditLog(Base, TimestampMixin):
         primary_key=True,
         default=lambda: str(uuid4()),
     )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        primary_key=True,
+        default=lambda: datetime.now(timezone.utc),
+    )
     tenant_id: Mapped[str] = mapped_column(
         UUID(as_uuid=False),
         ForeignKey("tenants.id", ondelete="CASCADE"),
@@ -88,8 +101,29 @@ class AuditLog(Base, TimestampMixin):
     __table_args__ = (
         Index("ix_audit_logs_entity", "entity_type", "entity_id"),
         Index("ix_audit_logs_created_at", "created_at"),
+        # Keyset pagination of a case history
+        Index(
+            "ix_audit_logs_tenant_entity_created",
+            "tenant_id",
+            "entity_id",
+            "created_at",
+            "id",
+        ),
+        {"postgresql_partition_by": "RANGE (created_at)"},
     )
 
 
+# Tables created by create_all (create_schema, tests) start with the default
+# partition only; monthly partitions are added by ensure_partitions.
+event.listen(
+    AuditLog.__table__,
+    "after_create",
+    DDL(
+        f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} "
+        "PARTITION OF audit_logs DEFAULT"
+    ),
+)
+
+
 # Import at the end to avoid circular imports
 from app.models.user import User  # noqa: E402, F401
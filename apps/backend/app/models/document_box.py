@@ -3,7 +3,7 @@
 from datetime import datetime
 from typing import TYPE_CHECKING  # noqa: F401
 
-from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, Integer, String
+from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, Index, Integer, String
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -123,3 +123,8 @@ class BoxDocument(TenantModel):
         "DocumentBox",
         back_populates="documents",
     )
+
+    # Keyset pagination of the documents of a box
+    __table_args__ = (
+        Index("ix_box_documents_box_uploaded", "box_id", "uploaded_at", "id"),
+    )
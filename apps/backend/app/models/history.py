@@ -4,7 +4,17 @@ from datetime import datetime, timezone
 from enum import Enum as PyEnum
 from uuid import uuid4
 
-from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, Integer, String, Text
+from sqlalchemy import (
+    Boolean,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    text,
+)
 from sqlalchemy.dialects.postgresql import JSON, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -76,6 +86,9 @@ class ModuleEvent(Base):
         nullable=False,
     )
 
+    # Keyset pagination of the event list
+    __table_args__ = (Index("ix_module_events_created", "created_at", "id"),)
+
 
 class LLMConversation(Base, TimestampMixin):
     """LLM conversation session.
@@ -128,6 +141,21 @@ class LLMConversation(Base, TimestampMixin):
         cascade="all, delete-orphan",
     )
 
+    # Keyset pagination of the conversation list, also per context object
+    __table_args__ = (
+        Index(
+            "ix_llm_conversations_tenant_updated", "tenant_id", "updated_at", "id"
+        ),
+        Index(
+            "ix_llm_conversations_tenant_context_updated",
+            "tenant_id",
+            "context_id",
+            "updated_at",
+            "id",
+            postgresql_where=text("context_id IS NOT NULL"),
+        ),
+    )
+
 
 class LLMMessage(Base):
     """LLM message in a conversation."""
@@ -3,8 +3,9 @@
 from datetime import date, datetime
 from decimal import Decimal
 from typing import Optional, Any
+from uuid import UUID
 
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, model_validator
 
 
 # --- Enums as string literals ---
@@ -99,10 +100,13 @@ class AuditCaseListResponse(BaseModel):
     """Schema for paginated audit case list."""
 
     items: list[AuditCaseResponse]
-    total: int
+    total: Optional[int] = None
     page: int
     page_size: int
-    pages: int
+    pages: Optional[int] = None
+    next_cursor: Optional[str] = None
+    has_more: bool = False
+    total_is_estimate: bool = False
 
 
 class AuditCaseSummary(BaseModel):
@@ -121,6 +125,107 @@ class AuditCaseSummary(BaseModel):
     irregular_amount: Optional[Decimal] = None
 
 
+class AuditCaseSearchHit(AuditCaseSummary):
+    """Audit case search result with relevance score."""
+
+    score: float
+
+
+class AuditCaseSearchResponse(BaseModel):
+    """Schema for ranked audit case search results."""
+
+    items: list[AuditCaseSearchHit]
+    query: str
+    fuzzy: bool = False  # typo-tolerant matching (pg_trgm) was used
+
+
+class AuditCaseImportError(BaseModel):
+    """Validation errors of one import row."""
+
+    row: int  # 1-based, the header is row 1
+    case_number: Optional[str] = None
+    errors: list[str]
+
+
+class AuditCaseImportResult(BaseModel):
+    """Result of a bulk audit case import."""
+
+    total_rows: int = 0
+    created: int = 0
+    failed: int = 0
+    dry_run: bool = False
+    ignored_columns: list[str] = Field(default_factory=list)
+    errors: list[AuditCaseImportError] = Field(default_factory=list)
+    errors_truncated: bool = False
+
+
+class AuditCaseBulkFilter(BaseModel):
+    """Selects audit cases like the list filters."""
+
+    status: Optional[AuditCaseStatus] = None
+    audit_type: Optional[AuditType] = None
+    fiscal_year_id: Optional[str] = None
+    search: Optional[str] = Field(None, min_length=1, max_length=200)
+
+
+class AuditCaseBulkChanges(BaseModel):
+    """Fields that can be set on many audit cases at once.
+
+    Only fields that are sent are changed; send null to clear an optional
+    field (status, audit_type, is_sample and requires_follow_up cannot be
+    cleared).
+    """
+
+    status: Optional[AuditCaseStatus] = None
+    result: Optional[AuditResult] = None
+    audit_type: Optional[AuditType] = None
+    primary_auditor_id: Optional[str] = None
+    secondary_auditor_id: Optional[str] = None
+    team_leader_id: Optional[str] = None
+    fiscal_year_id: Optional[str] = None
+    audit_start_date: Optional[date] = None
+    audit_end_date: Optional[date] = None
+    is_sample: Optional[bool] = None
+    requires_follow_up: Optional[bool] = None
+
+
+class AuditCaseBulkUpdate(BaseModel):
+    """Schema for updating many audit cases at once.
+
+    Select the cases either by ``ids`` or by ``filter``.
+    """
+
+    ids: Optional[list[UUID]] = Field(None, min_length=1, max_length=1000)
+    filter: Optional[AuditCaseBulkFilter] = None
+    changes: AuditCaseBulkChanges
+    dry_run: bool = False
+    max_affected: Optional[int] = Field(None, ge=1)
+
+    @model_validator(mode="after")
+    def check_selection(self) -> "AuditCaseBulkUpdate":
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("Either ids or filter must be given")
+        if not self.changes.model_fields_set:
+            raise ValueError("No changes given")
+        return self
+
+
+class AuditCaseBulkChange(BaseModel):
+    """One audit case changed by a bulk update."""
+
+    id: str
+    case_number: str
+    changes: dict[str, dict[str, Optional[str]]]
+
+
+class AuditCaseBulkUpdateResult(BaseModel):
+    """Result of a bulk audit case update."""
+
+    affected: int
+    dry_run: bool = False
+    items: list[AuditCaseBulkChange]
+
+
 # --- Auditor Schemas ---
 
 
@@ -170,6 +275,12 @@ class FindingCreate(FindingBase):
     pass
 
 
+class FindingBulkCreate(BaseModel):
+    """Schema for creating many findings of a case at once."""
+
+    findings: list[FindingCreate] = Field(..., min_length=1, max_length=500)
+
+
 class FindingUpdate(BaseModel):
     """Schema for updating a finding."""
 
@@ -208,6 +319,15 @@ class FindingResponse(FindingBase):
     updated_at: datetime
 
 
+class FindingsSummary(BaseModel):
+    """Summary of the findings of an audit case."""
+
+    total: int = 0
+    by_status: dict[str, int] = Field(default_factory=dict)
+    by_type: dict[str, int] = Field(default_factory=dict)
+    total_financial_impact: Decimal = Decimal("0")
+
+
 # --- Checklist Schemas ---
 
 
@@ -238,6 +358,7 @@ class ChecklistResponse(BaseModel):
     total_questions: int
     answered_questions: int
     responses: dict[str, Any]
+    version: int = 1
     completed_by: Optional[str] = None
     completed_at: Optional[datetime] = None
     created_at: datetime
@@ -249,6 +370,7 @@ class ChecklistUpdate(BaseModel):
 
     responses: dict[str, Any]
     status: Optional[str] = None
+    version: Optional[int] = None  # expected checklist version
 
 
 # --- Statistics ---
@@ -170,6 +170,7 @@ class ChecklistResponseUpdate(BaseModel):
     responses: dict[str, Any]  # question_id -> response value
     status: Optional[str] = None
     notes: Optional[dict[str, str]] = None  # question_id -> note
+    version: Optional[int] = None  # expected checklist version
 
 
 class ChecklistInstanceResponse(BaseModel):
@@ -186,6 +187,7 @@ class ChecklistInstanceResponse(BaseModel):
     total_questions: int
     answered_questions: int
     responses: dict[str, Any]
+    version: int = 1
     completed_by: Optional[str] = None
     completed_at: Optional[datetime] = None
     created_at: datetime
@@ -193,6 +195,8 @@ class ChecklistInstanceResponse(BaseModel):
 
     # Include template structure for rendering
     template_name: Optional[str] = None
+    template_version: Optional[int] = None
+    structure_etag: Optional[str] = None  # ETag of the template structure
     structure: Optional[dict[str, Any]] = None
 
 
@@ -212,6 +216,25 @@ class ChecklistSummaryResponse(BaseModel):
     updated_at: datetime
 
 
+class AnswerDistributionItem(BaseModel):
+    """Number of answers with one value (in one group)."""
+
+    value: Optional[str] = None
+    group_id: Optional[str] = None  # fiscal year or tenant ID
+    group_name: Optional[str] = None
+    count: int  # answers (a multiselect answer counts once per option)
+    cases: int  # distinct audit cases
+
+
+class AnswerDistributionResponse(BaseModel):
+    """Distribution of the answers to a question."""
+
+    question_id: str
+    group_by: str
+    total: int
+    items: list[AnswerDistributionItem]
+
+
 # --- Default Template Structures ---
 
 
@@ -91,10 +91,13 @@ class BoxDocumentListResponse(BaseModel):
     """Paginated list response for documents."""
 
     items: list[BoxDocumentResponse]
-    total: int
+    total: int | None = None
     page: int
     page_size: int
-    pages: int
+    pages: int | None = None
+    next_cursor: str | None = None
+    has_more: bool = False
+    total_is_estimate: bool = False
 
 
 # --- Category Labels (German) ---
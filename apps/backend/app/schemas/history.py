@@ -63,9 +63,12 @@ class ModuleEventListResponse(BaseModel):
     """Module events list response."""
 
     items: list[ModuleEventResponse]
-    total: int
+    total: Optional[int] = None
     page: int = 1
     page_size: int = 20
+    next_cursor: Optional[str] = None
+    has_more: bool = False
+    total_is_estimate: bool = False
 
 
 # LLM Conversation Schemas
@@ -107,9 +110,12 @@ class LLMConversationListResponse(BaseModel):
     """LLM conversations list response."""
 
     items: list[LLMConversationResponse]
-    total: int
+    total: Optional[int] = None
     page: int = 1
     page_size: int = 20
+    next_cursor: Optional[str] = None
+    has_more: bool = False
+    total_is_estimate: bool = False
 
 
 # LLM Message Schemas
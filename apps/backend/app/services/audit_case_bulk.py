@@ -0,0 +1,151 @@
+"""Bulk updates of audit cases.
+
+All selected cases are changed with a single UPDATE ... RETURNING. Their
+previous values are read (and the rows locked) in a CTE of the same
+statement, so the audit log can record old and new values without loading
+the cases into the session. Cases that already have the new values are not
+touched.
+"""
+
+from typing import Any
+
+from sqlalchemy import ColumnElement, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.audit_case import AuditCase, FiscalYear
+from app.models.user import User
+from app.schemas.audit_case import AuditCaseBulkChange
+
+
+_ENUM_FIELDS = ("status", "result", "audit_type")
+_USER_FIELDS = ("primary_auditor_id", "secondary_auditor_id", "team_leader_id")
+
+
+class BulkUpdateError(ValueError):
+    """Raised when the changes of a bulk update are invalid."""
+
+
+class BulkLimitExceeded(ValueError):
+    """Raised when a bulk update would affect more cases than allowed."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        super().__init__(f"Mehr als {limit} Prüfungsfälle betroffen")
+
+
+async def _check_changes(
+    db: AsyncSession, tenant_id: str, changes: dict[str, Any]
+) -> None:
+    """Validate required fields, enum values and referenced users/fiscal years."""
+    for field, value in changes.items():
+        if value is None and not AuditCase.__table__.c[field].nullable:
+            raise BulkUpdateError(f"{field}: darf nicht leer sein")
+
+    for field in _ENUM_FIELDS:
+        value = changes.get(field)
+        if value is not None and value not in AuditCase.__table__.c[field].type.enums:
+            raise BulkUpdateError(f"{field}: unbekannter Wert '{value}'")
+
+    user_ids = {changes[f] for f in _USER_FIELDS if changes.get(f)}
+    if user_ids:
+        result = await db.execute(
+            select(User.id).where(User.tenant_id == tenant_id, User.id.in_(user_ids))
+        )
+        if user_ids - set(result.scalars().all()):
+            raise BulkUpdateError("Benutzer nicht gefunden")
+
+    fiscal_year_id = changes.get("fiscal_year_id")
+    if fiscal_year_id:
+        result = await db.execute(
+            select(FiscalYear.id).where(
+                FiscalYear.tenant_id == tenant_id, FiscalYear.id == fiscal_year_id
+            )
+        )
+        if result.scalar_one_or_none() is None:
+            raise BulkUpdateError("Prüfjahr nicht gefunden")
+
+
+def _as_text(value: Any) -> str | None:
+    return str(value) if value is not None else None
+
+
+async def bulk_update_audit_cases(
+    db: AsyncSession,
+    tenant_id: str,
+    condition: ColumnElement[bool],
+    changes: dict[str, Any],
+    limit: int,
+    dry_run: bool = False,
+) -> list[AuditCaseBulkChange]:
+    """Apply the same changes to all audit cases matching a condition.
+
+    Runs in the caller's transaction. If the limit is exceeded the update
+    has already been executed and the caller must roll back.
+
+    Args:
+        db: Database session
+        tenant_id: Tenant ID (cases of other tenants are never changed)
+        condition: WHERE clause selecting the cases
+        changes: Column values to set
+        limit: Maximum number of cases to change
+        dry_run: Only report what would change
+
+    Returns:
+        The changed cases with old and new values of the changed fields
+
+    Raises:
+        BulkUpdateError: If a value or reference is invalid
+        BulkLimitExceeded: If more than limit cases would change
+    """
+    await _check_changes(db, tenant_id, changes)
+
+    fields = list(changes)
+    old = (
+        select(
+            AuditCase.id,
+            AuditCase.case_number,
+            *(getattr(AuditCase, field) for field in fields),
+        )
+        .where(
+            AuditCase.tenant_id == tenant_id,
+            condition,
+            or_(
+                *(
+                    getattr(AuditCase, field).is_distinct_from(value)
+                    for field, value in changes.items()
+                )
+            ),
+        )
+        .order_by(AuditCase.id)
+        # One more than allowed, to detect that the limit is exceeded
+        .limit(limit + 1)
+    )
+
+    if dry_run:
+        rows = (await db.execute(old)).all()
+    else:
+        old = old.with_for_update().cte("old")
+        statement = (
+            update(AuditCase)
+            .where(AuditCase.id == old.c.id)
+            .values(**changes)
+            .returning(*old.c)
+            .execution_options(synchronize_session=False)
+        )
+        rows = (await db.execute(statement)).all()
+
+    if len(rows) > limit:
+        raise BulkLimitExceeded(limit)
+
+    return [
+        AuditCaseBulkChange(
+            id=case_id,
+            case_number=case_number,
+            changes={
+                field: {"old": _as_text(old_value), "new": _as_text(changes[field])}
+                for field, old_value in zip(fields, old_values)
+                if old_value != changes[field]
+            },
+        )
+        for case_id, case_number, *old_values in rows
+    ]
@@ -0,0 +1,441 @@
+"""Bulk import and export of audit cases (CSV and XLSX).
+
+Import reads the uploaded spreadsheet row by row from its spooled file,
+validates rows in batches (schema, enum values, referenced fiscal years
+and auditors, duplicate case numbers) and inserts each batch of valid rows
+with one multi-row INSERT. Invalid rows are reported and skipped.
+
+Export streams the filtered cases from a server-side cursor, so memory use
+does not grow with the number of cases. Text that a spreadsheet would
+evaluate as a formula is exported as plain text.
+"""
+
+import codecs
+import csv
+import io
+import tempfile
+import uuid
+from collections.abc import AsyncIterator, Iterator
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from itertools import islice
+from typing import Any, BinaryIO, Literal
+from uuid import UUID
+
+from pydantic import ValidationError
+from sqlalchemy import Select, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.core.spreadsheet import escape_formula
+from app.models.audit_case import AuditCase, FiscalYear
+from app.models.user import User
+from app.schemas.audit_case import (
+    AuditCaseCreate,
+    AuditCaseImportError,
+    AuditCaseImportResult,
+)
+
+
+FileFormat = Literal["csv", "xlsx"]
+
+IMPORT_BATCH_SIZE = 500
+EXPORT_BATCH_SIZE = 1_000
+MAX_REPORTED_ERRORS = 1_000
+
+# custom_data is a JSON object and cannot be expressed as a cell
+IMPORT_COLUMNS = tuple(f for f in AuditCaseCreate.model_fields if f != "custom_data")
+
+EXPORT_COLUMNS = (
+    "id",
+    "case_number",
+    "external_id",
+    "project_name",
+    "beneficiary_name",
+    "audit_type",
+    "status",
+    "result",
+    "approved_amount",
+    "audited_amount",
+    "irregular_amount",
+    "audit_start_date",
+    "audit_end_date",
+    "fiscal_year_id",
+    "primary_auditor_id",
+    "secondary_auditor_id",
+    "team_leader_id",
+    "is_sample",
+    "requires_follow_up",
+    "created_at",
+    "updated_at",
+)
+
+_AUDITOR_COLUMNS = ("primary_auditor_id", "secondary_auditor_id", "team_leader_id")
+_ID_COLUMNS = ("fiscal_year_id", *_AUDITOR_COLUMNS)
+_AUDIT_TYPES = frozenset(AuditCase.__table__.c.audit_type.type.enums)
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+class ImportFormatError(ValueError):
+    """Raised when an uploaded file cannot be read as a case list."""
+
+
+class ImportTooLarge(ValueError):
+    """Raised when an import exceeds the row limit."""
+
+
+def detect_format(filename: str | None, content_type: str | None) -> FileFormat:
+    """Detect the spreadsheet format from file name or content type.
+
+    Raises:
+        ImportFormatError: If the format is not supported
+    """
+    name = (filename or "").lower()
+    if name.endswith(".xlsx") or content_type == XLSX_MEDIA_TYPE:
+        return "xlsx"
+    if name.endswith(".csv") or content_type in ("text/csv", "application/csv"):
+        return "csv"
+    raise ImportFormatError("Nur CSV- und XLSX-Dateien werden unterstützt")
+
+
+# =============================================================================
+# Reading
+# =============================================================================
+
+
+def _normalize_header(header: Any) -> str:
+    return str(header or "").strip().lower()
+
+
+def _csv_rows(file: BinaryIO) -> Iterator[dict[str, Any]]:
+    sample = file.read(4096).decode("utf-8-sig", errors="ignore")
+    file.seek(0)
+    try:
+        dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+    except csv.Error:
+        dialect = csv.excel
+
+    # Decode incrementally; the upload stays spooled on disk
+    reader = csv.reader(codecs.getreader("utf-8-sig")(file), dialect)
+    try:
+        header = next(reader, None)
+        if header is None:
+            raise ImportFormatError("Die Datei ist leer")
+        columns = [_normalize_header(h) for h in header]
+        for values in reader:
+            if any(values):
+                yield dict(zip(columns, values))
+    except UnicodeDecodeError as e:
+        raise ImportFormatError("Die CSV-Datei muss UTF-8-kodiert sein") from e
+
+
+def _xlsx_rows(file: BinaryIO) -> Iterator[dict[str, Any]]:
+    from openpyxl import load_workbook
+
+    try:
+        workbook = load_workbook(file, read_only=True, data_only=True)
+    except Exception as e:
+        raise ImportFormatError("Die XLSX-Datei kann nicht gelesen werden") from e
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            raise ImportFormatError("Die Datei ist leer")
+        columns = [_normalize_header(h) for h in header]
+        for values in rows:
+            if any(v not in (None, "") for v in values):
+                yield dict(zip(columns, values))
+    finally:
+        workbook.close()
+
+
+def read_rows(file: BinaryIO, file_format: FileFormat) -> Iterator[dict[str, Any]]:
+    """Iterate the rows of a spreadsheet as dicts keyed by lower-case header.
+
+    Args:
+        file: Binary file object positioned at the start
+        file_format: "csv" or "xlsx"
+
+    Returns:
+        Iterator of raw row dicts (blocking, run it in a thread pool)
+    """
+    if file_format == "xlsx":
+        return _xlsx_rows(file)
+    return _csv_rows(file)
+
+
+# =============================================================================
+# Import
+# =============================================================================
+
+
+def _clean(value: Any) -> Any:
+    """Convert a cell value into something the create schema accepts."""
+    if isinstance(value, str):
+        value = value.strip()
+        return value or None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    return value
+
+
+def _validate_row(raw: dict[str, Any]) -> tuple[AuditCaseCreate | None, list[str]]:
+    data = {}
+    for column in IMPORT_COLUMNS:
+        value = _clean(raw.get(column))
+        if value is not None:
+            data[column] = value
+
+    try:
+        case = AuditCaseCreate.model_validate(data)
+    except ValidationError as e:
+        return None, [
+            f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()
+        ]
+
+    errors = []
+    if case.audit_type not in _AUDIT_TYPES:
+        errors.append(f"audit_type: unbekannter Wert '{case.audit_type}'")
+    for column in _ID_COLUMNS:
+        value = getattr(case, column)
+        if value is not None:
+            try:
+                uuid.UUID(value)
+            except ValueError:
+                errors.append(f"{column}: keine gültige ID")
+    return (None, errors) if errors else (case, [])
+
+
+async def _existing(db: AsyncSession, query: Select, values: set[str]) -> set[str]:
+    """Run a lookup query for a set of values (skipped if the set is empty)."""
+    if not values:
+        return set()
+    result = await db.execute(query)
+    return {str(v) for v in result.scalars().all()}
+
+
+async def import_audit_cases(
+    db: AsyncSession,
+    rows: Iterator[dict[str, Any]],
+    user: User,
+    max_rows: int = 10_000,
+    dry_run: bool = False,
+) -> tuple[AuditCaseImportResult, list[tuple[UUID, str]]]:
+    """Validate and insert audit cases from spreadsheet rows.
+
+    Runs in the caller's transaction; the caller commits (or rolls back
+    for a dry run).
+
+    Args:
+        db: Database session
+        rows: Raw rows from read_rows
+        user: Importing user
+        max_rows: Maximum number of data rows
+        dry_run: Validate only, do not insert
+
+    Returns:
+        Import result with per-row errors, and the (id, case number) of
+        every created case for the audit log
+
+    Raises:
+        ImportTooLarge: If the file has more than max_rows rows
+    """
+    tenant_id = user.tenant_id
+    result = AuditCaseImportResult(dry_run=dry_run)
+    created: list[tuple[UUID, str]] = []
+    seen_case_numbers: set[str] = set()
+    valid_fiscal_years: set[str] = set()
+    valid_users: set[str] = set()
+    columns_checked = False
+
+    def report(row: int, case_number: str | None, errors: list[str]) -> None:
+        result.failed += 1
+        if len(result.errors) < MAX_REPORTED_ERRORS:
+            result.errors.append(
+                AuditCaseImportError(row=row, case_number=case_number, errors=errors)
+            )
+        else:
+            result.errors_truncated = True
+
+    while True:
+        # Reading and parsing the file is blocking
+        batch = await run_in_threadpool(list, islice(rows, IMPORT_BATCH_SIZE))
+        if not batch:
+            break
+        if not columns_checked:
+            result.ignored_columns = sorted(
+                c for c in batch[0] if c and c not in IMPORT_COLUMNS
+            )
+            columns_checked = True
+
+        first_row = result.total_rows + 2  # 1-based, after the header
+        result.total_rows += len(batch)
+        if result.total_rows > max_rows:
+            raise ImportTooLarge(f"Maximal {max_rows} Zeilen pro Import")
+
+        candidates: list[tuple[int, AuditCaseCreate]] = []
+        for offset, raw in enumerate(batch):
+            case, errors = _validate_row(raw)
+            if case is None:
+                report(first_row + offset, _clean(raw.get("case_number")), errors)
+            else:
+                candidates.append((first_row + offset, case))
+
+        # Check references and duplicates for the whole batch at once
+        case_numbers = {case.case_number for _, case in candidates}
+        taken = await _existing(
+            db,
+            select(AuditCase.case_number).where(
+                AuditCase.tenant_id == tenant_id,
+                AuditCase.case_number.in_(case_numbers),
+            ),
+            case_numbers,
+        )
+        fiscal_years = {
+            c.fiscal_year_id for _, c in candidates if c.fiscal_year_id
+        } - valid_fiscal_years
+        valid_fiscal_years |= await _existing(
+            db,
+            select(FiscalYear.id).where(
+                FiscalYear.tenant_id == tenant_id, FiscalYear.id.in_(fiscal_years)
+            ),
+            fiscal_years,
+        )
+        user_ids = {
+            getattr(c, column)
+            for _, c in candidates
+            for column in _AUDITOR_COLUMNS
+            if getattr(c, column)
+        } - valid_users
+        valid_users |= await _existing(
+            db,
+            select(User.id).where(User.tenant_id == tenant_id, User.id.in_(user_ids)),
+            user_ids,
+        )
+
+        values = []
+        for row, case in candidates:
+            errors = []
+            if case.case_number in taken or case.case_number in seen_case_numbers:
+                errors.append("case_number: existiert bereits")
+            if case.fiscal_year_id and case.fiscal_year_id not in valid_fiscal_years:
+                errors.append("fiscal_year_id: Prüfjahr nicht gefunden")
+            for column in _AUDITOR_COLUMNS:
+                user_id = getattr(case, column)
+                if user_id and user_id not in valid_users:
+                    errors.append(f"{column}: Benutzer nicht gefunden")
+            if errors:
+                report(row, case.case_number, errors)
+                continue
+            seen_case_numbers.add(case.case_number)
+            values.append({"tenant_id": tenant_id, **case.model_dump()})
+
+        result.created += len(values)
+        if not values or dry_run:
+            continue
+
+        inserted = await db.execute(
+            insert(AuditCase).returning(AuditCase.id, AuditCase.case_number), values
+        )
+        created.extend(tuple(row) for row in inserted.all())
+
+    return result, created
+
+
+# =============================================================================
+# Export
+# =============================================================================
+
+
+def _format(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, str):
+        return escape_formula(value)
+    return value
+
+
+def _xlsx_value(sheet: Any, value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        # Excel has no time zones; export in UTC
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    if isinstance(value, str) and value.startswith("="):
+        # openpyxl writes such text as a formula unless typed explicitly
+        from openpyxl.cell import WriteOnlyCell
+
+        cell = WriteOnlyCell(sheet, value)
+        cell.data_type = "s"
+        return cell
+    return value
+
+
+def _export_query(query: Select) -> Select:
+    columns = [getattr(AuditCase, column) for column in EXPORT_COLUMNS]
+    return (
+        query.with_only_columns(*columns)
+        .order_by(AuditCase.created_at.desc(), AuditCase.id.desc())
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+
+
+async def export_csv(db: AsyncSession, query: Select) -> AsyncIterator[bytes]:
+    """Stream the cases selected by a query as CSV.
+
+    Args:
+        db: Database session (must stay open while streaming)
+        query: Filtered select of AuditCase
+
+    Yields:
+        UTF-8 encoded CSV chunks, starting with a BOM for Excel
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    yield ("\ufeff" + buffer.getvalue()).encode()
+
+    result = await db.stream(_export_query(query))
+    async for partition in result.partitions():
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([_format(v) for v in row] for row in partition)
+        yield buffer.getvalue().encode()
+
+
+async def export_xlsx(db: AsyncSession, query: Select) -> AsyncIterator[bytes]:
+    """Stream the cases selected by a query as an XLSX workbook.
+
+    openpyxl's write-only mode spools rows to disk; the finished workbook
+    is then streamed from a temporary file in chunks.
+
+    Args:
+        db: Database session (must stay open while streaming)
+        query: Filtered select of AuditCase
+
+    Yields:
+        Chunks of the XLSX file
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Prüfungsfälle")
+    sheet.append(EXPORT_COLUMNS)
+
+    result = await db.stream(_export_query(query))
+    async for partition in result.partitions():
+        for row in partition:
+            sheet.append([_xlsx_value(sheet, v) for v in row])
+
+    with tempfile.TemporaryFile() as file:
+        await run_in_threadpool(workbook.save, file)
+        file.seek(0)
+        while chunk := await run_in_threadpool(file.read, 64 * 1024):
+            yield chunk
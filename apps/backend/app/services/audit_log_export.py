@@ -0,0 +1,175 @@
+"""Streaming export of the audit trail (NDJSON and CSV, optionally gzip).
+
+Entries are read oldest first from a server-side cursor in batches of
+EXPORT_BATCH_SIZE rows and written out batch by batch, so memory use does
+not grow with the size of the trail. Every exported entry carries the
+cursor of its position; an interrupted export is resumed by passing the
+cursor of the last received entry.
+"""
+
+import csv
+import io
+import json
+import zlib
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime
+from typing import Any, Literal
+
+from sqlalchemy import Row, Select, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.pagination import encode_cursor
+from app.core.spreadsheet import escape_formula
+from app.models.audit_log import AuditLog
+
+
+ExportFormat = Literal["ndjson", "csv"]
+
+EXPORT_BATCH_SIZE = 1_000
+
+EXPORT_COLUMNS = (
+    "id",
+    "created_at",
+    "entity_type",
+    "entity_id",
+    "action",
+    "field_name",
+    "old_value",
+    "new_value",
+    "changes",
+    "description",
+    "user_id",
+    "user_email",
+    "user_name",
+    "ip_address",
+    "user_agent",
+)
+
+
+def export_query(
+    tenant_id: str,
+    *,
+    entity_id: str | None = None,
+    entity_type: str | None = None,
+    actions: Sequence[str] | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    after: tuple[datetime, str] | None = None,
+) -> Select:
+    """Build the export query of a tenant's audit trail, oldest first.
+
+    Args:
+        tenant_id: Tenant of the entries
+        entity_id: Only entries of this entity (e.g. an audit case)
+        entity_type: Only entries of this entity type
+        actions: Only entries with one of these actions
+        since: Only entries created at or after this time
+        until: Only entries created before this time
+        after: (created_at, id) of the last entry already exported
+
+    Returns:
+        Select of the EXPORT_COLUMNS
+    """
+    query = select(*(getattr(AuditLog, column) for column in EXPORT_COLUMNS)).where(
+        AuditLog.tenant_id == tenant_id
+    )
+    if entity_id:
+        query = query.where(AuditLog.entity_id == entity_id)
+    if entity_type:
+        query = query.where(AuditLog.entity_type == entity_type)
+    if actions:
+        query = query.where(AuditLog.action.in_(actions))
+    # Plain created_at bounds let the planner prune the monthly partitions
+    if since:
+        query = query.where(AuditLog.created_at >= since)
+    if until:
+        query = query.where(AuditLog.created_at < until)
+    if after:
+        query = query.where(
+            tuple_(AuditLog.created_at, AuditLog.id) > after,
+            AuditLog.created_at >= after[0],
+        )
+    return query.order_by(AuditLog.created_at, AuditLog.id).execution_options(
+        yield_per=EXPORT_BATCH_SIZE
+    )
+
+
+def _record(row: Row) -> dict[str, Any]:
+    record = dict(row._mapping)
+    record["created_at"] = row.created_at.isoformat()
+    record["cursor"] = encode_cursor(row.created_at, row.id)
+    return record
+
+
+async def _batches(db: AsyncSession, query: Select) -> AsyncIterator[Sequence[Row]]:
+    result = await db.stream(query)
+    async for partition in result.partitions():
+        yield partition
+
+
+async def export_ndjson(db: AsyncSession, query: Select) -> AsyncIterator[bytes]:
+    """Stream audit log entries as newline-delimited JSON.
+
+    Args:
+        db: Database session (must stay open while streaming)
+        query: Query from export_query
+
+    Yields:
+        UTF-8 encoded lines, one JSON object per entry
+    """
+    async for batch in _batches(db, query):
+        lines = (
+            json.dumps(_record(row), ensure_ascii=False, separators=(",", ":"))
+            for row in batch
+        )
+        yield ("\n".join(lines) + "\n").encode()
+
+
+async def export_csv(db: AsyncSession, query: Select) -> AsyncIterator[bytes]:
+    """Stream audit log entries as CSV.
+
+    The changes object is written as a JSON string. Text that a spreadsheet
+    would evaluate as a formula is prefixed with an apostrophe; the cursor
+    column is left as is so that it can be passed back unchanged.
+
+    Args:
+        db: Database session (must stay open while streaming)
+        query: Query from export_query
+
+    Yields:
+        UTF-8 encoded CSV chunks, starting with a BOM for Excel
+    """
+    columns = (*EXPORT_COLUMNS, "cursor")
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, columns)
+    writer.writeheader()
+    yield ("\ufeff" + buffer.getvalue()).encode()
+
+    async for batch in _batches(db, query):
+        buffer.seek(0)
+        buffer.truncate()
+        for row in batch:
+            record = _record(row)
+            if record["changes"] is not None:
+                record["changes"] = json.dumps(record["changes"], ensure_ascii=False)
+            for column in EXPORT_COLUMNS:
+                if isinstance(record[column], str):
+                    record[column] = escape_formula(record[column])
+            writer.writerow(record)
+        yield buffer.getvalue().encode()
+
+
+async def gzip_stream(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Compress a byte stream into a gzip file on the fly.
+
+    Args:
+        chunks: Uncompressed chunks
+
+    Yields:
+        Chunks of the gzip file
+    """
+    compressor = zlib.compressobj(wbits=31)  # 31: gzip header and trailer
+    async for chunk in chunks:
+        if data := compressor.compress(chunk):
+            yield data
+    yield compressor.flush()
@@ -0,0 +1,343 @@
+"""Monthly partitions of the audit log.
+
+``audit_logs`` is range-partitioned on ``created_at`` with one partition
+per month (``audit_logs_y2025m01``) and a default partition for rows
+outside all monthly ranges. Queries with a created_at bound only scan the
+matching months.
+
+- ensure_partitions creates the partitions of the current and the next
+  months ahead of time (in the background after the startup schema check
+  and daily, see app.main, or ``python -m app.cli audit-log-partitions``).
+- archive_partitions detaches months older than the retention period,
+  exports them with COPY to gzip-compressed CSV files and drops them, one
+  transaction per month (scheduled job:
+  ``python -m app.cli audit-log-archive``).
+- restore_partition loads an archive file back and attaches it again
+  (``python -m app.cli audit-log-restore <file>``).
+
+All maintenance runs under an advisory lock, so several workers can call
+it concurrently.
+"""
+
+import asyncio
+import gzip
+import logging
+import re
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.core.config import settings
+from app.core.database import get_engine
+from app.models.audit_log import DEFAULT_PARTITION
+
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "audit_logs"
+
+# Key of the transaction-level advisory lock of partition maintenance
+_LOCK_KEY = 0x6175646974  # "audit"
+
+_NAME_RE = re.compile(r"^audit_logs_y(\d{4})m(\d{2})$")
+
+
+class PartitionError(Exception):
+    """Raised when a partition or archive file cannot be processed."""
+
+
+@dataclass(frozen=True)
+class Partition:
+    """A monthly partition."""
+
+    name: str
+    month: date  # first day of the month
+
+    @property
+    def start(self) -> datetime:
+        return datetime(self.month.year, self.month.month, 1, tzinfo=timezone.utc)
+
+    @property
+    def end(self) -> datetime:
+        month = add_months(self.month, 1)
+        return datetime(month.year, month.month, 1, tzinfo=timezone.utc)
+
+
+def month_start(value: date | datetime) -> date:
+    """First day of the month of a date."""
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    """Shift the first day of a month by a number of months."""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """Name of the partition of a month."""
+    return f"{PARENT_TABLE}_y{month.year:04d}m{month.month:02d}"
+
+
+def parse_partition_name(name: str) -> date | None:
+    """Month of a partition name (None for other tables)."""
+    match = _NAME_RE.match(name)
+    if not match:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+async def _lock(conn: AsyncConnection) -> None:
+    await conn.execute(
+        text("SELECT pg_advisory_xact_lock(:key)"), {"key": _LOCK_KEY}
+    )
+
+
+async def list_partitions(conn: AsyncConnection) -> list[Partition]:
+    """List the monthly partitions attached to the audit log, oldest first."""
+    result = await conn.execute(
+        text(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = :parent
+            """
+        ),
+        {"parent": PARENT_TABLE},
+    )
+    partitions = []
+    for (name,) in result:
+        month = parse_partition_name(name)
+        if month is not None:
+            partitions.append(Partition(name, month))
+    return sorted(partitions, key=lambda p: p.month)
+
+
+async def _attach(
+    conn: AsyncConnection, partition: Partition, table_exists: bool
+) -> None:
+    """Create (or attach) a monthly partition.
+
+    The partition is filled as a standalone table and attached afterwards.
+    Rows of the month that went to the default partition are moved into it
+    first; PostgreSQL refuses the partition otherwise. The default
+    partition itself stays attached, so its foreign keys are not rebuilt.
+    """
+    start = partition.start.isoformat()
+    end = partition.end.isoformat()
+    if not table_exists:
+        await conn.execute(
+            text(
+                f"CREATE TABLE {partition.name} "
+                f"(LIKE {PARENT_TABLE} INCLUDING DEFAULTS)"
+            )
+        )
+    await conn.execute(
+        text(
+            f"""
+            WITH moved AS (
+                DELETE FROM {DEFAULT_PARTITION}
+                WHERE created_at >= :start AND created_at < :end
+                RETURNING *
+            )
+            INSERT INTO {partition.name} SELECT * FROM moved
+            """
+        ),
+        {"start": partition.start, "end": partition.end},
+    )
+    await conn.execute(
+        text(
+            f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {partition.name} "
+            f"FOR VALUES FROM ('{start}') TO ('{end}')"
+        )
+    )
+
+
+async def ensure_partitions(
+    conn: AsyncConnection,
+    months_ahead: int = 3,
+    months_back: int = 0,
+    today: date | None = None,
+) -> list[str]:
+    """Create the missing monthly partitions around the current month.
+
+    The advisory lock is only taken if a partition is missing, so the
+    usual run (all partitions present) neither waits nor runs DDL.
+
+    Args:
+        conn: Connection in a transaction (committed by the caller)
+        months_ahead: Future months to create in advance
+        months_back: Past months to create as well
+        today: Current date (for tests)
+
+    Returns:
+        Names of the created partitions
+    """
+    current = month_start(today or datetime.now(timezone.utc).date())
+    months = [
+        add_months(current, offset)
+        for offset in range(-months_back, months_ahead + 1)
+    ]
+    existing = {p.month for p in await list_partitions(conn)}
+    if existing.issuperset(months):
+        return []
+
+    await _lock(conn)
+    existing = {p.month for p in await list_partitions(conn)}
+
+    created = []
+    for month in months:
+        if month in existing:
+            continue
+        partition = Partition(partition_name(month), month)
+        await _attach(conn, partition, table_exists=False)
+        created.append(partition.name)
+
+    if created:
+        logger.info(f"Created audit log partitions: {', '.join(created)}")
+    return created
+
+
+async def archive_partitions(
+    conn: AsyncConnection,
+    archive_dir: Path,
+    retention_months: int,
+    today: date | None = None,
+) -> list[Path]:
+    """Move monthly partitions older than the retention period to archives.
+
+    Each partition is detached, exported with COPY to
+    ``<archive_dir>/<partition>.csv.gz`` and dropped in a transaction of its
+    own, which is committed before the next partition is processed. The
+    ACCESS EXCLUSIVE lock of the detach is thus held for one month's export
+    only, and a failure rolls back just the current partition (left
+    attached, its file not written) while the archived ones stay dropped.
+    ``DETACH PARTITION ... CONCURRENTLY`` is not an option because the audit
+    log has a default partition.
+
+    Args:
+        conn: Connection outside a transaction (commits per partition)
+        archive_dir: Directory of the archive files
+        retention_months: Months kept in the database (besides the current)
+        today: Current date (for tests)
+
+    Returns:
+        The written archive files
+    """
+    current = month_start(today or datetime.now(timezone.utc).date())
+    cutoff = add_months(current, -retention_months)
+    archive_dir.mkdir(parents=True, exist_ok=True)
+
+    async with conn.begin():
+        expired = [p for p in await list_partitions(conn) if p.month < cutoff]
+
+    files = []
+    for partition in expired:
+        async with conn.begin():
+            path = await _archive_partition(conn, partition, archive_dir)
+        if path is not None:
+            files.append(path)
+    return files
+
+
+async def _archive_partition(
+    conn: AsyncConnection, partition: Partition, archive_dir: Path
+) -> Path | None:
+    """Detach, export and drop one partition (None if already archived)."""
+    await _lock(conn)
+    if partition not in await list_partitions(conn):
+        return None
+
+    path = archive_dir / f"{partition.name}.csv.gz"
+    await conn.execute(
+        text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {partition.name}")
+    )
+
+    driver = (await conn.get_raw_connection()).driver_connection
+    tmp_path = path.with_suffix(".tmp")
+    try:
+        with gzip.open(tmp_path, "wb") as archive:
+
+            async def write(chunk: bytes) -> None:
+                archive.write(chunk)
+
+            await driver.copy_from_table(
+                partition.name, output=write, format="csv", header=True
+            )
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    tmp_path.replace(path)
+
+    await conn.execute(text(f"DROP TABLE {partition.name}"))
+    logger.info(f"Archived audit log partition {partition.name} to {path}")
+    return path
+
+
+async def restore_partition(conn: AsyncConnection, path: Path) -> str:
+    """Load an archived partition and attach it to the audit log again.
+
+    Args:
+        conn: Connection in a transaction (committed by the caller)
+        path: Archive file written by archive_partitions
+
+    Returns:
+        Name of the restored partition
+
+    Raises:
+        PartitionError: If the file name is not an archive name or the
+            month is already attached
+    """
+    name = path.name.removesuffix(".csv.gz")
+    month = parse_partition_name(name)
+    if month is None or not path.name.endswith(".csv.gz"):
+        raise PartitionError(f"Keine Archivdatei einer Partition: {path.name}")
+
+    await _lock(conn)
+    if month in {p.month for p in await list_partitions(conn)}:
+        raise PartitionError(f"Partition {name} ist bereits vorhanden")
+
+    partition = Partition(name, month)
+    await conn.execute(
+        text(f"CREATE TABLE {name} (LIKE {PARENT_TABLE} INCLUDING DEFAULTS)")
+    )
+    driver = (await conn.get_raw_connection()).driver_connection
+    with gzip.open(path, "rb") as archive:
+        await driver.copy_to_table(name, source=archive, format="csv", header=True)
+    await _attach(conn, partition, table_exists=True)
+
+    logger.info(f"Restored audit log partition {name} from {path}")
+    return name
+
+
+async def maintain_partitions(engine: AsyncEngine | None = None) -> list[str]:
+    """Create the upcoming partitions in their own transaction.
+
+    Args:
+        engine: Database engine (default: the application engine)
+
+    Returns:
+        Names of the created partitions
+    """
+    engine = engine or get_engine()
+    async with engine.begin() as conn:
+        return await ensure_partitions(conn, settings.audit_log_partitions_ahead)
+
+
+async def run_partition_maintenance(interval: float = 24 * 3600) -> None:
+    """Create upcoming partitions now and periodically (runs until cancelled).
+
+    Args:
+        interval: Seconds between two runs
+    """
+    while True:
+        try:
+            await maintain_partitions()
+        except Exception:
+            logger.exception("Audit log partition maintenance failed")
+        await asyncio.sleep(interval)
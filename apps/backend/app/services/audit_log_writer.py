@@ -0,0 +1,219 @@
+"""Audit log sink.
+
+Audit log entries are written in one of two modes (``audit_log_mode``):
+
+``transactional``
+    Entries are inserted with a Core multi-row INSERT in the caller's
+    session, so they are committed or rolled back together with the change
+    they describe. No ORM objects are added to the unit of work.
+
+``buffered``
+    Entries are handed to a background writer through a bounded queue and
+    inserted in their own transaction, up to ``audit_log_batch_size``
+    entries per multi-row INSERT and at most ``audit_log_flush_interval_ms``
+    after they were queued. Request transactions no longer carry the audit
+    log, but an entry is kept even if the caller's transaction is rolled
+    back afterwards, and queued entries are lost if the process dies. When
+    the queue is full, callers wait (backpressure) instead of dropping
+    entries. The queue is drained on shutdown.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.database import get_session_factory
+from app.models.audit_log import AuditLog
+
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class AuditLogWriter:
+    """Background writer inserting queued audit log entries in batches."""
+
+    def __init__(
+        self,
+        batch_size: int = 500,
+        flush_interval: float = 0.2,
+        max_queue: int = 10_000,
+        max_attempts: int = 3,
+        session_factory: Callable[[], async_sessionmaker[AsyncSession]] = (
+            get_session_factory
+        ),
+    ) -> None:
+        """Initialize the writer (call start() from the event loop).
+
+        Args:
+            batch_size: Maximum entries per INSERT
+            flush_interval: Seconds an entry waits at most for its batch
+            max_queue: Queued entries before put() waits
+            max_attempts: Attempts to insert a batch before it is logged
+                and dropped
+            session_factory: Returns the session factory used for inserts
+        """
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.max_attempts = max_attempts
+        self._session_factory = session_factory
+        self._queue: asyncio.Queue[Any] | None = None
+        self._task: asyncio.Task[None] | None = None
+
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.flushes = 0
+        self.failed_flushes = 0
+        self.flush_seconds_total = 0.0
+        self.flush_seconds_max = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the background writer task."""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._task = asyncio.create_task(self._run(), name="audit-log-writer")
+
+    async def put(self, entries: list[dict[str, Any]]) -> None:
+        """Queue entries, waiting while the queue is full.
+
+        Entries are written right away if the writer is not running (e.g.
+        after shutdown).
+
+        Args:
+            entries: Column values of audit log entries
+        """
+        now = datetime.now(timezone.utc)
+        for entry in entries:
+            # Time of the event, not of the flush
+            entry.setdefault("created_at", now)
+            entry.setdefault("updated_at", now)
+
+        if not self.running or self._queue is None:
+            await self._flush(entries)
+            return
+        for entry in entries:
+            await self._queue.put(entry)
+        self.enqueued += len(entries)
+
+    async def stop(self) -> None:
+        """Write all queued entries and stop the writer."""
+        if self._task is None or self._queue is None:
+            return
+        if self.running:
+            await self._queue.put(_STOP)
+        await self._task
+        self._task = None
+        self._queue = None
+
+    async def _run(self) -> None:
+        queue = self._queue
+        assert queue is not None
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                if queue.empty():
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    item = queue.get_nowait()
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._flush(batch)
+
+    async def _flush(self, batch: list[dict[str, Any]]) -> None:
+        """Insert a batch with one multi-row INSERT, retrying on errors."""
+        if not batch:
+            return
+        for attempt in range(1, self.max_attempts + 1):
+            started = time.perf_counter()
+            try:
+                async with self._session_factory()() as session:
+                    await session.execute(insert(AuditLog), batch)
+                    await session.commit()
+            except Exception:
+                self.failed_flushes += 1
+                logger.exception(
+                    f"Writing {len(batch)} audit log entries failed "
+                    f"(attempt {attempt}/{self.max_attempts})"
+                )
+                if attempt < self.max_attempts:
+                    await asyncio.sleep(0.5 * attempt)
+                continue
+
+            elapsed = time.perf_counter() - started
+            self.flushes += 1
+            self.written += len(batch)
+            self.flush_seconds_total += elapsed
+            self.flush_seconds_max = max(self.flush_seconds_max, elapsed)
+            return
+
+        self.dropped += len(batch)
+        logger.error(f"Dropped {len(batch)} audit log entries: {batch!r}")
+
+    def metrics(self) -> dict[str, Any]:
+        """Queue depth, throughput and flush latency."""
+        return {
+            "mode": settings.audit_log_mode,
+            "running": self.running,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "queue_capacity": self.max_queue,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "flushes": self.flushes,
+            "failed_flushes": self.failed_flushes,
+            "flush_seconds_avg": (
+                self.flush_seconds_total / self.flushes if self.flushes else 0.0
+            ),
+            "flush_seconds_max": self.flush_seconds_max,
+        }
+
+
+audit_log_writer = AuditLogWriter(
+    batch_size=settings.audit_log_batch_size,
+    flush_interval=settings.audit_log_flush_interval_ms / 1000,
+    max_queue=settings.audit_log_queue_size,
+)
+
+
+async def write_audit_logs(db: AsyncSession, entries: list[dict[str, Any]]) -> None:
+    """Write audit log entries according to the configured mode.
+
+    Args:
+        db: The caller's session (used in transactional mode)
+        entries: Column values of audit log entries (see audit_log_values)
+    """
+    if not entries:
+        return
+    if settings.audit_log_mode == "buffered":
+        await audit_log_writer.put(entries)
+    else:
+        await db.execute(insert(AuditLog), entries)
@@ -0,0 +1,165 @@
+"""Search over audit cases.
+
+Matching combines these strategies:
+
+- Case-insensitive prefix match on the case number (``prf-2024`` finds
+  ``PRF-2024-017``)
+- Full text prefix match on the weighted ``search_vector`` column, so every
+  word of the query may be the start of a word in the case number, project
+  or beneficiary name
+- Case-insensitive substring match (``ILIKE '%term%'``) on the same
+  columns, so parts of a case number (``2024-017``) and infixes of names
+  are found; backed by the trigram indexes when pg_trgm is installed
+- Trigram word similarity (typo tolerance, e.g. ``Stadtwerk Mümchen``),
+  only when the pg_trgm extension is installed
+
+Results are ranked by full text rank (case number hits weigh most) plus
+trigram similarity.
+"""
+
+import re
+
+from sqlalchemy import (
+    ColumnElement,
+    Select,
+    case,
+    func,
+    literal,
+    literal_column,
+    or_,
+    select,
+    text,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.audit_case import AuditCase
+
+
+SEARCH_COLUMNS = (
+    AuditCase.case_number,
+    AuditCase.project_name,
+    AuditCase.beneficiary_name,
+)
+
+_WORD_RE = re.compile(r"\w+")
+_CONFIG = literal_column("'simple'::regconfig")
+
+# None until checked; the extension is not expected to vanish at runtime
+_trigram_available: bool | None = None
+
+
+async def trigram_available(db: AsyncSession) -> bool:
+    """Check (once per process) whether pg_trgm is installed."""
+    global _trigram_available
+    if _trigram_available is None:
+        result = await db.execute(
+            text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        )
+        _trigram_available = result.scalar() is not None
+    return _trigram_available
+
+
+def _prefix_tsquery(term: str) -> ColumnElement | None:
+    """Build a tsquery requiring every word of the term as a prefix."""
+    words = _WORD_RE.findall(term.lower())
+    if not words:
+        return None
+    return func.to_tsquery(_CONFIG, " & ".join(f"{word}:*" for word in words))
+
+
+def _like_escape(term: str) -> str:
+    """Escape LIKE wildcards so that the term matches literally."""
+    pattern = term.replace("\\", "\\\\").replace("%", "\\%")
+    return pattern.replace("_", "\\_")
+
+
+def _case_number_prefix(term: str) -> ColumnElement[bool]:
+    """Match case numbers starting with the term (uses a lower() index)."""
+    pattern = _like_escape(term.lower())
+    return func.lower(AuditCase.case_number).like(f"{pattern}%", escape="\\")
+
+
+def search_filter(term: str, trigram: bool = False) -> ColumnElement[bool]:
+    """Build the WHERE clause matching audit cases for a search term.
+
+    Args:
+        term: Search term
+        trigram: Also match by trigram word similarity (requires pg_trgm)
+
+    Returns:
+        Boolean SQL expression
+    """
+    term = term.strip()
+    clauses = [_case_number_prefix(term)]
+
+    tsquery = _prefix_tsquery(term)
+    if tsquery is not None:
+        clauses.append(AuditCase.search_vector.op("@@")(tsquery))
+
+    pattern = f"%{_like_escape(term)}%"
+    clauses.extend(column.ilike(pattern, escape="\\") for column in SEARCH_COLUMNS)
+
+    if trigram:
+        clauses.extend(literal(term).op("<%")(column) for column in SEARCH_COLUMNS)
+
+    return or_(*clauses)
+
+
+def search_rank(term: str, trigram: bool = False) -> ColumnElement[float]:
+    """Build the relevance score of an audit case for a search term.
+
+    Args:
+        term: Search term
+        trigram: Add trigram word similarity (requires pg_trgm)
+
+    Returns:
+        Numeric SQL expression, higher is more relevant
+    """
+    term = term.strip()
+    rank = case((_case_number_prefix(term), 1.0), else_=0.0)
+
+    tsquery = _prefix_tsquery(term)
+    if tsquery is not None:
+        rank = rank + func.ts_rank(AuditCase.search_vector, tsquery)
+
+    if trigram:
+        rank = rank + func.greatest(
+            *(func.word_similarity(term, column) for column in SEARCH_COLUMNS)
+        )
+
+    return rank
+
+
+async def search_audit_cases(
+    db: AsyncSession,
+    tenant_id: str,
+    term: str,
+    limit: int = 20,
+    query: Select | None = None,
+) -> list[tuple[AuditCase, float]]:
+    """Search the audit cases of a tenant, most relevant first.
+
+    Args:
+        db: Database session
+        tenant_id: Tenant ID
+        term: Search term
+        limit: Maximum number of results
+        query: Optional select of AuditCase with additional filters
+
+    Returns:
+        List of (audit case, score)
+    """
+    trigram = await trigram_available(db)
+    score = search_rank(term, trigram).label("score")
+
+    if query is None:
+        query = select(AuditCase)
+    query = (
+        query.add_columns(score)
+        .where(AuditCase.tenant_id == tenant_id, search_filter(term, trigram))
+        .order_by(score.desc(), AuditCase.created_at.desc(), AuditCase.id.desc())
+        .limit(limit)
+    )
+
+    result = await db.execute(query)
+    return [(audit_case, float(score)) for audit_case, score in result.all()]
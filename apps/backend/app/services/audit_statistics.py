@@ -0,0 +1,194 @@
+"""Audit case statistics.
+
+Statistics are aggregated in a single grouped query instead of loading
+every case of a tenant: GROUPING SETS yields one row per status, result
+and audit type plus a grand total row carrying the exact Decimal sums.
+
+Results are kept as snapshots per (tenant, fiscal year) for a short TTL.
+Case writes drop all snapshots of their tenant in this process; the TTL
+bounds staleness for writes made by other processes.
+"""
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from decimal import Decimal
+
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.audit_case import AuditCase
+from app.schemas.audit_case import AuditCaseStatistics
+
+
+# GROUPING() bitmask of (status, result, audit_type): a set bit means the
+# column is aggregated away in that row
+_BY_STATUS = 0b011
+_BY_RESULT = 0b101
+_BY_TYPE = 0b110
+_TOTAL = 0b111
+
+
+class StatisticsCache:
+    """TTL cache of statistics snapshots keyed by (tenant, fiscal year)."""
+
+    def __init__(
+        self,
+        ttl: float = 60.0,
+        max_entries: int = 1_000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            ttl: Seconds a snapshot is served (0 disables the cache)
+            max_entries: Maximum number of cached snapshots
+            clock: Monotonic clock returning seconds
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[
+            tuple[str, str | None], tuple[AuditCaseStatistics, float]
+        ] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(
+        self, tenant_id: str, fiscal_year_id: str | None
+    ) -> AuditCaseStatistics | None:
+        """Get a fresh snapshot, if any."""
+        key = (str(tenant_id), fiscal_year_id)
+        entry = self._entries.get(key)
+        if entry is None or entry[1] <= self._clock():
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0].model_copy(deep=True)
+
+    def set(
+        self,
+        tenant_id: str,
+        fiscal_year_id: str | None,
+        statistics: AuditCaseStatistics,
+    ) -> None:
+        """Store a snapshot."""
+        if self.ttl <= 0:
+            return
+        key = (str(tenant_id), fiscal_year_id)
+        self._entries[key] = (
+            statistics.model_copy(deep=True),
+            self._clock() + self.ttl,
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, tenant_id: str) -> None:
+        """Drop all snapshots of a tenant.
+
+        A write may move a case between fiscal years and always affects the
+        all-years snapshot, so every snapshot of the tenant is dropped.
+        """
+        tenant_id = str(tenant_id)
+        for key in [key for key in self._entries if key[0] == tenant_id]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        """Drop all snapshots."""
+        self._entries.clear()
+
+
+statistics_cache = StatisticsCache(ttl=settings.statistics_cache_ttl)
+
+
+async def compute_audit_statistics(
+    db: AsyncSession,
+    tenant_id: str,
+    fiscal_year_id: str | None = None,
+) -> AuditCaseStatistics:
+    """Aggregate the audit case statistics of a tenant in one query.
+
+    Args:
+        db: Database session
+        tenant_id: Tenant ID
+        fiscal_year_id: Optional fiscal year filter
+
+    Returns:
+        Statistics with exact Decimal sums
+    """
+    grouping = func.grouping(AuditCase.status, AuditCase.result, AuditCase.audit_type)
+    query = (
+        select(
+            grouping.label("grouping"),
+            AuditCase.status,
+            AuditCase.result,
+            AuditCase.audit_type,
+            func.count().label("count"),
+            func.coalesce(func.sum(AuditCase.audited_amount), 0).label("audited"),
+            func.coalesce(func.sum(AuditCase.irregular_amount), 0).label("irregular"),
+        )
+        .where(AuditCase.tenant_id == tenant_id)
+        .group_by(
+            func.grouping_sets(
+                tuple_(AuditCase.status),
+                tuple_(AuditCase.result),
+                tuple_(AuditCase.audit_type),
+                tuple_(),
+            )
+        )
+    )
+    if fiscal_year_id:
+        query = query.where(AuditCase.fiscal_year_id == fiscal_year_id)
+
+    statistics = AuditCaseStatistics()
+    for row in await db.execute(query):
+        if row.grouping == _BY_STATUS:
+            statistics.by_status[row.status] = row.count
+        elif row.grouping == _BY_RESULT:
+            if row.result:
+                statistics.by_result[row.result] = row.count
+        elif row.grouping == _BY_TYPE:
+            statistics.by_type[row.audit_type] = row.count
+        elif row.grouping == _TOTAL:
+            statistics.total = row.count
+            statistics.total_audited_amount = Decimal(row.audited)
+            statistics.total_irregular_amount = Decimal(row.irregular)
+
+    if statistics.total_audited_amount > 0:
+        error_rate = (
+            statistics.total_irregular_amount / statistics.total_audited_amount * 100
+        )
+        statistics.error_rate = float(round(error_rate, 2))
+
+    return statistics
+
+
+async def load_audit_statistics(
+    db: AsyncSession,
+    tenant_id: str,
+    fiscal_year_id: str | None = None,
+) -> AuditCaseStatistics:
+    """Get audit case statistics, served from the snapshot cache if fresh.
+
+    Args:
+        db: Database session
+        tenant_id: Tenant ID
+        fiscal_year_id: Optional fiscal year filter
+
+    Returns:
+        Audit case statistics
+    """
+    cached = statistics_cache.get(tenant_id, fiscal_year_id)
+    if cached is not None:
+        return cached
+
+    statistics = await compute_audit_statistics(db, tenant_id, fiscal_year_id)
+    statistics_cache.set(tenant_id, fiscal_year_id, statistics)
+    return statistics
@@ -2,13 +2,14 @@
 
 from datetime import datetime, timezone
 
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.principal_cache import principal_cache
 from app.core.security import (
     create_access_token,
-    get_password_hash,
-    verify_password,
+    hash_password,
+    verify_and_update_password,
 )
 from app.models.user import User
 from app.schemas.auth import UserCreate, UserResponse
@@ -34,7 +35,7 @@ class AuthService:
         """Create a new user."""
         user = User(
             email=data.email,
-            hashed_password=get_password_hash(data.password),
+            hashed_password=await hash_password(data.password),
             first_name=data.first_name,
             last_name=data.last_name,
             role=data.role,
@@ -50,21 +51,44 @@ class AuthService:
         email: str,
         password: str,
     ) -> User | None:
-        """Authenticate user with email and password."""
+        """Authenticate user with email and password.
+
+        Hashes with outdated parameters are transparently upgraded.
+        """
         user = await self.get_user_by_email(email)
         if not user:
             return None
-        if not verify_password(password, user.hashed_password):
+        valid, new_hash = await verify_and_update_password(
+            password, user.hashed_password
+        )
+        if not valid:
             return None
         if not user.is_active:
             return None
 
+        if new_hash:
+            user.hashed_password = new_hash
+
         # Update last login
         user.last_login_at = datetime.now(timezone.utc)
         await self.db.flush()
 
         return user
 
+    async def revoke_tokens(self, user_id: str) -> None:
+        """Revoke all issued tokens of a user.
+
+        Call after deactivating a user or changing their role, and on
+        logout.
+        """
+        await self.db.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(token_version=User.token_version + 1)
+        )
+        await self.db.commit()
+        principal_cache.invalidate("user", user_id)
+
     def create_token_for_user(self, user: User) -> str:
         """Create JWT token for user."""
         return create_access_token(
@@ -72,6 +96,7 @@ class AuthService:
                 "sub": user.id,
                 "tenant_id": user.tenant_id,
                 "role": user.role,
+                "ver": user.token_version,
             }
         )
 
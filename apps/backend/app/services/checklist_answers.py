@@ -0,0 +1,209 @@
+"""Normalized checklist answers.
+
+The answers stored in ``AuditCaseChecklist.responses`` are mirrored into
+the ``checklist_answers`` table, one row per checklist, question and value
+with typed value columns. The rows of a question are replaced whenever its
+answer changes, in the same transaction as the JSONB update. Responses
+whose key is longer than QUESTION_ID_LENGTH (no template question) are
+kept in the JSONB only, like in the backfill of migration 014. Answer
+distributions across cases, authorities and fiscal years are then grouped
+in SQL on an index instead of parsing every checklist in Python.
+"""
+
+import json
+import re
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Literal
+
+from sqlalchemy import delete, func, insert, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.audit_case import (
+    AuditCase,
+    AuditCaseChecklist,
+    ChecklistAnswer,
+    FiscalYear,
+)
+from app.models.tenant import Tenant
+from app.schemas.checklist import AnswerDistributionItem
+
+AnswerGrouping = Literal["none", "fiscal_year", "tenant"]
+
+QUESTION_ID_LENGTH = 100
+VALUE_TEXT_LENGTH = 500
+
+# Strings that are stored as numbers as well (same pattern as migration 014)
+_NUMBER_RE = re.compile(r"^-?[0-9]+(\.[0-9]+)?$")
+
+
+def _typed_value(value: Any) -> dict[str, Any]:
+    """Map one answer value to the typed value columns."""
+    if isinstance(value, bool):
+        return {"value_text": "true" if value else "false", "value_bool": value}
+    if isinstance(value, (int, float, Decimal)):
+        return {"value_text": str(value), "value_number": Decimal(str(value))}
+    if isinstance(value, str):
+        typed: dict[str, Any] = {"value_text": value[:VALUE_TEXT_LENGTH]}
+        if _NUMBER_RE.match(value):
+            typed["value_number"] = Decimal(value)
+        return typed
+    text = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+    return {"value_text": text[:VALUE_TEXT_LENGTH]}
+
+
+def answer_rows(value: Any) -> list[dict[str, Any]]:
+    """Split an answer into typed rows (one per selected option for lists).
+
+    Args:
+        value: Answer value, or a response entry with the value under "value"
+
+    Returns:
+        Typed value columns with their position, empty if unanswered
+    """
+    if isinstance(value, dict):
+        value = value.get("value")
+    if value is None:
+        return []
+    values = value if isinstance(value, list) else [value]
+    return [
+        {"position": position, **_typed_value(item)}
+        for position, item in enumerate(values)
+        if item is not None
+    ]
+
+
+async def sync_checklist_answers(
+    db: AsyncSession,
+    checklist: AuditCaseChecklist,
+    tenant_id: str,
+    answers: dict[str, Any],
+    answered_by: str | None = None,
+    answered_at: datetime | None = None,
+) -> None:
+    """Replace the normalized answer rows of the given questions.
+
+    Answers under keys longer than QUESTION_ID_LENGTH are skipped.
+
+    Args:
+        db: Database session
+        checklist: Checklist the answers belong to
+        tenant_id: Tenant of the checklist's audit case
+        answers: Question ID to answer value
+        answered_by: Answering user ID
+        answered_at: Time of the answer
+    """
+    answers = {
+        question_id: value
+        for question_id, value in answers.items()
+        if len(question_id) <= QUESTION_ID_LENGTH
+    }
+    if not answers:
+        return
+
+    await db.execute(
+        delete(ChecklistAnswer).where(
+            ChecklistAnswer.checklist_id == checklist.id,
+            ChecklistAnswer.question_id.in_(list(answers)),
+        )
+    )
+    rows = [
+        {
+            "checklist_id": checklist.id,
+            "question_id": question_id,
+            "tenant_id": tenant_id,
+            "audit_case_id": checklist.audit_case_id,
+            "checklist_type": checklist.checklist_type,
+            "template_id": checklist.checklist_template_id,
+            "value_text": None,
+            "value_number": None,
+            "value_bool": None,
+            "answered_at": answered_at,
+            "answered_by": answered_by,
+            **row,
+        }
+        for question_id, value in answers.items()
+        for row in answer_rows(value)
+    ]
+    if rows:
+        await db.execute(insert(ChecklistAnswer), rows)
+
+
+async def answer_distribution(
+    db: AsyncSession,
+    tenant_id: str,
+    question_id: str,
+    template_id: str | None = None,
+    checklist_type: str | None = None,
+    fiscal_year_id: str | None = None,
+    authority_id: str | None = None,
+    group_by: AnswerGrouping = "none",
+) -> list[AnswerDistributionItem]:
+    """Count the answers to a question by value.
+
+    Covers the cases of the tenant and of its authorities (child tenants).
+
+    Args:
+        db: Database session
+        tenant_id: Tenant of the requesting user
+        question_id: Question ID
+        template_id: Only checklists from this template
+        checklist_type: Only checklists of this type
+        fiscal_year_id: Only cases of this fiscal year
+        authority_id: Only cases of this tenant (the own or a child tenant)
+        group_by: Additionally group by fiscal year or tenant
+
+    Returns:
+        Answer counts per value (and group), most frequent first
+    """
+    visible_tenants = (
+        select(Tenant.id)
+        .where(or_(Tenant.id == tenant_id, Tenant.parent_id == tenant_id))
+        .correlate(None)
+    )
+    count = func.count().label("count")
+    cases = func.count(ChecklistAnswer.audit_case_id.distinct()).label("cases")
+
+    columns = [ChecklistAnswer.value_text]
+    if group_by == "fiscal_year":
+        columns += [AuditCase.fiscal_year_id, FiscalYear.name]
+    elif group_by == "tenant":
+        columns += [ChecklistAnswer.tenant_id, Tenant.name]
+
+    query = select(*columns, count, cases).where(
+        ChecklistAnswer.tenant_id.in_(visible_tenants),
+        ChecklistAnswer.question_id == question_id,
+    )
+    if template_id:
+        query = query.where(ChecklistAnswer.template_id == template_id)
+    if checklist_type:
+        query = query.where(ChecklistAnswer.checklist_type == checklist_type)
+    if authority_id:
+        query = query.where(ChecklistAnswer.tenant_id == authority_id)
+    if fiscal_year_id or group_by == "fiscal_year":
+        query = query.join(AuditCase, AuditCase.id == ChecklistAnswer.audit_case_id)
+    if fiscal_year_id:
+        query = query.where(AuditCase.fiscal_year_id == fiscal_year_id)
+    if group_by == "fiscal_year":
+        query = query.outerjoin(FiscalYear, FiscalYear.id == AuditCase.fiscal_year_id)
+    elif group_by == "tenant":
+        query = query.join(Tenant, Tenant.id == ChecklistAnswer.tenant_id)
+
+    query = query.group_by(*columns).order_by(
+        count.desc(), *(column.asc() for column in columns)
+    )
+
+    result = await db.execute(query)
+    items = []
+    for value, *group, answer_count, case_count in result.all():
+        group_id, group_name = group or (None, None)
+        items.append(
+            AnswerDistributionItem(
+                value=value,
+                group_id=group_id,
+                group_name=group_name,
+                count=answer_count,
+                cases=case_count,
+            )
+        )
+    return items
@@ -0,0 +1,174 @@
+"""Atomic updates of checklist responses.
+
+Answers and notes are merged into the ``responses`` JSONB inside a single
+UPDATE statement (``responses || patch``, merged per question), and the
+progress counters are advanced in the same statement from the old row. A
+request therefore only sends and processes the changed questions, and two
+auditors editing different questions of the same checklist never overwrite
+each other. Clients that need to detect any concurrent change pass the
+version they last read (optimistic concurrency). The normalized answer rows
+of the changed questions are replaced in the same transaction.
+"""
+
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import Text, case, cast, column, func, literal, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.audit_case import AuditCaseChecklist
+from app.models.user import User
+from app.services.checklist_answers import sync_checklist_answers
+from app.services.checklist_templates import CompiledTemplate
+
+
+class ChecklistVersionConflict(Exception):
+    """Raised when a checklist was changed since the given version."""
+
+    def __init__(self, current_version: int):
+        self.current_version = current_version
+        super().__init__(
+            "Die Checkliste wurde zwischenzeitlich geändert "
+            f"(Version {current_version})"
+        )
+
+
+def _merge_responses(patch: dict[str, dict[str, Any]]):
+    """Merge a patch into the responses, per question (old row values)."""
+    entries = (
+        func.jsonb_each(literal(patch, JSONB))
+        .table_valued(column("key", Text), column("value", JSONB))
+        .render_derived()
+    )
+    current = func.coalesce(
+        AuditCaseChecklist.responses[entries.c.key], literal({}, JSONB)
+    )
+    merged = select(
+        func.jsonb_object_agg(
+            entries.c.key, current.op("||", return_type=JSONB)(entries.c.value)
+        )
+    ).scalar_subquery()
+    return AuditCaseChecklist.responses.op("||", return_type=JSONB)(merged)
+
+
+def _unanswered_count(question_ids: list[str]):
+    """Count the given questions that have no answer yet (old row values)."""
+    keys = (
+        func.unnest(cast(question_ids, ARRAY(Text)))
+        .table_valued(column("key", Text))
+        .render_derived()
+    )
+    answered = AuditCaseChecklist.responses[keys.c.key].has_key("value")
+    return (
+        select(func.count())
+        .select_from(keys)
+        .where(~func.coalesce(answered, False))
+        .scalar_subquery()
+    )
+
+
+async def update_checklist_responses(
+    db: AsyncSession,
+    checklist_id: str,
+    case_id: str,
+    user: User,
+    compiled: CompiledTemplate | None,
+    answers: dict[str, Any] | None = None,
+    notes: dict[str, str] | None = None,
+    status: str | None = None,
+    expected_version: int | None = None,
+) -> AuditCaseChecklist | None:
+    """Apply answers, notes and a status change to a checklist atomically.
+
+    Args:
+        db: Database session
+        checklist_id: Checklist ID
+        case_id: Audit case ID of the checklist
+        user: Answering user (of the checklist's tenant)
+        compiled: Compiled template of the checklist (None if the template
+            was deleted; then every answered key counts as a question)
+        answers: Question ID to answer value
+        notes: Question ID to note
+        status: New checklist status
+        expected_version: Only update if the checklist still has this version
+
+    Returns:
+        The updated checklist, or None if it does not exist
+
+    Raises:
+        ChecklistVersionConflict: If expected_version is outdated
+    """
+    answers = answers or {}
+    now = datetime.now(timezone.utc)
+
+    patch: dict[str, dict[str, Any]] = {
+        question_id: {
+            "value": value,
+            "answered_at": now.isoformat(),
+            "answered_by": user.id,
+        }
+        for question_id, value in answers.items()
+    }
+    for question_id, note in (notes or {}).items():
+        patch.setdefault(question_id, {})["note"] = note
+
+    values: dict[str, Any] = {"version": AuditCaseChecklist.version + 1}
+    if patch:
+        values["responses"] = _merge_responses(patch)
+
+    if answers:
+        counted = [q for q in answers if compiled is None or q in compiled.questions]
+        answered = AuditCaseChecklist.answered_questions + _unanswered_count(counted)
+        total = AuditCaseChecklist.total_questions
+        if compiled is not None:
+            total = literal(compiled.total_questions)
+            answered = func.least(answered, total)
+            values["total_questions"] = total
+        values["answered_questions"] = answered
+        values["progress"] = case(
+            (total > 0, func.least(100, answered * 100 // total)),
+            else_=AuditCaseChecklist.progress,
+        )
+        values["status"] = case(
+            (
+                AuditCaseChecklist.status == "not_started",
+                literal("in_progress", AuditCaseChecklist.status.type),
+            ),
+            else_=AuditCaseChecklist.status,
+        )
+
+    if status:
+        values["status"] = status
+        if status == "completed":
+            values["completed_by"] = user.id
+            values["completed_at"] = now
+            values["progress"] = 100
+
+    statement = update(AuditCaseChecklist).where(
+        AuditCaseChecklist.id == checklist_id,
+        AuditCaseChecklist.audit_case_id == case_id,
+    )
+    if expected_version is not None:
+        statement = statement.where(AuditCaseChecklist.version == expected_version)
+    statement = (
+        statement.values(**values)
+        .returning(AuditCaseChecklist)
+        .execution_options(synchronize_session=False, populate_existing=True)
+    )
+
+    checklist = (await db.execute(statement)).scalar_one_or_none()
+    if checklist is not None:
+        await sync_checklist_answers(
+            db, checklist, user.tenant_id, answers, answered_by=user.id, answered_at=now
+        )
+    elif expected_version is not None:
+        current_version = await db.scalar(
+            select(AuditCaseChecklist.version).where(
+                AuditCaseChecklist.id == checklist_id,
+                AuditCaseChecklist.audit_case_id == case_id,
+            )
+        )
+        if current_version is not None:
+            raise ChecklistVersionConflict(current_version)
+    return checklist
@@ -0,0 +1,172 @@
+"""Compiled checklist templates.
+
+The structure JSON of a template is compiled once per (template id,
+version) into a flat question index, the set of required questions, the
+section order and the serialized structure with its ETag. Compiled
+templates are kept in an LRU cache, so checklist requests neither walk the
+structure nor load it from the database again.
+
+Templates are immutable per version: changing the structure of a template
+bumps its version (see update_template), which gives it a new cache key.
+"""
+
+import hashlib
+import json
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.audit_case import ChecklistTemplate
+
+
+@dataclass(frozen=True)
+class CompiledQuestion:
+    """An answerable question of a template."""
+
+    id: str
+    section_id: str | None
+    type: str | None
+    required: bool
+
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    """Precomputed view of a template version."""
+
+    template_id: str
+    version: int
+    questions: dict[str, CompiledQuestion]  # in section and question order
+    required: frozenset[str]
+    section_order: tuple[str, ...]
+    structure_json: bytes
+    etag: str
+
+    @property
+    def total_questions(self) -> int:
+        return len(self.questions)
+
+
+def _order(item: dict[str, Any]) -> int:
+    order = item.get("order")
+    return order if isinstance(order, int) else 0
+
+
+def compile_template(
+    template_id: str, version: int, structure: dict[str, Any] | None
+) -> CompiledTemplate:
+    """Compile the structure of a template version.
+
+    Args:
+        template_id: Template ID
+        version: Template version
+        structure: Template structure with sections and questions
+
+    Returns:
+        Compiled template
+    """
+    structure = structure or {}
+    sections = sorted(structure.get("sections", []), key=_order)
+
+    questions: dict[str, CompiledQuestion] = {}
+    for section in sections:
+        for question in section.get("questions", []):
+            # Section headings take no answer
+            if question.get("type") == "section" or "id" not in question:
+                continue
+            questions[str(question["id"])] = CompiledQuestion(
+                id=str(question["id"]),
+                section_id=section.get("id"),
+                type=question.get("type"),
+                required=bool(question.get("required")),
+            )
+
+    structure_json = json.dumps(
+        structure, ensure_ascii=False, separators=(",", ":")
+    ).encode()
+
+    return CompiledTemplate(
+        template_id=template_id,
+        version=version,
+        questions=questions,
+        required=frozenset(q.id for q in questions.values() if q.required),
+        section_order=tuple(s.get("id") for s in sections),
+        structure_json=structure_json,
+        etag=f'"{hashlib.sha256(structure_json).hexdigest()[:32]}"',
+    )
+
+
+class TemplateCache:
+    """LRU cache of compiled templates keyed by (template id, version)."""
+
+    def __init__(self, max_entries: int = 256) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of compiled templates (0 disables it)
+        """
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, int], CompiledTemplate] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, template_id: str, version: int) -> CompiledTemplate | None:
+        """Get a compiled template version."""
+        compiled = self._entries.get((template_id, version))
+        if compiled is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end((template_id, version))
+        self.hits += 1
+        return compiled
+
+    def set(self, compiled: CompiledTemplate) -> None:
+        """Cache a compiled template version."""
+        if self.max_entries <= 0:
+            return
+        key = (compiled.template_id, compiled.version)
+        self._entries[key] = compiled
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all compiled templates."""
+        self._entries.clear()
+
+
+template_cache = TemplateCache(max_entries=settings.template_cache_size)
+
+
+async def get_compiled_template(
+    db: AsyncSession, template_id: str, version: int
+) -> CompiledTemplate:
+    """Get a compiled template, loading its structure only on a cache miss.
+
+    Args:
+        db: Database session
+        template_id: Template ID
+        version: Template version as last read by the caller
+
+    Returns:
+        Compiled template (of the current version if the template changed
+        in the meantime)
+    """
+    compiled = template_cache.get(template_id, version)
+    if compiled is None:
+        row = (
+            await db.execute(
+                select(ChecklistTemplate.version, ChecklistTemplate.structure).where(
+                    ChecklistTemplate.id == template_id
+                )
+            )
+        ).one()
+        compiled = compile_template(template_id, row.version, row.structure)
+        template_cache.set(compiled)
+    return compiled
@@ -0,0 +1,57 @@
+"""Allocation of finding numbers.
+
+Finding numbers are consecutive per audit case. They are reserved from a
+counter row per case (``finding_number_counters``) with a single
+``INSERT ... ON CONFLICT DO UPDATE ... RETURNING``: concurrent allocations
+for the same case queue on the counter row instead of reading the same
+``max(finding_number)``, and a range of numbers for many findings is
+reserved by the same statement. The unique constraint on (audit_case_id,
+finding_number) guards the result.
+"""
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.audit_case import AuditCaseFinding, FindingNumberCounter
+
+
+async def reserve_finding_numbers(
+    db: AsyncSession, case_id: str, count: int = 1
+) -> range:
+    """Reserve consecutive finding numbers for an audit case.
+
+    The counter row stays locked until the caller's transaction ends, so
+    the findings should be inserted and committed right away. If findings
+    were inserted without a number reservation, the counter continues
+    after the highest existing number (an index lookup on the unique
+    constraint).
+
+    Args:
+        db: Database session
+        case_id: Audit case ID
+        count: Number of finding numbers to reserve
+
+    Returns:
+        The reserved finding numbers
+    """
+    highest = (
+        select(func.coalesce(func.max(AuditCaseFinding.finding_number), 0))
+        .where(AuditCaseFinding.audit_case_id == case_id)
+        .scalar_subquery()
+    )
+    statement = insert(FindingNumberCounter).values(
+        audit_case_id=case_id, last_number=highest + count
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=[FindingNumberCounter.audit_case_id],
+        set_={
+            "last_number": func.greatest(
+                FindingNumberCounter.last_number + count,
+                statement.excluded.last_number,
+            )
+        },
+    ).returning(FindingNumberCounter.last_number)
+
+    last_number = (await db.execute(statement)).scalar_one()
+    return range(last_number - count + 1, last_number + 1)
@@ -0,0 +1,169 @@
+"""Findings summaries.
+
+The summaries of any number of audit cases are aggregated in one grouped
+query: GROUPING SETS yields one row per case and status, per case and
+finding type, and a total row per case carrying the exact Decimal sum of
+the financial impact.
+
+Summaries are cached per case for a short TTL. Finding writes drop the
+summary of their case in this process; the TTL bounds staleness for
+writes made by other processes.
+"""
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from decimal import Decimal
+
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.audit_case import AuditCaseFinding
+from app.schemas.audit_case import FindingsSummary
+
+
+# GROUPING() bitmask of (status, finding_type): a set bit means the column
+# is aggregated away in that row
+_BY_STATUS = 0b01
+_BY_TYPE = 0b10
+_TOTAL = 0b11
+
+
+class FindingsSummaryCache:
+    """TTL cache of findings summaries keyed by audit case."""
+
+    def __init__(
+        self,
+        ttl: float = 60.0,
+        max_entries: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            ttl: Seconds a summary is served (0 disables the cache)
+            max_entries: Maximum number of cached summaries
+            clock: Monotonic clock returning seconds
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[FindingsSummary, float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, case_id: str) -> FindingsSummary | None:
+        """Get a fresh summary, if any."""
+        case_id = str(case_id)
+        entry = self._entries.get(case_id)
+        if entry is None or entry[1] <= self._clock():
+            self._entries.pop(case_id, None)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(case_id)
+        self.hits += 1
+        return entry[0].model_copy(deep=True)
+
+    def set(self, case_id: str, summary: FindingsSummary) -> None:
+        """Store a summary."""
+        if self.ttl <= 0:
+            return
+        case_id = str(case_id)
+        self._entries[case_id] = (
+            summary.model_copy(deep=True),
+            self._clock() + self.ttl,
+        )
+        self._entries.move_to_end(case_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, case_id: str) -> None:
+        """Drop the summary of a case."""
+        self._entries.pop(str(case_id), None)
+
+    def clear(self) -> None:
+        """Drop all summaries."""
+        self._entries.clear()
+
+
+findings_summary_cache = FindingsSummaryCache(ttl=settings.findings_summary_cache_ttl)
+
+
+async def compute_findings_summaries(
+    db: AsyncSession, case_ids: Iterable[str]
+) -> dict[str, FindingsSummary]:
+    """Aggregate the findings summaries of audit cases in one query.
+
+    Args:
+        db: Database session
+        case_ids: Audit case IDs (access must already be checked)
+
+    Returns:
+        Summary per case ID, with empty summaries for cases without findings
+    """
+    summaries = {str(case_id): FindingsSummary() for case_id in case_ids}
+    if not summaries:
+        return summaries
+
+    case_id = AuditCaseFinding.audit_case_id
+    grouping = func.grouping(AuditCaseFinding.status, AuditCaseFinding.finding_type)
+    query = (
+        select(
+            grouping.label("grouping"),
+            case_id.label("case_id"),
+            AuditCaseFinding.status,
+            AuditCaseFinding.finding_type,
+            func.count().label("count"),
+            func.coalesce(func.sum(AuditCaseFinding.financial_impact), 0).label(
+                "impact"
+            ),
+        )
+        .where(case_id.in_(list(summaries)))
+        .group_by(
+            func.grouping_sets(
+                tuple_(case_id, AuditCaseFinding.status),
+                tuple_(case_id, AuditCaseFinding.finding_type),
+                tuple_(case_id),
+            )
+        )
+    )
+
+    for row in await db.execute(query):
+        summary = summaries[str(row.case_id)]
+        if row.grouping == _BY_STATUS:
+            summary.by_status[row.status] = row.count
+        elif row.grouping == _BY_TYPE:
+            summary.by_type[row.finding_type] = row.count
+        elif row.grouping == _TOTAL:
+            summary.total = row.count
+            summary.total_financial_impact = Decimal(row.impact)
+
+    return summaries
+
+
+async def load_findings_summaries(
+    db: AsyncSession, case_ids: Iterable[str]
+) -> dict[str, FindingsSummary]:
+    """Get findings summaries, aggregating only the uncached cases.
+
+    Args:
+        db: Database session
+        case_ids: Audit case IDs (access must already be checked)
+
+    Returns:
+        Summary per case ID, in the given order
+    """
+    summaries: dict[str, FindingsSummary | None] = {
+        str(case_id): findings_summary_cache.get(case_id) for case_id in case_ids
+    }
+    missing = [case_id for case_id, summary in summaries.items() if summary is None]
+    if missing:
+        computed = await compute_findings_summaries(db, missing)
+        for case_id, summary in computed.items():
+            findings_summary_cache.set(case_id, summary)
+        summaries.update(computed)
+    return summaries
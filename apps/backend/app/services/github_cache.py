@@ -0,0 +1,248 @@
+"""Caches for GitHub API responses.
+
+GitHub answers conditional requests (If-None-Match / If-Modified-Since)
+with 304 Not Modified, which does not count against the rate limit. The
+response cache keeps the validators and payload of GET responses so that
+repeated reads only cost a revalidation round-trip.
+
+File contents are cached separately by blob SHA. Blobs are content
+addressed and therefore immutable, so these entries never need to be
+invalidated; they are only evicted to stay within the size limits.
+"""
+
+import logging
+import os
+import re
+import tempfile
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+
+logger = logging.getLogger(__name__)
+
+_SHA_RE = re.compile(r"^[0-9a-f]{40,64}$")
+
+
+@dataclass
+class CachedResponse:
+    """A cached GET response with its validators."""
+
+    data: Any
+    etag: str | None = None
+    last_modified: str | None = None
+    headers: dict[str, str] = field(default_factory=dict)
+
+
+class ResponseCache:
+    """LRU cache of GET responses keyed by URL and query parameters."""
+
+    def __init__(self, max_entries: int = 256) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached responses
+        """
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def make_key(url: str, params: dict[str, Any] | None = None) -> str:
+        """Build a cache key from URL and query parameters."""
+        if not params:
+            return url
+        query = "&".join(f"{k}={params[k]}" for k in sorted(params))
+        return f"{url}?{query}"
+
+    def get(self, key: str) -> CachedResponse | None:
+        """Get a cached response and mark it as recently used."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def conditional_headers(self, key: str) -> dict[str, str]:
+        """Get request headers for revalidating a cached response."""
+        entry = self.get(key)
+        if entry is None:
+            return {}
+        headers = {}
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def store(
+        self,
+        key: str,
+        data: Any,
+        etag: str | None,
+        last_modified: str | None,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        """Store a response if it carries a validator."""
+        if not etag and not last_modified:
+            return
+        self._entries[key] = CachedResponse(
+            data=data,
+            etag=etag,
+            last_modified=last_modified,
+            headers=headers or {},
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        self._entries.clear()
+
+
+class BlobCache:
+    """Decoded file contents keyed by git blob SHA.
+
+    A bounded in-memory LRU tier sits in front of an optional bounded
+    on-disk tier, so that contents survive process restarts and are shared
+    between workers using the same directory.
+    """
+
+    def __init__(
+        self,
+        max_memory_bytes: int = 32 * 1024 * 1024,
+        disk_dir: str | Path | None = None,
+        max_disk_bytes: int = 256 * 1024 * 1024,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_memory_bytes: Size limit of the in-memory tier
+            disk_dir: Directory of the on-disk tier (None disables it)
+            max_disk_bytes: Size limit of the on-disk tier
+        """
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self._memory: OrderedDict[str, str] = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_bytes = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if self.disk_dir is not None:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+            self._disk_bytes = sum(f.stat().st_size for f in self._disk_files())
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    @property
+    def disk_bytes(self) -> int:
+        """Current size of the on-disk tier."""
+        return self._disk_bytes
+
+    def _disk_path(self, sha: str) -> Path | None:
+        if self.disk_dir is None or not _SHA_RE.match(sha):
+            return None
+        return self.disk_dir / sha[:2] / sha
+
+    def _disk_files(self) -> list[Path]:
+        if self.disk_dir is None:
+            return []
+        return [f for f in self.disk_dir.glob("??/*") if _SHA_RE.match(f.name)]
+
+    def get(self, sha: str) -> str | None:
+        """Get the content of a blob, promoting disk hits to memory."""
+        content = self._memory.get(sha)
+        if content is not None:
+            self._memory.move_to_end(sha)
+            self.memory_hits += 1
+            return content
+
+        path = self._disk_path(sha)
+        if path is not None:
+            try:
+                content = path.read_text(encoding="utf-8")
+                os.utime(path)  # Keep recently used files on eviction
+            except (OSError, UnicodeDecodeError):
+                content = None
+            if content is not None:
+                self.disk_hits += 1
+                self._store_memory(sha, content)
+                return content
+
+        self.misses += 1
+        return None
+
+    def store(self, sha: str, content: str) -> None:
+        """Store the content of a blob in both tiers."""
+        self._store_memory(sha, content)
+        path = self._disk_path(sha)
+        if path is not None and not path.exists():
+            self._store_disk(path, content)
+
+    def _store_memory(self, sha: str, content: str) -> None:
+        size = len(content)
+        if size > self.max_memory_bytes:
+            return
+        if sha in self._memory:
+            self._memory.move_to_end(sha)
+            return
+        self._memory[sha] = content
+        self._memory_bytes += size
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    def _store_disk(self, path: Path, content: str) -> None:
+        data = content.encode("utf-8")
+        if len(data) > self.max_disk_bytes:
+            return
+        try:
+            path.parent.mkdir(exist_ok=True)
+            # Write atomically so concurrent readers never see partial files
+            fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f"Could not write blob cache file {path}: {e}")
+            return
+        self._disk_bytes += len(data)
+        if self._disk_bytes > self.max_disk_bytes:
+            self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        """Delete least recently used files down to 90% of the limit."""
+        target = int(self.max_disk_bytes * 0.9)
+        files = []
+        for f in self._disk_files():
+            try:
+                stat = f.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, f))
+        files.sort()
+
+        total = sum(size for _, size, _ in files)
+        for _, size, f in files:
+            if total <= target:
+                break
+            try:
+                f.unlink()
+            except OSError:
+                continue
+            total -= size
+        self._disk_bytes = total
+
+    def clear(self) -> None:
+        """Remove all cached contents from memory (the disk tier is kept)."""
+        self._memory.clear()
+        self._memory_bytes = 0
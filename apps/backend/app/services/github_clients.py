@@ -0,0 +1,250 @@
+"""Registry of long-lived GitHub API clients.
+
+Creating a GitHubService per call means a fresh TLS handshake (and an
+empty response cache) for every staging run or validation. The registry
+keeps one service per (integration, token fingerprint), all sharing one
+HTTP connection pool per API base, one rate limit scheduler per token and
+one file content cache.
+Services that have not been used for ``idle_timeout`` seconds are evicted;
+the pools are closed from the application lifespan on shutdown.
+"""
+
+import hashlib
+import importlib.util
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+import httpx
+
+from app.core.config import settings
+from app.models.module_converter import GitHubIntegration
+from app.services.github_cache import BlobCache
+from app.services.github_rate_limit import RateLimitScheduler
+from app.services.github_service import GitHubService
+
+
+logger = logging.getLogger(__name__)
+
+
+def token_fingerprint(access_token: str) -> str:
+    """Fingerprint a token so it can be used as a key without storing it."""
+    return hashlib.sha256(access_token.encode()).hexdigest()[:16]
+
+
+def _http2_available() -> bool:
+    """HTTP/2 requires the optional h2 package (httpx[http2])."""
+    return importlib.util.find_spec("h2") is not None
+
+
+@dataclass
+class _Entry:
+    service: GitHubService
+    last_used: float
+    uses: int = field(default=0)
+
+
+class GitHubClientRegistry:
+    """Pool of GitHubService instances keyed by integration and token."""
+
+    def __init__(
+        self,
+        idle_timeout: float = 300.0,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 60.0,
+        timeout: float = 30.0,
+        http2: bool = True,
+        content_cache: BlobCache | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the registry.
+
+        Args:
+            idle_timeout: Seconds after which an unused service is evicted
+            max_connections: Connection limit per API base
+            max_keepalive_connections: Idle connections kept per API base
+            keepalive_expiry: Seconds an idle connection is kept open
+            timeout: Request timeout in seconds
+            http2: Use HTTP/2 if the h2 package is installed
+            content_cache: File content cache shared by all services
+            clock: Monotonic clock returning seconds
+        """
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self.http2 = http2 and _http2_available()
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.content_cache = content_cache if content_cache is not None else BlobCache()
+        self._clock = clock
+        self._pools: dict[str, httpx.AsyncClient] = {}
+        self._schedulers: dict[str, RateLimitScheduler] = {}
+        self._entries: dict[tuple[str, str, str], _Entry] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _pool(self, api_base: str) -> httpx.AsyncClient:
+        """Get the shared HTTP client for an API base."""
+        client = self._pools.get(api_base)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=self._limits,
+                http2=self.http2,
+            )
+            self._pools[api_base] = client
+        return client
+
+    def get_for_token(
+        self,
+        access_token: str,
+        api_base: str | None = None,
+        owner_key: str = "",
+    ) -> GitHubService:
+        """Get the pooled service for a token.
+
+        Args:
+            access_token: GitHub access token
+            api_base: Optional custom API base (for GitHub Enterprise)
+            owner_key: Key of the owning integration
+
+        Returns:
+            Shared GitHubService (do not close it)
+        """
+        self.evict_idle()
+
+        api_base = api_base or GitHubService.API_BASE
+        fingerprint = token_fingerprint(access_token)
+        key = (owner_key, fingerprint, api_base)
+        now = self._clock()
+
+        entry = self._entries.get(key)
+        if entry is None:
+            # Rate limits are per token, so integrations sharing a token
+            # also share a scheduler
+            scheduler = self._schedulers.setdefault(fingerprint, RateLimitScheduler())
+            service = GitHubService(
+                access_token=access_token,
+                api_base=api_base,
+                timeout=self.timeout,
+                scheduler=scheduler,
+                client=self._pool(api_base),
+                content_cache=self.content_cache,
+            )
+            entry = _Entry(service=service, last_used=now)
+            self._entries[key] = entry
+            logger.info(f"Created pooled GitHub client for {owner_key or 'token'}")
+
+        entry.last_used = now
+        entry.uses += 1
+        return entry.service
+
+    def get(self, integration: GitHubIntegration) -> GitHubService:
+        """Get the pooled service for a GitHub integration.
+
+        Args:
+            integration: GitHub integration configuration
+
+        Returns:
+            Shared GitHubService (do not close it)
+        """
+        # TODO: Implement proper decryption
+        access_token = integration.access_token_encrypted or ""
+
+        # Check for GitHub Enterprise
+        api_base = integration.config.get("api_base") if integration.config else None
+
+        return self.get_for_token(
+            access_token, api_base=api_base, owner_key=str(integration.id)
+        )
+
+    def invalidate(self, integration_id: Any) -> int:
+        """Drop all services of an integration (e.g. after a token change).
+
+        Returns:
+            Number of services removed
+        """
+        owner_key = str(integration_id)
+        stale = [key for key in self._entries if key[0] == owner_key]
+        for key in stale:
+            del self._entries[key]
+        self._prune_schedulers()
+        return len(stale)
+
+    def evict_idle(self) -> int:
+        """Evict services unused for longer than the idle timeout.
+
+        Services do not own connections, so eviction never interrupts
+        requests that are still in flight.
+
+        Returns:
+            Number of services evicted
+        """
+        cutoff = self._clock() - self.idle_timeout
+        idle = [key for key, e in self._entries.items() if e.last_used < cutoff]
+        for key in idle:
+            del self._entries[key]
+        if idle:
+            self._prune_schedulers()
+            logger.info(f"Evicted {len(idle)} idle GitHub client(s)")
+        return len(idle)
+
+    def _prune_schedulers(self) -> None:
+        in_use = {key[1] for key in self._entries}
+        for fingerprint in list(self._schedulers):
+            if fingerprint not in in_use:
+                del self._schedulers[fingerprint]
+
+    def stats(self) -> dict[str, Any]:
+        """Get registry statistics."""
+        return {
+            "services": len(self._entries),
+            "pools": len(self._pools),
+            "http2": self.http2,
+            "cache_hits": sum(e.service.cache.hits for e in self._entries.values()),
+            "cache_misses": sum(e.service.cache.misses for e in self._entries.values()),
+            "content_memory_hits": self.content_cache.memory_hits,
+            "content_disk_hits": self.content_cache.disk_hits,
+            "content_misses": self.content_cache.misses,
+        }
+
+    async def aclose(self) -> None:
+        """Close all connection pools and forget all services."""
+        self._entries.clear()
+        self._schedulers.clear()
+        pools, self._pools = self._pools, {}
+        for client in pools.values():
+            await client.aclose()
+
+
+_registry: GitHubClientRegistry | None = None
+
+
+def get_github_clients() -> GitHubClientRegistry:
+    """Get or create the process-wide GitHub client registry."""
+    global _registry
+    if _registry is None:
+        _registry = GitHubClientRegistry(
+            idle_timeout=settings.github_client_idle_timeout,
+            max_connections=settings.github_max_connections,
+            http2=settings.github_http2,
+            content_cache=BlobCache(
+                disk_dir=settings.github_content_cache_dir,
+                max_disk_bytes=settings.github_content_cache_max_bytes,
+            ),
+        )
+    return _registry
+
+
+async def close_github_clients() -> None:
+    """Close the GitHub client registry (application shutdown)."""
+    global _registry
+    if _registry is not None:
+        await _registry.aclose()
+        _registry = None
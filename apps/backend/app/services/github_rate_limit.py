@@ -0,0 +1,212 @@
+"""Rate-limit-aware scheduling of GitHub API requests.
+
+The scheduler tracks the X-RateLimit-* headers of every response and
+hands out request slots by priority. Staging calls (branch creation,
+commits, PRs) run first; browsing calls such as repository and branch
+listings queue behind them and are refused early once the remaining quota
+drops into the reserve kept for staging.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections.abc import AsyncIterator, Callable, Mapping
+from contextlib import asynccontextmanager
+from enum import IntEnum
+
+
+logger = logging.getLogger(__name__)
+
+
+class RequestPriority(IntEnum):
+    """Priority of a GitHub API request (lower runs first)."""
+
+    HIGH = 0  # Staging: refs, blobs, trees, commits, PRs
+    NORMAL = 1
+    LOW = 2  # Browsing: repository/branch listings, file reads
+
+
+class RateLimitExhausted(Exception):
+    """Raised when a request would have to wait longer than allowed."""
+
+    def __init__(self, message: str, retry_after: float) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _parse_int(value: str | None) -> int | None:
+    """Parse an integer header value."""
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimitScheduler:
+    """Priority scheduler that paces requests against the rate limit.
+
+    - At most ``max_concurrent`` requests run at once; waiting requests are
+      served in priority order.
+    - Once the remaining quota falls below ``slowdown_threshold``, requests
+      are spaced out so the quota lasts until the reset time.
+    - LOW priority requests are not sent while the remaining quota is within
+      ``low_priority_reserve``.
+    - A request that would need to wait longer than ``max_wait`` seconds
+      raises RateLimitExhausted instead of blocking the caller.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = 8,
+        slowdown_threshold: int = 500,
+        low_priority_reserve: int = 200,
+        max_wait: float = 30.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """Initialize the scheduler.
+
+        Args:
+            max_concurrent: Maximum number of concurrent requests
+            slowdown_threshold: Remaining quota below which requests are paced
+            low_priority_reserve: Quota kept back from LOW priority requests
+            max_wait: Maximum seconds a request may be delayed
+            clock: Wall clock returning epoch seconds
+        """
+        self.max_concurrent = max_concurrent
+        self.slowdown_threshold = slowdown_threshold
+        self.low_priority_reserve = low_priority_reserve
+        self.max_wait = max_wait
+        self._clock = clock
+
+        self.limit: int | None = None
+        self.remaining: int | None = None
+        self.reset_at: float | None = None
+        self.blocked_until: float = 0.0
+        self._next_send_at: float = 0.0
+
+        self._active = 0
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._sequence = itertools.count()
+
+    @property
+    def active(self) -> int:
+        """Number of requests currently holding a slot."""
+        return self._active
+
+    @property
+    def queued(self) -> int:
+        """Number of requests waiting for a slot."""
+        return sum(1 for _, _, future in self._waiters if not future.done())
+
+    def update(self, headers: Mapping[str, str]) -> None:
+        """Record rate limit state from response headers."""
+        remaining = _parse_int(headers.get("x-ratelimit-remaining"))
+        if remaining is None:
+            return
+        self.remaining = remaining
+        self.limit = _parse_int(headers.get("x-ratelimit-limit")) or self.limit
+        reset = _parse_int(headers.get("x-ratelimit-reset"))
+        if reset is not None:
+            self.reset_at = float(reset)
+
+    def block(self, seconds: float) -> None:
+        """Hold back all requests, e.g. after a Retry-After response."""
+        self.blocked_until = max(self.blocked_until, self._clock() + seconds)
+
+    def _pacing(self, priority: RequestPriority) -> tuple[float, float]:
+        """Get (minimum wait, spacing interval) for a request."""
+        now = self._clock()
+        wait = max(0.0, self.blocked_until - now)
+
+        if self.remaining is None or self.reset_at is None:
+            return wait, 0.0
+
+        until_reset = max(0.0, self.reset_at - now)
+        if until_reset == 0.0:
+            # Window has reset; the next response brings fresh numbers
+            return wait, 0.0
+
+        reserve = self.low_priority_reserve if priority == RequestPriority.LOW else 0
+        usable = self.remaining - reserve
+        if usable <= 0:
+            return max(wait, until_reset), 0.0
+        if self.remaining < self.slowdown_threshold:
+            return wait, until_reset / usable
+        return wait, 0.0
+
+    def _reserve(self, priority: RequestPriority) -> float:
+        """Reserve a send time and return the delay until it."""
+        now = self._clock()
+        wait, interval = self._pacing(priority)
+        send_at = now + wait
+        if interval:
+            send_at = max(send_at, self._next_send_at)
+        delay = send_at - now
+        if delay > self.max_wait:
+            raise RateLimitExhausted(
+                f"GitHub rate limit nearly exhausted, retry in {delay:.0f}s",
+                retry_after=delay,
+            )
+        if interval:
+            self._next_send_at = send_at + interval
+        return delay
+
+    async def _acquire_slot(self, priority: RequestPriority) -> None:
+        if self._active < self.max_concurrent and not self._has_waiters_before(
+            priority
+        ):
+            self._active += 1
+            return
+
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (int(priority), next(self._sequence), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Slot was handed over just before cancellation
+                self._release_slot()
+            raise
+
+    def _has_waiters_before(self, priority: RequestPriority) -> bool:
+        return any(
+            p <= priority and not future.done() for p, _, future in self._waiters
+        )
+
+    def _release_slot(self) -> None:
+        self._active -= 1
+        while self._waiters and self._active < self.max_concurrent:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                self._active += 1
+                future.set_result(None)
+
+    @asynccontextmanager
+    async def slot(
+        self, priority: RequestPriority = RequestPriority.NORMAL
+    ) -> AsyncIterator[None]:
+        """Wait for a request slot, pacing against the rate limit.
+
+        Raises:
+            RateLimitExhausted: If the required wait exceeds max_wait
+        """
+        delay = self._reserve(priority)
+        if delay > 0:
+            logger.info(
+                f"Pacing GitHub request ({priority.name}) by {delay:.2f}s, "
+                f"{self.remaining} calls remaining"
+            )
+            await asyncio.sleep(delay)
+
+        await self._acquire_slot(priority)
+        try:
+            if self.remaining is not None:
+                # Count the request against the quota until headers arrive
+                self.remaining = max(0, self.remaining - 1)
+            yield
+        finally:
+            self._release_slot()
@@ -4,20 +4,37 @@ Handles all GitHub operations including repository management,
 branch operations, PR creation, and file staging.
 """
 
+import asyncio
 import base64
 import logging
+import re
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any
+from typing import Any, Generic, TypeVar
+from urllib.parse import urlsplit
 
 import httpx
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.module_converter import GitHubIntegration
+from app.services.github_cache import BlobCache, ResponseCache
+from app.services.github_rate_limit import (
+    RateLimitExhausted,
+    RateLimitScheduler,
+    RequestPriority,
+)
 
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+_NEXT_LINK_RE = re.compile(r'<([^>]+)>\s*;\s*rel="next"')
+_COMMIT_SHA_RE = re.compile(r"^[0-9a-f]{40}$")
+
 
 class GitHubError(Exception):
     """GitHub API error."""
@@ -74,6 +91,53 @@ class Commit:
     date: datetime
 
 
+@dataclass
+class Page(Generic[T]):
+    """A single page of a paginated GitHub listing."""
+
+    items: list[T]
+    page: int
+    per_page: int
+    has_next: bool
+
+
+def _parse_next_link(link_header: str | None) -> str | None:
+    """Extract the rel="next" URL from a Link header."""
+    if not link_header:
+        return None
+    match = _NEXT_LINK_RE.search(link_header)
+    return match.group(1) if match else None
+
+
+def _same_origin(url: str, base: str) -> bool:
+    """Check that url has the scheme, host and port of base."""
+    target, origin = urlsplit(url), urlsplit(base)
+    return (
+        target.scheme.lower() == origin.scheme.lower()
+        and target.hostname == origin.hostname
+        and target.port == origin.port
+    )
+
+
+def _repository_from_data(data: dict[str, Any]) -> Repository:
+    return Repository(
+        name=data["name"],
+        full_name=data["full_name"],
+        default_branch=data["default_branch"],
+        private=data["private"],
+        url=data["url"],
+        clone_url=data["clone_url"],
+    )
+
+
+def _branch_from_data(data: dict[str, Any]) -> Branch:
+    return Branch(
+        name=data["name"],
+        sha=data["commit"]["sha"],
+        protected=data.get("protected", False),
+    )
+
+
 class GitHubService:
     """Service for GitHub operations.
 
@@ -90,11 +154,27 @@ class GitHubService:
     ACCEPT_HEADER = "application/vnd.github+json"
     API_VERSION = "2022-11-28"
 
+    # Blob creation tuning for multi-file commits
+    BLOB_CONCURRENCY = 8
+    BLOB_MAX_RETRIES = 3
+    BLOB_RETRY_BACKOFF = 0.5  # seconds, doubled per attempt
+    INLINE_BLOB_MAX_BYTES = 32 * 1024
+
+    # File content lookups
+    REF_TTL = 30.0  # seconds a branch/tag -> tree SHA resolution is trusted
+    COMMIT_REF_TTL = 3600.0  # seconds a commit SHA -> tree SHA resolution is kept
+    REF_CACHE_SIZE = 256
+    TREE_INDEX_SIZE = 16
+
     def __init__(
         self,
         access_token: str,
         api_base: str | None = None,
         timeout: float = 30.0,
+        cache_size: int = 256,
+        scheduler: RateLimitScheduler | None = None,
+        client: httpx.AsyncClient | None = None,
+        content_cache: BlobCache | None = None,
     ) -> None:
         """Initialize GitHub service.
 
@@ -102,68 +182,166 @@ class GitHubService:
             access_token: GitHub personal access token or app token
             api_base: Optional custom API base (for GitHub Enterprise)
             timeout: Request timeout in seconds
+            cache_size: Maximum number of cached GET responses
+            scheduler: Optional rate limit scheduler (shared per token)
+            client: Optional shared HTTP client; it is not closed by close()
+            content_cache: Optional shared cache of file contents by blob SHA
         """
         self.access_token = access_token
         self.api_base = api_base or self.API_BASE
         self.timeout = timeout
-        self._client: httpx.AsyncClient | None = None
+        self.cache = ResponseCache(max_entries=cache_size)
+        self.scheduler = scheduler or RateLimitScheduler()
+        self._client: httpx.AsyncClient | None = client
+        self._owns_client = client is None
+        self.content_cache = content_cache if content_cache is not None else BlobCache()
+        self._ref_trees: OrderedDict[tuple[str, str, str], tuple[str, float]] = (
+            OrderedDict()
+        )
+        self._tree_indexes: OrderedDict[str, dict[str, str] | None] = OrderedDict()
+        self._tree_warmups: dict[tuple[str, str, str], asyncio.Task[None]] = {}
+        self._headers = {
+            "Authorization": f"Bearer {self.access_token}",
+            "Accept": self.ACCEPT_HEADER,
+            "X-GitHub-Api-Version": self.API_VERSION,
+        }
 
     async def _get_client(self) -> httpx.AsyncClient:
         """Get or create HTTP client."""
-        if self._client is None or self._client.is_closed:
-            self._client = httpx.AsyncClient(
-                timeout=self.timeout,
-                headers={
-                    "Authorization": f"Bearer {self.access_token}",
-                    "Accept": self.ACCEPT_HEADER,
-                    "X-GitHub-Api-Version": self.API_VERSION,
-                },
-            )
+        if self._client is None or (self._owns_client and self._client.is_closed):
+            self._client = httpx.AsyncClient(timeout=self.timeout)
+            self._owns_client = True
         return self._client
 
     async def close(self) -> None:
-        """Close the HTTP client."""
-        if self._client and not self._client.is_closed:
+        """Close the HTTP client unless it is shared."""
+        for task in self._tree_warmups.values():
+            task.cancel()
+        self._tree_warmups.clear()
+        if self._owns_client and self._client and not self._client.is_closed:
             await self._client.aclose()
 
     async def _request(
         self,
         method: str,
         path: str,
+        priority: RequestPriority | None = None,
+        cache: bool = True,
         **kwargs: Any,
     ) -> dict[str, Any]:
+        """Make an API request and return the response JSON.
+
+        See _send for caching and scheduling behaviour.
+        """
+        data, _ = await self._send(method, path, priority, cache, **kwargs)
+        return data
+
+    async def _send(
+        self,
+        method: str,
+        path: str,
+        priority: RequestPriority | None = None,
+        cache: bool = True,
+        **kwargs: Any,
+    ) -> tuple[Any, dict[str, str]]:
         """Make an API request.
 
+        GET requests are revalidated against the response cache with
+        If-None-Match / If-Modified-Since; a 304 answer is served from the
+        cache and does not count against the rate limit. Every request
+        passes through the rate limit scheduler.
+
         Args:
             method: HTTP method
-            path: API path (without base URL)
+            path: API path (without base URL) or an absolute API URL
+                (as found in Link headers)
+            priority: Scheduling priority (default: NORMAL for reads,
+                HIGH for writes)
+            cache: Keep GET responses in the response cache (disable for
+                SHA-addressed resources that are cached elsewhere)
             **kwargs: Additional request arguments
 
         Returns:
-            Response JSON
+            Tuple of (response JSON, response metadata headers)
 
         Raises:
             GitHubError: If request fails
         """
         client = await self._get_client()
-        url = f"{self.api_base}{path}"
-
-        try:
-            response = await client.request(method, url, **kwargs)
-
-            if response.status_code == 204:
-                return {}
-
-            if response.status_code >= 400:
-                error_data = response.json() if response.content else {}
-                message = error_data.get("message", f"HTTP {response.status_code}")
-                raise GitHubError(message, response.status_code)
+        if path.startswith(("http://", "https://")):
+            url = path
+        else:
+            url = f"{self.api_base}{path}"
+        if priority is None:
+            priority = (
+                RequestPriority.NORMAL if method == "GET" else RequestPriority.HIGH
+            )
 
-            return response.json() if response.content else {}
+        cache_key = None
+        conditional: dict[str, str] = {}
+        if method == "GET" and cache:
+            cache_key = self.cache.make_key(url, kwargs.get("params"))
+            conditional = self.cache.conditional_headers(cache_key)
+        # Auth goes per request so that clients can share a connection pool
+        request_kwargs = {
+            **kwargs,
+            "headers": {**self._headers, **kwargs.get("headers", {}), **conditional},
+        }
 
+        try:
+            async with self.scheduler.slot(priority):
+                response = await client.request(method, url, **request_kwargs)
+        except RateLimitExhausted as e:
+            raise GitHubError(str(e), 429) from e
         except httpx.RequestError as e:
             raise GitHubError(f"Request failed: {e}") from e
 
+        self.scheduler.update(response.headers)
+
+        if response.status_code == 304 and cache_key and conditional:
+            cached = self.cache.get(cache_key)
+            if cached is None:
+                # Evicted while in flight; fetch unconditionally
+                return await self._send(method, path, priority, cache, **kwargs)
+            self.cache.hits += 1
+            return cached.data, cached.headers
+
+        if response.status_code == 204:
+            return {}, {}
+
+        if response.status_code >= 400:
+            if response.status_code in (403, 429):
+                self._apply_retry_after(response)
+            error_data = response.json() if response.content else {}
+            message = error_data.get("message", f"HTTP {response.status_code}")
+            raise GitHubError(message, response.status_code)
+
+        data = response.json() if response.content else {}
+        meta = {}
+        link = response.headers.get("link")
+        if link:
+            meta["link"] = link
+        if cache_key:
+            self.cache.misses += 1
+            self.cache.store(
+                cache_key,
+                data,
+                etag=response.headers.get("etag"),
+                last_modified=response.headers.get("last-modified"),
+                headers=meta,
+            )
+        return data, meta
+
+    def _apply_retry_after(self, response: httpx.Response) -> None:
+        """Hold back further requests after a secondary rate limit response."""
+        retry_after = response.headers.get("retry-after")
+        if retry_after is None:
+            return
+        try:
+            self.scheduler.block(float(retry_after))
+        except (TypeError, ValueError):
+            pass
+
     # ==========================================================================
     # Authentication & Validation
     # ==========================================================================
@@ -188,6 +366,57 @@ class GitHubService:
     # Repository Operations
     # ==========================================================================
 
+    def _next_page_url(self, meta: dict[str, str]) -> str | None:
+        """Return the rel="next" URL of a response if it may be followed.
+
+        Links are requested with the Authorization header, so only links
+        back to the configured API base are followed.
+        """
+        next_url = _parse_next_link(meta.get("link"))
+        if next_url and not _same_origin(next_url, self.api_base):
+            logger.warning("Ignoring pagination link to foreign host: %s", next_url)
+            return None
+        return next_url
+
+    async def _paginate(
+        self,
+        path: str,
+        params: dict[str, Any] | None = None,
+        prefetch: bool = True,
+    ) -> AsyncIterator[list[Any]]:
+        """Yield result pages lazily, following Link rel="next" headers.
+
+        Args:
+            path: API path of the first page
+            params: Query parameters of the first page
+            prefetch: Request the next page while the current one is consumed
+
+        Yields:
+            The items of each page
+        """
+        data, meta = await self._send("GET", path, RequestPriority.LOW, params=params)
+        pending: asyncio.Task[tuple[Any, dict[str, str]]] | None = None
+        try:
+            while True:
+                next_url = self._next_page_url(meta)
+                if next_url and prefetch:
+                    pending = asyncio.create_task(
+                        self._send("GET", next_url, RequestPriority.LOW)
+                    )
+
+                yield data
+
+                if not next_url:
+                    return
+                if pending is not None:
+                    data, meta = await pending
+                    pending = None
+                else:
+                    data, meta = await self._send("GET", next_url, RequestPriority.LOW)
+        finally:
+            if pending is not None:
+                pending.cancel()
+
     async def list_repositories(
         self,
         visibility: str = "all",
@@ -195,6 +424,9 @@ class GitHubService:
     ) -> list[Repository]:
         """List repositories accessible to the authenticated user.
 
+        Only the first page is returned; use iter_repositories to walk
+        all repositories.
+
         Args:
             visibility: Filter by visibility (all, public, private)
             per_page: Results per page
@@ -202,22 +434,63 @@ class GitHubService:
         Returns:
             List of repositories
         """
-        data = await self._request(
+        page = await self.get_repositories_page(
+            visibility=visibility, per_page=per_page
+        )
+        return page.items
+
+    async def get_repositories_page(
+        self,
+        page: int = 1,
+        per_page: int = 30,
+        visibility: str = "all",
+    ) -> Page[Repository]:
+        """Get a single page of repositories.
+
+        Args:
+            page: Page number (1-based)
+            per_page: Results per page (max 100)
+            visibility: Filter by visibility (all, public, private)
+
+        Returns:
+            Page of repositories
+        """
+        data, meta = await self._send(
             "GET",
             "/user/repos",
-            params={"visibility": visibility, "per_page": per_page},
+            RequestPriority.LOW,
+            params={"visibility": visibility, "per_page": per_page, "page": page},
         )
-        return [
-            Repository(
-                name=r["name"],
-                full_name=r["full_name"],
-                default_branch=r["default_branch"],
-                private=r["private"],
-                url=r["url"],
-                clone_url=r["clone_url"],
-            )
-            for r in data
-        ]
+        return Page(
+            items=[_repository_from_data(r) for r in data],
+            page=page,
+            per_page=per_page,
+            has_next=self._next_page_url(meta) is not None,
+        )
+
+    async def iter_repositories(
+        self,
+        visibility: str = "all",
+        per_page: int = 100,
+        prefetch: bool = True,
+    ) -> AsyncIterator[Repository]:
+        """Iterate over all repositories, loading pages on demand.
+
+        Args:
+            visibility: Filter by visibility (all, public, private)
+            per_page: Results per page (max 100)
+            prefetch: Request the next page while the current one is consumed
+
+        Yields:
+            Repositories
+        """
+        async for page in self._paginate(
+            "/user/repos",
+            params={"visibility": visibility, "per_page": per_page},
+            prefetch=prefetch,
+        ):
+            for r in page:
+                yield _repository_from_data(r)
 
     async def get_repository(self, owner: str, repo: str) -> Repository:
         """Get repository information.
@@ -230,14 +503,7 @@ class GitHubService:
             Repository info
         """
         data = await self._request("GET", f"/repos/{owner}/{repo}")
-        return Repository(
-            name=data["name"],
-            full_name=data["full_name"],
-            default_branch=data["default_branch"],
-            private=data["private"],
-            url=data["url"],
-            clone_url=data["clone_url"],
-        )
+        return _repository_from_data(data)
 
     # ==========================================================================
     # Branch Operations
@@ -251,6 +517,9 @@ class GitHubService:
     ) -> list[Branch]:
         """List repository branches.
 
+        Only the first page is returned; use iter_branches to walk all
+        branches.
+
         Args:
             owner: Repository owner
             repo: Repository name
@@ -259,19 +528,65 @@ class GitHubService:
         Returns:
             List of branches
         """
-        data = await self._request(
+        page = await self.get_branches_page(owner, repo, per_page=per_page)
+        return page.items
+
+    async def get_branches_page(
+        self,
+        owner: str,
+        repo: str,
+        page: int = 1,
+        per_page: int = 30,
+    ) -> Page[Branch]:
+        """Get a single page of repository branches.
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            page: Page number (1-based)
+            per_page: Results per page (max 100)
+
+        Returns:
+            Page of branches
+        """
+        data, meta = await self._send(
             "GET",
             f"/repos/{owner}/{repo}/branches",
-            params={"per_page": per_page},
+            RequestPriority.LOW,
+            params={"per_page": per_page, "page": page},
+        )
+        return Page(
+            items=[_branch_from_data(b) for b in data],
+            page=page,
+            per_page=per_page,
+            has_next=self._next_page_url(meta) is not None,
         )
-        return [
-            Branch(
-                name=b["name"],
-                sha=b["commit"]["sha"],
-                protected=b.get("protected", False),
-            )
-            for b in data
-        ]
+
+    async def iter_branches(
+        self,
+        owner: str,
+        repo: str,
+        per_page: int = 100,
+        prefetch: bool = True,
+    ) -> AsyncIterator[Branch]:
+        """Iterate over all repository branches, loading pages on demand.
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            per_page: Results per page (max 100)
+            prefetch: Request the next page while the current one is consumed
+
+        Yields:
+            Branches
+        """
+        async for page in self._paginate(
+            f"/repos/{owner}/{repo}/branches",
+            params={"per_page": per_page},
+            prefetch=prefetch,
+        ):
+            for b in page:
+                yield _branch_from_data(b)
 
     async def get_branch(self, owner: str, repo: str, branch: str) -> Branch:
         """Get branch information.
@@ -285,11 +600,7 @@ class GitHubService:
             Branch info
         """
         data = await self._request("GET", f"/repos/{owner}/{repo}/branches/{branch}")
-        return Branch(
-            name=data["name"],
-            sha=data["commit"]["sha"],
-            protected=data.get("protected", False),
-        )
+        return _branch_from_data(data)
 
     async def create_branch(
         self,
@@ -317,6 +628,7 @@ class GitHubService:
                 "sha": from_sha,
             },
         )
+        self._forget_ref(owner, repo, branch_name)
         return await self.get_branch(owner, repo, branch_name)
 
     async def delete_branch(self, owner: str, repo: str, branch: str) -> None:
@@ -331,6 +643,7 @@ class GitHubService:
             "DELETE",
             f"/repos/{owner}/{repo}/git/refs/heads/{branch}",
         )
+        self._forget_ref(owner, repo, branch)
 
     # ==========================================================================
     # File Operations
@@ -345,6 +658,12 @@ class GitHubService:
     ) -> tuple[str, str]:
         """Get file content.
 
+        Once the ref's tree listing is known, the path is resolved to a
+        blob SHA locally and the content is served from the blob cache, so
+        repeated reads skip both the download and the base64 decoding. On
+        a cold cache the contents API answers in a single request and the
+        tree listing is loaded in the background for subsequent reads.
+
         Args:
             owner: Repository owner
             repo: Repository name
@@ -354,13 +673,188 @@ class GitHubService:
         Returns:
             Tuple of (content, sha)
         """
+        tree_sha = self._cached_tree_sha(owner, repo, ref)
+        if tree_sha is None or tree_sha not in self._tree_indexes:
+            self._schedule_tree_warmup(owner, repo, ref)
+            return await self._get_contents(owner, repo, path, ref)
+
+        self._tree_indexes.move_to_end(tree_sha)
+        index = self._tree_indexes[tree_sha]
+        blob_sha = index.get(path.strip("/")) if index is not None else None
+        if blob_sha is None:
+            # Not a blob in the tree, or the listing was truncated
+            return await self._get_contents(owner, repo, path, ref)
+        return await self.get_blob_content(owner, repo, blob_sha), blob_sha
+
+    async def warm_tree_index(
+        self, owner: str, repo: str, ref: str | None = None
+    ) -> None:
+        """Load the tree listing of a ref so that file reads resolve locally.
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            ref: Branch/tag/commit reference (default: HEAD)
+        """
+        tree_sha = await self.resolve_tree_sha(owner, repo, ref)
+        await self._get_tree_index(owner, repo, tree_sha)
+
+    def _schedule_tree_warmup(self, owner: str, repo: str, ref: str | None) -> None:
+        """Start warm_tree_index in the background unless it is running."""
+        key = (owner, repo, ref or "HEAD")
+        if key in self._tree_warmups:
+            return
+
+        async def warm() -> None:
+            try:
+                await self.warm_tree_index(owner, repo, ref)
+            except GitHubError as e:
+                logger.debug(f"Tree warm-up for {owner}/{repo}@{key[2]} failed: {e}")
+            finally:
+                self._tree_warmups.pop(key, None)
+
+        self._tree_warmups[key] = asyncio.create_task(warm())
+
+    def _cached_tree_sha(self, owner: str, repo: str, ref: str | None) -> str | None:
+        """Get a still valid ref -> tree SHA resolution, if any."""
+        key = (owner, repo, ref or "HEAD")
+        cached = self._ref_trees.get(key)
+        if cached is None:
+            return None
+        if cached[1] <= time.monotonic():
+            del self._ref_trees[key]
+            return None
+        self._ref_trees.move_to_end(key)
+        return cached[0]
+
+    def _forget_ref(self, owner: str, repo: str, branch: str | None) -> None:
+        """Drop the tree resolutions a ref update may have made stale.
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            branch: Moved branch, or None if unknown (drops all branch and
+                tag resolutions of the repository)
+        """
+        for key in list(self._ref_trees):
+            if key[:2] != (owner, repo):
+                continue
+            ref = key[2]
+            if branch is None:
+                stale = not _COMMIT_SHA_RE.match(ref)
+            else:
+                # HEAD follows the default branch, which may be the one moved
+                stale = ref in (branch, "HEAD")
+            if stale:
+                del self._ref_trees[key]
+
+    async def resolve_tree_sha(
+        self, owner: str, repo: str, ref: str | None = None
+    ) -> str:
+        """Resolve a branch, tag or commit to its root tree SHA.
+
+        Branch and tag resolutions are reused for REF_TTL seconds and
+        revalidated with conditional requests afterwards; commit SHAs are
+        kept for COMMIT_REF_TTL. At most REF_CACHE_SIZE resolutions are
+        kept, least recently used first out.
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            ref: Branch/tag/commit reference (default: HEAD)
+
+        Returns:
+            Tree SHA
+        """
+        ref = ref or "HEAD"
+        cached = self._cached_tree_sha(owner, repo, ref)
+        if cached is not None:
+            return cached
+
+        data = await self._request(
+            "GET",
+            f"/repos/{owner}/{repo}/git/trees/{ref}",
+            priority=RequestPriority.LOW,
+        )
+        ttl = self.COMMIT_REF_TTL if _COMMIT_SHA_RE.match(ref) else self.REF_TTL
+        self._ref_trees[(owner, repo, ref)] = (data["sha"], time.monotonic() + ttl)
+        self._ref_trees.move_to_end((owner, repo, ref))
+        while len(self._ref_trees) > self.REF_CACHE_SIZE:
+            self._ref_trees.popitem(last=False)
+        return data["sha"]
+
+    async def _get_tree_index(
+        self, owner: str, repo: str, tree_sha: str
+    ) -> dict[str, str] | None:
+        """Get the path -> blob SHA map of a tree (None if truncated)."""
+        if tree_sha in self._tree_indexes:
+            self._tree_indexes.move_to_end(tree_sha)
+            return self._tree_indexes[tree_sha]
+
+        # Trees are immutable; only the compact index is kept
+        data = await self._request(
+            "GET",
+            f"/repos/{owner}/{repo}/git/trees/{tree_sha}",
+            priority=RequestPriority.LOW,
+            cache=False,
+            params={"recursive": "1"},
+        )
+        index = None
+        if not data.get("truncated"):
+            index = {
+                item["path"]: item["sha"]
+                for item in data.get("tree", [])
+                if item.get("type") == "blob"
+            }
+        self._tree_indexes[tree_sha] = index
+        while len(self._tree_indexes) > self.TREE_INDEX_SIZE:
+            self._tree_indexes.popitem(last=False)
+        return index
+
+    async def get_blob_content(self, owner: str, repo: str, sha: str) -> str:
+        """Get the decoded content of a blob.
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            sha: Blob SHA
+
+        Returns:
+            File content
+        """
+        content = self.content_cache.get(sha)
+        if content is not None:
+            return content
+
+        data = await self._request(
+            "GET",
+            f"/repos/{owner}/{repo}/git/blobs/{sha}",
+            priority=RequestPriority.LOW,
+            cache=False,
+        )
+        content = base64.b64decode(data["content"]).decode("utf-8")
+        self.content_cache.store(sha, content)
+        return content
+
+    async def _get_contents(
+        self,
+        owner: str,
+        repo: str,
+        path: str,
+        ref: str | None = None,
+    ) -> tuple[str, str]:
+        """Get file content through the contents API."""
         params = {"ref": ref} if ref else {}
         data = await self._request(
             "GET",
             f"/repos/{owner}/{repo}/contents/{path}",
+            priority=RequestPriority.LOW,
             params=params,
         )
-        content = base64.b64decode(data["content"]).decode("utf-8")
+        content = self.content_cache.get(data["sha"])
+        if content is None:
+            content = base64.b64decode(data["content"]).decode("utf-8")
+            self.content_cache.store(data["sha"], content)
         return content, data["sha"]
 
     async def create_or_update_file(
@@ -400,6 +894,7 @@ class GitHubService:
             f"/repos/{owner}/{repo}/contents/{path}",
             json=payload,
         )
+        self._forget_ref(owner, repo, branch)
         commit = data["commit"]
         return Commit(
             sha=commit["sha"],
@@ -421,6 +916,10 @@ class GitHubService:
     ) -> Commit:
         """Create multiple files in a single commit.
 
+        Files up to INLINE_BLOB_MAX_BYTES are sent inline with the tree
+        request. Larger files get blobs created concurrently (at most
+        BLOB_CONCURRENCY at a time), each retried on transient errors.
+
         Args:
             owner: Repository owner
             repo: Repository name
@@ -444,25 +943,25 @@ class GitHubService:
         )
         base_tree_sha = base_commit["tree"]["sha"]
 
-        # Create blobs for each file
-        tree_items = []
+        # Small text files are inlined in the tree request; the rest get
+        # blobs created concurrently
+        tree_items: list[dict[str, Any]] = []
+        blob_files: list[dict[str, str]] = []
         for file in files:
-            blob = await self._request(
-                "POST",
-                f"/repos/{owner}/{repo}/git/blobs",
-                json={
-                    "content": file["content"],
-                    "encoding": "utf-8",
-                },
-            )
-            tree_items.append(
-                {
-                    "path": file["path"],
-                    "mode": "100644",
-                    "type": "blob",
-                    "sha": blob["sha"],
-                }
-            )
+            encoded_size = len(file["content"].encode("utf-8"))
+            if encoded_size <= self.INLINE_BLOB_MAX_BYTES:
+                tree_items.append(
+                    {
+                        "path": file["path"],
+                        "mode": "100644",
+                        "type": "blob",
+                        "content": file["content"],
+                    }
+                )
+            else:
+                blob_files.append(file)
+
+        tree_items.extend(await self._create_blobs(owner, repo, blob_files))
 
         # Create new tree
         new_tree = await self._request(
@@ -491,6 +990,7 @@ class GitHubService:
             f"/repos/{owner}/{repo}/git/refs/heads/{branch}",
             json={"sha": commit["sha"]},
         )
+        self._forget_ref(owner, repo, branch)
 
         return Commit(
             sha=commit["sha"],
@@ -502,6 +1002,81 @@ class GitHubService:
             ),
         )
 
+    async def _create_blobs(
+        self,
+        owner: str,
+        repo: str,
+        files: list[dict[str, str]],
+    ) -> list[dict[str, Any]]:
+        """Create blobs concurrently with a bounded number of requests.
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            files: List of {"path": ..., "content": ...}
+
+        Returns:
+            Tree items referencing the created blobs, in input order
+        """
+        semaphore = asyncio.Semaphore(self.BLOB_CONCURRENCY)
+
+        async def create(file: dict[str, str]) -> dict[str, Any]:
+            async with semaphore:
+                sha = await self._create_blob(owner, repo, file["content"])
+            return {
+                "path": file["path"],
+                "mode": "100644",
+                "type": "blob",
+                "sha": sha,
+            }
+
+        try:
+            async with asyncio.TaskGroup() as group:
+                tasks = [group.create_task(create(file)) for file in files]
+        except ExceptionGroup as eg:
+            # Surface the first failure as a plain GitHubError for callers
+            raise eg.exceptions[0] from None
+
+        return [task.result() for task in tasks]
+
+    async def _create_blob(self, owner: str, repo: str, content: str) -> str:
+        """Create a single blob, retrying transient failures.
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            content: File content
+
+        Returns:
+            SHA of the created blob
+
+        Raises:
+            GitHubError: If the blob could not be created
+        """
+        attempt = 0
+        while True:
+            try:
+                blob = await self._request(
+                    "POST",
+                    f"/repos/{owner}/{repo}/git/blobs",
+                    json={"content": content, "encoding": "utf-8"},
+                )
+                return blob["sha"]
+            except GitHubError as e:
+                retryable = (
+                    e.status_code is None
+                    or e.status_code == 429
+                    or e.status_code >= 500
+                )
+                if not retryable or attempt >= self.BLOB_MAX_RETRIES:
+                    raise
+                delay = self.BLOB_RETRY_BACKOFF * (2**attempt)
+                attempt += 1
+                logger.warning(
+                    f"Blob creation failed ({e}), retry {attempt} in {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
+
     # ==========================================================================
     # Pull Request Operations
     # ==========================================================================
@@ -672,6 +1247,8 @@ class GitHubService:
                 f"/repos/{owner}/{repo}/pulls/{pr_number}/merge",
                 json=payload,
             )
+            # The base branch moved; its name is not in the response
+            self._forget_ref(owner, repo, None)
             return True
         except GitHubError as e:
             if e.status_code == 405:
@@ -708,7 +1285,9 @@ async def create_github_service_from_integration(
     integration: GitHubIntegration,
     db: AsyncSession,
 ) -> GitHubService:
-    """Create a GitHubService from a GitHubIntegration model.
+    """Get the pooled GitHubService for a GitHubIntegration model.
+
+    The service is long-lived and shared between callers; do not close it.
 
     Args:
         integration: GitHub integration configuration
@@ -717,13 +1296,6 @@ async def create_github_service_from_integration(
     Returns:
         Configured GitHubService
     """
-    # TODO: Implement proper decryption
-    access_token = integration.access_token_encrypted or ""
+    from app.services.github_clients import get_github_clients
 
-    # Check for GitHub Enterprise
-    api_base = integration.config.get("api_base") if integration.config else None
-
-    return GitHubService(
-        access_token=access_token,
-        api_base=api_base,
-    )
+    return get_github_clients().get(integration)
@@ -559,78 +559,72 @@ Please generate the converted code."""
         if not integration:
             raise ModuleConversionError("GitHub integration not found")
 
-        # Create service
+        # Pooled service, shared with other staging runs
         github = await create_github_service_from_integration(integration, self.db)
 
-        try:
-            owner = integration.default_owner
-            repo = integration.default_repo
-            base_branch = integration.default_base_branch
-
-            # Get base branch SHA
-            base = await github.get_branch(owner, repo, base_branch)
-
-            # Create staging branch
-            branch_name = f"{integration.branch_prefix}{conversion.job_id}"
-            await github.create_branch(owner, repo, branch_name, base.sha)
-            conversion.staging_branch = branch_name
-
-            # Create files
-            generated_code = result.get("generated_code", "")
-            files = [
-                {
-                    "path": f"modules/{conversion.job_id}/generated.py",
-                    "content": generated_code,
-                }
-            ]
-            await github.create_files_in_commit(
-                owner,
-                repo,
-                branch_name,
-                files,
-                f"feat(module-converter): Add converted module {conversion.job_id}",
-            )
+        owner = integration.default_owner
+        repo = integration.default_repo
+        base_branch = integration.default_base_branch
 
-            # Create PR
-            title = integration.pr_title_template.format(
-                module_name=conversion.job_id,
-                action="converted",
-            )
-            pr = await github.create_pull_request(
-                owner,
-                repo,
-                title=title,
-                head=branch_name,
-                base=base_branch,
-                body=f"Automated module conversion\n\nJob ID: {conversion.job_id}",
-            )
+        # Get base branch SHA
+        base = await github.get_branch(owner, repo, base_branch)
 
-            conversion.staging_pr_url = pr.html_url
-            conversion.staging_pr_number = pr.number
+        # Create staging branch
+        branch_name = f"{integration.branch_prefix}{conversion.job_id}"
+        await github.create_branch(owner, repo, branch_name, base.sha)
+        conversion.staging_branch = branch_name
 
-            # Add labels if configured
-            if integration.default_labels:
-                await github.add_labels(
-                    owner, repo, pr.number, integration.default_labels
-                )
+        # Create files
+        generated_code = result.get("generated_code", "")
+        files = [
+            {
+                "path": f"modules/{conversion.job_id}/generated.py",
+                "content": generated_code,
+            }
+        ]
+        await github.create_files_in_commit(
+            owner,
+            repo,
+            branch_name,
+            files,
+            f"feat(module-converter): Add converted module {conversion.job_id}",
+        )
 
-            # Request reviewers if configured
-            if integration.default_reviewers:
-                await github.request_reviewers(
-                    owner, repo, pr.number, integration.default_reviewers
-                )
+        # Create PR
+        title = integration.pr_title_template.format(
+            module_name=conversion.job_id,
+            action="converted",
+        )
+        pr = await github.create_pull_request(
+            owner,
+            repo,
+            title=title,
+            head=branch_name,
+            base=base_branch,
+            body=f"Automated module conversion\n\nJob ID: {conversion.job_id}",
+        )
 
-            await self.db.commit()
+        conversion.staging_pr_url = pr.html_url
+        conversion.staging_pr_number = pr.number
 
-            return {
-                "branch": branch_name,
-                "pr_number": pr.number,
-                "pr_url": pr.html_url,
-                "files_staged": len(files),
-            }
+        # Add labels if configured
+        if integration.default_labels:
+            await github.add_labels(owner, repo, pr.number, integration.default_labels)
+
+        # Request reviewers if configured
+        if integration.default_reviewers:
+            await github.request_reviewers(
+                owner, repo, pr.number, integration.default_reviewers
+            )
+
+        await self.db.commit()
 
-        finally:
-            await github.close()
+        return {
+            "branch": branch_name,
+            "pr_number": pr.number,
+            "pr_url": pr.html_url,
+            "files_staged": len(files),
+        }
 
     # ==========================================================================
     # Template Management
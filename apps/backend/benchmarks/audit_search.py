@@ -0,0 +1,204 @@
+"""Benchmark audit case search over a synthetic dataset.
+
+Inserts a tenant with 100k generated audit cases, then compares the former
+``ILIKE '%term%'`` search with the indexed ranked search for a few typical
+queries. The tenant and its cases are deleted afterwards.
+
+Usage (from apps/backend, with DATABASE_URL pointing at a dev database that
+is migrated to revision 012 or created by create_schema):
+
+    python -m benchmarks.audit_search --cases 100000 --runs 50
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+import uuid
+from datetime import datetime, timezone
+
+os.environ.setdefault("TESTING", "true")
+
+from sqlalchemy import or_, select, text  # noqa: E402
+
+from app.core.database import close_db, create_schema, get_session_factory  # noqa: E402
+from app.models.audit_case import AuditCase  # noqa: E402
+from app.services.audit_search import (  # noqa: E402
+    search_audit_cases,
+    trigram_available,
+)
+
+
+# Word lists for synthetic project and beneficiary names
+PROJECTS = [
+    "Sanierung",
+    "Neubau",
+    "Erweiterung",
+    "Digitalisierung",
+    "Modernisierung",
+    "Ausbau",
+    "Renaturierung",
+    "Errichtung",
+]
+OBJECTS = [
+    "Kläranlage",
+    "Grundschule",
+    "Radweg",
+    "Breitbandnetz",
+    "Feuerwehrhaus",
+    "Stadtbibliothek",
+    "Hochwasserschutz",
+    "Gewerbegebiet",
+    "Kindergarten",
+    "Sporthalle",
+]
+PLACES = [
+    "Magdeburg",
+    "Halle",
+    "Dessau",
+    "Wittenberg",
+    "Stendal",
+    "Quedlinburg",
+    "Naumburg",
+    "Merseburg",
+    "Bernburg",
+    "Zeitz",
+]
+FORMS = ["GmbH", "AG", "e.V.", "Stadtwerke", "Zweckverband", "Landkreis"]
+
+QUERIES = [
+    "PRF-2023-0421",  # case number prefix
+    "Kläranlage",  # common word
+    "Feuerwehr Stendal",  # two word prefixes
+    "Quedlinburg GmbH",  # beneficiary
+    "Kläranalge",  # typo (matches only with pg_trgm)
+]
+
+
+async def _seed(tenant_id: uuid.UUID, cases: int) -> None:
+    now = datetime.now(timezone.utc)
+    async with get_session_factory()() as session:
+        await session.execute(
+            text(
+                "INSERT INTO tenants (id, name, type, status, created_at, updated_at) "
+                "VALUES (:id, 'Search Benchmark', 'authority', 'active', :now, :now)"
+            ),
+            {"id": tenant_id, "now": now},
+        )
+        await session.execute(
+            text(
+                """
+                INSERT INTO audit_cases
+                    (id, tenant_id, case_number, project_name, beneficiary_name,
+                     status, audit_type, custom_data, is_sample,
+                     requires_follow_up, created_at, updated_at)
+                SELECT
+                    gen_random_uuid(), :tenant_id,
+                    'PRF-' || (2015 + i % 10) || '-' || lpad((i / 10)::text, 5, '0'),
+                    p.projects[1 + i % 8] || ' ' || p.objects[1 + (i / 8) % 10]
+                        || ' ' || p.places[1 + (i / 80) % 10],
+                    p.places[1 + (i / 7) % 10] || ' ' || p.forms[1 + i % 6],
+                    'draft', 'operation', '{}', false, false,
+                    p.now - i * interval '1 minute', p.now
+                FROM generate_series(1, :cases) AS i,
+                    (SELECT CAST(:projects AS text[]) AS projects,
+                            CAST(:objects AS text[]) AS objects,
+                            CAST(:places AS text[]) AS places,
+                            CAST(:forms AS text[]) AS forms,
+                            CAST(:now AS timestamptz) AS now) AS p
+                """
+            ),
+            {
+                "tenant_id": tenant_id,
+                "projects": PROJECTS,
+                "objects": OBJECTS,
+                "places": PLACES,
+                "forms": FORMS,
+                "now": now,
+                "cases": cases,
+            },
+        )
+        await session.commit()
+        await session.execute(text("ANALYZE audit_cases"))
+
+
+async def _delete(tenant_id: uuid.UUID) -> None:
+    async with get_session_factory()() as session:
+        await session.execute(
+            text("DELETE FROM audit_cases WHERE tenant_id = :id"), {"id": tenant_id}
+        )
+        await session.execute(
+            text("DELETE FROM tenants WHERE id = :id"), {"id": tenant_id}
+        )
+        await session.commit()
+
+
+async def _legacy_search(session, tenant_id: str, term: str) -> list:
+    """The former ILIKE search of list_audit_cases (first page)."""
+    pattern = f"%{term}%"
+    result = await session.execute(
+        select(AuditCase)
+        .where(
+            AuditCase.tenant_id == tenant_id,
+            or_(
+                AuditCase.case_number.ilike(pattern),
+                AuditCase.project_name.ilike(pattern),
+                AuditCase.beneficiary_name.ilike(pattern),
+            ),
+        )
+        .order_by(AuditCase.created_at.desc())
+        .limit(20)
+    )
+    return list(result.scalars().all())
+
+
+async def _time(func, runs: int) -> tuple[list[float], int]:
+    timings = []
+    hits = 0
+    for _ in range(runs):
+        started = time.perf_counter()
+        hits = len(await func())
+        timings.append(time.perf_counter() - started)
+    return timings, hits
+
+
+def _report(label: str, timings: list[float], hits: int) -> None:
+    ordered = sorted(timings)
+    p95 = ordered[max(0, int(len(ordered) * 0.95) - 1)]
+    print(
+        f"  {label:<8} mean {statistics.mean(timings) * 1000:8.2f} ms  "
+        f"p95 {p95 * 1000:8.2f} ms  hits {hits}"
+    )
+
+
+async def main(cases: int, runs: int) -> None:
+    await create_schema()
+    tenant_id = uuid.uuid4()
+    print(f"Seeding {cases} audit cases ...")
+    await _seed(tenant_id, cases)
+
+    try:
+        async with get_session_factory()() as session:
+            print(f"pg_trgm installed: {await trigram_available(session)}")
+            for term in QUERIES:
+                print(f"{term!r}")
+                timings, hits = await _time(
+                    lambda: _legacy_search(session, str(tenant_id), term), runs
+                )
+                _report("ILIKE", timings, hits)
+                timings, hits = await _time(
+                    lambda: search_audit_cases(session, str(tenant_id), term), runs
+                )
+                _report("search", timings, hits)
+    finally:
+        await _delete(tenant_id)
+        await close_db()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cases", type=int, default=100_000)
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.cases, args.runs))
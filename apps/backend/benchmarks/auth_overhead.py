@@ -0,0 +1,120 @@
+"""Benchmark the per-request overhead of authentication.
+
+Sends authenticated requests to /api/auth/me through the ASGI app with the
+principal cache enabled and disabled, and reports the latency per request.
+
+Usage (from apps/backend, with DATABASE_URL pointing at a dev database):
+
+    python -m benchmarks.auth_overhead --requests 2000
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+import uuid
+from datetime import datetime, timezone
+
+# Rate limiting would throttle the benchmark
+os.environ.setdefault("TESTING", "true")
+
+from httpx import ASGITransport, AsyncClient  # noqa: E402
+from sqlalchemy import text  # noqa: E402
+
+from app.core.database import close_db, create_schema, get_session_factory  # noqa: E402
+from app.core.principal_cache import principal_cache  # noqa: E402
+from app.core.security import create_access_token  # noqa: E402
+from app.main import app  # noqa: E402
+
+
+async def _create_user() -> tuple[uuid.UUID, uuid.UUID]:
+    user_id, tenant_id = uuid.uuid4(), uuid.uuid4()
+    now = datetime.now(timezone.utc)
+    async with get_session_factory()() as session:
+        await session.execute(
+            text(
+                "INSERT INTO tenants (id, name, type, status, created_at, updated_at) "
+                "VALUES (:id, 'Benchmark Tenant', 'authority', 'active', :now, :now)"
+            ),
+            {"id": tenant_id, "now": now},
+        )
+        await session.execute(
+            text(
+                "INSERT INTO users (id, tenant_id, email, hashed_password, "
+                "first_name, last_name, role, is_active, created_at, updated_at) "
+                "VALUES (:id, :tenant_id, :email, 'x', 'Bench', 'User', "
+                "'auditor', true, :now, :now)"
+            ),
+            {
+                "id": user_id,
+                "tenant_id": tenant_id,
+                "email": f"bench_{user_id.hex[:8]}@example.com",
+                "now": now,
+            },
+        )
+        await session.commit()
+    return user_id, tenant_id
+
+
+async def _delete_user(user_id: uuid.UUID, tenant_id: uuid.UUID) -> None:
+    async with get_session_factory()() as session:
+        await session.execute(text("DELETE FROM users WHERE id = :id"), {"id": user_id})
+        await session.execute(
+            text("DELETE FROM tenants WHERE id = :id"), {"id": tenant_id}
+        )
+        await session.commit()
+
+
+async def _measure(client: AsyncClient, headers: dict, requests: int) -> list[float]:
+    timings = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        response = await client.get("/api/auth/me", headers=headers)
+        timings.append(time.perf_counter() - started)
+        response.raise_for_status()
+    return timings
+
+
+def _report(label: str, timings: list[float]) -> None:
+    ordered = sorted(timings)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(
+        f"{label:<16} mean {statistics.mean(timings) * 1000:7.3f} ms  "
+        f"p50 {statistics.median(timings) * 1000:7.3f} ms  "
+        f"p95 {p95 * 1000:7.3f} ms"
+    )
+
+
+async def main(requests: int) -> None:
+    await create_schema()
+    user_id, tenant_id = await _create_user()
+    token = create_access_token(
+        data={"sub": str(user_id), "tenant_id": str(tenant_id), "role": "auditor"}
+    )
+    headers = {"Authorization": f"Bearer {token}"}
+    ttl = principal_cache.ttl
+
+    try:
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://bench") as client:
+            await _measure(client, headers, 50)  # Warm up pools
+
+            principal_cache.ttl = 0
+            principal_cache.clear()
+            _report("without cache", await _measure(client, headers, requests))
+
+            principal_cache.ttl = ttl
+            _report("with cache", await _measure(client, headers, requests))
+            print(f"cache hits {principal_cache.hits}, misses {principal_cache.misses}")
+    finally:
+        principal_cache.ttl = ttl
+        await _delete_user(user_id, tenant_id)
+        await close_db()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
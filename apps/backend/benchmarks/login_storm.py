@@ -0,0 +1,157 @@
+"""Load test: latency of other endpoints during a login storm.
+
+Fires concurrent logins through the ASGI app (a single worker) while a
+probe keeps requesting /api/health, and reports the probe's latency
+percentiles before and during the storm. ``--blocking`` hashes on the
+event loop, as before passwords were hashed off-loop, for comparison.
+
+Usage (from apps/backend, with DATABASE_URL pointing at a dev database):
+
+    python -m benchmarks.login_storm --logins 64 --concurrency 16
+    python -m benchmarks.login_storm --logins 64 --concurrency 16 --blocking
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+import uuid
+from collections.abc import Callable
+from datetime import datetime, timezone
+from typing import Any
+
+# Rate limiting would throttle the benchmark
+os.environ.setdefault("TESTING", "true")
+
+from httpx import ASGITransport, AsyncClient  # noqa: E402
+from sqlalchemy import text  # noqa: E402
+
+from app.core.database import close_db, create_schema, get_session_factory  # noqa: E402
+from app.core.security import get_password_hash, password_hasher  # noqa: E402
+from app.main import app  # noqa: E402
+
+PASSWORD = "storm-password"
+
+
+async def _create_user() -> tuple[uuid.UUID, uuid.UUID, str]:
+    user_id, tenant_id = uuid.uuid4(), uuid.uuid4()
+    email = f"storm_{user_id.hex[:8]}@example.com"
+    now = datetime.now(timezone.utc)
+    async with get_session_factory()() as session:
+        await session.execute(
+            text(
+                "INSERT INTO tenants (id, name, type, status, created_at, updated_at) "
+                "VALUES (:id, 'Benchmark Tenant', 'authority', 'active', :now, :now)"
+            ),
+            {"id": tenant_id, "now": now},
+        )
+        await session.execute(
+            text(
+                "INSERT INTO users (id, tenant_id, email, hashed_password, "
+                "first_name, last_name, role, is_active, created_at, updated_at) "
+                "VALUES (:id, :tenant_id, :email, :password, 'Storm', 'User', "
+                "'auditor', true, :now, :now)"
+            ),
+            {
+                "id": user_id,
+                "tenant_id": tenant_id,
+                "email": email,
+                "password": get_password_hash(PASSWORD),
+                "now": now,
+            },
+        )
+        await session.commit()
+    return user_id, tenant_id, email
+
+
+async def _delete_user(user_id: uuid.UUID, tenant_id: uuid.UUID) -> None:
+    async with get_session_factory()() as session:
+        await session.execute(text("DELETE FROM users WHERE id = :id"), {"id": user_id})
+        await session.execute(
+            text("DELETE FROM tenants WHERE id = :id"), {"id": tenant_id}
+        )
+        await session.commit()
+
+
+async def _probe(client: AsyncClient, stop: asyncio.Event) -> list[float]:
+    timings = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        response = await client.get("/api/health")
+        timings.append(time.perf_counter() - started)
+        response.raise_for_status()
+        await asyncio.sleep(0.01)
+    return timings
+
+
+async def _storm(
+    client: AsyncClient, email: str, logins: int, concurrency: int
+) -> dict[int, int]:
+    semaphore = asyncio.Semaphore(concurrency)
+    statuses: dict[int, int] = {}
+
+    async def login() -> None:
+        async with semaphore:
+            response = await client.post(
+                "/api/auth/login", data={"username": email, "password": PASSWORD}
+            )
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    await asyncio.gather(*(login() for _ in range(logins)))
+    return statuses
+
+
+def _report(label: str, timings: list[float]) -> None:
+    ordered = sorted(timings)
+    p99 = ordered[max(0, int(len(ordered) * 0.99) - 1)]
+    print(
+        f"{label:<14} n={len(timings):<5} "
+        f"p50 {statistics.median(timings) * 1000:8.2f} ms  "
+        f"p99 {p99 * 1000:8.2f} ms  max {ordered[-1] * 1000:8.2f} ms"
+    )
+
+
+async def main(logins: int, concurrency: int, blocking: bool) -> None:
+    if blocking:
+
+        async def run_inline(func: Callable[..., Any], *args: Any) -> Any:
+            return func(*args)
+
+        password_hasher._run = run_inline  # type: ignore[method-assign]
+
+    await create_schema()
+    user_id, tenant_id, email = await _create_user()
+    try:
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://bench") as client:
+            stop = asyncio.Event()
+            probe = asyncio.create_task(_probe(client, stop))
+            await asyncio.sleep(1.0)
+            stop.set()
+            _report("idle", await probe)
+
+            stop = asyncio.Event()
+            probe = asyncio.create_task(_probe(client, stop))
+            started = time.perf_counter()
+            statuses = await _storm(client, email, logins, concurrency)
+            elapsed = time.perf_counter() - started
+            stop.set()
+            _report("login storm", await probe)
+            print(
+                f"{logins} logins in {elapsed:.2f}s "
+                f"({logins / elapsed:.1f}/s), status codes {statuses}"
+            )
+    finally:
+        await _delete_user(user_id, tenant_id)
+        await close_db()
+        password_hasher.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--blocking", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(main(args.logins, args.concurrency, args.blocking))
@@ -0,0 +1,484 @@
+"""Review the query plans of the SQL emitted by the test suite.
+
+Two steps (from apps/backend, with DATABASE_URL pointing at a dev
+database):
+
+1. Record a query catalog. With QUERY_CATALOG set, the test engine appends
+   every SELECT with its parameters, and the IDs of the tenants the tests
+   create, to a JSON lines file::
+
+       QUERY_CATALOG=/tmp/queries.jsonl python -m pytest -q
+
+2. Explain the catalog against a large dataset. A tenant with generated
+   audit cases, findings, audit log entries and LLM conversations is
+   seeded, each distinct statement is run with EXPLAIN (ANALYZE, BUFFERS)
+   and sequential scans, scans discarding most of their rows in a filter
+   and sorts over large inputs are reported::
+
+       python -m benchmarks.query_plans /tmp/queries.jsonl --cases 100000
+
+Parameters equal to the ID of a tenant created by the tests are replaced
+by the seeded tenant, so that tenant-scoped queries run against the large
+dataset. The seeded tenant is deleted afterwards. Statements are explained
+in a rolled back transaction.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import uuid
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import Any
+
+os.environ.setdefault("TESTING", "true")
+
+from sqlalchemy import event, text  # noqa: E402
+from sqlalchemy.engine import Engine  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncConnection  # noqa: E402
+
+from app.core.database import close_db, create_schema, get_engine  # noqa: E402
+from app.services.audit_log_partitions import ensure_partitions  # noqa: E402
+
+
+# Statements worth explaining (no DML, no catalog or lock queries)
+_SELECT_RE = re.compile(r"^\s*(SELECT|WITH)\b", re.IGNORECASE)
+_SKIP_RE = re.compile(r"pg_catalog|pg_advisory|information_schema|pg_inherits")
+_TENANT_INSERT_RE = re.compile(r"^\s*INSERT INTO tenants \(id,", re.IGNORECASE)
+
+
+# =============================================================================
+# Recording
+# =============================================================================
+
+
+def _encode(value: Any) -> Any:
+    """Encode a statement parameter as JSON, keeping its Python type."""
+    if isinstance(value, uuid.UUID):
+        return {"uuid": str(value)}
+    if isinstance(value, datetime):
+        return {"datetime": value.isoformat()}
+    if isinstance(value, date):
+        return {"date": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"decimal": str(value)}
+    if isinstance(value, (list, tuple)):
+        return [_encode(v) for v in value]
+    return value
+
+
+def _decode(value: Any) -> Any:
+    if isinstance(value, list):
+        return [_decode(v) for v in value]
+    if isinstance(value, dict) and len(value) == 1:
+        ((kind, raw),) = value.items()
+        if kind == "uuid":
+            return uuid.UUID(raw)
+        if kind == "datetime":
+            return datetime.fromisoformat(raw)
+        if kind == "date":
+            return date.fromisoformat(raw)
+        if kind == "decimal":
+            return Decimal(raw)
+    return value
+
+
+def record_queries(engine: Engine, path: str | Path) -> None:
+    """Append the SELECTs executed by an engine to a query catalog.
+
+    Tenants inserted through the engine are recorded as ``{"tenant": id}``.
+
+    Args:
+        engine: Synchronous engine (``AsyncEngine.sync_engine``)
+        path: JSON lines file the statements are appended to
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if executemany:
+            return
+        if _TENANT_INSERT_RE.match(statement):
+            entry: dict[str, Any] = {"tenant": str(parameters[0])}
+        elif _SELECT_RE.match(statement) and not _SKIP_RE.search(statement):
+            entry = {
+                "test": os.environ.get("PYTEST_CURRENT_TEST", "").split(" ")[0],
+                "statement": statement,
+                "parameters": _encode(list(parameters or ())),
+            }
+        else:
+            return
+        with open(path, "a", encoding="utf-8") as catalog:
+            catalog.write(json.dumps(entry, default=str) + "\n")
+
+
+@dataclass
+class CatalogEntry:
+    """A distinct statement of the catalog."""
+
+    statement: str
+    parameters: list[Any]
+    tests: set[str] = field(default_factory=set)
+    executions: int = 0
+
+
+def load_catalog(path: Path) -> tuple[list[CatalogEntry], set[str]]:
+    """Read a query catalog, merging repeated statements.
+
+    Returns:
+        The distinct statements and the IDs of the tenants of the tests
+    """
+    entries: dict[str, CatalogEntry] = {}
+    tenants: set[str] = set()
+    with open(path, encoding="utf-8") as catalog:
+        for line in catalog:
+            raw = json.loads(line)
+            if "tenant" in raw:
+                tenants.add(raw["tenant"])
+                continue
+            entry = entries.setdefault(
+                raw["statement"],
+                CatalogEntry(raw["statement"], _decode(raw["parameters"])),
+            )
+            entry.tests.add(raw["test"])
+            entry.executions += 1
+    return list(entries.values()), tenants
+
+
+# =============================================================================
+# Dataset
+# =============================================================================
+
+
+async def _seed(
+    conn: AsyncConnection, tenant_id: uuid.UUID, cases: int, details: bool = True
+) -> None:
+    """Seed a tenant with audit cases and LLM conversations.
+
+    Args:
+        conn: Connection in a transaction
+        tenant_id: ID of the new tenant
+        cases: Number of audit cases
+        details: Also seed findings and audit log entries of the cases
+    """
+    now = datetime.now(timezone.utc)
+    params = {"tenant_id": tenant_id, "now": now, "cases": cases}
+    await conn.execute(
+        text(
+            "INSERT INTO tenants (id, name, type, status, created_at, updated_at) "
+            "VALUES (:tenant_id, 'Plan Review', 'authority', 'active', :now, :now)"
+        ),
+        params,
+    )
+    await conn.execute(
+        text(
+            """
+            INSERT INTO audit_cases
+                (id, tenant_id, case_number, project_name, beneficiary_name,
+                 status, audit_type, custom_data, is_sample,
+                 requires_follow_up, created_at, updated_at)
+            SELECT
+                gen_random_uuid(), :tenant_id,
+                'PLAN-' || lpad(i::text, 7, '0'),
+                'Projekt ' || i, 'Begünstigter ' || i % 1000,
+                (ARRAY['draft', 'in_progress', 'review', 'completed',
+                       'archived'])[1 + i % 5]::audit_case_status,
+                (ARRAY['operation', 'system', 'accounts'])[1 + i % 3]::audit_type,
+                '{}', i % 10 = 0, false,
+                CAST(:now AS timestamptz) - i * interval '1 minute',
+                CAST(:now AS timestamptz) - i * interval '30 seconds'
+            FROM generate_series(1, :cases) AS i
+            """
+        ),
+        params,
+    )
+    await conn.execute(
+        text(
+            """
+            INSERT INTO llm_conversations
+                (id, tenant_id, context_type, total_tokens, is_active,
+                 created_at, updated_at)
+            SELECT
+                gen_random_uuid(), :tenant_id, 'general', i, i % 4 <> 0,
+                CAST(:now AS timestamptz) - i * interval '5 minutes',
+                CAST(:now AS timestamptz) - i * interval '1 minute'
+            FROM generate_series(1, :cases / 5) AS i
+            """
+        ),
+        params,
+    )
+    if not details:
+        return
+    await conn.execute(
+        text(
+            """
+            INSERT INTO audit_case_findings
+                (id, audit_case_id, finding_number, finding_type, title,
+                 description, is_systemic, status, response_requested,
+                 financial_impact, created_at, updated_at)
+            SELECT
+                gen_random_uuid(), c.id, n,
+                (ARRAY['irregularity', 'deficiency', 'recommendation',
+                       'observation'])[1 + n % 4]::finding_type,
+                'Feststellung ' || n, 'Beschreibung', false,
+                (ARRAY['draft', 'confirmed', 'resolved'])[1 + n % 3]
+                    ::finding_status,
+                false, n * 100, c.created_at, c.created_at
+            FROM audit_cases c, generate_series(1, 2) AS n
+            WHERE c.tenant_id = :tenant_id
+            """
+        ),
+        params,
+    )
+    await conn.execute(
+        text(
+            """
+            INSERT INTO audit_logs
+                (id, tenant_id, entity_type, entity_id, action, description,
+                 created_at, updated_at)
+            SELECT
+                gen_random_uuid(), :tenant_id, 'audit_case', c.id,
+                (ARRAY['create', 'update', 'status_change', 'comment'])
+                    [1 + n % 4]::audit_action,
+                'Eintrag ' || n,
+                c.created_at + n * interval '1 hour',
+                c.created_at + n * interval '1 hour'
+            FROM audit_cases c, generate_series(0, 4) AS n
+            WHERE c.tenant_id = :tenant_id
+            """
+        ),
+        params,
+    )
+
+
+async def _delete(conn: AsyncConnection, tenant_id: uuid.UUID) -> None:
+    # Findings cascade from the cases
+    await conn.execute(
+        text("DELETE FROM audit_logs WHERE tenant_id = :id"), {"id": tenant_id}
+    )
+    await conn.execute(
+        text("DELETE FROM audit_cases WHERE tenant_id = :id"), {"id": tenant_id}
+    )
+    await conn.execute(
+        text("DELETE FROM llm_conversations WHERE tenant_id = :id"),
+        {"id": tenant_id},
+    )
+    await conn.execute(text("DELETE FROM tenants WHERE id = :id"), {"id": tenant_id})
+
+
+# =============================================================================
+# Plans
+# =============================================================================
+
+
+@dataclass
+class PlanReport:
+    """EXPLAIN ANALYZE result of a catalog entry."""
+
+    entry: CatalogEntry
+    execution_ms: float
+    issues: list[str]
+
+
+def _nodes(node: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    yield node
+    for child in node.get("Plans", ()):
+        yield from _nodes(child)
+
+
+def plan_issues(plan: dict[str, Any], min_rows: int) -> list[str]:
+    """Flag plan nodes reading or sorting at least min_rows rows in vain.
+
+    Reported are sequential scans over min_rows rows, scans whose filter
+    discards min_rows rows after the index (a composite index would skip
+    them) and sorts of min_rows input rows or spilling to disk.
+
+    Args:
+        plan: Top node of an EXPLAIN (ANALYZE, FORMAT JSON) plan
+        min_rows: Rows below which nodes are not reported
+
+    Returns:
+        One description per flagged plan node
+    """
+    issues = []
+    for node in _nodes(plan):
+        loops = node.get("Actual Loops", 1)
+        removed = (
+            node.get("Rows Removed by Filter", 0)
+            + node.get("Rows Removed by Index Recheck", 0)
+        ) * loops
+        kind = node["Node Type"]
+        if kind == "Seq Scan":
+            read = node.get("Actual Rows", 0) * loops + removed
+            if read >= min_rows:
+                issues.append(
+                    f"Seq Scan on {node['Relation Name']}: {read} rows read, "
+                    f"filter {node.get('Filter', '-')}"
+                )
+        elif "Relation Name" in node and removed >= min_rows:
+            index = node.get("Index Name") or _index_names(node)
+            issues.append(
+                f"{kind} on {node['Relation Name']} using {index}: "
+                f"{removed} rows removed by filter {node.get('Filter', '-')}"
+            )
+        elif kind == "Sort":
+            sorted_rows = sum(
+                child.get("Actual Rows", 0) * child.get("Actual Loops", 1)
+                for child in node.get("Plans", ())
+            )
+            if sorted_rows >= min_rows or node.get("Sort Space Type") == "Disk":
+                issues.append(
+                    f"Sort of {sorted_rows} rows by {', '.join(node['Sort Key'])} "
+                    f"({node.get('Sort Method')}, {node.get('Sort Space Type')})"
+                )
+    return issues
+
+
+def _index_names(node: dict[str, Any]) -> str:
+    """Indexes of the bitmap index scans below a bitmap heap scan."""
+    names = [n["Index Name"] for n in _nodes(node) if "Index Name" in n]
+    return ", ".join(names) or "-"
+
+
+def _replace_tenants(value: Any, tenants: set[str], tenant_id: uuid.UUID) -> Any:
+    if isinstance(value, list):
+        return [_replace_tenants(v, tenants, tenant_id) for v in value]
+    if isinstance(value, (str, uuid.UUID)) and str(value) in tenants:
+        return tenant_id if isinstance(value, uuid.UUID) else str(tenant_id)
+    return value
+
+
+async def explain(
+    conn: AsyncConnection, statement: str, parameters: list[Any]
+) -> dict[str, Any]:
+    """Run a statement with EXPLAIN (ANALYZE, BUFFERS) and return its plan."""
+    result = await conn.exec_driver_sql(
+        f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}", tuple(parameters)
+    )
+    plan = result.scalar_one()
+    return (json.loads(plan) if isinstance(plan, str) else plan)[0]
+
+
+async def review(
+    entries: list[CatalogEntry],
+    tenants: set[str],
+    tenant_id: uuid.UUID,
+    min_rows: int,
+) -> tuple[list[PlanReport], int]:
+    """Explain all catalog entries.
+
+    Args:
+        entries: Statements of the catalog
+        tenants: Tenant IDs replaced by tenant_id in the parameters
+        tenant_id: Seeded tenant
+        min_rows: Rows below which plan nodes are not reported
+
+    Returns:
+        Reports ordered by execution time, and the number of statements
+        that could not be explained (e.g. referencing rows of a test)
+    """
+    engine = get_engine()
+    reports, failed = [], 0
+    for entry in entries:
+        parameters = _replace_tenants(entry.parameters, tenants, tenant_id)
+        async with engine.connect() as conn:
+            transaction = await conn.begin()
+            try:
+                plan = await explain(conn, entry.statement, parameters)
+            except Exception:
+                failed += 1
+                continue
+            finally:
+                await transaction.rollback()
+        reports.append(
+            PlanReport(
+                entry=entry,
+                execution_ms=plan["Execution Time"],
+                issues=plan_issues(plan["Plan"], min_rows),
+            )
+        )
+    reports.sort(key=lambda r: r.execution_ms, reverse=True)
+    return reports, failed
+
+
+def _print_report(reports: list[PlanReport], failed: int, verbose: bool) -> None:
+    flagged = [r for r in reports if r.issues]
+    print(
+        f"{len(reports)} statements explained, {failed} failed, "
+        f"{len(flagged)} flagged"
+    )
+    for report in reports if verbose else flagged:
+        statement = " ".join(report.entry.statement.split())
+        print()
+        print(f"{report.execution_ms:10.2f} ms  {statement[:300]}")
+        print(f"    from {sorted(report.entry.tests)[0]}")
+        for issue in report.issues:
+            print(f"    ! {issue}")
+
+
+async def main(
+    catalog: Path, cases: int, background: int, min_rows: int, verbose: bool
+) -> None:
+    await create_schema()
+    entries, tenants = load_catalog(catalog)
+    print(
+        f"{len(entries)} distinct statements of {len(tenants)} tenants "
+        f"in {catalog}"
+    )
+
+    tenant_id, other_tenant_id = uuid.uuid4(), uuid.uuid4()
+    engine = get_engine()
+    print(
+        f"Seeding a tenant with {cases} audit cases and another one with "
+        f"{cases * background} ..."
+    )
+    async with engine.begin() as conn:
+        # One case per minute: partitions for the months the seed spans
+        months = cases // (60 * 24 * 28) + 2
+        await ensure_partitions(conn, months_ahead=0, months_back=months)
+        await _seed(conn, tenant_id, cases)
+        # Other tenants make tenant filters selective
+        await _seed(conn, other_tenant_id, cases * background, details=False)
+    # Vacuumed like autovacuum would, so the visibility map allows
+    # index-only scans
+    async with engine.connect() as conn:
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("VACUUM ANALYZE"))
+
+    try:
+        reports, failed = await review(entries, tenants, tenant_id, min_rows)
+        _print_report(reports, failed, verbose)
+    finally:
+        async with engine.begin() as conn:
+            await _delete(conn, tenant_id)
+            await _delete(conn, other_tenant_id)
+        await close_db()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("catalog", type=Path, help="Query catalog (JSON lines)")
+    parser.add_argument("--cases", type=int, default=100_000)
+    parser.add_argument(
+        "--background",
+        type=int,
+        default=4,
+        help="Audit cases of another tenant, as a multiple of --cases",
+    )
+    parser.add_argument(
+        "--min-rows",
+        type=int,
+        default=10_000,
+        help="Report scans and sorts reading at least this many rows",
+    )
+    parser.add_argument(
+        "--verbose", action="store_true", help="List all statements, not only flagged"
+    )
+    args = parser.parse_args()
+    asyncio.run(
+        main(args.catalog, args.cases, args.background, args.min_rows, args.verbose)
+    )
@@ -0,0 +1,93 @@
+"""Benchmark the cold start of an API worker.
+
+Starts fresh interpreters, each importing app.main and running the
+application lifespan up to the point where the worker accepts requests,
+and reports the import and startup times. With --create-all, the former
+startup step (create_all over all models) is timed as well.
+
+Usage (from apps/backend, with DATABASE_URL pointing at a dev database):
+
+    python -m benchmarks.startup --runs 10 --create-all
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Rate limiting would throttle the benchmark
+os.environ.setdefault("TESTING", "true")
+
+
+async def _child(create_all: bool) -> dict[str, float]:
+    """Measure one cold start in this (fresh) interpreter."""
+    started = time.perf_counter()
+    from app.main import app
+
+    imported = time.perf_counter()
+    async with app.router.lifespan_context(app):
+        ready = time.perf_counter()
+        timings = {"import": imported - started, "startup": ready - imported}
+        if create_all:
+            from app.core.database import Base, get_engine
+
+            started = time.perf_counter()
+            async with get_engine().begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            timings["create_all"] = time.perf_counter() - started
+    return timings
+
+
+def _run_child(create_all: bool) -> dict[str, float]:
+    command = [sys.executable, "-m", "benchmarks.startup", "--child"]
+    if create_all:
+        command.append("--create-all")
+    output = subprocess.run(
+        command, check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def _report(label: str, seconds: list[float]) -> None:
+    ms = sorted(s * 1000 for s in seconds)
+    print(
+        f"{label:>10}: median {statistics.median(ms):7.1f} ms, "
+        f"min {ms[0]:7.1f} ms, max {ms[-1]:7.1f} ms"
+    )
+
+
+def main(runs: int, create_all: bool) -> None:
+    from app.core.database import close_db, create_schema
+
+    async def prepare() -> None:
+        await create_schema()
+        await close_db()
+
+    # The lifespan refuses to start on a database without schema
+    asyncio.run(prepare())
+
+    _run_child(create_all)  # Warm up the bytecode cache
+    results = [_run_child(create_all) for _ in range(runs)]
+    for key in results[0]:
+        _report(key, [r[key] for r in results])
+    _report("ready", [r["import"] + r["startup"] for r in results])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument(
+        "--create-all",
+        action="store_true",
+        help="Also time create_all, the former startup step",
+    )
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        print(json.dumps(asyncio.run(_child(args.create_all))))
+    else:
+        main(args.runs, args.create_all)
@@ -16,7 +16,7 @@ from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, Asyn
 
 # Import database config and models
 from app.core.config import settings
-from app.core.database import Base, get_db
+from app.core.database import Base, get_db, get_read_db
 from app.core.security import create_access_token
 
 # Import all models to register them with Base.metadata
@@ -38,6 +38,12 @@ async def db_engine():
         max_overflow=10,
     )
 
+    # Record the executed queries for benchmarks.query_plans
+    if os.environ.get("QUERY_CATALOG"):
+        from benchmarks.query_plans import record_queries
+
+        record_queries(engine.sync_engine, os.environ["QUERY_CATALOG"])
+
     # Create tables
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
@@ -184,7 +190,7 @@ async def client(db_session_factory) -> AsyncGenerator[AsyncClient, None]:
     """Create test client with overridden database dependency."""
     from app.main import app
 
-    # Override the get_db dependency to use the test session
+    # Override the database dependencies to use the test session
     async def override_get_db() -> AsyncGenerator[AsyncSession, None]:
         async with db_session_factory() as session:
             try:
@@ -197,6 +203,7 @@ async def client(db_session_factory) -> AsyncGenerator[AsyncClient, None]:
                 await session.close()
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
 
     transport = ASGITransport(app=app)
     async with AsyncClient(
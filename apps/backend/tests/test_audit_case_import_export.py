@@ -0,0 +1,301 @@
+"""
+Tests for bulk import and export of audit cases.
+"""
+
+import csv
+import io
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from openpyxl import Workbook, load_workbook
+from sqlalchemy import text
+
+from app.services.audit_case_io import XLSX_MEDIA_TYPE
+
+
+def _csv_file(rows: list[list[str]], delimiter: str = ",") -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer, delimiter=delimiter).writerows(rows)
+    return buffer.getvalue().encode()
+
+
+HEADER = ["case_number", "project_name", "beneficiary_name", "audit_type"]
+
+
+@pytest.mark.usefixtures("cleanup_test_cases")
+class TestAuditCaseImport:
+    """Tests for POST /audit-cases/import."""
+
+    @pytest.mark.asyncio
+    async def test_import_csv(
+        self, client: AsyncClient, auth_headers: dict, test_db
+    ):
+        """Test that valid rows are created and invalid rows reported."""
+        content = _csv_file(
+            [
+                HEADER + ["approved_amount", "comment"],
+                ["TEST-IMP-001", "Kläranlage", "Werk", "operation", "1000.50", ""],
+                ["TEST-IMP-002", "Radweg", "Landkreis", "system", "", "x"],
+                ["TEST-IMP-001", "Doppelt", "Werk", "operation", "", ""],
+                ["TEST-IMP-003", "Schule", "Stadt", "unknown", "", ""],
+                ["", "Ohne Nummer", "Stadt", "operation", "", ""],
+            ]
+        )
+
+        response = await client.post(
+            "/api/audit-cases/import",
+            files={"file": ("cases.csv", content, "text/csv")},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_rows"] == 5
+        assert data["created"] == 2
+        assert data["failed"] == 3
+        assert data["dry_run"] is False
+        assert data["ignored_columns"] == ["comment"]
+        errors = {error["row"]: error for error in data["errors"]}
+        assert set(errors) == {4, 5, 6}
+        assert "case_number: existiert bereits" in errors[4]["errors"]
+        assert errors[5]["case_number"] == "TEST-IMP-003"
+        assert errors[5]["errors"][0].startswith("audit_type")
+        assert errors[6]["errors"][0].startswith("case_number")
+
+        result = await test_db.execute(
+            text(
+                "SELECT c.case_number, c.approved_amount, count(l.id) "
+                "FROM audit_cases c LEFT JOIN audit_logs l "
+                "ON l.entity_id = c.id AND l.action = 'create' "
+                "WHERE c.case_number LIKE 'TEST-IMP-%' "
+                "GROUP BY c.id ORDER BY c.case_number"
+            )
+        )
+        rows = result.all()
+        assert [row[0] for row in rows] == ["TEST-IMP-001", "TEST-IMP-002"]
+        assert str(rows[0][1]) == "1000.50"
+        assert all(row[2] == 1 for row in rows)
+
+    @pytest.mark.asyncio
+    async def test_import_existing_case_number(
+        self, client: AsyncClient, auth_headers: dict
+    ):
+        """Test that case numbers already in the database are rejected."""
+        content = _csv_file(
+            [HEADER, ["TEST-IMP-010", "Projekt", "Empfänger", "operation"]]
+        )
+        files = {"file": ("cases.csv", content, "text/csv")}
+
+        first = await client.post(
+            "/api/audit-cases/import", files=files, headers=auth_headers
+        )
+        second = await client.post(
+            "/api/audit-cases/import", files=files, headers=auth_headers
+        )
+
+        assert first.json()["created"] == 1
+        assert second.json()["created"] == 0
+        assert second.json()["errors"][0]["errors"] == [
+            "case_number: existiert bereits"
+        ]
+
+    @pytest.mark.asyncio
+    async def test_import_semicolon_csv(
+        self, client: AsyncClient, auth_headers: dict
+    ):
+        """Test that semicolon separated files (German Excel) are detected."""
+        content = "\ufeff".encode() + _csv_file(
+            [HEADER, ["TEST-IMP-020", "Straßenbau", "Gemeinde Zeitz", "accounts"]],
+            delimiter=";",
+        )
+
+        response = await client.post(
+            "/api/audit-cases/import",
+            files={"file": ("cases.csv", content, "text/csv")},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        assert response.json()["created"] == 1
+
+    @pytest.mark.asyncio
+    async def test_import_xlsx(self, client: AsyncClient, auth_headers: dict):
+        """Test importing an XLSX workbook."""
+        workbook = Workbook()
+        sheet = workbook.active
+        sheet.append(HEADER + ["approved_amount"])
+        sheet.append(["TEST-IMP-030", "Sporthalle", "Stadt Halle", "operation", 2500])
+        sheet.append(["TEST-IMP-031", "Bibliothek", "Stadt Halle", "system", None])
+        buffer = io.BytesIO()
+        workbook.save(buffer)
+
+        response = await client.post(
+            "/api/audit-cases/import",
+            files={"file": ("cases.xlsx", buffer.getvalue(), XLSX_MEDIA_TYPE)},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["created"] == 2
+        assert data["failed"] == 0
+
+    @pytest.mark.asyncio
+    async def test_import_dry_run(
+        self, client: AsyncClient, auth_headers: dict, test_db
+    ):
+        """Test that a dry run validates without creating cases."""
+        content = _csv_file(
+            [HEADER, ["TEST-IMP-040", "Projekt", "Empfänger", "operation"]]
+        )
+
+        response = await client.post(
+            "/api/audit-cases/import",
+            files={"file": ("cases.csv", content, "text/csv")},
+            data={"dry_run": "true"},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        assert response.json()["dry_run"] is True
+        assert response.json()["created"] == 1
+        result = await test_db.execute(
+            text("SELECT count(*) FROM audit_cases WHERE case_number = 'TEST-IMP-040'")
+        )
+        assert result.scalar() == 0
+
+    @pytest.mark.asyncio
+    async def test_import_row_limit(
+        self, client: AsyncClient, auth_headers: dict, monkeypatch
+    ):
+        """Test that files above the row limit are rejected as a whole."""
+        from app.core.config import settings
+
+        monkeypatch.setattr(settings, "import_max_rows", 1)
+        content = _csv_file(
+            [
+                HEADER,
+                ["TEST-IMP-050", "Projekt", "Empfänger", "operation"],
+                ["TEST-IMP-051", "Projekt", "Empfänger", "operation"],
+            ]
+        )
+
+        response = await client.post(
+            "/api/audit-cases/import",
+            files={"file": ("cases.csv", content, "text/csv")},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 413
+
+    @pytest.mark.asyncio
+    async def test_import_unsupported_format(
+        self, client: AsyncClient, auth_headers: dict
+    ):
+        """Test that other file types are rejected."""
+        response = await client.post(
+            "/api/audit-cases/import",
+            files={"file": ("cases.pdf", b"%PDF-1.4", "application/pdf")},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 400
+
+
+@pytest.mark.usefixtures("cleanup_test_cases")
+class TestAuditCaseExport:
+    """Tests for GET /audit-cases/export."""
+
+    @pytest_asyncio.fixture
+    async def imported_cases(self, client: AsyncClient, auth_headers: dict):
+        """Import two cases to export."""
+        content = _csv_file(
+            [
+                HEADER + ["approved_amount"],
+                ["TEST-EXP-001", "Export Alpha", "Empfänger", "operation", "10.00"],
+                ["TEST-EXP-002", "Export Beta", "Empfänger", "system", ""],
+            ]
+        )
+        response = await client.post(
+            "/api/audit-cases/import",
+            files={"file": ("cases.csv", content, "text/csv")},
+            headers=auth_headers,
+        )
+        assert response.json()["created"] == 2
+
+    @pytest.mark.asyncio
+    async def test_export_csv(
+        self, client: AsyncClient, auth_headers: dict, imported_cases
+    ):
+        """Test that the CSV export contains the filtered cases."""
+        response = await client.get(
+            "/api/audit-cases/export",
+            params={"search": "TEST-EXP", "audit_type": "operation"},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        assert "attachment" in response.headers["content-disposition"]
+        rows = list(csv.DictReader(io.StringIO(response.content.decode("utf-8-sig"))))
+        assert [row["case_number"] for row in rows] == ["TEST-EXP-001"]
+        assert rows[0]["approved_amount"] == "10.00"
+        assert rows[0]["status"] == "draft"
+
+    @pytest.mark.asyncio
+    async def test_export_xlsx(
+        self, client: AsyncClient, auth_headers: dict, imported_cases
+    ):
+        """Test that the XLSX export is a readable workbook."""
+        response = await client.get(
+            "/api/audit-cases/export",
+            params={"format": "xlsx", "search": "TEST-EXP"},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == XLSX_MEDIA_TYPE
+        workbook = load_workbook(io.BytesIO(response.content), read_only=True)
+        rows = list(workbook.active.iter_rows(values_only=True))
+        header = rows[0]
+        case_numbers = {row[header.index("case_number")] for row in rows[1:]}
+        assert case_numbers == {"TEST-EXP-001", "TEST-EXP-002"}
+
+    @pytest.mark.asyncio
+    async def test_export_escapes_formulas(
+        self, client: AsyncClient, auth_headers: dict
+    ):
+        """Test that text starting like a formula is exported as plain text."""
+        content = _csv_file(
+            [
+                HEADER,
+                ["TEST-EXP-F01", '=HYPERLINK("http://x")', "@SUM(A1)", "operation"],
+            ]
+        )
+        response = await client.post(
+            "/api/audit-cases/import",
+            files={"file": ("cases.csv", content, "text/csv")},
+            headers=auth_headers,
+        )
+        assert response.json()["created"] == 1
+
+        response = await client.get(
+            "/api/audit-cases/export",
+            params={"search": "TEST-EXP-F01"},
+            headers=auth_headers,
+        )
+        rows = list(csv.DictReader(io.StringIO(response.content.decode("utf-8-sig"))))
+        assert rows[0]["project_name"] == '\'=HYPERLINK("http://x")'
+        assert rows[0]["beneficiary_name"] == "'@SUM(A1)"
+
+        response = await client.get(
+            "/api/audit-cases/export",
+            params={"format": "xlsx", "search": "TEST-EXP-F01"},
+            headers=auth_headers,
+        )
+        workbook = load_workbook(io.BytesIO(response.content))
+        header = [cell.value for cell in workbook.active[1]]
+        cell = workbook.active.cell(row=2, column=header.index("project_name") + 1)
+        assert cell.data_type == "s"
+        assert cell.value == '=HYPERLINK("http://x")'
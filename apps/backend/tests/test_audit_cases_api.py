@@ -141,6 +141,118 @@ class TestAuditCaseCRUD:
         assert "checklists_count" in data
         assert "findings_count" in data
 
+    @pytest.mark.asyncio
+    async def test_get_audit_case_single_statement(
+        self,
+        client: AsyncClient,
+        auth_headers: dict,
+        test_user: dict,
+        test_db,
+        db_engine,
+    ):
+        """Test that case, auditors and counts are loaded in one statement."""
+        from sqlalchemy import event
+
+        case_id = str(uuid.uuid4())
+        now = datetime.now(timezone.utc)
+        await test_db.execute(
+            text(
+                """
+                INSERT INTO audit_cases
+                    (id, tenant_id, case_number, project_name, beneficiary_name,
+                     status, audit_type, custom_data, is_sample, requires_follow_up,
+                     primary_auditor_id, team_leader_id, created_at, updated_at)
+                VALUES
+                    (:id, :tenant_id, 'GET-2024-002', 'Auditor Project',
+                     'Auditor Beneficiary', 'draft', 'operation', '{}', false, false,
+                     :user_id, :user_id, :now, :now)
+                """
+            ),
+            {
+                "id": uuid.UUID(case_id),
+                "tenant_id": uuid.UUID(test_user["tenant_id"]),
+                "user_id": uuid.UUID(test_user["id"]),
+                "now": now,
+            },
+        )
+        await test_db.execute(
+            text(
+                """
+                INSERT INTO audit_case_findings
+                    (id, audit_case_id, finding_number, finding_type, title,
+                     description, status, is_systemic, response_requested,
+                     created_at, updated_at)
+                VALUES
+                    (:id, :case_id, 1, 'deficiency', 'Finding', 'Description',
+                     'draft', false, false, :now, :now)
+                """
+            ),
+            {"id": uuid.uuid4(), "case_id": uuid.UUID(case_id), "now": now},
+        )
+        await test_db.commit()
+
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if "audit_case" in statement:
+                statements.append(statement)
+
+        event.listen(db_engine.sync_engine, "before_cursor_execute", record)
+        try:
+            response = await client.get(
+                f"/api/audit-cases/{case_id}", headers=auth_headers
+            )
+        finally:
+            event.remove(db_engine.sync_engine, "before_cursor_execute", record)
+
+        assert response.status_code == 200
+        assert len(statements) == 1
+        data = response.json()
+        assert data["findings_count"] == 1
+        assert data["checklists_count"] == 0
+        assert data["primary_auditor"]["id"] == test_user["id"]
+        assert data["team_leader"]["id"] == test_user["id"]
+        assert data["secondary_auditor"] is None
+
+        await test_db.execute(
+            text("DELETE FROM audit_case_findings WHERE audit_case_id = :id"),
+            {"id": uuid.UUID(case_id)},
+        )
+        await test_db.commit()
+
+    @pytest.mark.asyncio
+    async def test_get_audit_case_response_cache(
+        self, client: AsyncClient, auth_headers: dict, test_user: dict, test_db
+    ):
+        """Test that unchanged cases are served from the response cache."""
+        from app.api.audit_cases import detail_cache
+
+        response = await client.post(
+            "/api/audit-cases",
+            json={
+                "case_number": "GET-2024-003",
+                "project_name": "Cached Project",
+                "beneficiary_name": "Cached Beneficiary",
+                "audit_type": "operation",
+            },
+            headers=auth_headers,
+        )
+        case_id = response.json()["id"]
+        url = f"/api/audit-cases/{case_id}"
+
+        first = await client.get(url, headers=auth_headers)
+        hits = detail_cache.hits
+        second = await client.get(url, headers=auth_headers)
+        assert detail_cache.hits == hits + 1
+        assert second.json() == first.json()
+
+        # An update changes updated_at and thus the cache key
+        await client.patch(
+            url, json={"project_name": "Renamed Project"}, headers=auth_headers
+        )
+        third = await client.get(url, headers=auth_headers)
+        assert third.json()["project_name"] == "Renamed Project"
+
     @pytest.mark.asyncio
     async def test_update_audit_case(
         self, client: AsyncClient, auth_headers: dict, test_user: dict, test_db
@@ -436,6 +548,213 @@ class TestAuditCaseFiltering:
         assert any("FILTER-003" in item["case_number"] for item in data["items"])
 
 
+class TestAuditCaseSearch:
+    """Tests for ranked audit case search."""
+
+    @pytest_asyncio.fixture
+    async def search_cases(self, test_db, test_user) -> dict:
+        """Create cases sharing a unique search word in different fields."""
+        word = f"Kanal{uuid.uuid4().hex[:8]}"
+        now = datetime.now(timezone.utc)
+        test_cases = [
+            ("in_beneficiary", f"FILTER-S-{word}-1", "Other Project", f"{word} GmbH"),
+            ("in_project", f"FILTER-S-{word}-2", f"Sanierung {word}", "Stadt"),
+            ("in_number", f"{word.upper()}-2024-7", "Other Project", "Stadt"),
+        ]
+
+        ids = {}
+        for key, case_number, project_name, beneficiary in test_cases:
+            case_id = str(uuid.uuid4())
+            await test_db.execute(
+                text(
+                    """
+                    INSERT INTO audit_cases
+                        (id, tenant_id, case_number, project_name, beneficiary_name,
+                         status, audit_type, custom_data, is_sample,
+                         requires_follow_up, created_at, updated_at)
+                    VALUES
+                        (:id, :tenant_id, :case_number, :project_name,
+                         :beneficiary, 'draft', 'operation', '{}', false, false,
+                         :now, :now)
+                    """
+                ),
+                {
+                    "id": uuid.UUID(case_id),
+                    "tenant_id": uuid.UUID(test_user["tenant_id"]),
+                    "case_number": case_number,
+                    "project_name": project_name,
+                    "beneficiary": beneficiary,
+                    "now": now,
+                },
+            )
+            ids[key] = case_id
+        await test_db.commit()
+
+        yield {"word": word, "ids": ids}
+
+        await test_db.execute(
+            text("DELETE FROM audit_cases WHERE id = ANY(:ids)"),
+            {"ids": [uuid.UUID(case_id) for case_id in ids.values()]},
+        )
+        await test_db.commit()
+
+    @pytest.mark.asyncio
+    async def test_search_ranks_case_number_first(
+        self, client: AsyncClient, auth_headers: dict, search_cases: dict
+    ):
+        """Test that hits are ranked case number > project > beneficiary."""
+        response = await client.get(
+            "/api/audit-cases/search",
+            params={"q": search_cases["word"]},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        items = response.json()["items"]
+        ids = search_cases["ids"]
+        assert [item["id"] for item in items] == [
+            ids["in_number"],
+            ids["in_project"],
+            ids["in_beneficiary"],
+        ]
+        assert items[0]["score"] > items[1]["score"] > items[2]["score"]
+
+    @pytest.mark.asyncio
+    async def test_search_prefix_and_case_insensitive(
+        self, client: AsyncClient, auth_headers: dict, search_cases: dict
+    ):
+        """Test that word prefixes match regardless of case."""
+        prefix = search_cases["word"][:-2].lower()
+        response = await client.get(
+            "/api/audit-cases/search",
+            params={"q": f"sanierung {prefix}"},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        items = response.json()["items"]
+        assert [item["id"] for item in items] == [search_cases["ids"]["in_project"]]
+
+    @pytest.mark.asyncio
+    async def test_search_typo_tolerance(
+        self,
+        client: AsyncClient,
+        auth_headers: dict,
+        search_cases: dict,
+        test_db,
+    ):
+        """Test that misspelled terms still match when pg_trgm is installed."""
+        from app.services.audit_search import trigram_available
+
+        if not await trigram_available(test_db):
+            pytest.skip("pg_trgm extension not installed")
+
+        word = search_cases["word"]
+        typo = word[:3] + word[4:]  # drop one letter
+        response = await client.get(
+            "/api/audit-cases/search", params={"q": typo}, headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        assert response.json()["fuzzy"] is True
+        found = {item["id"] for item in response.json()["items"]}
+        assert search_cases["ids"]["in_project"] in found
+
+    @pytest.mark.asyncio
+    async def test_search_case_number_parts_without_trigram(
+        self,
+        client: AsyncClient,
+        auth_headers: dict,
+        search_cases: dict,
+        monkeypatch,
+    ):
+        """Test that year and serial of a case number match without pg_trgm."""
+        from app.services import audit_search
+
+        monkeypatch.setattr(audit_search, "_trigram_available", False)
+        in_number = search_cases["ids"]["in_number"]
+        word = search_cases["word"].lower()
+
+        for q in [f"{word}-2024", "2024-7", f"{word[4:]}-2024-7"]:
+            response = await client.get(
+                "/api/audit-cases/search", params={"q": q}, headers=auth_headers
+            )
+            assert response.status_code == 200
+            assert in_number in {item["id"] for item in response.json()["items"]}
+
+    @pytest.mark.asyncio
+    async def test_search_substring_without_trigram(
+        self,
+        client: AsyncClient,
+        auth_headers: dict,
+        search_cases: dict,
+        monkeypatch,
+    ):
+        """Test that infixes of names match without pg_trgm."""
+        from app.services import audit_search
+
+        monkeypatch.setattr(audit_search, "_trigram_available", False)
+        infix = search_cases["word"][2:-1]
+
+        response = await client.get(
+            "/api/audit-cases/search", params={"q": infix}, headers=auth_headers
+        )
+        list_response = await client.get(
+            "/api/audit-cases", params={"search": infix}, headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        assert {item["id"] for item in response.json()["items"]} == set(
+            search_cases["ids"].values()
+        )
+        assert list_response.status_code == 200
+        assert {item["id"] for item in list_response.json()["items"]} == set(
+            search_cases["ids"].values()
+        )
+
+    @pytest.mark.asyncio
+    async def test_search_filter_trigram_keeps_substring_match(
+        self, search_cases: dict, test_db
+    ):
+        """Test that short infixes, dissimilar as trigrams, still match."""
+        from sqlalchemy import select
+
+        from app.models.audit_case import AuditCase
+        from app.services.audit_search import search_filter, trigram_available
+
+        if not await trigram_available(test_db):
+            pytest.skip("pg_trgm extension not installed")
+
+        infix = search_cases["word"][3:7].upper()
+        result = await test_db.execute(
+            select(AuditCase.id).where(search_filter(infix, trigram=True))
+        )
+
+        found = {str(case_id) for case_id in result.scalars()}
+        assert set(search_cases["ids"].values()) <= found
+
+    @pytest.mark.asyncio
+    async def test_search_requires_query(
+        self, client: AsyncClient, auth_headers: dict
+    ):
+        """Test that an empty query is rejected."""
+        response = await client.get(
+            "/api/audit-cases/search?q=", headers=auth_headers
+        )
+        assert response.status_code == 422
+
+    @pytest.mark.asyncio
+    async def test_search_special_characters(
+        self, client: AsyncClient, auth_headers: dict
+    ):
+        """Test that LIKE wildcards and tsquery syntax are treated literally."""
+        for q in ["%", "_", "a & b | !c", "foo:*", "'"]:
+            response = await client.get(
+                "/api/audit-cases/search", params={"q": q}, headers=auth_headers
+            )
+            assert response.status_code == 200
+
+
 class TestAuditCaseStatistics:
     """Tests for audit case statistics endpoint."""
 
@@ -535,6 +854,152 @@ class TestAuditCaseStatistics:
         assert data["total"] >= 4
         assert "draft" in data["by_status"] or "completed" in data["by_status"]
 
+    @pytest_asyncio.fixture
+    async def fiscal_year_cases(self, test_db, test_user):
+        """Create a fiscal year with its own set of audit cases."""
+        from app.services.audit_statistics import statistics_cache
+
+        fiscal_year_id = str(uuid.uuid4())
+        tenant_id = uuid.UUID(test_user["tenant_id"])
+        now = datetime.now(timezone.utc)
+
+        await test_db.execute(
+            text(
+                """
+                INSERT INTO fiscal_years
+                    (id, tenant_id, year, name, start_date, end_date, status,
+                     config, statistics, created_at, updated_at)
+                VALUES
+                    (:id, :tenant_id, 2031, 'Stats 2031', :start, :end, 'active',
+                     '{}', '{}', :now, :now)
+                """
+            ),
+            {
+                "id": uuid.UUID(fiscal_year_id),
+                "tenant_id": tenant_id,
+                "start": date(2031, 1, 1),
+                "end": date(2031, 12, 31),
+                "now": now,
+            },
+        )
+
+        test_cases = [
+            ("STAT-FY-1", "draft", None, "operation", "0.10", None),
+            ("STAT-FY-2", "completed", "no_findings", "operation", "0.20", "0.00"),
+            ("STAT-FY-3", "completed", "irregularity", "system", "0.30", "0.10"),
+        ]
+        for case_number, status, result, audit_type, audited, irregular in test_cases:
+            await test_db.execute(
+                text(
+                    """
+                    INSERT INTO audit_cases
+                        (id, tenant_id, fiscal_year_id, case_number, project_name,
+                         beneficiary_name, status, result, audit_type,
+                         audited_amount, irregular_amount, custom_data, is_sample,
+                         requires_follow_up, created_at, updated_at)
+                    VALUES
+                        (:id, :tenant_id, :fiscal_year_id, :case_number,
+                         'Stats Project', 'Stats Beneficiary', :status, :result,
+                         :audit_type, :audited, :irregular, '{}', false, false,
+                         :now, :now)
+                    """
+                ),
+                {
+                    "id": uuid.uuid4(),
+                    "tenant_id": tenant_id,
+                    "fiscal_year_id": uuid.UUID(fiscal_year_id),
+                    "case_number": case_number,
+                    "status": status,
+                    "result": result,
+                    "audit_type": audit_type,
+                    "audited": Decimal(audited),
+                    "irregular": Decimal(irregular) if irregular else None,
+                    "now": now,
+                },
+            )
+        await test_db.commit()
+        statistics_cache.clear()
+
+        yield fiscal_year_id
+
+        await test_db.execute(
+            text("DELETE FROM audit_cases WHERE fiscal_year_id = :id"),
+            {"id": uuid.UUID(fiscal_year_id)},
+        )
+        await test_db.execute(
+            text("DELETE FROM fiscal_years WHERE id = :id"),
+            {"id": uuid.UUID(fiscal_year_id)},
+        )
+        await test_db.commit()
+        statistics_cache.clear()
+
+    @pytest.mark.asyncio
+    async def test_statistics_exact_aggregates(
+        self,
+        client: AsyncClient,
+        auth_headers: dict,
+        fiscal_year_cases: str,
+    ):
+        """Test grouped counts and exact decimal sums for one fiscal year."""
+        response = await client.get(
+            f"/api/audit-cases/statistics?fiscal_year_id={fiscal_year_cases}",
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 3
+        assert data["by_status"] == {"draft": 1, "completed": 2}
+        assert data["by_result"] == {"no_findings": 1, "irregularity": 1}
+        assert data["by_type"] == {"operation": 2, "system": 1}
+        # 0.1 + 0.2 + 0.3 is not 0.6 in binary floating point
+        assert Decimal(data["total_audited_amount"]) == Decimal("0.60")
+        assert Decimal(data["total_irregular_amount"]) == Decimal("0.10")
+        assert data["error_rate"] == 16.67
+
+    @pytest.mark.asyncio
+    async def test_statistics_snapshot_invalidated_on_write(
+        self,
+        client: AsyncClient,
+        auth_headers: dict,
+        fiscal_year_cases: str,
+        test_db,
+        test_user,
+    ):
+        """Test that snapshots are served until a case write invalidates them."""
+        url = f"/api/audit-cases/statistics?fiscal_year_id={fiscal_year_cases}"
+        first = (await client.get(url, headers=auth_headers)).json()
+
+        # A write that bypasses the API is not seen while the snapshot is fresh
+        await test_db.execute(
+            text(
+                "UPDATE audit_cases SET status = 'archived' "
+                "WHERE fiscal_year_id = :id AND status = 'draft'"
+            ),
+            {"id": uuid.UUID(fiscal_year_cases)},
+        )
+        await test_db.commit()
+        assert (await client.get(url, headers=auth_headers)).json() == first
+
+        # Creating a case through the API drops the snapshot
+        response = await client.post(
+            "/api/audit-cases",
+            json={
+                "case_number": "STAT-FY-4",
+                "project_name": "Stats Project",
+                "beneficiary_name": "Stats Beneficiary",
+                "audit_type": "accounts",
+                "fiscal_year_id": fiscal_year_cases,
+            },
+            headers=auth_headers,
+        )
+        assert response.status_code == 201
+
+        data = (await client.get(url, headers=auth_headers)).json()
+        assert data["total"] == 4
+        assert data["by_status"] == {"archived": 1, "completed": 2, "draft": 1}
+        assert data["by_type"]["accounts"] == 1
+
 
 class TestAuditCaseChecklists:
     """Tests for audit case embedded checklists."""
@@ -832,3 +1297,215 @@ class TestAuditCaseCleanup:
             await test_db.commit()
         except Exception:
             await test_db.rollback()
+
+
+@pytest.mark.usefixtures("cleanup_test_cases")
+class TestAuditCaseBulkUpdate:
+    """Tests for POST /audit-cases/bulk-update."""
+
+    @pytest_asyncio.fixture
+    async def bulk_cases(self, test_db, test_user) -> list[str]:
+        """Create audit cases for bulk updates."""
+        ids = []
+        now = datetime.now(timezone.utc)
+        for number, status in [
+            ("TEST-BULK-001", "review"),
+            ("TEST-BULK-002", "review"),
+            ("TEST-BULK-003", "completed"),
+            ("TEST-BULK-004", "draft"),
+        ]:
+            case_id = uuid.uuid4()
+            await test_db.execute(
+                text(
+                    """
+                    INSERT INTO audit_cases
+                        (id, tenant_id, case_number, project_name, beneficiary_name,
+                         status, audit_type, custom_data, is_sample,
+                         requires_follow_up, created_at, updated_at)
+                    VALUES
+                        (:id, :tenant_id, :case_number, 'Bulk Project',
+                         'Bulk Beneficiary', :status, 'operation', '{}',
+                         false, false, :now, :now)
+                    """
+                ),
+                {
+                    "id": case_id,
+                    "tenant_id": uuid.UUID(test_user["tenant_id"]),
+                    "case_number": number,
+                    "status": status,
+                    "now": now,
+                },
+            )
+            ids.append(str(case_id))
+        await test_db.commit()
+        return ids
+
+    async def _statuses(self, test_db, ids: list[str]) -> list[str]:
+        result = await test_db.execute(
+            text(
+                "SELECT status FROM audit_cases WHERE id = ANY(:ids) "
+                "ORDER BY case_number"
+            ),
+            {"ids": [uuid.UUID(i) for i in ids]},
+        )
+        return list(result.scalars().all())
+
+    @pytest.mark.asyncio
+    async def test_bulk_update_by_filter(
+        self, client: AsyncClient, auth_headers: dict, bulk_cases, test_db
+    ):
+        """Test moving all filtered cases to a new status."""
+        response = await client.post(
+            "/api/audit-cases/bulk-update",
+            json={
+                "filter": {"status": "review", "search": "TEST-BULK"},
+                "changes": {"status": "completed"},
+            },
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["affected"] == 2
+        assert {item["case_number"] for item in data["items"]} == {
+            "TEST-BULK-001",
+            "TEST-BULK-002",
+        }
+        assert data["items"][0]["changes"] == {
+            "status": {"old": "review", "new": "completed"}
+        }
+        assert await self._statuses(test_db, bulk_cases) == [
+            "completed",
+            "completed",
+            "completed",
+            "draft",
+        ]
+
+        result = await test_db.execute(
+            text(
+                "SELECT count(*) FROM audit_logs "
+                "WHERE entity_id = ANY(:ids) AND action = 'status_change'"
+            ),
+            {"ids": [uuid.UUID(i) for i in bulk_cases]},
+        )
+        assert result.scalar() == 2
+
+    @pytest.mark.asyncio
+    async def test_bulk_update_by_ids_skips_unchanged(
+        self,
+        client: AsyncClient,
+        auth_headers: dict,
+        bulk_cases,
+        test_user: dict,
+        test_db,
+    ):
+        """Test reassigning listed cases; cases already matching are skipped."""
+        payload = {
+            "ids": bulk_cases[:3],
+            "changes": {"primary_auditor_id": test_user["id"], "status": "completed"},
+        }
+        response = await client.post(
+            "/api/audit-cases/bulk-update", json=payload, headers=auth_headers
+        )
+        assert response.status_code == 200
+        assert response.json()["affected"] == 3
+        changes = {i["case_number"]: i["changes"] for i in response.json()["items"]}
+        assert set(changes["TEST-BULK-003"]) == {"primary_auditor_id"}
+
+        again = await client.post(
+            "/api/audit-cases/bulk-update", json=payload, headers=auth_headers
+        )
+        assert again.json()["affected"] == 0
+
+        result = await test_db.execute(
+            text(
+                "SELECT count(*) FROM audit_cases "
+                "WHERE id = ANY(:ids) AND primary_auditor_id = :user_id"
+            ),
+            {
+                "ids": [uuid.UUID(i) for i in bulk_cases],
+                "user_id": uuid.UUID(test_user["id"]),
+            },
+        )
+        assert result.scalar() == 3
+
+    @pytest.mark.asyncio
+    async def test_bulk_update_dry_run(
+        self, client: AsyncClient, auth_headers: dict, bulk_cases, test_db
+    ):
+        """Test that a dry run reports the changes without applying them."""
+        response = await client.post(
+            "/api/audit-cases/bulk-update",
+            json={
+                "ids": bulk_cases,
+                "changes": {"status": "archived"},
+                "dry_run": True,
+            },
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        assert response.json()["dry_run"] is True
+        assert response.json()["affected"] == 4
+        assert "archived" not in await self._statuses(test_db, bulk_cases)
+
+    @pytest.mark.asyncio
+    async def test_bulk_update_limit(
+        self, client: AsyncClient, auth_headers: dict, bulk_cases, test_db
+    ):
+        """Test that nothing changes if more cases than allowed match."""
+        response = await client.post(
+            "/api/audit-cases/bulk-update",
+            json={
+                "ids": bulk_cases,
+                "changes": {"status": "archived"},
+                "max_affected": 3,
+            },
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 409
+        assert "archived" not in await self._statuses(test_db, bulk_cases)
+
+    @pytest.mark.asyncio
+    async def test_bulk_update_invalid(
+        self, client: AsyncClient, auth_headers: dict, bulk_cases
+    ):
+        """Test rejection of invalid selections and values."""
+        url = "/api/audit-cases/bulk-update"
+        both = await client.post(
+            url,
+            json={"ids": bulk_cases, "filter": {}, "changes": {"status": "draft"}},
+            headers=auth_headers,
+        )
+        no_changes = await client.post(
+            url, json={"ids": bulk_cases, "changes": {}}, headers=auth_headers
+        )
+        bad_status = await client.post(
+            url,
+            json={"ids": bulk_cases, "changes": {"status": "unknown"}},
+            headers=auth_headers,
+        )
+        foreign_user = await client.post(
+            url,
+            json={
+                "ids": bulk_cases,
+                "changes": {"primary_auditor_id": str(uuid.uuid4())},
+            },
+            headers=auth_headers,
+        )
+
+        cleared = [
+            await client.post(
+                url,
+                json={"ids": bulk_cases, "changes": {field: None}},
+                headers=auth_headers,
+            )
+            for field in ("status", "audit_type", "is_sample", "requires_follow_up")
+        ]
+
+        assert both.status_code == 422
+        assert no_changes.status_code == 422
+        assert bad_status.status_code == 400
+        assert foreign_user.status_code == 400
+        assert [response.status_code for response in cleared] == [400] * 4
@@ -0,0 +1,224 @@
+"""Tests for the streaming audit trail export."""
+
+import csv
+import gzip
+import io
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import text
+
+from app.services import audit_log_export
+
+
+START = datetime(2002, 3, 1, tzinfo=timezone.utc)
+ACTIONS = ["create", "update", "comment", "update", "status_change"]
+
+
+@pytest_asyncio.fixture
+async def trail_case(test_db, test_user: dict) -> dict:
+    """Audit case with five audit log entries, one day apart, in 2002."""
+    case_id = uuid.uuid4()
+    tenant_id = uuid.UUID(test_user["tenant_id"])
+    now = datetime.now(timezone.utc)
+    await test_db.execute(
+        text(
+            """
+            INSERT INTO audit_cases (id, tenant_id, case_number, project_name,
+                beneficiary_name, status, audit_type, is_sample,
+                requires_follow_up, custom_data, created_at, updated_at)
+            VALUES (:id, :tenant_id, 'TEST-TRAIL-001', 'Prüfpfad',
+                'Begünstigter', 'draft', 'operation', false, false, '{}',
+                :now, :now)
+            """
+        ),
+        {"id": case_id, "tenant_id": tenant_id, "now": now},
+    )
+    for day, action in enumerate(ACTIONS):
+        created_at = START + timedelta(days=day)
+        await test_db.execute(
+            text(
+                """
+                INSERT INTO audit_logs (id, tenant_id, entity_type, entity_id,
+                    action, description, changes, created_at, updated_at)
+                VALUES (:id, :tenant_id, 'audit_case', :case_id, :action,
+                    :description, :changes, :created_at, :created_at)
+                """
+            ),
+            {
+                "id": uuid.uuid4(),
+                "tenant_id": tenant_id,
+                "case_id": case_id,
+                "action": action,
+                "description": f"Schritt {day}",
+                "changes": json.dumps({"schritt": day}),
+                "created_at": created_at,
+            },
+        )
+    await test_db.commit()
+
+    yield {"id": str(case_id)}
+
+    await test_db.execute(
+        text("DELETE FROM audit_logs WHERE entity_id = :id"), {"id": case_id}
+    )
+    await test_db.execute(
+        text("DELETE FROM audit_cases WHERE id = :id"), {"id": case_id}
+    )
+    await test_db.commit()
+
+
+def ndjson(content: bytes) -> list[dict]:
+    return [json.loads(line) for line in content.decode().splitlines()]
+
+
+class TestAuditLogExport:
+    """Tests for GET /audit-cases/{case_id}/history/export."""
+
+    @pytest.mark.asyncio
+    async def test_export_ndjson(
+        self, client: AsyncClient, auth_headers: dict, trail_case: dict
+    ):
+        """Test that the NDJSON export holds all entries, oldest first."""
+        response = await client.get(
+            f"/api/audit-cases/{trail_case['id']}/history/export",
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert "attachment" in response.headers["content-disposition"]
+        records = ndjson(response.content)
+        assert [r["description"] for r in records] == [
+            f"Schritt {day}" for day in range(5)
+        ]
+        assert records[2]["changes"] == {"schritt": 2}
+        assert records[0]["created_at"].startswith("2002-03-01")
+
+    @pytest.mark.asyncio
+    async def test_export_csv_with_filters(
+        self, client: AsyncClient, auth_headers: dict, trail_case: dict
+    ):
+        """Test the CSV export with action and time range filters."""
+        response = await client.get(
+            f"/api/audit-cases/{trail_case['id']}/history/export",
+            params={
+                "format": "csv",
+                "action": ["update", "status_change"],
+                "until": "2002-03-05T00:00:00Z",
+            },
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        rows = list(csv.DictReader(io.StringIO(response.content.decode("utf-8-sig"))))
+        assert [row["description"] for row in rows] == ["Schritt 1", "Schritt 3"]
+        assert json.loads(rows[1]["changes"]) == {"schritt": 3}
+        assert rows[0]["cursor"]
+
+    @pytest.mark.asyncio
+    async def test_export_csv_escapes_formulas(
+        self, client: AsyncClient, auth_headers: dict, trail_case: dict
+    ):
+        """Test that user text starting like a formula is exported as text."""
+        url = f"/api/audit-cases/{trail_case['id']}/history"
+        comment = await client.post(
+            url,
+            json={"action": "comment", "description": "=HYPERLINK(\"http://x\")"},
+            headers=auth_headers,
+        )
+        assert comment.status_code == 201
+
+        response = await client.get(
+            f"{url}/export",
+            params={"format": "csv", "since": "2010-01-01T00:00:00Z"},
+            headers=auth_headers,
+        )
+        plain = await client.get(
+            f"{url}/export",
+            params={"since": "2010-01-01T00:00:00Z"},
+            headers=auth_headers,
+        )
+
+        rows = list(csv.DictReader(io.StringIO(response.content.decode("utf-8-sig"))))
+        assert [row["description"] for row in rows] == ['\'=HYPERLINK("http://x")']
+        assert ndjson(plain.content)[0]["description"] == '=HYPERLINK("http://x")'
+
+    @pytest.mark.asyncio
+    async def test_export_gzip(
+        self, client: AsyncClient, auth_headers: dict, trail_case: dict
+    ):
+        """Test the compressed export."""
+        response = await client.get(
+            f"/api/audit-cases/{trail_case['id']}/history/export",
+            params={"compress": True},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/gzip"
+        assert '.ndjson.gz"' in response.headers["content-disposition"]
+        assert len(ndjson(gzip.decompress(response.content))) == 5
+
+    @pytest.mark.asyncio
+    async def test_export_resumes_after_cursor(
+        self,
+        client: AsyncClient,
+        auth_headers: dict,
+        trail_case: dict,
+        monkeypatch,
+    ):
+        """Test that an export resumes after the cursor of an entry."""
+        # Several batches per export
+        monkeypatch.setattr(audit_log_export, "EXPORT_BATCH_SIZE", 2)
+        url = f"/api/audit-cases/{trail_case['id']}/history/export"
+        records = ndjson((await client.get(url, headers=auth_headers)).content)
+
+        response = await client.get(
+            url, params={"cursor": records[1]["cursor"]}, headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        assert ndjson(response.content) == records[2:]
+
+    @pytest.mark.asyncio
+    async def test_export_rejects_bad_input(
+        self, client: AsyncClient, auth_headers: dict, trail_case: dict
+    ):
+        """Test that invalid cursors and actions fail before streaming."""
+        url = f"/api/audit-cases/{trail_case['id']}/history/export"
+
+        response = await client.get(
+            url, params={"cursor": "kein-cursor"}, headers=auth_headers
+        )
+        assert response.status_code == 400
+
+        response = await client.get(
+            url, params={"action": "erfunden"}, headers=auth_headers
+        )
+        assert response.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_export_tenant_trail(
+        self, client: AsyncClient, auth_headers: dict, trail_case: dict
+    ):
+        """Test the tenant-wide export with an entity type filter."""
+        response = await client.get(
+            "/api/audit-logs/export",
+            params={
+                "entity_type": "audit_case",
+                "since": START.isoformat(),
+                "until": (START + timedelta(days=30)).isoformat(),
+            },
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        records = ndjson(response.content)
+        assert {r["entity_id"] for r in records} == {trail_case["id"]}
+        assert len(records) == 5
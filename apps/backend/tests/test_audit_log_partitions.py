@@ -0,0 +1,290 @@
+"""Tests for the monthly partitions of the audit log.
+
+Partition DDL is transactional: every test works in a transaction on
+months of 2001 and rolls it back. Archival commits per partition; its
+tests drop the partitions of 2001 afterwards.
+"""
+
+import gzip
+import uuid
+from datetime import date, datetime, timezone
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import text
+
+from app.services.audit_log_partitions import (
+    PartitionError,
+    add_months,
+    archive_partitions,
+    ensure_partitions,
+    list_partitions,
+    parse_partition_name,
+    partition_name,
+    restore_partition,
+)
+
+
+@pytest_asyncio.fixture
+async def conn(db_engine):
+    """Connection in a transaction that is rolled back after the test."""
+    async with db_engine.connect() as connection:
+        transaction = await connection.begin()
+        yield connection
+        await transaction.rollback()
+
+
+@pytest_asyncio.fixture
+async def committing_conn(db_engine):
+    """Connection outside a transaction; drops the 2001 partitions afterwards."""
+    async with db_engine.connect() as connection:
+        yield connection
+        await connection.rollback()
+        async with connection.begin():
+            for partition in await list_partitions(connection):
+                if partition.month.year == 2001:
+                    await connection.execute(text(f"DROP TABLE {partition.name}"))
+            await connection.execute(
+                text("DELETE FROM audit_logs WHERE created_at < '2002-01-01'")
+            )
+
+
+@pytest_asyncio.fixture
+async def tenant_id(test_db, test_user: dict) -> str:
+    """Tenant of the test user (ends the session's transaction, whose lock on
+    users would block detaching partitions)."""
+    await test_db.rollback()
+    return test_user["tenant_id"]
+
+
+async def insert_log(conn, tenant_id: str, created_at: datetime) -> str:
+    log_id = str(uuid.uuid4())
+    await conn.execute(
+        text(
+            """
+            INSERT INTO audit_logs (id, tenant_id, entity_type, entity_id,
+                action, description, created_at, updated_at)
+            VALUES (:id, :tenant_id, 'audit_case', :entity_id, 'comment',
+                'Partitionstest', :created_at, :created_at)
+            """
+        ),
+        {
+            "id": uuid.UUID(log_id),
+            "tenant_id": uuid.UUID(tenant_id),
+            "entity_id": uuid.uuid4(),
+            "created_at": created_at,
+        },
+    )
+    return log_id
+
+
+async def partition_of(conn, log_id: str) -> str | None:
+    result = await conn.execute(
+        text("SELECT tableoid::regclass::text FROM audit_logs WHERE id = :id"),
+        {"id": uuid.UUID(log_id)},
+    )
+    return result.scalar_one_or_none()
+
+
+class TestPartitionNames:
+    """Tests for partition naming."""
+
+    def test_name_round_trip(self):
+        """Test that partition names encode their month."""
+        assert partition_name(date(2025, 3, 1)) == "audit_logs_y2025m03"
+        assert parse_partition_name("audit_logs_y2025m03") == date(2025, 3, 1)
+        assert parse_partition_name("audit_logs_default") is None
+
+    def test_add_months_crosses_years(self):
+        """Test month arithmetic across year boundaries."""
+        assert add_months(date(2024, 11, 1), 3) == date(2025, 2, 1)
+        assert add_months(date(2025, 1, 1), -1) == date(2024, 12, 1)
+
+
+class TestAuditLogPartitions:
+    """Tests for partition maintenance, archival and restore."""
+
+    @pytest.mark.asyncio
+    async def test_ensure_partitions_creates_upcoming_months(self, conn):
+        """Test that the current and the next months get partitions."""
+        created = await ensure_partitions(
+            conn, months_ahead=2, today=date(2001, 1, 15)
+        )
+
+        assert created == [
+            "audit_logs_y2001m01",
+            "audit_logs_y2001m02",
+            "audit_logs_y2001m03",
+        ]
+        names = {p.name for p in await list_partitions(conn)}
+        assert set(created) <= names
+        # Idempotent
+        assert not await ensure_partitions(
+            conn, months_ahead=2, today=date(2001, 1, 15)
+        )
+
+    @pytest.mark.asyncio
+    async def test_rows_move_out_of_the_default_partition(
+        self, conn, tenant_id: str
+    ):
+        """Test that a new partition takes over its rows from the default."""
+        log_id = await insert_log(
+            conn, tenant_id, datetime(2001, 5, 10, tzinfo=timezone.utc)
+        )
+        assert await partition_of(conn, log_id) == "audit_logs_default"
+
+        await ensure_partitions(conn, months_ahead=0, today=date(2001, 5, 1))
+
+        assert await partition_of(conn, log_id) == "audit_logs_y2001m05"
+
+    @pytest.mark.asyncio
+    async def test_archive_and_restore(
+        self, committing_conn, tenant_id: str, tmp_path
+    ):
+        """Test that archived partitions are exported, dropped and restored."""
+        conn = committing_conn
+        async with conn.begin():
+            await ensure_partitions(conn, months_ahead=0, today=date(2001, 3, 1))
+            log_id = await insert_log(
+                conn, tenant_id, datetime(2001, 3, 20, tzinfo=timezone.utc)
+            )
+
+        files = await archive_partitions(
+            conn, tmp_path, retention_months=2, today=date(2001, 6, 1)
+        )
+
+        assert files == [tmp_path / "audit_logs_y2001m03.csv.gz"]
+        with gzip.open(files[0], "rt") as archive:
+            assert log_id in archive.read()
+        async with conn.begin():
+            assert await partition_of(conn, log_id) is None
+            assert "audit_logs_y2001m03" not in {
+                p.name for p in await list_partitions(conn)
+            }
+
+            name = await restore_partition(conn, files[0])
+
+            assert name == "audit_logs_y2001m03"
+            assert await partition_of(conn, log_id) == "audit_logs_y2001m03"
+
+    @pytest.mark.asyncio
+    async def test_archive_commits_each_partition(
+        self, committing_conn, tenant_id: str, tmp_path, monkeypatch
+    ):
+        """Test that a failed export keeps the partitions archived before."""
+        from app.services import audit_log_partitions
+
+        conn = committing_conn
+        async with conn.begin():
+            await ensure_partitions(conn, months_ahead=1, today=date(2001, 3, 1))
+            april_log = await insert_log(
+                conn, tenant_id, datetime(2001, 4, 20, tzinfo=timezone.utc)
+            )
+
+        gzip_open = gzip.open
+
+        def failing_open(path, *args, **kwargs):
+            if "2001m04" in str(path):
+                raise OSError("disk full")
+            return gzip_open(path, *args, **kwargs)
+
+        monkeypatch.setattr(audit_log_partitions.gzip, "open", failing_open)
+
+        with pytest.raises(OSError, match="disk full"):
+            await archive_partitions(
+                conn, tmp_path, retention_months=1, today=date(2001, 6, 1)
+            )
+
+        assert sorted(path.name for path in tmp_path.iterdir()) == [
+            "audit_logs_y2001m03.csv.gz"
+        ]
+        async with conn.begin():
+            names = {p.name for p in await list_partitions(conn)}
+            assert "audit_logs_y2001m03" not in names
+            assert await partition_of(conn, april_log) == "audit_logs_y2001m04"
+
+    @pytest.mark.asyncio
+    async def test_restore_rejects_attached_and_unknown_files(self, conn, tmp_path):
+        """Test that restore refuses other files and attached months."""
+        await ensure_partitions(conn, months_ahead=0, today=date(2001, 8, 1))
+        attached = tmp_path / "audit_logs_y2001m08.csv.gz"
+        attached.write_bytes(gzip.compress(b""))
+
+        with pytest.raises(PartitionError):
+            await restore_partition(conn, tmp_path / "export.csv.gz")
+        with pytest.raises(PartitionError):
+            await restore_partition(conn, attached)
+
+
+class TestAuditLogListRange:
+    """Tests for the created_at range of the audit log list."""
+
+    @pytest.mark.asyncio
+    async def test_list_filters_by_time_range(
+        self, client: AsyncClient, auth_headers: dict, test_db, test_user: dict
+    ):
+        """Test the since/until filter of the audit log list."""
+        case_id = uuid.uuid4()
+        now = datetime.now(timezone.utc)
+        await test_db.execute(
+            text(
+                """
+                INSERT INTO audit_cases (id, tenant_id, case_number, project_name,
+                    beneficiary_name, status, audit_type, is_sample,
+                    requires_follow_up, custom_data, created_at, updated_at)
+                VALUES (:id, :tenant_id, 'TEST-PART-001', 'Partitionen',
+                    'Begünstigter', 'draft', 'operation', false, false, '{}',
+                    :now, :now)
+                """
+            ),
+            {
+                "id": case_id,
+                "tenant_id": uuid.UUID(test_user["tenant_id"]),
+                "now": now,
+            },
+        )
+        for created_at in (datetime(2024, 1, 10, tzinfo=timezone.utc), now):
+            await test_db.execute(
+                text(
+                    """
+                    INSERT INTO audit_logs (id, tenant_id, entity_type, entity_id,
+                        action, created_at, updated_at)
+                    VALUES (:id, :tenant_id, 'audit_case', :case_id, 'comment',
+                        :created_at, :created_at)
+                    """
+                ),
+                {
+                    "id": uuid.uuid4(),
+                    "tenant_id": uuid.UUID(test_user["tenant_id"]),
+                    "case_id": case_id,
+                    "created_at": created_at,
+                },
+            )
+        await test_db.commit()
+
+        try:
+            url = f"/api/audit-cases/{case_id}/history"
+            response = await client.get(url, headers=auth_headers)
+            assert response.json()["total"] == 2
+
+            response = await client.get(
+                url,
+                headers=auth_headers,
+                params={
+                    "since": "2024-01-01T00:00:00Z",
+                    "until": "2024-02-01T00:00:00Z",
+                },
+            )
+            assert response.status_code == 200
+            data = response.json()
+            assert data["total"] == 1
+            assert data["items"][0]["created_at"].startswith("2024-01-10")
+        finally:
+            await test_db.execute(
+                text("DELETE FROM audit_logs WHERE entity_id = :id"), {"id": case_id}
+            )
+            await test_db.execute(
+                text("DELETE FROM audit_cases WHERE id = :id"), {"id": case_id}
+            )
+            await test_db.commit()
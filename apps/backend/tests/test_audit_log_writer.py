@@ -0,0 +1,170 @@
+"""Tests for the audit log sink (transactional and buffered modes)."""
+
+import asyncio
+import uuid
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import text
+
+from app.api.audit_logs import audit_log_values, log_audit_event
+from app.core.config import settings
+from app.services import audit_log_writer as writer_module
+from app.services.audit_log_writer import AuditLogWriter
+
+
+@pytest_asyncio.fixture
+async def entity_id(test_db):
+    """Entity ID whose audit log entries are removed after the test."""
+    entity_id = str(uuid.uuid4())
+    yield entity_id
+    await test_db.execute(
+        text("DELETE FROM audit_logs WHERE entity_id = :id"),
+        {"id": uuid.UUID(entity_id)},
+    )
+    await test_db.commit()
+
+
+async def count_entries(test_db, entity_id: str) -> int:
+    result = await test_db.execute(
+        text("SELECT count(*) FROM audit_logs WHERE entity_id = :id"),
+        {"id": uuid.UUID(entity_id)},
+    )
+    return result.scalar_one()
+
+
+def entries(tenant_id: str, entity_id: str, count: int) -> list[dict]:
+    return [
+        audit_log_values(
+            tenant_id=tenant_id,
+            entity_type="audit_case",
+            entity_id=entity_id,
+            action="comment",
+            description=f"Eintrag {i}",
+        )
+        for i in range(count)
+    ]
+
+
+class TestAuditLogWriter:
+    """Tests for the buffered audit log writer."""
+
+    @pytest.mark.asyncio
+    async def test_writes_batches_and_drains_on_stop(
+        self, test_db, db_session_factory, test_user: dict, entity_id: str
+    ):
+        """Test that queued entries are written in batches and on stop."""
+        writer = AuditLogWriter(
+            batch_size=3,
+            flush_interval=60,
+            session_factory=lambda: db_session_factory,
+        )
+        writer.start()
+
+        await writer.put(entries(test_user["tenant_id"], entity_id, 7))
+        await writer.stop()
+
+        assert await count_entries(test_db, entity_id) == 7
+        metrics = writer.metrics()
+        assert metrics["written"] == 7
+        assert metrics["flushes"] == 3
+        assert metrics["queue_depth"] == 0
+        assert metrics["running"] is False
+
+    @pytest.mark.asyncio
+    async def test_flushes_after_interval(
+        self, test_db, db_session_factory, test_user: dict, entity_id: str
+    ):
+        """Test that a partial batch is written after the flush interval."""
+        writer = AuditLogWriter(
+            batch_size=100,
+            flush_interval=0.05,
+            session_factory=lambda: db_session_factory,
+        )
+        writer.start()
+        try:
+            await writer.put(entries(test_user["tenant_id"], entity_id, 2))
+            for _ in range(50):
+                if writer.written:
+                    break
+                await asyncio.sleep(0.02)
+            assert await count_entries(test_db, entity_id) == 2
+        finally:
+            await writer.stop()
+
+    @pytest.mark.asyncio
+    async def test_put_waits_while_queue_is_full(
+        self, test_db, db_session_factory, test_user: dict, entity_id: str
+    ):
+        """Test backpressure of the bounded queue."""
+        writer = AuditLogWriter(
+            batch_size=2,
+            flush_interval=0.01,
+            max_queue=2,
+            session_factory=lambda: db_session_factory,
+        )
+        writer.start()
+
+        await writer.put(entries(test_user["tenant_id"], entity_id, 9))
+        await writer.stop()
+
+        assert writer.dropped == 0
+        assert await count_entries(test_db, entity_id) == 9
+
+    @pytest.mark.asyncio
+    async def test_buffered_mode_is_independent_of_the_request(
+        self,
+        test_db,
+        db_session_factory,
+        test_user: dict,
+        entity_id: str,
+        monkeypatch,
+    ):
+        """Test that buffered entries do not join the caller's transaction."""
+        writer = AuditLogWriter(session_factory=lambda: db_session_factory)
+        monkeypatch.setattr(writer_module, "audit_log_writer", writer)
+        monkeypatch.setattr(settings, "audit_log_mode", "buffered")
+        writer.start()
+
+        async with db_session_factory() as session:
+            await log_audit_event(
+                db=session,
+                tenant_id=test_user["tenant_id"],
+                entity_type="audit_case",
+                entity_id=entity_id,
+                action="comment",
+                description="Gepuffert",
+            )
+            await session.rollback()
+        await writer.stop()
+
+        assert await count_entries(test_db, entity_id) == 1
+
+    @pytest.mark.asyncio
+    async def test_transactional_mode_rolls_back(
+        self, test_db, db_session_factory, test_user: dict, entity_id: str
+    ):
+        """Test that transactional entries share the caller's transaction."""
+        async with db_session_factory() as session:
+            await log_audit_event(
+                db=session,
+                tenant_id=test_user["tenant_id"],
+                entity_type="audit_case",
+                entity_id=entity_id,
+                action="comment",
+            )
+            await session.rollback()
+
+        assert await count_entries(test_db, entity_id) == 0
+
+    @pytest.mark.asyncio
+    async def test_metrics_endpoint(self, client: AsyncClient):
+        """Test the audit log writer metrics endpoint."""
+        response = await client.get("/api/health/audit-log")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["mode"] == "transactional"
+        assert "queue_depth" in data
+        assert "flush_seconds_max" in data
@@ -0,0 +1,269 @@
+"""Tests for authentication and the principal cache."""
+
+import asyncio
+import time
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from passlib.hash import bcrypt
+from sqlalchemy import text
+
+from app.core.principal_cache import PrincipalCache, principal_cache
+from app.core.security import (
+    PasswordHasher,
+    PasswordHasherBusy,
+    create_access_token,
+    password_hasher,
+    pwd_context,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest_asyncio.fixture
+async def fresh_user(test_db, test_user) -> dict:
+    """Create a user of its own so token revocation does not leak."""
+    user_id = uuid.uuid4()
+    email = f"fresh_{user_id.hex[:8]}@example.com"
+    now = datetime.now(timezone.utc)
+    await test_db.execute(
+        text(
+            """
+            INSERT INTO users (
+                id, tenant_id, email, hashed_password,
+                first_name, last_name, role, is_active,
+                created_at, updated_at
+            )
+            VALUES (
+                :id, :tenant_id, :email, :password,
+                'Fresh', 'User', 'auditor', true,
+                :now, :now
+            )
+            """
+        ),
+        {
+            "id": user_id,
+            "tenant_id": uuid.UUID(test_user["tenant_id"]),
+            "email": email,
+            # Deliberately weak rounds: upgraded on the next login
+            "password": bcrypt.using(rounds=4).hash("password123"),
+            "now": now,
+        },
+    )
+    await test_db.commit()
+    yield {"id": str(user_id), "tenant_id": test_user["tenant_id"], "email": email}
+    await test_db.execute(text("DELETE FROM users WHERE id = :id"), {"id": user_id})
+    await test_db.commit()
+
+
+def _headers(user: dict, version: int | None = None) -> dict:
+    data = {"sub": user["id"], "tenant_id": user["tenant_id"], "role": "auditor"}
+    if version is not None:
+        data["ver"] = version
+    return {"Authorization": f"Bearer {create_access_token(data=data)}"}
+
+
+class TestPrincipalCache:
+    """Unit tests for the principal cache."""
+
+    def test_hit_requires_matching_version(self):
+        cache = PrincipalCache(ttl=30.0)
+        cache.set("user", "u1", 0, "principal")
+
+        assert cache.get("user", "u1", 0) == "principal"
+        assert cache.get("user", "u1", 1) is None
+        # A version mismatch drops the entry
+        assert cache.get("user", "u1", 0) is None
+
+    def test_entries_expire(self):
+        clock = FakeClock()
+        cache = PrincipalCache(ttl=30.0, clock=clock)
+        cache.set("user", "u1", 0, "principal")
+
+        clock.now = 29.0
+        assert cache.get("user", "u1", 0) == "principal"
+        clock.now = 31.0
+        assert cache.get("user", "u1", 0) is None
+
+    def test_invalidate_and_kinds(self):
+        cache = PrincipalCache()
+        cache.set("user", "u1", 0, "user")
+        cache.set("vendor", "u1", 0, "vendor")
+
+        cache.invalidate("user", "u1")
+
+        assert cache.get("user", "u1", 0) is None
+        assert cache.get("vendor", "u1", 0) == "vendor"
+
+    def test_bounded(self):
+        cache = PrincipalCache(max_entries=2)
+        for i in range(3):
+            cache.set("user", f"u{i}", 0, i)
+
+        assert len(cache) == 2
+        assert cache.get("user", "u0", 0) is None
+
+    def test_zero_ttl_disables_cache(self):
+        cache = PrincipalCache(ttl=0)
+        cache.set("user", "u1", 0, "principal")
+        assert len(cache) == 0
+
+
+class TestCurrentUserCache:
+    """Tests for get_current_user with the principal cache."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_requests_hit_cache(
+        self, client: AsyncClient, fresh_user: dict
+    ):
+        headers = _headers(fresh_user)
+        first = await client.get("/api/auth/me", headers=headers)
+        hits = principal_cache.hits
+        second = await client.get("/api/auth/me", headers=headers)
+
+        assert first.status_code == second.status_code == 200
+        assert second.json() == first.json()
+        assert principal_cache.hits == hits + 1
+
+    @pytest.mark.asyncio
+    async def test_logout_revokes_tokens(self, client: AsyncClient, fresh_user: dict):
+        headers = _headers(fresh_user)
+        assert (await client.get("/api/auth/me", headers=headers)).status_code == 200
+
+        response = await client.post("/api/auth/logout", headers=headers)
+        assert response.status_code == 204
+
+        assert (await client.get("/api/auth/me", headers=headers)).status_code == 401
+        fresh = _headers(fresh_user, version=1)
+        assert (await client.get("/api/auth/me", headers=fresh)).status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_deactivated_user_rejected_after_invalidation(
+        self, client: AsyncClient, fresh_user: dict, test_db
+    ):
+        headers = _headers(fresh_user)
+        assert (await client.get("/api/auth/me", headers=headers)).status_code == 200
+
+        await test_db.execute(
+            text("UPDATE users SET is_active = false WHERE id = :id"),
+            {"id": uuid.UUID(fresh_user["id"])},
+        )
+        await test_db.commit()
+        principal_cache.invalidate("user", fresh_user["id"])
+
+        assert (await client.get("/api/auth/me", headers=headers)).status_code == 403
+
+
+class TestPasswordHasher:
+    """Tests for off-loop password hashing."""
+
+    @pytest.mark.asyncio
+    async def test_hash_and_verify(self):
+        hasher = PasswordHasher(max_workers=2)
+        hashed = await hasher.hash("secret")
+
+        assert await hasher.verify_and_update("secret", hashed) == (True, None)
+        assert (await hasher.verify_and_update("wrong", hashed))[0] is False
+        hasher.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_event_loop_not_blocked(self):
+        hasher = PasswordHasher(max_workers=4)
+        hashed = pwd_context.hash("secret")
+        gaps = []
+
+        async def heartbeat() -> None:
+            last = time.perf_counter()
+            while True:
+                await asyncio.sleep(0.005)
+                now = time.perf_counter()
+                gaps.append(now - last)
+                last = now
+
+        ticker = asyncio.create_task(heartbeat())
+        results = await asyncio.gather(
+            *(hasher.verify_and_update("secret", hashed) for _ in range(4))
+        )
+        ticker.cancel()
+        hasher.shutdown()
+
+        assert all(valid for valid, _ in results)
+        # Verification takes hundreds of ms; the loop keeps ticking meanwhile
+        assert len(gaps) > 10
+        assert max(gaps) < 0.1
+
+    @pytest.mark.asyncio
+    async def test_full_queue_fails_fast(self):
+        hasher = PasswordHasher(max_workers=1, max_queue=1)
+        hashed = pwd_context.hash("secret")
+        running = [
+            asyncio.create_task(hasher.verify_and_update("secret", hashed))
+            for _ in range(2)
+        ]
+        await asyncio.sleep(0)
+
+        with pytest.raises(PasswordHasherBusy):
+            await hasher.verify_and_update("secret", hashed)
+        assert hasher.rejected == 1
+
+        await asyncio.gather(*running)
+        assert hasher.pending == 0
+        hasher.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_outdated_hash_upgraded(self):
+        hasher = PasswordHasher()
+        weak = bcrypt.using(rounds=4).hash("secret")
+
+        valid, new_hash = await hasher.verify_and_update("secret", weak)
+
+        assert valid
+        assert new_hash is not None and not new_hash.startswith("$2b$04$")
+        assert pwd_context.verify("secret", new_hash)
+        hasher.shutdown()
+
+
+class TestLogin:
+    """Tests for the login endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_login_upgrades_outdated_hash(
+        self, client: AsyncClient, fresh_user: dict, test_db
+    ):
+        response = await client.post(
+            "/api/auth/login",
+            data={"username": fresh_user["email"], "password": "password123"},
+        )
+        assert response.status_code == 200
+
+        result = await test_db.execute(
+            text("SELECT hashed_password FROM users WHERE id = :id"),
+            {"id": uuid.UUID(fresh_user["id"])},
+        )
+        stored = result.scalar_one()
+        assert not stored.startswith("$2b$04$")
+        assert pwd_context.verify("password123", stored)
+
+    @pytest.mark.asyncio
+    async def test_login_rejected_when_hash_queue_full(
+        self, client: AsyncClient, fresh_user: dict, monkeypatch
+    ):
+        monkeypatch.setattr(password_hasher, "max_workers", 0)
+        monkeypatch.setattr(password_hasher, "max_queue", 0)
+
+        response = await client.post(
+            "/api/auth/login",
+            data={"username": fresh_user["email"], "password": "password123"},
+        )
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
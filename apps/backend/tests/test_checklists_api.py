@@ -3,8 +3,10 @@
 Tests for checklist templates and audit case checklists.
 """
 
+import asyncio
 import uuid
 from datetime import datetime, timezone
+from decimal import Decimal
 
 import pytest
 import pytest_asyncio
@@ -739,6 +741,469 @@ class TestAuditCaseChecklistEndpoints:
         )
         assert response.status_code == 404
 
+    @pytest.mark.asyncio
+    async def test_checklist_structure_by_etag(
+        self,
+        client: AsyncClient,
+        auth_headers: dict,
+        test_audit_case: dict,
+        test_template: dict,
+    ):
+        """Test omitting the structure and fetching it by ETag."""
+        created = await client.post(
+            f"/api/checklists/audit-case/{test_audit_case['id']}",
+            json={"template_id": test_template["id"]},
+            params={"include_structure": "false"},
+            headers=auth_headers,
+        )
+        assert created.status_code == 201
+        data = created.json()
+        assert data["structure"] is None
+        assert data["total_questions"] == 2
+        assert data["template_version"] == 1
+        etag = data["structure_etag"]
+
+        url = f"/api/checklists/templates/{test_template['id']}/structure"
+        structure = await client.get(url, headers=auth_headers)
+        assert structure.status_code == 200
+        assert structure.headers["etag"] == etag
+        assert structure.json()["sections"][0]["id"] == "section1"
+
+        not_modified = await client.get(
+            url, headers={**auth_headers, "If-None-Match": etag}
+        )
+        assert not_modified.status_code == 304
+
+        full = await client.get(
+            f"/api/checklists/audit-case/{test_audit_case['id']}/{data['id']}",
+            headers=auth_headers,
+        )
+        assert full.json()["structure"] == structure.json()
+
+    @pytest.mark.asyncio
+    async def test_progress_counts_template_questions(
+        self,
+        client: AsyncClient,
+        auth_headers: dict,
+        test_audit_case: dict,
+        test_template: dict,
+    ):
+        """Test that progress counts each template question once."""
+        created = await client.post(
+            f"/api/checklists/audit-case/{test_audit_case['id']}",
+            json={"template_id": test_template["id"]},
+            headers=auth_headers,
+        )
+        url = (
+            f"/api/checklists/audit-case/{test_audit_case['id']}/"
+            f"{created.json()['id']}"
+        )
+
+        first = await client.patch(
+            url, json={"responses": {"q1": "yes", "unknown": "x"}}, headers=auth_headers
+        )
+        again = await client.patch(
+            url, json={"responses": {"q1": "no"}}, headers=auth_headers
+        )
+
+        assert first.json()["answered_questions"] == 1
+        assert first.json()["progress"] == 50
+        assert again.json()["answered_questions"] == 1
+        assert again.json()["responses"]["q1"]["value"] == "no"
+
+    @pytest.mark.asyncio
+    async def test_concurrent_answers_are_merged(
+        self,
+        client: AsyncClient,
+        auth_headers: dict,
+        test_audit_case: dict,
+        test_template: dict,
+    ):
+        """Test that concurrent updates of different questions both persist."""
+        created = await client.post(
+            f"/api/checklists/audit-case/{test_audit_case['id']}",
+            json={"template_id": test_template["id"]},
+            headers=auth_headers,
+        )
+        url = (
+            f"/api/checklists/audit-case/{test_audit_case['id']}/"
+            f"{created.json()['id']}"
+        )
+        await client.patch(
+            url,
+            json={"responses": {}, "notes": {"q1": "Beleg fehlt"}},
+            headers=auth_headers,
+        )
+
+        results = await asyncio.gather(
+            client.patch(url, json={"responses": {"q1": "no"}}, headers=auth_headers),
+            client.patch(
+                url, json={"responses": {"q2": "Text"}}, headers=auth_headers
+            ),
+        )
+        assert all(r.status_code == 200 for r in results)
+
+        data = (await client.get(url, headers=auth_headers)).json()
+        assert data["responses"]["q1"]["value"] == "no"
+        assert data["responses"]["q1"]["note"] == "Beleg fehlt"
+        assert data["responses"]["q2"]["value"] == "Text"
+        assert data["answered_questions"] == 2
+        assert data["progress"] == 100
+        assert data["version"] == 4
+
+    @pytest.mark.asyncio
+    async def test_update_with_outdated_version(
+        self,
+        client: AsyncClient,
+        auth_headers: dict,
+        test_audit_case: dict,
+        test_template: dict,
+    ):
+        """Test optimistic concurrency with the checklist version."""
+        created = await client.post(
+            f"/api/checklists/audit-case/{test_audit_case['id']}",
+            json={"template_id": test_template["id"]},
+            headers=auth_headers,
+        )
+        url = (
+            f"/api/checklists/audit-case/{test_audit_case['id']}/"
+            f"{created.json()['id']}"
+        )
+        version = created.json()["version"]
+
+        first = await client.patch(
+            url,
+            json={"responses": {"q1": "yes"}, "version": version},
+            headers=auth_headers,
+        )
+        stale = await client.patch(
+            url,
+            json={"responses": {"q1": "no"}, "version": version},
+            headers=auth_headers,
+        )
+
+        assert first.status_code == 200
+        assert first.json()["version"] == version + 1
+        assert stale.status_code == 409
+        data = (await client.get(url, headers=auth_headers)).json()
+        assert data["responses"]["q1"]["value"] == "yes"
+
+    @pytest.mark.asyncio
+    async def test_audit_case_route_merges_answers(
+        self,
+        client: AsyncClient,
+        auth_headers: dict,
+        test_audit_case: dict,
+        test_template: dict,
+    ):
+        """Test that both checklist update routes merge into the same version."""
+        created = await client.post(
+            f"/api/checklists/audit-case/{test_audit_case['id']}",
+            json={"template_id": test_template["id"]},
+            headers=auth_headers,
+        )
+        checklist_id = created.json()["id"]
+        version = created.json()["version"]
+        url = f"/api/checklists/audit-case/{test_audit_case['id']}/{checklist_id}"
+        case_url = f"/api/audit-cases/{test_audit_case['id']}/checklists/{checklist_id}"
+
+        first = await client.patch(
+            url, json={"responses": {"q1": "yes"}}, headers=auth_headers
+        )
+        second = await client.patch(
+            case_url, json={"responses": {"q2": "Text"}}, headers=auth_headers
+        )
+        stale = await client.patch(
+            case_url,
+            json={"responses": {"q2": "Alt"}, "version": version},
+            headers=auth_headers,
+        )
+
+        assert first.status_code == 200
+        assert second.status_code == 200
+        assert second.json()["version"] == version + 2
+        assert stale.status_code == 409
+        data = (await client.get(url, headers=auth_headers)).json()
+        assert data["responses"]["q1"]["value"] == "yes"
+        assert data["responses"]["q2"]["value"] == "Text"
+        assert data["answered_questions"] == 2
+        assert data["progress"] == 100
+        assert data["version"] == version + 2
+
+    @pytest.mark.asyncio
+    async def test_structure_change_bumps_version(
+        self,
+        client: AsyncClient,
+        auth_headers: dict,
+        test_template: dict,
+    ):
+        """Test that a new structure gets a new version and ETag."""
+        url = f"/api/checklists/templates/{test_template['id']}"
+        before = await client.get(f"{url}/structure", headers=auth_headers)
+
+        renamed = await client.patch(
+            url, json={"name": "Case Test Template 2"}, headers=auth_headers
+        )
+        assert renamed.json()["version"] == 1
+
+        structure = {"sections": [{"id": "s", "title": "S", "questions": []}]}
+        updated = await client.patch(
+            url, json={"structure": structure}, headers=auth_headers
+        )
+        assert updated.json()["version"] == 2
+
+        after = await client.get(f"{url}/structure", headers=auth_headers)
+        assert after.json() == structure
+        assert after.headers["etag"] != before.headers["etag"]
+
+    @pytest.mark.asyncio
+    async def test_answers_are_normalized(
+        self,
+        client: AsyncClient,
+        auth_headers: dict,
+        test_audit_case: dict,
+        test_template: dict,
+        test_db,
+    ):
+        """Test that answer rows are written and replaced with the responses."""
+        created = await client.post(
+            f"/api/checklists/audit-case/{test_audit_case['id']}",
+            json={"template_id": test_template["id"]},
+            headers=auth_headers,
+        )
+        checklist_id = created.json()["id"]
+        url = f"/api/checklists/audit-case/{test_audit_case['id']}/{checklist_id}"
+
+        async def answer_rows():
+            result = await test_db.execute(
+                text(
+                    "SELECT question_id, position, value_text, value_number, "
+                    "value_bool FROM checklist_answers "
+                    "WHERE checklist_id = :id ORDER BY question_id, position"
+                ),
+                {"id": uuid.UUID(checklist_id)},
+            )
+            return [tuple(row) for row in result.all()]
+
+        await client.patch(
+            url,
+            json={"responses": {"q1": True, "q2": ["a", "b"]}},
+            headers=auth_headers,
+        )
+        assert await answer_rows() == [
+            ("q1", 0, "true", None, True),
+            ("q2", 0, "a", None, None),
+            ("q2", 1, "b", None, None),
+        ]
+
+        await client.patch(url, json={"responses": {"q2": "42"}}, headers=auth_headers)
+        assert await answer_rows() == [
+            ("q1", 0, "true", None, True),
+            ("q2", 0, "42", 42, None),
+        ]
+
+        # Keys too long for a question ID stay in the JSONB only
+        long_key = "x" * 101
+        response = await client.patch(
+            url, json={"responses": {long_key: "a", "q1": False}}, headers=auth_headers
+        )
+        assert response.status_code == 200
+        assert response.json()["responses"][long_key]["value"] == "a"
+        assert await answer_rows() == [
+            ("q1", 0, "false", None, False),
+            ("q2", 0, "42", 42, None),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_audit_case_route_writes_answer_rows(
+        self,
+        client: AsyncClient,
+        auth_headers: dict,
+        test_audit_case: dict,
+        test_template: dict,
+        test_db,
+        test_user: dict,
+    ):
+        """Test that the audit case route writes answer rows like the JSONB."""
+        created = await client.post(
+            f"/api/checklists/audit-case/{test_audit_case['id']}",
+            json={"template_id": test_template["id"]},
+            headers=auth_headers,
+        )
+        checklist_id = created.json()["id"]
+        case_url = f"/api/audit-cases/{test_audit_case['id']}/checklists/{checklist_id}"
+
+        response = await client.patch(
+            case_url, json={"responses": {"q1": True}}, headers=auth_headers
+        )
+
+        result = await test_db.execute(
+            text(
+                "SELECT question_id, value_bool, answered_by, answered_at "
+                "FROM checklist_answers WHERE checklist_id = :id"
+            ),
+            {"id": uuid.UUID(checklist_id)},
+        )
+        rows = result.all()
+        stored = response.json()["responses"]["q1"]
+        assert [row[:3] for row in rows] == [("q1", True, uuid.UUID(test_user["id"]))]
+        assert rows[0].answered_at == datetime.fromisoformat(stored["answered_at"])
+
+    @pytest.mark.asyncio
+    async def test_answer_distribution(
+        self,
+        client: AsyncClient,
+        auth_headers: dict,
+        test_user: dict,
+        test_audit_case: dict,
+        test_template: dict,
+        test_db,
+    ):
+        """Test counting the answers to a question across cases."""
+        second_case_id = uuid.uuid4()
+        now = datetime.now(timezone.utc)
+        await test_db.execute(
+            text(
+                """
+                INSERT INTO audit_cases
+                    (id, tenant_id, case_number, project_name, beneficiary_name,
+                     status, audit_type, custom_data, is_sample, requires_follow_up,
+                     created_at, updated_at)
+                VALUES
+                    (:id, :tenant_id, 'TEST-2024-002', 'Test Project 2',
+                     'Test Beneficiary', 'draft', 'operation', '{}', false, false,
+                     :created_at, :updated_at)
+                """
+            ),
+            {
+                "id": second_case_id,
+                "tenant_id": uuid.UUID(test_user["tenant_id"]),
+                "created_at": now,
+                "updated_at": now,
+            },
+        )
+        await test_db.commit()
+
+        answers = [
+            (test_audit_case["id"], ["a", "b"]),
+            (str(second_case_id), ["a"]),
+        ]
+        for case_id, value in answers:
+            created = await client.post(
+                f"/api/checklists/audit-case/{case_id}",
+                json={"template_id": test_template["id"]},
+                headers=auth_headers,
+            )
+            await client.patch(
+                f"/api/checklists/audit-case/{case_id}/{created.json()['id']}",
+                json={"responses": {"q2": value}},
+                headers=auth_headers,
+            )
+
+        url = "/api/checklists/answers/distribution"
+        params = {"question_id": "q2", "template_id": test_template["id"]}
+        response = await client.get(url, params=params, headers=auth_headers)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 3
+        assert [(i["value"], i["count"], i["cases"]) for i in data["items"]] == [
+            ("a", 2, 2),
+            ("b", 1, 1),
+        ]
+
+        by_tenant = await client.get(
+            url, params={**params, "group_by": "tenant"}, headers=auth_headers
+        )
+        items = by_tenant.json()["items"]
+        assert {i["group_id"] for i in items} == {test_user["tenant_id"]}
+        assert all(i["group_name"] for i in items)
+
+        by_year = await client.get(
+            url, params={**params, "group_by": "fiscal_year"}, headers=auth_headers
+        )
+        assert by_year.json()["total"] == 3
+        assert by_year.json()["items"][0]["group_id"] is None
+
+        other = await client.get(
+            url,
+            params={**params, "authority_id": str(uuid.uuid4())},
+            headers=auth_headers,
+        )
+        assert other.json()["items"] == []
+
+
+class TestChecklistAnswerRows:
+    """Tests for splitting answers into typed rows."""
+
+    def test_answer_rows(self):
+        """Test the typed value columns of answer values."""
+        from app.services.checklist_answers import answer_rows
+
+        assert answer_rows(None) == []
+        assert answer_rows(False) == [
+            {"position": 0, "value_text": "false", "value_bool": False}
+        ]
+        assert answer_rows(12.5) == [
+            {"position": 0, "value_text": "12.5", "value_number": Decimal("12.5")}
+        ]
+        assert answer_rows({"value": ["x", None, "1"]}) == [
+            {"position": 0, "value_text": "x"},
+            {"position": 2, "value_text": "1", "value_number": Decimal("1")},
+        ]
+        assert answer_rows("x" * 600)[0]["value_text"] == "x" * 500
+
+
+class TestCompiledTemplate:
+    """Tests for compiled checklist templates."""
+
+    def test_compile_template(self):
+        """Test the question index, required set and section order."""
+        from app.services.checklist_templates import compile_template
+
+        compiled = compile_template(
+            "t1",
+            3,
+            {
+                "sections": [
+                    {
+                        "id": "b",
+                        "order": 2,
+                        "questions": [{"id": "q3", "type": "text"}],
+                    },
+                    {
+                        "id": "a",
+                        "order": 1,
+                        "questions": [
+                            {"id": "h", "type": "section"},
+                            {"id": "q1", "type": "yes_no", "required": True},
+                            {"id": "q2", "type": "text"},
+                        ],
+                    },
+                ]
+            },
+        )
+
+        assert compiled.section_order == ("a", "b")
+        assert list(compiled.questions) == ["q1", "q2", "q3"]
+        assert compiled.questions["q3"].section_id == "b"
+        assert compiled.required == {"q1"}
+        assert compiled.total_questions == 3
+
+    def test_template_cache_lru(self):
+        """Test that the cache evicts the least recently used version."""
+        from app.services.checklist_templates import TemplateCache, compile_template
+
+        cache = TemplateCache(max_entries=2)
+        for version in (1, 2):
+            cache.set(compile_template("t1", version, {}))
+        assert cache.get("t1", 1) is not None
+        cache.set(compile_template("t1", 3, {}))
+
+        assert cache.get("t1", 2) is None
+        assert cache.get("t1", 1) is not None
+        assert len(cache) == 2
+
 
 class TestChecklistTemplateArchival:
     """Tests for template archival when in use."""
@@ -0,0 +1,171 @@
+"""Tests for the instrumented connection pool and its metrics."""
+
+import asyncio
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.config import settings
+from app.core.database import close_db, get_engine, reset_engine
+from app.core.db_pool import Histogram, InstrumentedPool, render_metrics
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest_asyncio.fixture
+async def pool_engine():
+    """Engine on the test database with 2 + 2 connections."""
+    engine = create_async_engine(
+        str(settings.database_url),
+        poolclass=InstrumentedPool,
+        pool_size=2,
+        max_overflow=2,
+        pool_timeout=0.2,
+    )
+    yield engine
+    await engine.dispose()
+
+
+async def check_out(engine, count: int) -> tuple[asyncio.Event, asyncio.Future]:
+    """Check out ``count`` connections, kept until the event is set."""
+    release = asyncio.Event()
+
+    async def one() -> None:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            await release.wait()
+
+    holders = asyncio.gather(*(one() for _ in range(count)))
+    while engine.pool.checkedout() < count:
+        await asyncio.sleep(0.01)
+    return release, holders
+
+
+async def burst(engine, count: int) -> None:
+    """Use ``count`` connections at once."""
+    release, holders = await check_out(engine, count)
+    release.set()
+    await holders
+
+
+def test_histogram_is_cumulative():
+    """Test bucket counts, sum and count of the histogram."""
+    histogram = Histogram(buckets=(0.01, 0.1))
+
+    for value in (0.005, 0.05, 0.05, 3.0):
+        histogram.observe(value)
+
+    assert histogram.cumulative() == [("0.01", 1), ("0.1", 3), ("+Inf", 4)]
+    assert histogram.count == 4
+    assert histogram.sum == pytest.approx(3.105)
+
+
+class TestInstrumentedPool:
+    """Tests for pool sizing and counters."""
+
+    @pytest.mark.asyncio
+    async def test_overflow_connections_are_closed(self, pool_engine):
+        """Test that only pool_size connections stay open after a burst."""
+        await burst(pool_engine, 4)
+
+        snapshot = pool_engine.pool.snapshot()
+        assert snapshot["open"] == snapshot["idle"] == 2
+        assert snapshot["connects"] == 4
+        assert snapshot["overflow_connects"] == 2
+        assert snapshot["overflow_closes"] == 2
+        assert snapshot["checkouts"] == 4
+
+    @pytest.mark.asyncio
+    async def test_timeout_when_exhausted(self, pool_engine):
+        """Test that checkouts beyond the maximum time out and are counted."""
+        release, holders = await check_out(pool_engine, 4)
+
+        with pytest.raises(exc.TimeoutError):
+            async with pool_engine.connect():
+                pass
+        assert pool_engine.pool.stats.waiting == 0
+        release.set()
+        await holders
+
+        assert pool_engine.pool.snapshot()["timeouts"] == 1
+
+    @pytest.mark.asyncio
+    async def test_adaptive_target_follows_peak(self, pool_engine):
+        """Test that the adaptive target grows with load and shrinks after."""
+        pool = pool_engine.pool
+        clock = FakeClock()
+        pool.configure_adaptive(60, clock=clock)
+
+        await burst(pool_engine, 4)
+        clock.now += 60
+        async with pool_engine.connect():
+            pass
+        assert pool.target_size == 4
+
+        await burst(pool_engine, 4)
+        assert pool.snapshot()["idle"] == 4
+        assert pool.stats.overflow_closes == 2  # only during the first burst
+
+        for _ in range(2):
+            clock.now += 60
+            async with pool_engine.connect():
+                pass
+        assert pool.target_size == 2
+
+    @pytest.mark.asyncio
+    async def test_dispose_keeps_configuration(self, pool_engine):
+        """Test that the recreated pool keeps sizes and counters."""
+        await burst(pool_engine, 3)
+
+        await pool_engine.dispose()
+
+        pool = pool_engine.pool
+        assert (pool.pool_size, pool.max_size) == (2, 4)
+        assert pool.stats.connects == 3
+        assert pool.snapshot()["open"] == 0
+
+
+class TestMetrics:
+    """Tests for the Prometheus exposition."""
+
+    @pytest.mark.asyncio
+    async def test_render_metrics(self, pool_engine):
+        """Test gauges, counters and histogram of a pool."""
+        await burst(pool_engine, 3)
+
+        lines = render_metrics({"primary": pool_engine.pool}, "db_pool")
+
+        assert "# TYPE db_pool_checkout_seconds histogram" in lines
+        assert 'db_pool_checkout_seconds_bucket{engine="primary",le="+Inf"} 3' in lines
+        assert 'db_pool_checkout_seconds_count{engine="primary"} 3' in lines
+        assert 'db_pool_overflow_connects_total{engine="primary"} 1' in lines
+        assert 'db_pool_idle{engine="primary"} 2' in lines
+        assert 'db_pool_waiting{engine="primary"} 0' in lines
+
+    @pytest.mark.asyncio
+    async def test_metrics_endpoint(self, client: AsyncClient, db_engine):
+        """Test that /metrics exposes the pool of the application engine."""
+        reset_engine()
+        try:
+            async with get_engine().connect() as conn:
+                await conn.execute(text("SELECT 1"))
+
+            response = await client.get("/metrics")
+        finally:
+            await close_db()
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert (
+            'flowaudit_db_pool_checkout_seconds_count{engine="primary"} 1'
+            in response.text
+        )
@@ -279,6 +279,81 @@ class TestListDocuments:
         assert data["page_size"] == 2
         assert data["pages"] >= 1
 
+    @pytest.mark.asyncio
+    async def test_list_documents_cursor_pagination(
+        self,
+        client: AsyncClient,
+        auth_headers: dict,
+        doc_audit_case: dict,
+        document_box: dict,
+        test_db,
+        test_user,
+    ):
+        """Test keyset pagination over documents sharing one upload time."""
+        now = datetime.now(timezone.utc)
+        doc_ids = set()
+        for i in range(5):
+            doc_id = str(uuid.uuid4())
+            doc_ids.add(doc_id)
+            await test_db.execute(
+                text(
+                    """
+                    INSERT INTO box_documents (id, tenant_id, box_id, file_name,
+                        file_size, mime_type, storage_path, category, uploaded_by,
+                        uploaded_at, created_at, updated_at)
+                    VALUES (:id, :tenant_id, :box_id, :file_name, 1024,
+                        'application/pdf', '/tmp/test/doc.pdf', 'sonstige',
+                        :uploaded_by, :uploaded_at, :created_at, :updated_at)
+                    """
+                ),
+                {
+                    "id": doc_id,
+                    "tenant_id": uuid.UUID(test_user["tenant_id"]),
+                    "box_id": document_box["id"],
+                    "file_name": f"doc_{i}.pdf",
+                    "uploaded_by": test_user["id"],
+                    "uploaded_at": now,
+                    "created_at": now,
+                    "updated_at": now,
+                },
+            )
+        await test_db.commit()
+
+        url = f"/api/audit-cases/{doc_audit_case['id']}/documents"
+        seen = []
+        cursor = None
+        while True:
+            params = {"page_size": 2, "count": "none"}
+            if cursor:
+                params["cursor"] = cursor
+            response = await client.get(url, params=params, headers=auth_headers)
+            assert response.status_code == 200
+            data = response.json()
+            assert data["total"] is None
+            seen.extend(item["id"] for item in data["items"])
+            cursor = data["next_cursor"]
+            assert data["has_more"] == (cursor is not None)
+            if cursor is None:
+                break
+
+        assert len(seen) == len(set(seen)) == 5
+        assert set(seen) == doc_ids
+
+    @pytest.mark.asyncio
+    async def test_list_documents_invalid_cursor(
+        self,
+        client: AsyncClient,
+        auth_headers: dict,
+        doc_audit_case: dict,
+        test_document: dict,
+    ):
+        """Test that a malformed cursor is rejected."""
+        response = await client.get(
+            f"/api/audit-cases/{doc_audit_case['id']}/documents?cursor=not-a-cursor",
+            headers=auth_headers,
+        )
+        assert response.status_code == 400
+
     @pytest.mark.asyncio
     async def test_list_documents_case_not_found(
         self, client: AsyncClient, auth_headers: dict
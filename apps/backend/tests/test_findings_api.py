@@ -3,6 +3,7 @@
 Tests for audit case findings (Feststellungen) management.
 """
 
+import asyncio
 import uuid
 from datetime import datetime, timezone
 from decimal import Decimal
@@ -361,6 +362,95 @@ class TestCreateFinding:
         assert response.status_code == 201
         assert response.json()["is_systemic"] is True
 
+    @pytest.mark.asyncio
+    async def test_create_finding_numbers_continue(
+        self,
+        client: AsyncClient,
+        auth_headers: dict,
+        test_finding: dict,
+        confirmed_finding: dict,
+    ):
+        """Test that numbering continues after existing findings."""
+        response = await client.post(
+            f"/api/audit-cases/{test_finding['audit_case_id']}/findings",
+            json={
+                "finding_type": "observation",
+                "title": "Next Finding",
+                "description": "Numbered after the existing findings",
+            },
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 201
+        assert response.json()["finding_number"] == 3
+
+    @pytest.mark.asyncio
+    async def test_concurrent_creates_get_unique_numbers(
+        self, client: AsyncClient, auth_headers: dict, findings_audit_case: dict
+    ):
+        """Test that concurrently created findings get distinct numbers."""
+        url = f"/api/audit-cases/{findings_audit_case['id']}/findings"
+        responses = await asyncio.gather(
+            *(
+                client.post(
+                    url,
+                    json={
+                        "finding_type": "observation",
+                        "title": f"Concurrent Finding {i}",
+                        "description": "Created concurrently",
+                    },
+                    headers=auth_headers,
+                )
+                for i in range(5)
+            )
+        )
+
+        assert all(r.status_code == 201 for r in responses)
+        numbers = sorted(r.json()["finding_number"] for r in responses)
+        assert numbers == [1, 2, 3, 4, 5]
+
+    @pytest.mark.asyncio
+    async def test_bulk_create_findings(
+        self, client: AsyncClient, auth_headers: dict, test_finding: dict
+    ):
+        """Test creating many findings with a reserved number range."""
+        url = f"/api/audit-cases/{test_finding['audit_case_id']}/findings"
+        items = [
+            {
+                "finding_type": "deficiency",
+                "title": f"Bulk Finding {i}",
+                "description": "Created in bulk",
+                "financial_impact": "10.50",
+            }
+            for i in range(3)
+        ]
+
+        response = await client.post(
+            f"{url}/bulk", json={"findings": items}, headers=auth_headers
+        )
+
+        assert response.status_code == 201
+        data = response.json()
+        assert [f["finding_number"] for f in data] == [2, 3, 4]
+        assert [f["title"] for f in data] == [i["title"] for i in items]
+        assert all(f["status"] == "draft" for f in data)
+
+        single = await client.post(url, json=items[0], headers=auth_headers)
+        assert single.json()["finding_number"] == 5
+
+    @pytest.mark.asyncio
+    async def test_bulk_create_requires_findings(
+        self, client: AsyncClient, auth_headers: dict, findings_audit_case: dict
+    ):
+        """Test that an empty bulk create is rejected."""
+        response = await client.post(
+            f"/api/audit-cases/{findings_audit_case['id']}/findings/bulk",
+            json={"findings": []},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 422
+
     @pytest.mark.asyncio
     async def test_create_finding_case_not_found(
         self, client: AsyncClient, auth_headers: dict
@@ -796,7 +886,64 @@ class TestFindingsStatistics:
 
         assert response.status_code == 200
         data = response.json()
-        assert data["total_financial_impact"] >= 6000.0
+        assert Decimal(data["total_financial_impact"]) == Decimal("6000.00")
+        assert data["total"] == 3
+        assert data["by_type"] == {"irregularity": 3}
+
+    @pytest.mark.asyncio
+    async def test_summary_follows_finding_writes(
+        self,
+        client: AsyncClient,
+        auth_headers: dict,
+        test_finding: dict,
+    ):
+        """Test that the cached summary is refreshed by create and confirm."""
+        url = f"/api/audit-cases/{test_finding['audit_case_id']}/findings"
+        before = await client.get(f"{url}/stats/summary", headers=auth_headers)
+        assert before.json()["by_status"] == {"draft": 1}
+
+        created = await client.post(
+            url,
+            json={
+                "finding_type": "deficiency",
+                "title": "Summary Finding",
+                "description": "Counted in the summary",
+                "financial_impact": "0.10",
+            },
+            headers=auth_headers,
+        )
+        await client.post(
+            f"{url}/{created.json()['id']}/confirm", headers=auth_headers
+        )
+
+        after = await client.get(f"{url}/stats/summary", headers=auth_headers)
+        data = after.json()
+        assert data["total"] == 2
+        assert data["by_status"] == {"draft": 1, "confirmed": 1}
+        assert data["by_type"] == {"irregularity": 1, "deficiency": 1}
+        assert Decimal(data["total_financial_impact"]) == Decimal("0.10")
+
+    @pytest.mark.asyncio
+    async def test_findings_summaries_of_many_cases(
+        self,
+        client: AsyncClient,
+        auth_headers: dict,
+        test_finding: dict,
+        confirmed_finding: dict,
+    ):
+        """Test the batched summaries for dashboards."""
+        case_id = test_finding["audit_case_id"]
+        response = await client.get(
+            "/api/audit-cases/findings-summary",
+            params={"case_ids": [case_id, str(uuid.uuid4())]},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert list(data) == [case_id]
+        assert data[case_id]["total"] == 2
+        assert data[case_id]["by_status"] == {"draft": 1, "confirmed": 1}
 
     @pytest.mark.asyncio
     async def test_get_summary_case_not_found(
@@ -0,0 +1,966 @@
+"""Tests for the GitHub service against a local mock GitHub API server."""
+
+import asyncio
+import base64
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlsplit
+from typing import Any
+
+import pytest
+import pytest_asyncio
+
+from app.services.github_cache import BlobCache, ResponseCache
+from app.services.github_clients import GitHubClientRegistry
+from app.services.github_rate_limit import (
+    RateLimitExhausted,
+    RateLimitScheduler,
+    RequestPriority,
+)
+from app.services.github_service import GitHubError, GitHubService, _parse_next_link
+
+
+# =============================================================================
+# Mock GitHub API Server
+# =============================================================================
+
+
+class MockGitHub:
+    """In-memory state and request log of the mock GitHub API."""
+
+    def __init__(self) -> None:
+        self.api_base = ""
+        # Base URL used in Link headers (defaults to api_base)
+        self.link_base: str | None = None
+        self.lock = threading.Lock()
+        self.requests: list[tuple[str, str]] = []
+        self.blob_counter = 0
+        self.blob_delay = 0.0
+        self.blob_in_flight = 0
+        self.blob_max_in_flight = 0
+        # content -> number of failures still to return for that blob
+        self.blob_failures: dict[str, int] = {}
+        self.blob_attempts: dict[str, int] = {}
+        self.trees: list[dict[str, Any]] = []
+        self.ref_updates: list[str] = []
+        self.request_headers: list[dict[str, str]] = []
+        self.connections: set[tuple[str, int]] = set()
+        self.repos = [_repo(f"repo-{i}") for i in range(3)]
+        self.branches = [f"branch-{i}" for i in range(3)]
+        self.page_delay = 0.0
+        self.files: dict[str, str] = {}
+        self.tree_truncated = False
+        self.file_last_modified = "Wed, 01 Jan 2025 00:00:00 GMT"
+        self.rate_limit = 5000
+        self.rate_remaining = 5000
+        self.rate_reset = int(time.time()) + 3600
+        self.retry_after: str | None = None
+
+    def count(self, method: str, path_prefix: str) -> int:
+        """Count requests matching method and path prefix."""
+        return sum(
+            1 for m, p in self.requests if m == method and p.startswith(path_prefix)
+        )
+
+    def handle(
+        self,
+        method: str,
+        path: str,
+        body: dict[str, Any] | None,
+        headers: dict[str, str],
+    ) -> tuple[int, dict[str, str], Any]:
+        """Dispatch a request and return (status, headers, json body)."""
+        with self.lock:
+            self.requests.append((method, path))
+            self.request_headers.append(headers)
+
+        status, response_headers, data = self._route(method, path, body, headers)
+
+        with self.lock:
+            # Conditional hits (304) do not count against the quota
+            if status != 304:
+                self.rate_remaining = max(0, self.rate_remaining - 1)
+            response_headers = {
+                "X-RateLimit-Limit": str(self.rate_limit),
+                "X-RateLimit-Remaining": str(self.rate_remaining),
+                "X-RateLimit-Reset": str(self.rate_reset),
+                **response_headers,
+            }
+        return status, response_headers, data
+
+    def _route(
+        self,
+        method: str,
+        path: str,
+        body: dict[str, Any] | None,
+        headers: dict[str, str],
+    ) -> tuple[int, dict[str, str], Any]:
+        if self.retry_after is not None:
+            return (
+                403,
+                {"Retry-After": self.retry_after},
+                {"message": "You have exceeded a secondary rate limit"},
+            )
+
+        if method == "GET" and path.startswith("/user/repos"):
+            items, link = self._page(path, self.repos)
+            etag = '"' + hashlib.sha1(json.dumps(items).encode()).hexdigest() + '"'
+            if headers.get("If-None-Match") == etag:
+                return 304, {"ETag": etag, **link}, None
+            return 200, {"ETag": etag, **link}, items
+
+        if method == "GET" and urlsplit(path).path.endswith("/branches"):
+            names, link = self._page(path, self.branches)
+            items = [{"name": n, "commit": {"sha": f"sha-{n}"}} for n in names]
+            return 200, link, items
+
+        if method == "GET" and "/git/trees/" in path:
+            return self._tree(path)
+
+        if method == "GET" and "/git/blobs/" in path:
+            sha = urlsplit(path).path.rsplit("/", 1)[-1]
+            for content in self.files.values():
+                if _blob_sha(content) == sha:
+                    encoded = base64.b64encode(content.encode()).decode()
+                    return 200, {}, {"sha": sha, "content": encoded}
+            return 404, {}, {"message": "Not Found"}
+
+        if method == "GET" and "/contents/" in path:
+            if headers.get("If-Modified-Since") == self.file_last_modified:
+                return 304, {"Last-Modified": self.file_last_modified}, None
+            file_path = urlsplit(path).path.split("/contents/", 1)[1]
+            data = {"content": "aGVsbG8=", "sha": "file-sha"}
+            if file_path in self.files and not self.tree_truncated:
+                content = self.files[file_path]
+                data = {
+                    "content": base64.b64encode(content.encode()).decode(),
+                    "sha": _blob_sha(content),
+                }
+            return 200, {"Last-Modified": self.file_last_modified}, data
+
+        if method == "GET" and "/branches/" in path:
+            name = path.rsplit("/", 1)[-1]
+            return 200, {}, {"name": name, "commit": {"sha": "branch-sha"}}
+
+        if method == "GET" and "/git/ref/heads/" in path:
+            return 200, {}, {"object": {"sha": "base-commit-sha"}}
+
+        if method == "GET" and "/git/commits/" in path:
+            return 200, {}, {"tree": {"sha": "base-tree-sha"}}
+
+        if method == "POST" and path.endswith("/git/blobs"):
+            return self._create_blob(body or {})
+
+        if method == "POST" and path.endswith("/git/trees"):
+            with self.lock:
+                self.trees.append(body or {})
+            return 201, {}, {"sha": f"tree-{len(self.trees)}"}
+
+        if method == "POST" and path.endswith("/git/commits"):
+            return (
+                201,
+                {},
+                {
+                    "sha": "new-commit-sha",
+                    "message": (body or {}).get("message", ""),
+                    "url": "http://mock/commits/new-commit-sha",
+                    "author": {"name": "Mock", "date": "2025-01-01T00:00:00Z"},
+                },
+            )
+
+        if method == "PATCH" and "/git/refs/heads/" in path:
+            with self.lock:
+                self.ref_updates.append((body or {}).get("sha", ""))
+            return 200, {}, {"object": {"sha": (body or {}).get("sha")}}
+
+        return 404, {}, {"message": "Not Found"}
+
+    def _tree(self, path: str) -> tuple[int, dict[str, str], Any]:
+        parts = urlsplit(path)
+        tree_sha = hashlib.sha1(json.dumps(sorted(self.files.items())).encode())
+        tree_sha = tree_sha.hexdigest()
+        entries = [
+            {"path": p, "type": "blob", "sha": _blob_sha(c)}
+            for p, c in self.files.items()
+        ]
+        if parts.path.rsplit("/", 1)[-1] == tree_sha and "recursive" in parts.query:
+            listing = {"sha": tree_sha, "tree": entries}
+            return 200, {}, {**listing, "truncated": self.tree_truncated}
+        top_level = [e for e in entries if "/" not in e["path"]]
+        return 200, {}, {"sha": tree_sha, "tree": top_level, "truncated": False}
+
+    def _page(self, path: str, items: list[Any]) -> tuple[list[Any], dict[str, str]]:
+        """Slice a listing like GitHub does and build the Link header."""
+        if self.page_delay:
+            time.sleep(self.page_delay)
+        parts = urlsplit(path)
+        query = parse_qs(parts.query)
+        page = int(query.get("page", ["1"])[0])
+        per_page = int(query.get("per_page", ["30"])[0])
+        start = (page - 1) * per_page
+        if start + per_page >= len(items):
+            return items[start : start + per_page], {}
+        query["page"] = [str(page + 1)]
+        next_query = "&".join(f"{k}={v[0]}" for k, v in query.items())
+        base = self.link_base or self.api_base
+        link = f'<{base}{parts.path}?{next_query}>; rel="next"'
+        return items[start : start + per_page], {"Link": link}
+
+    def _create_blob(self, body: dict[str, Any]) -> tuple[int, dict[str, str], Any]:
+        content = body.get("content", "")
+        with self.lock:
+            self.blob_attempts[content] = self.blob_attempts.get(content, 0) + 1
+            if self.blob_failures.get(content, 0) > 0:
+                self.blob_failures[content] -= 1
+                return 502, {}, {"message": "Server Error"}
+            self.blob_in_flight += 1
+            self.blob_max_in_flight = max(self.blob_max_in_flight, self.blob_in_flight)
+        try:
+            if self.blob_delay:
+                time.sleep(self.blob_delay)
+            with self.lock:
+                self.blob_counter += 1
+                sha = f"blob-{self.blob_counter}"
+            return 201, {}, {"sha": sha}
+        finally:
+            with self.lock:
+                self.blob_in_flight -= 1
+
+
+def _blob_sha(content: str) -> str:
+    return hashlib.sha1(content.encode()).hexdigest()
+
+
+def _repo(name: str) -> dict[str, Any]:
+    return {
+        "name": name,
+        "full_name": f"owner/{name}",
+        "default_branch": "main",
+        "private": False,
+        "url": f"http://mock/repos/owner/{name}",
+        "clone_url": f"http://mock/owner/{name}.git",
+    }
+
+
+def _make_handler(state: MockGitHub) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _dispatch(self) -> None:
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length) if length else b""
+            body = json.loads(raw) if raw else None
+            with state.lock:
+                state.connections.add(self.client_address)
+            status, headers, data = state.handle(
+                self.command, self.path, body, dict(self.headers)
+            )
+            payload = json.dumps(data).encode() if data is not None else b""
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            for key, value in headers.items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        do_GET = do_POST = do_PATCH = do_PUT = do_DELETE = _dispatch
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    return Handler
+
+
+@pytest.fixture
+def mock_github():
+    """Run a mock GitHub API server on a free local port."""
+    state = MockGitHub()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(state))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    state.api_base = f"http://127.0.0.1:{server.server_address[1]}"
+    yield state
+    server.shutdown()
+    server.server_close()
+
+
+@pytest_asyncio.fixture
+async def github(mock_github):
+    """GitHub service pointed at the mock server."""
+    service = GitHubService(access_token="ghp_test", api_base=mock_github.api_base)
+    service.BLOB_RETRY_BACKOFF = 0.01
+    yield service
+    await service.close()
+
+
+def _large(index: int) -> str:
+    """Content above the inline threshold, unique per index."""
+    return f"# file {index}\n" + "x" * (GitHubService.INLINE_BLOB_MAX_BYTES + 1)
+
+
+# =============================================================================
+# create_files_in_commit
+# =============================================================================
+
+
+@pytest.mark.asyncio
+class TestCreateFilesInCommit:
+    """Tests for multi-file commits."""
+
+    async def test_small_files_are_inlined(self, github, mock_github):
+        """Small text files go into the tree request without blob calls."""
+        files = [{"path": f"src/f{i}.py", "content": f"x = {i}\n"} for i in range(5)]
+
+        commit = await github.create_files_in_commit(
+            "owner", "repo", "feature", files, "Add files"
+        )
+
+        assert commit.sha == "new-commit-sha"
+        assert mock_github.count("POST", "/repos/owner/repo/git/blobs") == 0
+        tree = mock_github.trees[0]
+        assert tree["base_tree"] == "base-tree-sha"
+        assert [item["path"] for item in tree["tree"]] == [f["path"] for f in files]
+        assert all("content" in item and "sha" not in item for item in tree["tree"])
+        assert mock_github.ref_updates == ["new-commit-sha"]
+
+    async def test_large_blobs_created_concurrently(self, github, mock_github):
+        """Blob creation runs in parallel up to the configured bound."""
+        mock_github.blob_delay = 0.05
+        github.BLOB_CONCURRENCY = 4
+        files = [{"path": f"big/{i}.txt", "content": _large(i)} for i in range(12)]
+
+        await github.create_files_in_commit(
+            "owner", "repo", "feature", files, "Add big files"
+        )
+
+        assert mock_github.count("POST", "/repos/owner/repo/git/blobs") == 12
+        assert 1 < mock_github.blob_max_in_flight <= 4
+        tree_items = mock_github.trees[0]["tree"]
+        assert [item["path"] for item in tree_items] == [f["path"] for f in files]
+        assert all(item["sha"].startswith("blob-") for item in tree_items)
+
+    async def test_mixed_files_keep_order(self, github, mock_github):
+        """Inline entries precede blob entries; every file is in the tree."""
+        files = [
+            {"path": "a.py", "content": "a = 1\n"},
+            {"path": "b.bin", "content": _large(1)},
+            {"path": "c.py", "content": "c = 3\n"},
+        ]
+
+        await github.create_files_in_commit("owner", "repo", "main", files, "Mixed")
+
+        paths = [item["path"] for item in mock_github.trees[0]["tree"]]
+        assert sorted(paths) == ["a.py", "b.bin", "c.py"]
+        assert mock_github.count("POST", "/repos/owner/repo/git/blobs") == 1
+
+    async def test_failed_blob_retried_alone(self, github, mock_github):
+        """A transient failure retries only the failing blob."""
+        files = [{"path": f"big/{i}.txt", "content": _large(i)} for i in range(3)]
+        mock_github.blob_failures[files[1]["content"]] = 2
+
+        await github.create_files_in_commit("owner", "repo", "main", files, "Retry")
+
+        assert mock_github.blob_attempts[files[0]["content"]] == 1
+        assert mock_github.blob_attempts[files[1]["content"]] == 3
+        assert mock_github.blob_attempts[files[2]["content"]] == 1
+        assert len(mock_github.trees) == 1
+
+    async def test_persistent_blob_failure_aborts_commit(self, github, mock_github):
+        """Exhausted retries raise and no tree or commit is created."""
+        github.BLOB_MAX_RETRIES = 1
+        files = [{"path": "big.txt", "content": _large(0)}]
+        mock_github.blob_failures[files[0]["content"]] = 5
+
+        with pytest.raises(GitHubError) as exc_info:
+            await github.create_files_in_commit(
+                "owner", "repo", "main", files, "Fail"
+            )
+
+        assert exc_info.value.status_code == 502
+        assert mock_github.blob_attempts[files[0]["content"]] == 2
+        assert mock_github.trees == []
+        assert mock_github.ref_updates == []
+
+
+# =============================================================================
+# Conditional Request Cache
+# =============================================================================
+
+
+@pytest.mark.asyncio
+class TestResponseCache:
+    """Tests for ETag / Last-Modified revalidation."""
+
+    async def test_etag_revalidation_served_from_cache(self, github, mock_github):
+        """A 304 answer returns the cached list and keeps the quota."""
+        first = await github.list_repositories()
+        remaining_after_first = mock_github.rate_remaining
+
+        second = await github.list_repositories()
+
+        assert [r.name for r in second] == [r.name for r in first]
+        assert mock_github.request_headers[-1]["If-None-Match"].startswith('"')
+        assert mock_github.rate_remaining == remaining_after_first
+        assert github.cache.hits == 1
+
+    async def test_changed_resource_refreshes_cache(self, github, mock_github):
+        """A changed ETag yields a full response that replaces the entry."""
+        await github.list_repositories()
+        mock_github.repos.append(_repo("repo-new"))
+
+        repos = await github.list_repositories()
+
+        assert "repo-new" in [r.name for r in repos]
+        assert github.cache.hits == 0
+        assert github.cache.misses == 2
+
+    async def test_last_modified_revalidation(self, github, mock_github):
+        """Last-Modified validators are sent as If-Modified-Since."""
+        await github.get_file_content("owner", "repo", "README.md", ref="main")
+        content, sha = await github.get_file_content(
+            "owner", "repo", "README.md", ref="main"
+        )
+
+        contents_headers = [
+            headers
+            for (_, path), headers in zip(
+                mock_github.requests, mock_github.request_headers
+            )
+            if "/contents/" in path
+        ]
+        assert content == "hello"
+        assert sha == "file-sha"
+        assert (
+            contents_headers[-1]["If-Modified-Since"] == mock_github.file_last_modified
+        )
+        assert github.cache.hits == 1
+
+    async def test_lru_eviction(self):
+        """The least recently used entry is evicted first."""
+        cache = ResponseCache(max_entries=2)
+        cache.store("a", 1, etag='"a"', last_modified=None)
+        cache.store("b", 2, etag='"b"', last_modified=None)
+        cache.get("a")
+        cache.store("c", 3, etag='"c"', last_modified=None)
+
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+        assert cache.get("c") is not None
+        assert len(cache) == 2
+
+    async def test_responses_without_validators_not_cached(self):
+        """Responses without ETag or Last-Modified are not stored."""
+        cache = ResponseCache()
+        cache.store("a", 1, etag=None, last_modified=None)
+        assert cache.get("a") is None
+        assert cache.conditional_headers("a") == {}
+
+
+# =============================================================================
+# Rate Limit Scheduler
+# =============================================================================
+
+
+@pytest.mark.asyncio
+class TestRateLimitScheduler:
+    """Tests for rate-limit-aware scheduling."""
+
+    async def test_rate_limit_headers_recorded(self, github, mock_github):
+        """The scheduler tracks the quota reported by GitHub."""
+        await github.get_branch("owner", "repo", "main")
+
+        assert github.scheduler.limit == 5000
+        assert github.scheduler.remaining == mock_github.rate_remaining
+        assert github.scheduler.reset_at == mock_github.rate_reset
+
+    async def test_low_priority_refused_within_reserve(self, github, mock_github):
+        """Browsing calls fail fast once the quota reaches the reserve."""
+        github.scheduler.low_priority_reserve = 10
+        github.scheduler.slowdown_threshold = 0
+        mock_github.rate_remaining = 8
+        await github.get_branch("owner", "repo", "main")
+
+        with pytest.raises(GitHubError) as exc_info:
+            await github.list_repositories()
+        assert exc_info.value.status_code == 429
+
+        # Staging-path calls still go through
+        branch = await github.get_branch("owner", "repo", "main")
+        assert branch.name == "main"
+
+    async def test_requests_paced_below_threshold(self):
+        """Below the threshold requests are spread until the reset."""
+        now = [1000.0]
+        scheduler = RateLimitScheduler(slowdown_threshold=100, clock=lambda: now[0])
+        scheduler.update(
+            {
+                "x-ratelimit-limit": "5000",
+                "x-ratelimit-remaining": "50",
+                "x-ratelimit-reset": "1100",
+            }
+        )
+
+        first = scheduler._reserve(RequestPriority.HIGH)
+        second = scheduler._reserve(RequestPriority.HIGH)
+
+        assert first == 0
+        assert second == pytest.approx(100 / 50)
+
+    async def test_no_pacing_with_ample_quota(self):
+        """Requests are not delayed while the quota is healthy."""
+        scheduler = RateLimitScheduler(clock=lambda: 1000.0)
+        scheduler.update(
+            {"x-ratelimit-remaining": "4000", "x-ratelimit-reset": "4600"}
+        )
+        assert scheduler._reserve(RequestPriority.LOW) == 0
+        assert scheduler._reserve(RequestPriority.LOW) == 0
+
+    async def test_exhausted_quota_raises_beyond_max_wait(self):
+        """A wait longer than max_wait raises instead of blocking."""
+        scheduler = RateLimitScheduler(max_wait=5, clock=lambda: 1000.0)
+        scheduler.update({"x-ratelimit-remaining": "0", "x-ratelimit-reset": "1600"})
+
+        with pytest.raises(RateLimitExhausted) as exc_info:
+            async with scheduler.slot(RequestPriority.HIGH):
+                pass
+        assert exc_info.value.retry_after == pytest.approx(600)
+
+    async def test_high_priority_served_before_low(self):
+        """Queued staging calls get the next free slot before browsing calls."""
+        scheduler = RateLimitScheduler(max_concurrent=1)
+        order: list[str] = []
+        release = asyncio.Event()
+
+        async def hold() -> None:
+            async with scheduler.slot(RequestPriority.HIGH):
+                await release.wait()
+
+        async def run(name: str, priority: RequestPriority) -> None:
+            async with scheduler.slot(priority):
+                order.append(name)
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        low = asyncio.create_task(run("low", RequestPriority.LOW))
+        await asyncio.sleep(0)
+        high = asyncio.create_task(run("high", RequestPriority.HIGH))
+        await asyncio.sleep(0)
+        assert scheduler.queued == 2
+
+        release.set()
+        await asyncio.gather(holder, low, high)
+
+        assert order == ["high", "low"]
+        assert scheduler.active == 0
+
+    async def test_retry_after_blocks_requests(self, github, mock_github):
+        """A secondary rate limit response holds back further requests."""
+        mock_github.retry_after = "120"
+
+        with pytest.raises(GitHubError) as exc_info:
+            await github.get_branch("owner", "repo", "main")
+        assert exc_info.value.status_code == 403
+        assert github.scheduler.blocked_until > time.time() + 100
+
+        mock_github.retry_after = None
+        github.scheduler.max_wait = 1
+        with pytest.raises(GitHubError) as exc_info:
+            await github.get_branch("owner", "repo", "main")
+        assert exc_info.value.status_code == 429
+
+
+# =============================================================================
+# Pagination
+# =============================================================================
+
+
+class TestPagination:
+    """Tests for lazy, Link-header driven pagination."""
+
+    @pytest.mark.asyncio
+    async def test_parse_next_link(self):
+        header = (
+            '<https://api.github.com/user/repos?page=3>; rel="next", '
+            '<https://api.github.com/user/repos?page=9>; rel="last"'
+        )
+        assert _parse_next_link(header) == "https://api.github.com/user/repos?page=3"
+        assert _parse_next_link('<https://x/?page=1>; rel="prev"') is None
+        assert _parse_next_link(None) is None
+
+    @pytest.mark.asyncio
+    async def test_iter_repositories_follows_links(self, github, mock_github):
+        mock_github.repos = [_repo(f"repo-{i}") for i in range(25)]
+
+        names = [r.name async for r in github.iter_repositories(per_page=10)]
+
+        assert names == [f"repo-{i}" for i in range(25)]
+        assert mock_github.count("GET", "/user/repos") == 3
+
+    @pytest.mark.asyncio
+    async def test_foreign_next_link_not_followed(self, github, mock_github):
+        mock_github.repos = [_repo(f"repo-{i}") for i in range(25)]
+        # Same server, but a host name that differs from the API base
+        mock_github.link_base = mock_github.api_base.replace("127.0.0.1", "localhost")
+
+        names = [r.name async for r in github.iter_repositories(per_page=10)]
+        page = await github.get_repositories_page(page=1, per_page=10)
+
+        assert names == [f"repo-{i}" for i in range(10)]
+        assert mock_github.count("GET", "/user/repos") == 2
+        assert not page.has_next
+
+    @pytest.mark.asyncio
+    async def test_iteration_is_lazy(self, github, mock_github):
+        mock_github.repos = [_repo(f"repo-{i}") for i in range(50)]
+
+        names = []
+        async for repo in github.iter_repositories(per_page=10, prefetch=False):
+            names.append(repo.name)
+            if len(names) == 5:
+                break
+
+        assert len(names) == 5
+        assert mock_github.count("GET", "/user/repos") == 1
+
+    @pytest.mark.asyncio
+    async def test_next_page_prefetched(self, github, mock_github):
+        mock_github.repos = [_repo(f"repo-{i}") for i in range(20)]
+        mock_github.page_delay = 0.1
+
+        iterator = github.iter_repositories(per_page=10)
+        await anext(iterator)
+        # Consumer is slow; the second page loads in the background
+        await asyncio.sleep(0.3)
+        assert mock_github.count("GET", "/user/repos") == 2
+
+        started = time.monotonic()
+        names = [r.name async for r in iterator]
+        assert time.monotonic() - started < 0.1
+        assert len(names) == 19
+
+    @pytest.mark.asyncio
+    async def test_early_break_cancels_prefetch(self, github, mock_github):
+        mock_github.repos = [_repo(f"repo-{i}") for i in range(50)]
+        mock_github.page_delay = 0.05
+
+        iterator = github.iter_repositories(per_page=10)
+        await anext(iterator)
+        await iterator.aclose()
+        await asyncio.sleep(0.2)
+
+        assert mock_github.count("GET", "/user/repos") <= 2
+        assert github.scheduler.active == 0
+
+    @pytest.mark.asyncio
+    async def test_iter_branches(self, github, mock_github):
+        mock_github.branches = [f"branch-{i}" for i in range(7)]
+
+        branches = [b async for b in github.iter_branches("owner", "repo", per_page=3)]
+
+        assert [b.name for b in branches] == [f"branch-{i}" for i in range(7)]
+        assert branches[0].sha == "sha-branch-0"
+        assert mock_github.count("GET", "/repos/owner/repo/branches") == 3
+
+    @pytest.mark.asyncio
+    async def test_single_page_api(self, github, mock_github):
+        mock_github.repos = [_repo(f"repo-{i}") for i in range(15)]
+
+        first = await github.get_repositories_page(page=1, per_page=10)
+        last = await github.get_repositories_page(page=2, per_page=10)
+
+        assert len(first.items) == 10 and first.has_next
+        assert len(last.items) == 5 and not last.has_next
+        assert mock_github.count("GET", "/user/repos") == 2
+
+
+# =============================================================================
+# Client registry
+# =============================================================================
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _integration(api_base: str, token: str = "ghp_test", id: str = "int-1"):
+    return SimpleNamespace(
+        id=id, access_token_encrypted=token, config={"api_base": api_base}
+    )
+
+
+@pytest_asyncio.fixture
+async def registry():
+    """Client registry with a controllable clock."""
+    clock = FakeClock()
+    registry = GitHubClientRegistry(idle_timeout=60.0, clock=clock)
+    registry.clock = clock
+    yield registry
+    await registry.aclose()
+
+
+class TestClientRegistry:
+    """Tests for pooled, long-lived GitHub clients."""
+
+    @pytest.mark.asyncio
+    async def test_same_integration_reuses_service(self, registry, mock_github):
+        integration = _integration(mock_github.api_base)
+
+        first = registry.get(integration)
+        second = registry.get(integration)
+
+        assert first is second
+        assert len(registry) == 1
+
+    @pytest.mark.asyncio
+    async def test_token_change_creates_new_service(self, registry, mock_github):
+        first = registry.get(_integration(mock_github.api_base, token="ghp_old"))
+        second = registry.get(_integration(mock_github.api_base, token="ghp_new"))
+
+        assert first is not second
+        assert second.access_token == "ghp_new"
+
+    @pytest.mark.asyncio
+    async def test_connections_shared_between_integrations(
+        self, registry, mock_github
+    ):
+        a = registry.get(_integration(mock_github.api_base, id="int-a"))
+        b = registry.get(_integration(mock_github.api_base, id="int-b"))
+
+        assert a is not b
+        for _ in range(3):
+            await a.get_branch("owner", "repo", "main")
+            await b.get_branch("owner", "repo", "main")
+
+        # Sequential requests reuse one keep-alive connection
+        assert len(mock_github.connections) == 1
+        assert mock_github.request_headers[-1]["Authorization"] == "Bearer ghp_test"
+
+    @pytest.mark.asyncio
+    async def test_scheduler_shared_per_token(self, registry, mock_github):
+        a = registry.get(_integration(mock_github.api_base, id="int-a"))
+        b = registry.get(_integration(mock_github.api_base, id="int-b"))
+        c = registry.get(_integration(mock_github.api_base, token="other", id="c"))
+
+        assert a.scheduler is b.scheduler
+        assert a.scheduler is not c.scheduler
+
+    @pytest.mark.asyncio
+    async def test_idle_services_evicted(self, registry, mock_github):
+        first = registry.get(_integration(mock_github.api_base, id="idle"))
+        registry.clock.now = 30.0
+        registry.get(_integration(mock_github.api_base, id="busy"))
+
+        registry.clock.now = 70.0
+        assert registry.evict_idle() == 1
+
+        assert registry.get(_integration(mock_github.api_base, id="idle")) is not first
+        assert len(registry) == 2
+
+    @pytest.mark.asyncio
+    async def test_invalidate_integration(self, registry, mock_github):
+        first = registry.get(_integration(mock_github.api_base))
+
+        assert registry.invalidate("int-1") == 1
+        assert registry.get(_integration(mock_github.api_base)) is not first
+
+    @pytest.mark.asyncio
+    async def test_closing_service_keeps_shared_pool(self, registry, mock_github):
+        service = registry.get(_integration(mock_github.api_base))
+        await service.close()
+
+        await service.get_branch("owner", "repo", "main")
+
+        await registry.aclose()
+        assert len(registry) == 0
+        assert service._client.is_closed
+
+
+# =============================================================================
+# File content cache
+# =============================================================================
+
+
+class TestFileContentCache:
+    """Tests for blob-SHA keyed file content caching."""
+
+    @pytest.mark.asyncio
+    async def test_cold_read_uses_contents_api(self, github, mock_github):
+        mock_github.files = {"src/module.py": "print('hi')\n"}
+
+        content, sha = await github.get_file_content(
+            "owner", "repo", "src/module.py", "main"
+        )
+
+        assert (content, sha) == ("print('hi')\n", _blob_sha("print('hi')\n"))
+        assert mock_github.requests[0] == (
+            "GET",
+            "/repos/owner/repo/contents/src/module.py?ref=main",
+        )
+        assert github.content_cache.get(sha) == content
+
+    @pytest.mark.asyncio
+    async def test_warm_reads_skip_network(self, github, mock_github):
+        mock_github.files = {"src/module.py": "print('hi')\n", "README.md": "hello"}
+        await github.warm_tree_index("owner", "repo", "main")
+
+        first = await github.get_file_content("owner", "repo", "src/module.py", "main")
+        second = await github.get_file_content("owner", "repo", "src/module.py", "main")
+
+        assert first == second == ("print('hi')\n", _blob_sha("print('hi')\n"))
+        # Ref resolution, tree listing and blob fetch happen only once
+        assert mock_github.count("GET", "/repos/owner/repo/git/trees") == 2
+        assert mock_github.count("GET", "/repos/owner/repo/git/blobs") == 1
+        assert mock_github.count("GET", "/repos/owner/repo/contents") == 0
+
+    @pytest.mark.asyncio
+    async def test_cold_read_warms_tree_index(self, github, mock_github):
+        mock_github.files = {"a.py": "a", "b.py": "b"}
+
+        await github.get_file_content("owner", "repo", "a.py", "main")
+        await asyncio.gather(*github._tree_warmups.values())
+        content, _ = await github.get_file_content("owner", "repo", "b.py", "main")
+
+        assert content == "b"
+        assert mock_github.count("GET", "/repos/owner/repo/contents") == 1
+        assert mock_github.count("GET", "/repos/owner/repo/git/blobs") == 1
+
+    @pytest.mark.asyncio
+    async def test_sha_addressed_responses_not_double_cached(
+        self, github, mock_github
+    ):
+        mock_github.files = {"a.py": "a"}
+        await github.warm_tree_index("owner", "repo", "main")
+        await github.get_file_content("owner", "repo", "a.py", "main")
+
+        # Only the ref resolution is kept for revalidation
+        assert len(github.cache) <= 1
+        assert not any("recursive" in key for key in github.cache._entries)
+
+    @pytest.mark.asyncio
+    async def test_same_blob_on_other_ref_not_downloaded(self, github, mock_github):
+        mock_github.files = {"a.py": "same", "b.py": "other"}
+        await github.warm_tree_index("owner", "repo", "main")
+        await github.get_file_content("owner", "repo", "a.py", "main")
+
+        mock_github.files["b.py"] = "changed"
+        await github.warm_tree_index("owner", "repo", "dev")
+        content, _ = await github.get_file_content("owner", "repo", "a.py", "dev")
+
+        assert content == "same"
+        assert mock_github.count("GET", "/repos/owner/repo/git/blobs") == 1
+
+    @pytest.mark.asyncio
+    async def test_branch_resolution_expires(self, github, mock_github):
+        mock_github.files = {"a.py": "v1"}
+        github.REF_TTL = 0.0
+        await github.warm_tree_index("owner", "repo", "main")
+        content, _ = await github.get_file_content("owner", "repo", "a.py", "main")
+        assert content == "v1"
+
+        mock_github.files = {"a.py": "v2"}
+        mock_github.file_last_modified = "Thu, 02 Jan 2025 00:00:00 GMT"
+        content, _ = await github.get_file_content("owner", "repo", "a.py", "main")
+        assert content == "v2"
+
+    @pytest.mark.asyncio
+    async def test_commit_drops_branch_resolution(self, github, mock_github):
+        mock_github.files = {"a.py": "v1"}
+        await github.warm_tree_index("owner", "repo", "main")
+        await github.warm_tree_index("owner", "repo", "dev")
+        content, _ = await github.get_file_content("owner", "repo", "a.py", "main")
+        assert content == "v1"
+
+        await github.create_files_in_commit(
+            "owner", "repo", "main", [{"path": "a.py", "content": "v2"}], "Update"
+        )
+        mock_github.files = {"a.py": "v2"}
+        mock_github.file_last_modified = "Thu, 02 Jan 2025 00:00:00 GMT"
+
+        assert ("owner", "repo", "main") not in github._ref_trees
+        assert ("owner", "repo", "dev") in github._ref_trees
+        content, _ = await github.get_file_content("owner", "repo", "a.py", "main")
+        assert content == "v2"
+
+    @pytest.mark.asyncio
+    async def test_unknown_moved_branch_drops_repo_resolutions(
+        self, github, mock_github
+    ):
+        commit = "a" * 40
+        for ref in ("main", "HEAD", commit):
+            await github.resolve_tree_sha("owner", "repo", ref)
+        await github.resolve_tree_sha("owner", "other", "main")
+
+        github._forget_ref("owner", "repo", None)
+
+        assert set(github._ref_trees) == {
+            ("owner", "repo", commit),
+            ("owner", "other", "main"),
+        }
+
+    @pytest.mark.asyncio
+    async def test_ref_resolutions_bounded(self, github, mock_github):
+        github.REF_CACHE_SIZE = 2
+        commit = "a" * 40
+        await github.resolve_tree_sha("owner", "repo", commit)
+        await github.resolve_tree_sha("owner", "repo", "main")
+        await github.resolve_tree_sha("owner", "repo", "dev")
+
+        assert len(github._ref_trees) == 2
+        assert ("owner", "repo", commit) not in github._ref_trees
+
+    @pytest.mark.asyncio
+    async def test_truncated_tree_falls_back_to_contents(self, github, mock_github):
+        mock_github.files = {"a.py": "x"}
+        mock_github.tree_truncated = True
+        await github.warm_tree_index("owner", "repo")
+
+        content, sha = await github.get_file_content("owner", "repo", "a.py")
+
+        assert (content, sha) == ("hello", "file-sha")
+        assert mock_github.count("GET", "/repos/owner/repo/contents/a.py") == 1
+
+    @pytest.mark.asyncio
+    async def test_disk_tier_shared_between_services(self, mock_github, tmp_path):
+        mock_github.files = {"a.py": "persisted"}
+        for _ in range(2):
+            service = GitHubService(
+                access_token="ghp_test",
+                api_base=mock_github.api_base,
+                content_cache=BlobCache(disk_dir=tmp_path),
+            )
+            await service.warm_tree_index("owner", "repo")
+            content, _ = await service.get_file_content("owner", "repo", "a.py")
+            await service.close()
+            assert content == "persisted"
+
+        assert mock_github.count("GET", "/repos/owner/repo/git/blobs") == 1
+        assert service.content_cache.disk_hits == 1
+
+    def test_disk_tier_bounded(self, tmp_path):
+        cache = BlobCache(max_memory_bytes=0, disk_dir=tmp_path, max_disk_bytes=1000)
+        for i in range(10):
+            cache.store(hashlib.sha1(str(i).encode()).hexdigest(), "x" * 300)
+
+        assert cache.disk_bytes <= 1000
+        # The most recent blob survives eviction
+        assert cache.get(hashlib.sha1(b"9").hexdigest()) == "x" * 300
+
+    def test_memory_tier_lru(self):
+        cache = BlobCache(max_memory_bytes=10)
+        cache.store("a" * 40, "12345")
+        cache.store("b" * 40, "12345")
+        cache.get("a" * 40)
+        cache.store("c" * 40, "12345")
+
+        assert cache.get("a" * 40) == "12345"
+        assert cache.get("b" * 40) is None
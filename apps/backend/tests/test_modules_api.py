@@ -959,6 +959,44 @@ class TestGitHubIntegrationsAPI:
         )
         assert response.status_code == 404
 
+    @pytest.mark.asyncio
+    async def test_list_github_repos_not_found(
+        self, client: AsyncClient, auth_headers: dict
+    ):
+        """Test listing repositories of a non-existent integration."""
+        fake_id = str(uuid.uuid4())
+        response = await client.get(
+            f"/api/modules/github-integrations/{fake_id}/repos",
+            params={"page": 2, "per_page": 50},
+            headers=auth_headers,
+        )
+        assert response.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_list_github_repos_rejects_oversized_page(
+        self, client: AsyncClient, auth_headers: dict
+    ):
+        """Test that per_page is capped at GitHub's maximum."""
+        fake_id = str(uuid.uuid4())
+        response = await client.get(
+            f"/api/modules/github-integrations/{fake_id}/repos",
+            params={"per_page": 500},
+            headers=auth_headers,
+        )
+        assert response.status_code == 422
+
+    @pytest.mark.asyncio
+    async def test_list_github_branches_not_found(
+        self, client: AsyncClient, auth_headers: dict
+    ):
+        """Test listing branches of a non-existent integration."""
+        fake_id = str(uuid.uuid4())
+        response = await client.get(
+            f"/api/modules/github-integrations/{fake_id}/branches",
+            headers=auth_headers,
+        )
+        assert response.status_code == 404
+
 
 class TestModulesCleanup:
     """Cleanup test data after module tests."""
@@ -0,0 +1,139 @@
+"""Tests for cursor pagination helpers and list endpoints."""
+
+import time
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+from httpx import AsyncClient
+
+from app.core import pagination
+from app.core.pagination import decode_cursor, encode_cursor
+
+
+class TestCursor:
+    """Tests for cursor encoding."""
+
+    def test_roundtrip_datetime(self):
+        """Test that datetimes survive a cursor roundtrip."""
+        now = datetime.now(timezone.utc)
+        row_id = str(uuid4())
+
+        sort_value, decoded_id = decode_cursor(encode_cursor(now, row_id))
+
+        assert sort_value == now
+        assert decoded_id == row_id
+
+    def test_cursor_is_url_safe(self):
+        """Test that cursors need no escaping in query strings."""
+        cursor = encode_cursor(datetime.now(timezone.utc), uuid4())
+        assert all(c.isalnum() or c in "-_" for c in cursor)
+
+    @pytest.mark.parametrize("cursor", ["", "###", "bm90LWpzb24", "e30"])
+    def test_invalid_cursor(self, cursor):
+        """Test that malformed cursors raise a 400."""
+        with pytest.raises(HTTPException) as exc_info:
+            decode_cursor(cursor)
+        assert exc_info.value.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_cursor_with_wrong_sort_type(
+        self, client: AsyncClient, auth_headers: dict
+    ):
+        """Test that a cursor whose sort value has the wrong type is rejected."""
+        cursor = encode_cursor("yesterday", uuid4())
+        response = await client.get(
+            f"/api/audit-cases?cursor={cursor}", headers=auth_headers
+        )
+        assert response.status_code == 400
+
+
+class TestAuditCaseListPagination:
+    """Tests for keyset pagination of the audit case list."""
+
+    async def _create_cases(self, client, auth_headers, n):
+        prefix = f"TEST-PAGE-{int(time.time() * 1000)}"
+        for i in range(n):
+            response = await client.post(
+                "/api/audit-cases",
+                json={
+                    "case_number": f"{prefix}-{i}",
+                    "project_name": f"Pagination {i}",
+                    "beneficiary_name": "Test GmbH",
+                    "audit_type": "operation",
+                },
+                headers=auth_headers,
+            )
+            assert response.status_code == 201
+        return prefix
+
+    @pytest.mark.asyncio
+    async def test_cursor_matches_offset(
+        self, client: AsyncClient, auth_headers: dict, cleanup_test_cases
+    ):
+        """Test that cursor pages return the same rows as offset pages."""
+        prefix = await self._create_cases(client, auth_headers, 5)
+        params = {"search": prefix, "page_size": 2}
+
+        offset_ids = []
+        for page in (1, 2, 3):
+            response = await client.get(
+                "/api/audit-cases",
+                params={**params, "page": page},
+                headers=auth_headers,
+            )
+            data = response.json()
+            assert data["total"] == 5
+            assert data["pages"] == 3
+            offset_ids.extend(item["id"] for item in data["items"])
+
+        cursor_ids = []
+        cursor = None
+        while True:
+            query = {**params, "count": "none"}
+            if cursor:
+                query["cursor"] = cursor
+            response = await client.get(
+                "/api/audit-cases", params=query, headers=auth_headers
+            )
+            assert response.status_code == 200
+            data = response.json()
+            cursor_ids.extend(item["id"] for item in data["items"])
+            cursor = data["next_cursor"]
+            if cursor is None:
+                break
+
+        assert cursor_ids == offset_ids
+        assert len(set(cursor_ids)) == 5
+
+    @pytest.mark.asyncio
+    async def test_capped_count(
+        self,
+        client: AsyncClient,
+        auth_headers: dict,
+        cleanup_test_cases,
+        monkeypatch,
+    ):
+        """Test that capped counts stop at the cap and flag an estimate."""
+        prefix = await self._create_cases(client, auth_headers, 3)
+        monkeypatch.setattr(pagination, "COUNT_CAP", 2)
+
+        response = await client.get(
+            "/api/audit-cases",
+            params={"search": prefix, "count": "capped"},
+            headers=auth_headers,
+        )
+
+        data = response.json()
+        assert data["total"] == 2
+        assert data["total_is_estimate"] is True
+        assert len(data["items"]) == 3
+
+    @pytest.mark.asyncio
+    async def test_invalid_count_mode(self, client: AsyncClient, auth_headers: dict):
+        """Test that unknown count modes are rejected."""
+        response = await client.get(
+            "/api/audit-cases?count=approximate", headers=auth_headers
+        )
+        assert response.status_code == 422
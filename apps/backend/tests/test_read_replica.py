@@ -0,0 +1,246 @@
+"""Tests for routing read-only requests to a read replica.
+
+The replica is stood in by a second engine on the test database. Its
+connections are read-only like those of a hot standby, which tells the
+tests which engine served a read.
+"""
+
+import uuid
+
+import pytest
+import pytest_asyncio
+from fastapi import Request
+from httpx import AsyncClient
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import close_db, get_read_db, reset_engine
+from app.core.read_replica import (
+    LAST_WRITE_COOKIE,
+    ReplicaRouter,
+    last_write_of,
+    principal_of,
+    replica_router,
+)
+from app.core.security import create_access_token
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest_asyncio.fixture
+async def replica(monkeypatch, db_engine):
+    """Stand-in replica on the test database."""
+    monkeypatch.setattr(settings, "database_replica_url", settings.database_url)
+    replica_router.clear()
+    # Engines are created anew in the event loop of the test
+    reset_engine()
+    yield
+    await close_db()
+    replica_router.clear()
+
+
+def request_with(headers: dict[str, str] | None = None) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "headers": [
+                (name.lower().encode(), value.encode())
+                for name, value in (headers or {}).items()
+            ],
+        }
+    )
+
+
+async def read_only(request: Request) -> str:
+    """transaction_read_only of the session get_read_db provides."""
+    sessions = get_read_db(request)
+    session = await anext(sessions)
+    try:
+        result = await session.execute(text("SHOW transaction_read_only"))
+        return result.scalar_one()
+    finally:
+        await sessions.aclose()
+
+
+class TestReplicaRouter:
+    """Tests for the routing decisions."""
+
+    def test_writers_read_from_primary_for_sticky_window(self):
+        """Test that a write pins only the writer, and only for a while."""
+        clock = FakeClock()
+        router = ReplicaRouter(sticky_seconds=10, clock=clock)
+
+        router.record_write("user-1")
+
+        assert not router.use_replica("user-1")
+        assert router.use_replica("user-2")
+        assert router.use_replica(None)
+        clock.now += 10
+        assert router.use_replica("user-1")
+        assert router.metrics()["sticky_users"] == 0
+
+    def test_write_time_from_cookie_pins_reads(self):
+        """Test stickiness for writes recorded by another process."""
+        wall_clock = FakeClock()
+        router = ReplicaRouter(sticky_seconds=10, wall_clock=wall_clock)
+
+        assert not router.use_replica("user-1", last_write=wall_clock.now - 5)
+        assert router.use_replica("user-1", last_write=wall_clock.now - 10)
+        # Times in the future do not pin reads indefinitely
+        assert router.use_replica("user-1", last_write=wall_clock.now + 60)
+        assert router.write_cookie().startswith(
+            f"{LAST_WRITE_COOKIE}={wall_clock.now:.3f}; Max-Age=10;"
+        )
+        assert last_write_of("1000.5") == 1000.5
+        assert last_write_of("nan") is None
+        assert last_write_of("x") is None
+
+    def test_failure_sends_reads_to_primary_until_retry(self):
+        """Test the fallback to the primary after a replica failure."""
+        clock = FakeClock()
+        router = ReplicaRouter(retry_seconds=30, clock=clock)
+
+        assert router.use_replica(None)
+        router.replica_failed()
+
+        assert not router.use_replica(None)
+        assert not router.metrics()["replica_available"]
+        clock.now += 30
+        assert router.use_replica(None)
+        metrics = router.metrics()
+        assert metrics["replica_reads"] == 1
+        assert metrics["fallback_reads"] == 2
+        assert metrics["replica_failures"] == 1
+
+    def test_tracked_writers_are_bounded(self):
+        """Test that the oldest writers are forgotten first."""
+        router = ReplicaRouter(max_entries=2)
+
+        for user in ("a", "b", "c"):
+            router.record_write(user)
+
+        assert router.use_replica("a")
+        assert not router.use_replica("c")
+
+    def test_principal_of_bearer_token(self):
+        """Test that writers are identified by the subject of their token."""
+        token = create_access_token(data={"sub": "user-1"})
+
+        assert principal_of(f"Bearer {token}") == "user-1"
+        assert principal_of("Bearer kein-token") is None
+        assert principal_of(None) is None
+
+
+class TestGetReadDb:
+    """Tests for the session of read-only endpoints."""
+
+    @pytest.mark.asyncio
+    async def test_reads_from_replica(self, replica):
+        """Test that reads go to the replica."""
+        assert await read_only(request_with()) == "on"
+        assert replica_router.replica_reads == 1
+
+    @pytest.mark.asyncio
+    async def test_writer_reads_from_primary(self, replica, auth_headers: dict):
+        """Test read-your-writes for a user who just wrote."""
+        token = auth_headers["Authorization"].split()[1]
+        replica_router.record_write(principal_of(f"Bearer {token}"))
+
+        assert await read_only(request_with(auth_headers)) == "off"
+        assert await read_only(request_with()) == "on"
+
+    @pytest.mark.asyncio
+    async def test_unreachable_replica_falls_back(self, replica, monkeypatch):
+        """Test that an unreachable replica is skipped."""
+        monkeypatch.setattr(
+            settings,
+            "database_replica_url",
+            "postgresql+asyncpg://flowaudit:x@127.0.0.1:1/flowaudit",
+        )
+
+        assert await read_only(request_with()) == "off"
+        assert await read_only(request_with()) == "off"
+        assert replica_router.replica_failures == 1
+
+    @pytest.mark.asyncio
+    async def test_without_replica_reads_from_primary(self, monkeypatch, db_engine):
+        """Test that the primary serves reads when no replica is configured."""
+        monkeypatch.setattr(settings, "database_replica_url", None)
+        reset_engine()
+        try:
+            assert await read_only(request_with()) == "off"
+        finally:
+            await close_db()
+
+
+class TestReadYourWritesMiddleware:
+    """Tests for the routing of API requests."""
+
+    @pytest.mark.asyncio
+    async def test_write_pins_reads_of_the_user(
+        self, client: AsyncClient, auth_headers: dict, replica
+    ):
+        """Test that a user's reads follow a write to the primary."""
+        from app.main import app
+
+        app.dependency_overrides.pop(get_read_db)
+        url = "/api/audit-cases"
+
+        assert (await client.get(url, headers=auth_headers)).status_code == 200
+        assert replica_router.replica_reads == 1
+
+        await client.post("/api/history/events", json={}, headers=auth_headers)
+        assert (await client.get(url, headers=auth_headers)).status_code == 200
+        assert replica_router.sticky_reads == 1
+
+        response = await client.get("/api/health/database")
+        assert set(response.json()["pools"]) == {"primary", "replica"}
+        assert response.json()["replica_routing"]["sticky_users"] == 1
+
+    @pytest.mark.asyncio
+    async def test_write_cookie_pins_reads_on_other_workers(
+        self, client: AsyncClient, auth_headers: dict, replica
+    ):
+        """Test that the write cookie pins reads the process did not see."""
+        from app.main import app
+
+        app.dependency_overrides.pop(get_read_db)
+        response = await client.post(
+            "/api/history/events", json={}, headers=auth_headers
+        )
+        assert LAST_WRITE_COOKIE in response.cookies
+
+        # Another worker: the write is only known from the cookie
+        replica_router.clear()
+        assert (
+            await client.get("/api/audit-cases", headers=auth_headers)
+        ).status_code == 200
+        assert replica_router.sticky_reads == 1
+        assert replica_router.replica_reads == 0
+
+    @pytest.mark.asyncio
+    async def test_cached_endpoints_read_from_primary(
+        self, client: AsyncClient, auth_headers: dict, replica
+    ):
+        """Test that reads filling shared caches never use the replica."""
+        from app.main import app
+
+        app.dependency_overrides.clear()
+        statistics = await client.get(
+            "/api/audit-cases/statistics", headers=auth_headers
+        )
+        summaries = await client.get(
+            "/api/audit-cases/findings-summary",
+            params={"case_ids": [str(uuid.uuid4())]},
+            headers=auth_headers,
+        )
+
+        assert statistics.status_code == 200
+        assert summaries.status_code == 200
+        assert replica_router.replica_reads == 0
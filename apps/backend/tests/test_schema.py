@@ -0,0 +1,182 @@
+"""Tests for the schema version check and schema creation."""
+
+import asyncio
+import uuid
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.config import settings
+from app.core.database import (
+    SCHEMA_REVISION,
+    STARTUP_SCHEMA_REVISION,
+    Base,
+    SchemaVersionError,
+    check_schema,
+    create_schema,
+)
+
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+
+async def drop_version_table(engine) -> None:
+    async with engine.begin() as conn:
+        await conn.execute(text("DROP TABLE IF EXISTS alembic_version"))
+
+
+async def stamp(engine, revision: str) -> None:
+    async with engine.begin() as conn:
+        await conn.execute(
+            text("CREATE TABLE alembic_version (version_num VARCHAR(32) NOT NULL)")
+        )
+        await conn.execute(
+            text("INSERT INTO alembic_version VALUES (:revision)"),
+            {"revision": revision},
+        )
+
+
+@pytest_asyncio.fixture
+async def engine(db_engine):
+    """Test database without Alembic version table."""
+    await drop_version_table(db_engine)
+    yield db_engine
+    await drop_version_table(db_engine)
+
+
+@pytest_asyncio.fixture
+async def empty_engine(db_engine):
+    """Engine whose connections use a new, empty schema."""
+    schema = f"test_schema_{uuid.uuid4().hex[:8]}"
+    async with db_engine.begin() as conn:
+        await conn.execute(text(f"CREATE SCHEMA {schema}"))
+    engine = create_async_engine(
+        str(settings.database_url),
+        connect_args={"server_settings": {"search_path": schema}},
+    )
+    yield engine
+    await engine.dispose()
+    async with db_engine.begin() as conn:
+        await conn.execute(text(f"DROP SCHEMA {schema} CASCADE"))
+
+
+async def table_names(engine) -> set[str]:
+    async with engine.connect() as conn:
+        result = await conn.execute(
+            text(
+                "SELECT table_name FROM information_schema.tables "
+                "WHERE table_schema = current_schema()"
+            )
+        )
+        return set(result.scalars().all())
+
+
+def test_schema_revision_is_alembic_head():
+    """Test that SCHEMA_REVISION names the newest migration."""
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND_DIR / "alembic"))
+
+    assert ScriptDirectory.from_config(config).get_current_head() == SCHEMA_REVISION
+
+
+class TestCheckSchema:
+    """Tests for the startup check of the schema revision."""
+
+    @pytest.mark.asyncio
+    async def test_missing_version_table(self, engine):
+        """Test that a database without Alembic version is rejected."""
+        with pytest.raises(SchemaVersionError, match="create-schema"):
+            await check_schema(engine)
+
+    @pytest.mark.asyncio
+    async def test_outdated_revision(self, engine):
+        """Test that a database at an older revision is rejected."""
+        await stamp(engine, "016")
+
+        with pytest.raises(SchemaVersionError, match="016"):
+            await check_schema(engine)
+
+    @pytest.mark.asyncio
+    async def test_current_revision(self, engine):
+        """Test that a database at the head revision passes."""
+        await stamp(engine, SCHEMA_REVISION)
+
+        assert await check_schema(engine) == SCHEMA_REVISION
+
+
+class TestCreateSchema:
+    """Tests for creating the schema of a new database."""
+
+    @pytest.mark.asyncio
+    async def test_create_stamps_head(self, empty_engine):
+        """Test that the created schema passes the check, once."""
+        assert await create_schema(empty_engine)
+        assert await check_schema(empty_engine) == SCHEMA_REVISION
+        assert not await create_schema(empty_engine)
+        assert set(Base.metadata.tables) <= await table_names(empty_engine)
+
+    @pytest.mark.asyncio
+    async def test_refuses_database_created_at_startup(self, empty_engine):
+        """Test that tables created by the former startup create_all are kept.
+
+        Such a database lacks the columns of later migrations, so stamping it
+        at head would break the application.
+        """
+        tables = [Base.metadata.tables[name] for name in ("tenants", "users")]
+        async with empty_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all, tables=tables)
+            # Added by migration 010, after the startup create_all was dropped
+            await conn.execute(text("ALTER TABLE users DROP COLUMN token_version"))
+
+        with pytest.raises(SchemaVersionError) as exc_info:
+            await create_schema(empty_engine)
+
+        assert f"alembic stamp {STARTUP_SCHEMA_REVISION}" in str(exc_info.value)
+        assert await table_names(empty_engine) == {"tenants", "users"}
+
+    @pytest.mark.asyncio
+    async def test_refuses_migrated_database(self, engine):
+        """Test that a database at another revision is left to Alembic."""
+        await stamp(engine, "016")
+
+        with pytest.raises(SchemaVersionError, match="alembic upgrade"):
+            await create_schema(engine)
+
+
+class TestStartupSchemaCheck:
+    """Tests for the schema check at application startup."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "mode,schema_ok,maintained",
+        [("warn", True, True), ("warn", False, False), ("off", True, False)],
+    )
+    async def test_partition_maintenance_needs_checked_schema(
+        self, monkeypatch, mode: str, schema_ok: bool, maintained: bool
+    ):
+        """Test that partitions are only maintained on a checked schema."""
+        from app import main
+
+        async def check_schema_stub():
+            if not schema_ok:
+                raise SchemaVersionError("Schema revision 015, expected 017")
+            return SCHEMA_REVISION
+
+        started = []
+
+        async def maintenance_stub():
+            started.append(True)
+
+        monkeypatch.setattr(settings, "database_schema_check", mode)
+        monkeypatch.setattr(main, "check_schema", check_schema_stub)
+        monkeypatch.setattr(main, "run_partition_maintenance", maintenance_stub)
+
+        async with main.lifespan(main.app):
+            await asyncio.sleep(0)
+
+        assert bool(started) is maintained
@@ -837,6 +837,40 @@ class TestVendorUserCRUD:
         )
         assert response.status_code == 204
 
+    @pytest.mark.asyncio
+    async def test_deactivation_revokes_cached_principal(
+        self,
+        client: AsyncClient,
+        vendor_admin_headers: dict,
+        vendor_support: dict,
+        vendor_support_headers: dict,
+    ):
+        """Test that a deactivated user's token stops working immediately."""
+        response = await client.get("/api/v1/vendor", headers=vendor_support_headers)
+        assert response.status_code == 200
+
+        response = await client.delete(
+            f"/api/v1/vendor/users/{vendor_support['id']}",
+            headers=vendor_admin_headers,
+        )
+        assert response.status_code == 204
+
+        response = await client.get("/api/v1/vendor", headers=vendor_support_headers)
+        assert response.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_vendor_logout_revokes_token(
+        self, client: AsyncClient, vendor_support_headers: dict
+    ):
+        """Test that logging out revokes the vendor token."""
+        response = await client.post(
+            "/api/v1/vendor/logout", headers=vendor_support_headers
+        )
+        assert response.status_code == 204
+
+        response = await client.get("/api/v1/vendor", headers=vendor_support_headers)
+        assert response.status_code == 401
+
     @pytest.mark.asyncio
     async def test_cannot_deactivate_self(
         self, client: AsyncClient, vendor_admin_headers: dict, vendor_admin: dict
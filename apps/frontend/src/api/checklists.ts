@@ -69,12 +69,15 @@ interface ChecklistInstance {
   total_questions: number
   answered_questions: number
   responses: Record<string, ResponseValue>
+  version?: number
   completed_by: string | null
   completed_at: string | null
   created_at: string
   updated_at: string
   template_name?: string
-  structure?: ChecklistStructure
+  template_version?: number
+  structure_etag?: string
+  structure?: ChecklistStructure | null
 }
 
 interface ResponseValue {
@@ -187,7 +190,9 @@ export async function updateChecklist(
     status?: string
   }
 ): Promise<ChecklistInstance> {
-  const response = await fetch(`${API_BASE}/checklists/audit-case/${caseId}/${checklistId}`, {
+  // The caller already has the template structure; do not send it back
+  const url = `${API_BASE}/checklists/audit-case/${caseId}/${checklistId}?include_structure=false`
+  const response = await fetch(url, {
     method: 'PATCH',
     headers: getAuthHeaders(),
     body: JSON.stringify(data),
@@ -69,7 +69,7 @@ export interface FindingsSummary {
   total: number
   by_status: Record<string, number>
   by_type: Record<string, number>
-  total_financial_impact: number
+  total_financial_impact: string // exact decimal, e.g. "6000.00"
 }
 
 // --- Helpers ---